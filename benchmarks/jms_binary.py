@@ -0,0 +1,85 @@
+# ##### BEGIN MIT LICENSE BLOCK #####
+#
+# MIT License
+#
+# Copyright (c) 2023 Steven Garcia & Jadeon Sheppard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# ##### END MIT LICENSE BLOCK #####
+# Compares the internal binary JMS intermediate with text JMS on the retail models in resources/halo3. Every model is parsed from
+# text, written back as text and as binary, and the binary file is read again with process_file_binary.
+#
+# Run it with Blender's Python or with the bpy module installed:
+#     blender -b --python benchmarks/jms_binary.py
+#     python benchmarks/jms_binary.py
+
+import os
+import sys
+import glob
+import time
+import tempfile
+
+REPOSITORY_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPOSITORY_DIRECTORY)
+sys.path.insert(0, os.path.join(REPOSITORY_DIRECTORY, "tests"))
+
+import export_assets
+
+from io_scene_halo.file_jms import build_asset
+from io_scene_halo.file_jms.format import JMSAsset
+from io_scene_halo.file_jms.process_file_retail import process_file_retail
+from io_scene_halo.file_jms.process_file_binary import process_file_binary
+
+RETAIL_VERSIONS = (8197, 8198, 8199, 8200, 8201, 8202, 8203, 8204, 8205, 8206, 8207, 8208, 8209, 8210, 8211, 8212, 8213)
+
+def get_time(function, *args, **kwargs):
+    start_time = time.perf_counter()
+    result = function(*args, **kwargs)
+
+    return result, time.perf_counter() - start_time
+
+def read_text_jms(input_file):
+    return process_file_retail(JMSAsset(input_file), 'auto', 'JMS', RETAIL_VERSIONS, 'default', 'default')
+
+def run_benchmark():
+    output_directory = tempfile.mkdtemp()
+    totals = [0.0, 0.0, 0.0, 0.0, 0, 0]
+    print("%-26s %8s %10s %10s %10s %10s %10s %10s" % ("model", "vertices", "text read", "text write", "bin write", "bin read", "text KB", "bin KB"))
+    for input_file in sorted(glob.glob(os.path.join(REPOSITORY_DIRECTORY, "io_scene_halo", "resources", "halo3", "*.[jJ][mM][sS]"))):
+        JMS, text_read_time = get_time(read_text_jms, input_file)
+        export_assets.set_export_layout(JMS)
+        output_path = os.path.join(output_directory, os.path.basename(input_file))
+        result, text_write_time = get_time(build_asset.write_asset_sections, JMS, output_path, JMS.version, "halo3")
+        result, binary_write_time = get_time(build_asset.write_asset_sections, JMS, output_path, JMS.version, "halo3", binary=True)
+        BINARY_JMS, binary_read_time = get_time(process_file_binary, output_path + "B", 'auto', 'JMS', RETAIL_VERSIONS, 'default', 'default')
+        text_size = os.path.getsize(output_path)
+        binary_size = os.path.getsize(output_path + "B")
+        print("%-26s %8s %9.3fs %9.3fs %9.3fs %9.3fs %10s %10s" % (os.path.basename(input_file), len(BINARY_JMS.vertices), text_read_time, text_write_time, binary_write_time, binary_read_time, text_size // 1024, binary_size // 1024))
+        for value_idx, value in enumerate((text_read_time, text_write_time, binary_write_time, binary_read_time, text_size, binary_size)):
+            totals[value_idx] += value
+
+        os.remove(output_path)
+        os.remove(output_path + "B")
+
+    os.rmdir(output_directory)
+    print("%-26s %8s %9.3fs %9.3fs %9.3fs %9.3fs %10s %10s" % ("total", "", totals[0], totals[1], totals[2], totals[3], totals[4] // 1024, totals[5] // 1024))
+
+if __name__ == '__main__':
+    run_benchmark()
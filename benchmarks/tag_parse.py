@@ -0,0 +1,117 @@
+# ##### BEGIN MIT LICENSE BLOCK #####
+#
+# MIT License
+#
+# Copyright (c) 2023 Steven Garcia & Jadeon Sheppard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# ##### END MIT LICENSE BLOCK #####
+# Measures tag parse time for big-endian Halo 1 and little-endian Halo 2 tags. The field reader pass always runs on a generated
+# stream, once through the readers TagAsset binds while XML output is off and once through the XML aware methods. Any tag files
+# passed after the field count are also parsed with the reader parse_tags picks for their group.
+#
+# Run it with Blender's Python or with the bpy module installed:
+#     blender -b --python benchmarks/tag_parse.py -- 200000 path/to/tag.gbxmodel path/to/tag.render_model
+#     python benchmarks/tag_parse.py 200000
+
+import io
+import os
+import sys
+import time
+
+from types import MethodType
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from io_scene_halo.global_functions import tag_cache, tag_format, parse_tags
+
+PARSE_REPEAT = 5
+
+def get_field_stream(field_count, big_endian):
+    field_struct = tag_format.get_struct(big_endian, 'fhhi3f')
+    return io.BytesIO(b"".join(field_struct.pack(index * 0.5, index % 32767, -(index % 32767), index, 1.0, 2.0, 3.0) for index in range(field_count)))
+
+def read_fields(input_stream, TAG, field_count, read_float, read_signed_short, read_signed_integer, read_point_3d):
+    input_stream.seek(0)
+    xml_data = tag_format.XMLData(None, "field")
+    start_time = time.perf_counter()
+    for field_idx in range(field_count):
+        read_float(input_stream, TAG, xml_data)
+        read_signed_short(input_stream, TAG, xml_data)
+        read_signed_short(input_stream, TAG, xml_data)
+        read_signed_integer(input_stream, TAG, xml_data)
+        read_point_3d(input_stream, TAG, xml_data)
+
+    return time.perf_counter() - start_time
+
+def run_field_benchmark(field_count):
+    for game_title, big_endian in (("halo1 big-endian", True), ("halo2 little-endian", False)):
+        TAG = tag_format.TagAsset()
+        TAG.big_endian = big_endian
+        input_stream = get_field_stream(field_count, big_endian)
+        xml_time = read_fields(input_stream, TAG, field_count,
+                               MethodType(tag_format.TagAsset.read_float, TAG),
+                               MethodType(tag_format.TagAsset.read_signed_short, TAG),
+                               MethodType(tag_format.TagAsset.read_signed_integer, TAG),
+                               MethodType(tag_format.TagAsset.read_point_3d, TAG))
+        fast_time = read_fields(input_stream, TAG, field_count, TAG.read_float, TAG.read_signed_short, TAG.read_signed_integer, TAG.read_point_3d)
+        print("%s: %s fields, xml aware readers %0.3fs, no xml readers %0.3fs" % (game_title, field_count * 5, xml_time, fast_time))
+
+def get_process_file(input_file):
+    with open(input_file, 'rb') as input_stream:
+        header = input_stream.read(64)
+
+    engine_tag = header[60:64]
+    tag_group = header[36:40].decode('utf-8', 'replace')
+    game_title = "halo1"
+    tag_groups = parse_tags.H1_TAG_GROUPS
+    if not engine_tag == b"blam":
+        game_title = "halo2"
+        tag_groups = parse_tags.H2_TAG_GROUPS
+        tag_group = tag_group[::-1]
+
+    for tag_extension, process_file in tag_groups.get(tag_group, ()):
+        if input_file.endswith(tag_extension):
+            return game_title, process_file
+
+    return game_title, None
+
+def report(message_type, message):
+    print("%s: %s" % (", ".join(message_type), message))
+
+def run_tag_benchmark(input_file):
+    game_title, process_file = get_process_file(input_file)
+    if process_file == None:
+        print("%s: no reader for this tag group" % input_file)
+        return
+
+    parse_times = []
+    for repeat_idx in range(PARSE_REPEAT):
+        start_time = time.perf_counter()
+        tag_cache.parse_tag_file(input_file, process_file, report)
+        parse_times.append(time.perf_counter() - start_time)
+
+    print("%s (%s): best %0.3fs, mean %0.3fs over %s parses" % (input_file, game_title, min(parse_times), sum(parse_times) / len(parse_times), PARSE_REPEAT))
+
+if __name__ == '__main__':
+    script_args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    run_field_benchmark(int(script_args[0]) if len(script_args) > 0 else 200000)
+    for input_file in script_args[1:]:
+        run_tag_benchmark(input_file)
@@ -0,0 +1,99 @@
+# ##### BEGIN MIT LICENSE BLOCK #####
+#
+# MIT License
+#
+# Copyright (c) 2023 Steven Garcia & Jadeon Sheppard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# ##### END MIT LICENSE BLOCK #####
+# Measures what vertex welding does to the size and write time of the JMS geometry sections. The mesh is a grid split the way
+# process_scene emits it, three new vertices per triangle, with noise well below the default weld epsilon on every value.
+#
+# Run it with Blender's Python or with the bpy module installed:
+#     blender -b --python benchmarks/weld_export.py -- 300
+#     python benchmarks/weld_export.py 300
+
+import os
+import sys
+import time
+import random
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from io_scene_halo.file_jms import build_asset
+from io_scene_halo.file_jms.format import JMSAsset
+from io_scene_halo.global_functions import mesh_processing
+
+WELD_EPSILON = 0.0001
+
+def get_grid_asset(grid_size, seed=7):
+    rng = random.Random(seed)
+    def get_noise():
+        return rng.uniform(-WELD_EPSILON * 0.1, WELD_EPSILON * 0.1)
+
+    def get_vertex(grid_x, grid_y):
+        translation = (grid_x + get_noise(), grid_y + get_noise(), get_noise())
+        normal = (get_noise(), get_noise(), 1.0 + get_noise())
+        uv_set = [(grid_x / grid_size + get_noise(), grid_y / grid_size + get_noise())]
+        node_set = [[0, 0.75 + get_noise()], [1, 0.25 + get_noise()]]
+        return JMSAsset.Vertex(2, node_set, 0, translation, normal, (1.0, 1.0, 1.0), uv_set)
+
+    JMS = JMSAsset()
+    JMS.vertices = []
+    JMS.triangles = []
+    for grid_x in range(grid_size):
+        for grid_y in range(grid_size):
+            for corners in (((0, 0), (1, 0), (1, 1)), ((0, 0), (1, 1), (0, 1))):
+                vertex_index = len(JMS.vertices)
+                for corner_x, corner_y in corners:
+                    JMS.vertices.append(get_vertex(grid_x + corner_x, grid_y + corner_y))
+
+                JMS.triangles.append(JMSAsset.Triangle(0, 0, vertex_index, vertex_index + 1, vertex_index + 2))
+
+    return JMS
+
+def write_geometry(JMS, output_path):
+    start_time = time.perf_counter()
+    with open(output_path, 'w', encoding='utf_8') as output_file:
+        build_asset.write_vertices_8211(output_file, JMS, False)
+        build_asset.write_triangles_8205(output_file, JMS, False)
+
+    return time.perf_counter() - start_time
+
+def run_benchmark(grid_size):
+    output_path = os.path.join(tempfile.gettempdir(), "weld_export_benchmark.jms")
+    JMS = get_grid_asset(grid_size)
+    print("%s triangles, %s vertices before welding" % (len(JMS.triangles), len(JMS.vertices)))
+
+    write_time = write_geometry(JMS, output_path)
+    print("unwelded: %0.2f MB written in %0.3fs" % (os.path.getsize(output_path) / 1048576, write_time))
+
+    start_time = time.perf_counter()
+    JMS.vertices = mesh_processing.weld_export_vertices(JMS.vertices, JMS.triangles, WELD_EPSILON)
+    weld_time = time.perf_counter() - start_time
+    write_time = write_geometry(JMS, output_path)
+    print("welded:   %0.2f MB written in %0.3fs, %s vertices, welding took %0.3fs" % (os.path.getsize(output_path) / 1048576, write_time, len(JMS.vertices), weld_time))
+
+    os.remove(output_path)
+
+if __name__ == '__main__':
+    script_args = sys.argv[sys.argv.index("--") + 1:] if "--" in sys.argv else sys.argv[1:]
+    run_benchmark(int(script_args[0]) if len(script_args) > 0 else 200)
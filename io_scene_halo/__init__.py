@@ -59,6 +59,7 @@ from . import file_qua
 from . import file_tag
 from . import file_wrl
 from . import misc
+from .global_functions import export_cache
 
 modules = [
     global_ui,
@@ -92,6 +93,12 @@ class HaloAddonPrefs(bpy.types.AddonPreferences):
         default = False,
     )
 
+    enable_timing_report: BoolProperty(
+        name ="Enable Timing Report",
+        description = "Time each phase of an import or export and show a summary when it finishes. The results are written as JSON next to exported files and to the system temp directory for imports",
+        default = False,
+    )
+
     enable_crash_report: BoolProperty(
         name ="Enable Crash Report",
         description = "Write crash logs to the users Windows profile",
@@ -173,6 +180,25 @@ class HaloAddonPrefs(bpy.types.AddonPreferences):
         subtype="DIR_PATH"
     )
 
+    enable_tag_cache: BoolProperty(
+        name ="Enable Tag Cache",
+        description = "Store parsed tags on disk so later imports can skip parsing tags that have not changed. Cached tags are Python pickles, which can run code when they are loaded. Entries are signed with a key from the Blender config directory and anything unsigned is ignored, but the cache directory should still not be writable by other users",
+        default = False,
+    )
+
+    tag_cache_path: StringProperty(
+        name="Tag Cache Path",
+        description="Path to the directory parsed tags are cached in. Leave empty to use blender_halo_tag_cache in the users home directory. Don't point this at a shared or world writable directory",
+        subtype="DIR_PATH"
+    )
+
+    tag_cache_size: IntProperty(
+        name="Tag Cache Size",
+        description="Maximum size of the tag cache in megabytes. The least recently used tags are removed once it grows past this",
+        default=1024,
+        min=0,
+    )
+
     def draw(self, context):
         layout = self.layout
 
@@ -189,6 +215,9 @@ class HaloAddonPrefs(bpy.types.AddonPreferences):
         row.label(text='Enable Profiling:')
         row.prop(self, "enable_profiling", text='')
         row = col.row()
+        row.label(text='Enable Timing Report:')
+        row.prop(self, "enable_timing_report", text='')
+        row = col.row()
         row.label(text='Enable Crash Report:')
         row.prop(self, "enable_crash_report", text='')
 
@@ -236,15 +265,35 @@ class HaloAddonPrefs(bpy.types.AddonPreferences):
         row.label(text='Halo ODST Tag Path:')
         row.prop(self, "halo_odst_tag_path", text='')
 
+        box = layout.box()
+        box.label(text="Tag Cache Options:")
+        col = box.column(align=True)
+        row = col.row()
+        row.label(text='Enable Tag Cache:')
+        row.prop(self, "enable_tag_cache", text='')
+        row = col.row()
+        row.label(text='Tag Cache Path:')
+        row.prop(self, "tag_cache_path", text='')
+        row = col.row()
+        row.label(text='Tag Cache Size:')
+        row.prop(self, "tag_cache_size", text='')
+
 def register():
     bpy.utils.register_class(HaloAddonPrefs)
     for module in modules:
         module.register()
 
+    bpy.app.handlers.load_post.append(export_cache.clear_geometry_cache_on_load)
+
 def unregister():
     bpy.utils.unregister_class(HaloAddonPrefs)
     for module in reversed(modules):
         module.unregister()
 
+    if export_cache.clear_geometry_cache_on_load in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(export_cache.clear_geometry_cache_on_load)
+
+    export_cache.clear_geometry_cache()
+
 if __name__ == '__main__':
     register()
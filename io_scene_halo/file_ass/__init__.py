@@ -159,6 +159,26 @@ class ASS_ScenePropertiesGroup(PropertyGroup):
         max=3.141593,
         )
 
+    weld_vertices: BoolProperty(
+        name ="Weld Vertices",
+        description = "Merge vertices that share position, normal, UVs, color, weights and region so triangles reuse them",
+        default = False,
+        )
+
+    weld_epsilon: FloatProperty(
+        name="Weld Epsilon",
+        description="Largest difference in any position, normal, UV, color or weight component between two vertices that are still merged. 0 only merges identical vertices",
+        default=0.0001,
+        min=0.0,
+        precision=6,
+        )
+
+    reuse_geometry: BoolProperty(
+        name ="Reuse Unchanged Geometry",
+        description = "Keep the extracted geometry of every object between exports and reuse it for objects that haven't changed since the last export",
+        default = False,
+        )
+
     scale_enum: EnumProperty(
         name="Scale",
         description="Choose a preset value to multiply position values by",
@@ -236,6 +256,12 @@ class ASS_SceneProps(Panel):
         row.label(text='Use Edge Split:')
         row.prop(scene_ass, "edge_split", text='')
         row = col.row()
+        row.label(text='Weld Vertices:')
+        row.prop(scene_ass, "weld_vertices", text='')
+        row = col.row()
+        row.label(text='Reuse Unchanged Geometry:')
+        row.prop(scene_ass, "reuse_geometry", text='')
+        row = col.row()
         row.label(text='Use As Default Export Settings:')
         row.prop(scene_ass, "use_scene_properties", text='')
         if scene_ass.edge_split == True:
@@ -251,6 +277,14 @@ class ASS_SceneProps(Panel):
             row.label(text='Sharp Edges:')
             row.prop(scene_ass, "use_edge_sharp", text='')
 
+        if scene_ass.weld_vertices == True:
+            box = layout.box()
+            box.label(text="Vertex Welding:")
+            col = box.column(align=True)
+            row = col.row()
+            row.label(text='Weld Epsilon:')
+            row.prop(scene_ass, "weld_epsilon", text='')
+
         box = layout.box()
         box.label(text="Scale:")
         row = box.row()
@@ -355,6 +389,26 @@ class ExportASS(Operator, ExportHelper):
         max=3.141593,
         )
 
+    weld_vertices: BoolProperty(
+        name ="Weld Vertices",
+        description = "Merge vertices that share position, normal, UVs, color, weights and region so triangles reuse them",
+        default = False,
+        )
+
+    weld_epsilon: FloatProperty(
+        name="Weld Epsilon",
+        description="Largest difference in any position, normal, UV, color or weight component between two vertices that are still merged. 0 only merges identical vertices",
+        default=0.0001,
+        min=0.0,
+        precision=6,
+        )
+
+    reuse_geometry: BoolProperty(
+        name ="Reuse Unchanged Geometry",
+        description = "Keep the extracted geometry of every object between exports and reuse it for objects that haven't changed since the last export",
+        default = False,
+        )
+
     scale_enum: EnumProperty(
         name="Scale",
         description="Choose a preset value to multiply position values by",
@@ -383,7 +437,7 @@ class ExportASS(Operator, ExportHelper):
         edge_split = global_functions.EdgeSplit(self.edge_split, self.use_edge_angle, self.split_angle, self.use_edge_sharp)
         int_ass_version = int(self.ass_version)
 
-        return global_functions.run_code("export_ass.write_file(context, self.filepath, int_ass_version, self.game_title, self.folder_structure, self.hidden_geo, self.nonrender_geo, self.apply_modifiers, self.triangulate_faces, self.loop_normals, edge_split, self.clean_normalize_weights, scale_value, self.report)")
+        return global_functions.run_code("export_ass.write_file(context, self.filepath, int_ass_version, self.game_title, self.folder_structure, self.hidden_geo, self.nonrender_geo, self.apply_modifiers, self.triangulate_faces, self.loop_normals, edge_split, self.clean_normalize_weights, scale_value, self.report, self.weld_vertices, self.weld_epsilon, self.reuse_geometry)")
 
     def draw(self, context):
         scene = context.scene
@@ -409,6 +463,9 @@ class ExportASS(Operator, ExportHelper):
             self.use_edge_angle = scene_ass.use_edge_angle
             self.split_angle = scene_ass.split_angle
             self.use_edge_sharp = scene_ass.use_edge_sharp
+            self.weld_vertices = scene_ass.weld_vertices
+            self.weld_epsilon = scene_ass.weld_epsilon
+            self.reuse_geometry = scene_ass.reuse_geometry
             self.scale_enum = scene_ass.scale_enum
             self.scale_float = scene_ass.scale_float
 
@@ -467,6 +524,14 @@ class ExportASS(Operator, ExportHelper):
         row.label(text='Use Edge Split:')
         row.prop(self, "edge_split", text='')
         row = col.row()
+        row.enabled = is_enabled
+        row.label(text='Weld Vertices:')
+        row.prop(self, "weld_vertices", text='')
+        row = col.row()
+        row.enabled = is_enabled
+        row.label(text='Reuse Unchanged Geometry:')
+        row.prop(self, "reuse_geometry", text='')
+        row = col.row()
         row.label(text='Use Scene Export Settings:')
         row.prop(scene_ass, "use_scene_properties", text='')
         if self.edge_split == True:
@@ -484,6 +549,15 @@ class ExportASS(Operator, ExportHelper):
             row.label(text='Sharp Edges:')
             row.prop(self, "use_edge_sharp", text='')
 
+        if self.weld_vertices == True:
+            box = layout.box()
+            box.label(text="Vertex Welding:")
+            col = box.column(align=True)
+            row = col.row()
+            row.enabled = is_enabled
+            row.label(text='Weld Epsilon:')
+            row.prop(self, "weld_epsilon", text='')
+
         box = layout.box()
         box.label(text="Scale:")
         row = box.row()
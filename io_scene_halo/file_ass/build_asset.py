@@ -30,15 +30,88 @@ import socket
 
 from getpass import getuser
 from .process_scene import process_scene
-from ..global_functions import global_functions
+from ..global_functions import global_functions, timing_report
 
-def build_asset(context, filepath, version, game_version, folder_structure, hidden_geo, nonrender_geo, apply_modifiers, triangulate_faces, loop_normals, edge_split, clean_normalize_weights, custom_scale, report):
-    ASS = process_scene(context, version, game_version, hidden_geo, nonrender_geo, apply_modifiers, triangulate_faces, loop_normals, edge_split, clean_normalize_weights, custom_scale, report)
+def get_vertex_format(vertex_formats, version, node_count, uv_count):
+    # Vertices only differ in their node and texture coordinate counts so the format for each combination is built once.
+    vertex_key = (node_count, uv_count)
+    vertex_format = vertex_formats.get(vertex_key)
+    if vertex_format == None:
+        vertex_format = '\n%0.10f\t%0.10f\t%0.10f' + '\n%0.10f\t%0.10f\t%0.10f'
+        if version >= 6:
+            vertex_format += '\n%0.10f\t%0.10f\t%0.10f'
+
+        node_format = '\n%s' + '\n%0.10f'
+        if version >= 3:
+            node_format = '\n%s\t%0.10f'
+
+        uv_format = '\n%0.10f\t%0.10f'
+        if version >= 5:
+            uv_format = '\n%0.10f\t%0.10f\t%0.10f\n'
+
+        vertex_format += '\n%s' + node_format * node_count + '\n%s' + uv_format * uv_count
+        vertex_formats[vertex_key] = vertex_format
+
+    return vertex_format
+
+def write_vertices(file, vertices, version):
+    vertex_formats = {}
+    def format_vertex(vertex_idx, vert, values):
+        values.extend((vert.translation[0], vert.translation[1], vert.translation[2]))
+        values.extend((vert.normal[0], vert.normal[1], vert.normal[2]))
+        if version >= 6:
+            values.extend((vert.color[0], vert.color[1], vert.color[2]))
+
+        values.append(len(vert.node_set))
+        for node in vert.node_set:
+            node_index = node[0]
+            node_weight = node[1]
+            values.extend((node_index, node_weight))
+
+        values.append(len(vert.uv_set))
+        for uv in vert.uv_set:
+            tex_u = uv[0]
+            tex_v = uv[1]
+            tex_w = 0
+            if version >= 5:
+                values.extend((tex_u, tex_v, tex_w))
+
+            else:
+                values.extend((tex_u, tex_v))
+
+        return get_vertex_format(vertex_formats, version, len(vert.node_set), len(vert.uv_set))
+
+    global_functions.write_record_chunks(file, vertices, format_vertex)
+
+def write_triangles(file, triangles, version):
+    triangle_format = '\n%s' + '\n%s\n%s\n%s'
+    if version >= 3:
+        triangle_format = '\n%s' + '\t\t%s\t%s\t%s'
+
+    def format_triangle(triangle_idx, triangle, values):
+        values.extend((triangle.material_index, triangle.v0, triangle.v1, triangle.v2))
+
+        return triangle_format
+
+    global_functions.write_record_chunks(file, triangles, format_triangle)
+
+def write_mesh_geometry(file, geometry, version):
+    file.write('\n%s' % (len(geometry.vertices)))
+    write_vertices(file, geometry.vertices, version)
+
+    file.write('\n%s' % (len(geometry.triangles)))
+    write_triangles(file, geometry.triangles, version)
+
+    file.write('\n')
+
+def build_asset(context, filepath, version, game_version, folder_structure, hidden_geo, nonrender_geo, apply_modifiers, triangulate_faces, loop_normals, edge_split, clean_normalize_weights, custom_scale, report, weld_vertices=False, weld_epsilon=0.0, reuse_geometry=False):
+    ASS = process_scene(context, version, game_version, hidden_geo, nonrender_geo, apply_modifiers, triangulate_faces, loop_normals, edge_split, clean_normalize_weights, custom_scale, report, weld_vertices, weld_epsilon, reuse_geometry)
 
     filename = os.path.basename(filepath)
     root_directory = global_functions.get_directory(context, game_version, global_functions.ModelTypeEnum.render, folder_structure, True, False, filepath)
 
-    file = open(os.path.join(root_directory, filename), 'w', encoding='utf_8')
+    timing_phase = timing_report.begin_phase("serialization")
+    file = global_functions.open_export_file(os.path.join(root_directory, filename))
 
     username = bpy.context.preferences.addons["io_scene_halo"].preferences.username
     device_name = bpy.context.preferences.addons["io_scene_halo"].preferences.device_name
@@ -178,61 +251,10 @@ def build_asset(context, filepath, version, game_version, folder_structure, hidd
                 '\n;OBJECT %s' % (idx) +
                 '\n"%s"' % (geometry.geo_class) +
                 '\n"%s"' % (geometry.xref_filepath) +
-                '\n"%s"' % (geometry.xref_objectname) +
-                '\n%s' % (len(geometry.vertices))
+                '\n"%s"' % (geometry.xref_objectname)
             )
 
-            for vert in geometry.vertices:
-                file.write(
-                    '\n%0.10f\t%0.10f\t%0.10f' % (vert.translation[0], vert.translation[1], vert.translation[2]) +
-                    '\n%0.10f\t%0.10f\t%0.10f' % (vert.normal[0], vert.normal[1], vert.normal[2])
-                )
-
-                if version >= 6:
-                    file.write('\n%0.10f\t%0.10f\t%0.10f' % (vert.color[0], vert.color[1], vert.color[2]))
-
-                file.write('\n%s' % (len(vert.node_set)))
-
-                for node in vert.node_set:
-                    node_index = node[0]
-                    node_weight = node[1]
-                    if version >= 3:
-                        file.write(
-                            '\n%s\t%0.10f' % (node_index, node_weight)
-                        )
-
-                    else:
-                        file.write(
-                            '\n%s' % (node_index) +
-                            '\n%0.10f' % (node_weight)
-                        )
-
-                file.write('\n%s' % (len(vert.uv_set)))
-                for uv in vert.uv_set:
-                    tex_u = uv[0]
-                    tex_v = uv[1]
-                    tex_w = 0
-                    if version >= 5:
-                        file.write('\n%0.10f\t%0.10f\t%0.10f\n' % (tex_u, tex_v, tex_w))
-
-                    else:
-                        file.write('\n%0.10f\t%0.10f' % (tex_u, tex_v))
-
-            file.write('\n%s' % (len(geometry.triangles)))
-            for triangle in geometry.triangles:
-                if version >= 3:
-                    file.write(
-                        '\n%s' % (triangle.material_index) +
-                        '\t\t%s\t%s\t%s' % (triangle.v0, triangle.v1, triangle.v2)
-                    )
-
-                else:
-                    file.write(
-                        '\n%s' % (triangle.material_index) +
-                        '\n%s\n%s\n%s' % (triangle.v0, triangle.v1, triangle.v2)
-                    )
-
-            file.write('\n')
+            write_mesh_geometry(file, geometry, version)
 
         else:
             print("Geometry file has an invalid geometry class during build: ",  geometry.geo_class)
@@ -283,3 +305,5 @@ def build_asset(context, filepath, version, game_version, folder_structure, hidd
             file.write('%s\n' % node_index)
 
     file.close()
+    timing_phase.count("objects", len(ASS.objects))
+    timing_report.end_phase(timing_phase)
@@ -27,11 +27,15 @@
 import bpy
 
 from .build_asset import build_asset
+from ..global_functions import timing_report
 
-def write_file(context, filepath, ass_version, game_version, folder_structure, hidden_geo, nonrender_geo, apply_modifiers, triangulate_faces, loop_normals, edge_split, clean_normalize_weights, scale_value, report):
-    build_asset(context, filepath, ass_version, game_version, folder_structure, hidden_geo, nonrender_geo, apply_modifiers, triangulate_faces, loop_normals, edge_split, clean_normalize_weights, scale_value, report)
+def write_file(context, filepath, ass_version, game_version, folder_structure, hidden_geo, nonrender_geo, apply_modifiers, triangulate_faces, loop_normals, edge_split, clean_normalize_weights, scale_value, report, weld_vertices=False, weld_epsilon=0.0, reuse_geometry=False):
+    timing_report.start("ASS export")
+    build_asset(context, filepath, ass_version, game_version, folder_structure, hidden_geo, nonrender_geo, apply_modifiers, triangulate_faces, loop_normals, edge_split, clean_normalize_weights, scale_value, report, weld_vertices, weld_epsilon, reuse_geometry)
 
     report({'INFO'}, "Export completed successfully")
+    timing_report.finish(filepath, report)
+
     return {'FINISHED'}
 
 if __name__ == '__main__':
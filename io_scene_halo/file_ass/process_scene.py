@@ -29,7 +29,7 @@ import bpy
 
 from math import degrees
 from .format import ASSAsset
-from ..global_functions import mesh_processing, global_functions, resource_management
+from ..global_functions import mesh_processing, global_functions, resource_management, export_cache, timing_report
 from datetime import datetime
 
 def get_material_strings(material, version):
@@ -118,13 +118,14 @@ def scale_is_uniform(obj):
 
     return is_uniform
 
-def process_scene(context, version, game_version, hidden_geo, nonrender_geo, apply_modifiers, triangulate_faces, loop_normals, edge_split, clean_normalize_weights, custom_scale, report):
+def process_scene(context, version, game_version, hidden_geo, nonrender_geo, apply_modifiers, triangulate_faces, loop_normals, edge_split, clean_normalize_weights, custom_scale, report, weld_vertices=False, weld_epsilon=0.0, reuse_geometry=False):
     ASS = ASSAsset()
 
     layer_collection_list = []
     object_list = []
 
     # Gather all scene resources that fit export criteria
+    timing_phase = timing_report.begin_phase("scene gather")
     resource_management.gather_scene_resources(context, layer_collection_list, object_list, hidden_geo, nonrender_geo)
 
     # Store visibility for all relevant resources
@@ -138,18 +139,21 @@ def process_scene(context, version, game_version, hidden_geo, nonrender_geo, app
     if not context.view_layer.objects.active == None:
         bpy.ops.object.mode_set(mode='OBJECT')
 
+    timing_phase.count("objects", len(object_list))
+    timing_report.end_phase(timing_phase)
+
     default_region = ""
     default_permutation = ""
 
     limit_value = 0.001
 
-    region_list = []
-    permutation_list = []
+    region_list = global_functions.ExportRegistry()
+    permutation_list = global_functions.ExportRegistry()
 
     ASS.materials = []
     ASS.objects = []
     ASS.instances = []
-    material_list = []
+    material_list = global_functions.ExportRegistry()
     armature = None
     geometry_list = []
     linked_object_list = []
@@ -157,6 +161,7 @@ def process_scene(context, version, game_version, hidden_geo, nonrender_geo, app
     instance_list = []
     object_count = 0
 
+    timing_phase = timing_report.begin_phase("modifier eval")
     for obj in object_list:
         if obj.type== 'MESH':
             if clean_normalize_weights:
@@ -166,7 +171,13 @@ def process_scene(context, version, game_version, hidden_geo, nonrender_geo, app
                 mesh_processing.add_modifier(context, obj, triangulate_faces, edge_split, None)
 
     depsgraph = context.evaluated_depsgraph_get()
+    geometry_cache = None
+    if reuse_geometry:
+        geometry_cache = export_cache.GeometryCache("ASS", depsgraph, apply_modifiers)
+
+    timing_report.end_phase(timing_phase)
 
+    registries = (region_list, permutation_list, material_list)
     for obj in object_list:
         if not scale_is_uniform(obj):
             report({'WARNING'}, "Object %s has non uniform scale. Object will not look correct ingame. Apply transforms and export again." % (obj.name))
@@ -220,14 +231,12 @@ def process_scene(context, version, game_version, hidden_geo, nonrender_geo, app
                 geometry_list.append((evaluted_mesh, obj, 'PILL'))
 
             elif obj.data.ass_jms.Object_Type == 'CONVEX SHAPES':
-                if apply_modifiers:
-                    obj_for_convert = obj.evaluated_get(depsgraph)
-                    evaluted_mesh = obj_for_convert.to_mesh(preserve_all_data_layers=True, depsgraph=depsgraph)
-                    geometry_list.append((evaluted_mesh, obj, 'MESH'))
+                # With the geometry cache on, meshes are only evaluated once the object is found to have changed.
+                evaluted_mesh = None
+                if geometry_cache == None:
+                    evaluted_mesh = export_cache.get_evaluated_mesh(obj, apply_modifiers, depsgraph)
 
-                else:
-                    evaluted_mesh = obj.to_mesh(preserve_all_data_layers=True)
-                    geometry_list.append((evaluted_mesh, obj, 'MESH'))
+                geometry_list.append((evaluted_mesh, obj, 'MESH'))
 
             else:
                 print("%s has an out of bounds object_type setting" % obj.name)
@@ -282,6 +291,7 @@ def process_scene(context, version, game_version, hidden_geo, nonrender_geo, app
             increment_count += 1
 
     ASS.instances.append(ASS.Instance(name='Scene Root', local_transform=ASS.Transform(), pivot_transform=ASS.Transform(), bone_groups=[]))
+    timing_phase = timing_report.begin_phase("geometry extraction")
     for idx, geometry in enumerate(geometry_list):
         verts = []
         triangles = []
@@ -305,6 +315,9 @@ def process_scene(context, version, game_version, hidden_geo, nonrender_geo, app
         if evaluted_mesh:
             evaluted_mesh_name = evaluted_mesh.name
 
+        elif geo_class == 'MESH':
+            evaluted_mesh_name = original_geo.data.name
+
         else:
             evaluted_mesh_name = original_geo.name
 
@@ -452,59 +465,96 @@ def process_scene(context, version, game_version, hidden_geo, nonrender_geo, app
                     xref_name = os.path.basename(xref_path).rsplit('.', 1)[0]
 
                 vertex_groups = original_geo.vertex_groups.keys()
-                if (4, 1, 0) > bpy.app.version:
-                    evaluted_mesh.calc_normals_split()
-
-                region_attribute = evaluted_mesh.get_custom_attribute()
-                region_count = len(original_geo.region_list)
-                for idx, face in enumerate(evaluted_mesh.polygons):
-                    if not original_geo.active_region == -1 and region_count > 0:
-                        region_idx = region_attribute.data[idx].value - 1
-                        if not region_idx == -1 and not region_idx >= region_count:
-                            face_set = mesh_processing.process_mesh_export_face_set(default_permutation, default_region, game_version, original_geo, region_idx)
-                            if not region in region_list:
-                                region_list.append(region)
-
-                            region_index = region_list.index(region)
-                            if not game_version == "halo1":
-                                if not permutation in permutation_list:
-                                    permutation_list.append(permutation)
-
-                    permutation = face_set[1]
-                    region = face_set[2]
-
-                    material = global_functions.get_material(game_version, original_geo, face, evaluted_mesh, lod, region, permutation)
-                    material_index = -1
-                    if not material == -1:
-                        material_list = global_functions.gather_materials(game_version, material, material_list, "ASS")
-                        material_index = material_list.index(material)
-
-                    v0 = (idx * 3)
-                    v1 = (idx * 3) + 1
-                    v2 = (idx * 3) + 2
-
-                    triangles.append(ASS.Triangle(region_index, material_index, v0, v1, v2))
-                    for loop_index in face.loop_indices:
-                        point_idx = evaluted_mesh.loops[loop_index].vertex_index
-                        loop_data = evaluted_mesh.loops[loop_index]
-                        vertex_data = evaluted_mesh.vertices[loop_data.vertex_index]
-
-                        region = region_index
-                        normal = evaluted_mesh.corner_normals[loop_index].vector.normalized()
-                        if not loop_normals:
-                            normal = vertex_data.normal.normalized()
-
-                        if normal.length <= 0.0:
-                            normal = face.normal.normalized()
-
-                        scaled_translation = mesh_processing.process_mesh_export_vert(vertex_data, "ASS", object_matrix, custom_scale)
-                        uv_set = mesh_processing.process_mesh_export_uv(evaluted_mesh, "ASS", loop_index, version)
-                        color = mesh_processing.process_mesh_export_color(evaluted_mesh, loop_index, point_idx)
-                        node_influence_count, node_set = mesh_processing.process_mesh_export_weights(vertex_data, armature, original_geo, vertex_groups, instance_list, "ASS", node_index_list)
-
-                        verts.append(ASS.Vertex(node_influence_count, node_set, region, scaled_translation, normal, color, uv_set))
-
-                original_geo.to_mesh_clear()
+                weight_table = mesh_processing.VertexWeightTable(armature, original_geo, vertex_groups, instance_list, "ASS", node_index_list)
+
+                # Meshes that haven't changed since the last export reuse their cached sections and skip to_mesh and the face walk.
+                object_hash = None
+                cache_entry = None
+                index_maps = None
+                if not geometry_cache == None:
+                    object_hash = geometry_cache.get_object_hash(original_geo, version, game_version, loop_normals, weld_vertices, weld_epsilon, tuple(map(tuple, object_matrix)), weight_table.get_node_key())
+                    cache_entry = geometry_cache.load(original_geo, object_hash)
+                    if not cache_entry == None:
+                        index_maps = export_cache.replay_registries(registries, cache_entry.registry_entries)
+
+                if not index_maps == None:
+                    region_map, permutation_map, material_map = index_maps
+                    verts = export_cache.get_cached_vertices(cache_entry.vertices, region_map, ASS.Vertex)
+                    triangles = export_cache.get_cached_triangles(cache_entry.triangles, region_map, material_map, ASS.Triangle)
+                    node_index_list.extend(cache_entry.node_index_list)
+                    material_index = material_map[cache_entry.material_index]
+                    timing_phase.count("cached objects", 1)
+
+                else:
+                    if evaluted_mesh == None:
+                        evaluted_mesh = geometry_cache.get_evaluated_mesh(original_geo)
+
+                    if (4, 1, 0) > bpy.app.version:
+                        evaluted_mesh.calc_normals_split()
+
+                    if not object_hash == None:
+                        export_cache.start_recording(registries)
+
+                    region_attribute = evaluted_mesh.get_custom_attribute()
+                    region_count = len(original_geo.region_list)
+                    for idx, face in enumerate(evaluted_mesh.polygons):
+                        if not original_geo.active_region == -1 and region_count > 0:
+                            region_idx = region_attribute.data[idx].value - 1
+                            if not region_idx == -1 and not region_idx >= region_count:
+                                face_set = mesh_processing.process_mesh_export_face_set(default_permutation, default_region, game_version, original_geo, region_idx)
+                                if not region in region_list:
+                                    region_list.append(region)
+
+                                region_index = region_list.index(region)
+                                if not game_version == "halo1":
+                                    if not permutation in permutation_list:
+                                        permutation_list.append(permutation)
+
+                        permutation = face_set[1]
+                        region = face_set[2]
+
+                        material = global_functions.get_material(game_version, original_geo, face, evaluted_mesh, lod, region, permutation)
+                        material_index = -1
+                        if not material == -1:
+                            material_list = global_functions.gather_materials(game_version, material, material_list, "ASS")
+                            material_index = material_list.index(material)
+
+                        v0 = (idx * 3)
+                        v1 = (idx * 3) + 1
+                        v2 = (idx * 3) + 2
+
+                        triangles.append(ASS.Triangle(region_index, material_index, v0, v1, v2))
+                        for loop_index in face.loop_indices:
+                            point_idx = evaluted_mesh.loops[loop_index].vertex_index
+                            loop_data = evaluted_mesh.loops[loop_index]
+                            vertex_data = evaluted_mesh.vertices[loop_data.vertex_index]
+
+                            region = region_index
+                            normal = evaluted_mesh.corner_normals[loop_index].vector.normalized()
+                            if not loop_normals:
+                                normal = vertex_data.normal.normalized()
+
+                            if normal.length <= 0.0:
+                                normal = face.normal.normalized()
+
+                            scaled_translation = mesh_processing.process_mesh_export_vert(vertex_data, "ASS", object_matrix, custom_scale)
+                            uv_set = mesh_processing.process_mesh_export_uv(evaluted_mesh, "ASS", loop_index, version)
+                            color = mesh_processing.process_mesh_export_color(evaluted_mesh, loop_index, point_idx)
+                            node_influence_count, node_set = weight_table.get_weights(evaluted_mesh.vertices, point_idx)
+
+                            verts.append(ASS.Vertex(node_influence_count, node_set, region, scaled_translation, normal, color, uv_set))
+
+                    if weld_vertices:
+                        verts = mesh_processing.weld_export_vertices(verts, triangles, weld_epsilon)
+
+                    original_geo.to_mesh_clear()
+
+                    if not object_hash == None:
+                        registry_entries = export_cache.stop_recording(registries)
+                        cache_entry = export_cache.GeometryCacheEntry(object_hash, verts, export_cache.get_triangle_records(triangles), registry_entries, list(node_index_list), material_index)
+
+                    if not geometry_cache == None:
+                        geometry_cache.store(original_geo, object_hash, cache_entry)
 
             else:
                 print("Geometry file has an invalid geometry class during scene processing: ",  geo_class)
@@ -513,6 +563,14 @@ def process_scene(context, version, game_version, hidden_geo, nonrender_geo, app
 
         ASS.instances[-1].bone_groups = node_index_list
 
+    if not geometry_cache == None:
+        geometry_cache.finish()
+
+    timing_phase.count("objects", len(ASS.objects))
+    timing_phase.count("vertices", sum([len(ass_object.vertices) for ass_object in ASS.objects]))
+    timing_phase.count("triangles", sum([len(ass_object.triangles) for ass_object in ASS.objects]))
+    timing_report.end_phase(timing_phase)
+
     for material in material_list:
         material_data = material[0]
 
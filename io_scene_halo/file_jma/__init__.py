@@ -193,6 +193,18 @@ class JMA_ScenePropertiesGroup(PropertyGroup):
         default = False,
         )
 
+    evaluate_fcurves: BoolProperty(
+        name ="Evaluate F-Curves",
+        description = "Compute the pose straight from the action F-Curves instead of stepping through the scene frames. Only used for armatures without constraints, drivers or NLA strips",
+        default = False,
+        )
+
+    export_all_actions: BoolProperty(
+        name ="Export All Actions",
+        description = "Export every action that animates the armature to its own file named after the action. Each file uses the frame range of its action",
+        default = False,
+        )
+
 
     use_scene_properties: BoolProperty(
         name ="Use scene properties",
@@ -297,6 +309,12 @@ class JMA_SceneProps(Panel):
         row.label(text='Use Maya Sorting:')
         row.prop(scene_jma, "use_maya_sorting", text='')
         row = col.row()
+        row.label(text='Evaluate F-Curves:')
+        row.prop(scene_jma, "evaluate_fcurves", text='')
+        row = col.row()
+        row.label(text='Export All Actions:')
+        row.prop(scene_jma, "export_all_actions", text='')
+        row = col.row()
         row.label(text='Use As Default Export Settings:')
         row.prop(scene_jma, "use_scene_properties", text='')
         box = layout.box()
@@ -372,6 +390,18 @@ class ExportJMA(Operator, ExportHelper):
         default = False,
         )
 
+    evaluate_fcurves: BoolProperty(
+        name ="Evaluate F-Curves",
+        description = "Compute the pose straight from the action F-Curves instead of stepping through the scene frames. Only used for armatures without constraints, drivers or NLA strips",
+        default = False,
+        )
+
+    export_all_actions: BoolProperty(
+        name ="Export All Actions",
+        description = "Export every action that animates the armature to its own file named after the action. Each file uses the frame range of its action",
+        default = False,
+        )
+
     use_scene_properties: BoolProperty(
         name ="Use scene properties",
         description = "Use the options set in the scene or uncheck this to override",
@@ -429,7 +459,7 @@ class ExportJMA(Operator, ExportHelper):
         frame_rate_value = global_functions.set_framerate(self.frame_rate_enum, self.frame_rate_float)
         int_jma_version = int(self.jma_version)
 
-        return global_functions.run_code("export_jma.write_file(context, self.filepath, self.report, self.extension, int_jma_version, self.game_title, self.generate_checksum, self.folder_structure, self.fix_rotations, self.use_maya_sorting, frame_rate_value, scale_value)")
+        return global_functions.run_code("export_jma.write_file(context, self.filepath, self.report, self.extension, int_jma_version, self.game_title, self.generate_checksum, self.folder_structure, self.fix_rotations, self.use_maya_sorting, frame_rate_value, scale_value, self.evaluate_fcurves, self.export_all_actions)")
 
     def draw(self, context):
         scene = context.scene
@@ -449,6 +479,8 @@ class ExportJMA(Operator, ExportHelper):
             self.folder_structure = scene_jma.folder_structure
             self.fix_rotations = scene_jma.fix_rotations
             self.use_maya_sorting = scene_jma.use_maya_sorting
+            self.evaluate_fcurves = scene_jma.evaluate_fcurves
+            self.export_all_actions = scene_jma.export_all_actions
             self.scale_enum = scene_jma.scale_enum
             self.scale_float = scene_jma.scale_float
             frame_rate_string = str(scene.render.fps)
@@ -498,6 +530,14 @@ class ExportJMA(Operator, ExportHelper):
         row.label(text='Use Maya Sorting:')
         row.prop(self, "use_maya_sorting", text='')
         row = col.row()
+        row.enabled = is_enabled
+        row.label(text='Evaluate F-Curves:')
+        row.prop(self, "evaluate_fcurves", text='')
+        row = col.row()
+        row.enabled = is_enabled
+        row.label(text='Export All Actions:')
+        row.prop(self, "export_all_actions", text='')
+        row = col.row()
         row.label(text='Use Scene Export Settings:')
         row.prop(scene_jma, "use_scene_properties", text='')
         if scene_halo.expert_mode:
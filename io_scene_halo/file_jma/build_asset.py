@@ -28,7 +28,8 @@ import os
 import struct
 
 from .process_scene import process_scene
-from ..global_functions.global_functions import get_directory, get_true_extension, ModelTypeEnum
+from ..global_functions import timing_report
+from ..global_functions.global_functions import get_directory, get_true_extension, open_export_file, ModelTypeEnum
 
 DECIMAL_POINT = "6"
 DECIMAL_1 = '\n%0.{decimal_point}f'.format(decimal_point=DECIMAL_POINT)
@@ -131,13 +132,12 @@ def write_node_transforms_16390(file, JMA, binary):
                 file.write(struct.pack('<f', node.scale))
 
     else:
+        # One format per transform and one write per frame instead of three formats and a write per node.
+        transform_format = DECIMAL_3 + DECIMAL_4 + DECIMAL_1
         for node_transform in JMA.transforms:
-            for node in node_transform:
-                file.write(
-                    DECIMAL_3 % (node.translation[0], node.translation[1], node.translation[2]) +
-                    DECIMAL_4 % (node.rotation[0], node.rotation[1], node.rotation[2], node.rotation[3]) +
-                    DECIMAL_1 % (node.scale)
-                    )
+            file.write(''.join([transform_format % (node.translation[0], node.translation[1], node.translation[2],
+                                                    node.rotation[0], node.rotation[1], node.rotation[2], node.rotation[3],
+                                                    node.scale) for node in node_transform]))
 
 def write_root_transforms_16395(file, JMA, binary):
     #H2 specific biped controller data bool value.
@@ -174,27 +174,27 @@ def update_decimal():
     DECIMAL_3 = '\n%0.{decimal_point}f\t%0.{decimal_point}f\t%0.{decimal_point}f'.format(decimal_point=DECIMAL_POINT)
     DECIMAL_4 = '\n%0.{decimal_point}f\t%0.{decimal_point}f\t%0.{decimal_point}f\t%0.{decimal_point}f'.format(decimal_point=DECIMAL_POINT)
 
-def build_asset(context, filepath, report, extension, jma_version, game_title, generate_checksum, folder_structure, fix_rotations, use_maya_sorting, frame_rate_value, scale_value, JMA=None):
-    if not JMA:
-        JMA = process_scene(context, extension, jma_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, scale_value)
-        JMA.version = jma_version
-        JMA.frame_rate = frame_rate_value
+def get_output_path(context, filepath, extension, game_title, folder_structure):
+    filename = os.path.basename(filepath)
 
-    binary = False
+    root_directory = get_directory(context, game_title, ModelTypeEnum.animations, folder_structure, False, False, filepath)
+
+    return os.path.join(root_directory, "%s%s" % (filename, get_true_extension(filepath, extension, False)))
+
+def write_asset(JMA, output_path, jma_version, binary=False):
+    # Only touches the JMA data so batch exports can run it on writer threads. binary writes the IMBF intermediate to output_path
+    # with a B appended. It is internal only, the export operators never set it and there is no reader for it.
 
     if jma_version >= 16395:
         update_decimal()
 
-    filename = os.path.basename(filepath)
-
-    root_directory = get_directory(context, game_title, ModelTypeEnum.animations, folder_structure, False, False, filepath)
-    output_path = os.path.join(root_directory, "%s%s" % (filename, get_true_extension(filepath, extension, False)))
+    timing_phase = timing_report.begin_phase("serialization")
     if binary:
-        file = open(output_path + "B", 'wb')
+        file = open_export_file(output_path + "B", True)
         file.write(struct.pack('<4s', bytes("IMBF", 'utf-8')))
 
     else:
-        file = open(output_path, 'w', encoding='utf_8')
+        file = open_export_file(output_path)
 
     if jma_version >= 16395:
         write_header_16394(file, JMA, binary)
@@ -224,3 +224,15 @@ def build_asset(context, filepath, report, extension, jma_version, game_title, g
     if not binary:
         file.write('\n')
     file.close()
+
+    timing_phase.count("frames", len(JMA.transforms))
+    timing_report.end_phase(timing_phase)
+
+def build_asset(context, filepath, report, extension, jma_version, game_title, generate_checksum, folder_structure, fix_rotations, use_maya_sorting, frame_rate_value, scale_value, JMA=None, evaluate_fcurves=False):
+    if not JMA:
+        JMA = process_scene(context, extension, jma_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, scale_value, evaluate_fcurves, report=report)
+        JMA.version = jma_version
+        JMA.frame_rate = frame_rate_value
+
+    output_path = get_output_path(context, filepath, extension, game_title, folder_structure)
+    write_asset(JMA, output_path, jma_version)
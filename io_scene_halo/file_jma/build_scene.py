@@ -26,11 +26,12 @@
 
 import re
 import bpy
+import numpy as np
 
 from math import radians
 from .format import JMAAsset
 from mathutils import Matrix
-from ..global_functions import mesh_processing, global_functions, resource_management
+from ..global_functions import mesh_processing, global_functions, resource_management, animation_processing
 
 def remove_node_prefix(string):
     node_prefix_tuple = ('b ', 'b_', 'bone ', 'bone_', 'frame ', 'frame_', 'bip01 ', 'bip01_')
@@ -300,6 +301,34 @@ def get_pose_bone(arm: bpy.types.Object, node_name: str) -> bpy.types.PoseBone |
         if remove_node_prefix(bone.name).lower() == node_name.lower():
             return bone
 
+def keyframe_biped_controller(JMA, armature, action, frames):
+    location = list(armature.location)
+    rotation_euler = list(armature.rotation_euler)
+    locations = []
+    rotation_eulers = []
+    for frame_idx in range(len(frames)):
+        controller_transform = JMA.biped_controller_transforms[frame_idx]
+        if JMA.biped_controller_frame_type & JMAAsset.BipedControllerFrameType.DX:
+            location[0] = controller_transform.translation[0]
+
+        if JMA.biped_controller_frame_type & JMAAsset.BipedControllerFrameType.DY:
+            location[1] = controller_transform.translation[1]
+
+        if JMA.biped_controller_frame_type & JMAAsset.BipedControllerFrameType.DZ:
+            location[2] = controller_transform.translation[2]
+
+        if JMA.biped_controller_frame_type & JMAAsset.BipedControllerFrameType.DYAW:
+            rotation_euler[2] = controller_transform.rotation.to_euler().z
+
+        locations.append(tuple(location))
+        rotation_eulers.append(tuple(rotation_euler))
+
+    locations = np.array(locations)
+    rotation_eulers = np.array(rotation_eulers)
+    for array_index in range(3):
+        animation_processing.set_fcurve_keyframes(action, "location", array_index, "Object Transforms", frames, locations[:, array_index])
+        animation_processing.set_fcurve_keyframes(action, "rotation_euler", array_index, "Object Transforms", frames, rotation_eulers[:, array_index])
+
 def build_scene(context, JMA, JMS_A, JMS_B, filepath, game_version, fix_parents, fix_rotations, report):
     collection = context.collection
     scene = context.scene
@@ -392,59 +421,82 @@ def build_scene(context, JMA, JMS_A, JMS_B, filepath, game_version, fix_parents,
     if JMA.version == 16390:
         nodes = global_functions.sort_by_layer(list(armature.data.bones), armature)[0]
 
-    for frame_idx, frame in enumerate(JMA.transforms):
-        scene.frame_set(frame_idx + 1)
-
+    pose_bones = []
+    node_indices = []
+    for idx, node in enumerate(nodes):
+        pose_bone = get_pose_bone(armature, node.name)
+        if not pose_bone == None:
+            pose_bones.append(pose_bone)
+            node_indices.append(idx)
+
+    if len(JMA.transforms) > 0 and animation_processing.can_bulk_keyframe(armature.pose.bones, False):
+        # Work out every bone and frame at once and write the F-Curves directly instead of posing and keying one bone at a time.
+        frames = np.arange(1, len(JMA.transforms) + 1)
+        translations, quaternions, scales = animation_processing.get_transform_arrays(JMA.transforms, node_indices)
+        transform_matrices = animation_processing.get_transform_matrices(translations, quaternions, scales)
+        pose_matrices = animation_processing.get_pose_matrices(pose_bones, transform_matrices, JMA.version < 16394, fix_rotations)
+        pose_eulers = {}
+        for bone_name, pose_matrix in pose_matrices.items():
+            pose_eulers[bone_name] = animation_processing.get_matrix_eulers(pose_matrix)
+
+        animation_processing.keyframe_pose_bones(action, pose_bones, frames, pose_matrices, pose_eulers)
         if JMA.biped_controller_frame_type != JMAAsset.BipedControllerFrameType.DISABLE:
-            controller_transform = JMA.biped_controller_transforms[frame_idx]
+            keyframe_biped_controller(JMA, armature, action, frames)
+
+    else:
+        for frame_idx, frame in enumerate(JMA.transforms):
+            scene.frame_set(frame_idx + 1)
 
-            if JMA.biped_controller_frame_type & JMAAsset.BipedControllerFrameType.DX:
-                armature.location.x = controller_transform.translation[0]
+            if JMA.biped_controller_frame_type != JMAAsset.BipedControllerFrameType.DISABLE:
+                controller_transform = JMA.biped_controller_transforms[frame_idx]
 
-            if JMA.biped_controller_frame_type & JMAAsset.BipedControllerFrameType.DY:
-                armature.location.y = controller_transform.translation[1]
+                if JMA.biped_controller_frame_type & JMAAsset.BipedControllerFrameType.DX:
+                    armature.location.x = controller_transform.translation[0]
 
-            if JMA.biped_controller_frame_type & JMAAsset.BipedControllerFrameType.DZ:
-                armature.location.z = controller_transform.translation[2]
+                if JMA.biped_controller_frame_type & JMAAsset.BipedControllerFrameType.DY:
+                    armature.location.y = controller_transform.translation[1]
 
-            if JMA.biped_controller_frame_type & JMAAsset.BipedControllerFrameType.DYAW:
-                armature.rotation_euler.z = controller_transform.rotation.to_euler().z
+                if JMA.biped_controller_frame_type & JMAAsset.BipedControllerFrameType.DZ:
+                    armature.location.z = controller_transform.translation[2]
 
-            view_layer.update()
-            armature.keyframe_insert('location')
-            armature.keyframe_insert('rotation_euler')
+                if JMA.biped_controller_frame_type & JMAAsset.BipedControllerFrameType.DYAW:
+                    armature.rotation_euler.z = controller_transform.rotation.to_euler().z
 
-        for idx, node in enumerate(nodes):
-            pose_bone = get_pose_bone(armature, node.name)
-            if not pose_bone == None:
-                matrix_scale = Matrix.Scale(frame[idx].scale, 4)
-                matrix_rotation = frame[idx].rotation.to_matrix().to_4x4()
-                matrix_translation = Matrix.Translation(frame[idx].translation)
+                view_layer.update()
+                armature.keyframe_insert('location')
+                armature.keyframe_insert('rotation_euler')
 
-                if JMA.version < 16394 and fix_rotations:
-                    matrix_rotation = matrix_rotation @ Matrix.Rotation(radians(-90.0), 4, 'Z')
+            for idx, node in enumerate(nodes):
+                pose_bone = get_pose_bone(armature, node.name)
+                if not pose_bone == None:
+                    matrix_scale = Matrix.Scale(frame[idx].scale, 4)
+                    matrix_rotation = frame[idx].rotation.to_matrix().to_4x4()
+                    matrix_translation = Matrix.Translation(frame[idx].translation)
 
-                transform_matrix = matrix_translation @ matrix_rotation @ matrix_scale
+                    if JMA.version < 16394 and fix_rotations:
+                        matrix_rotation = matrix_rotation @ Matrix.Rotation(radians(-90.0), 4, 'Z')
 
-                if JMA.version < 16394 and pose_bone.parent:
-                    parent_matrix = pose_bone.parent.matrix
-                    if fix_rotations:
-                        parent_matrix = parent_matrix @ Matrix.Rotation(radians(90.0), 4, 'Z')
+                    transform_matrix = matrix_translation @ matrix_rotation @ matrix_scale
 
-                    transform_matrix = parent_matrix @ transform_matrix
+                    if JMA.version < 16394 and pose_bone.parent:
+                        parent_matrix = pose_bone.parent.matrix
+                        if fix_rotations:
+                            parent_matrix = parent_matrix @ Matrix.Rotation(radians(90.0), 4, 'Z')
 
-                if JMA.version >= 16394 and fix_rotations:
-                    transform_matrix = transform_matrix @ Matrix.Rotation(radians(-90.0), 4, 'Z')
+                        transform_matrix = parent_matrix @ transform_matrix
 
-                pose_bone.matrix = transform_matrix
-                pose_bone.rotation_euler = transform_matrix.to_euler()
+                    if JMA.version >= 16394 and fix_rotations:
+                        transform_matrix = transform_matrix @ Matrix.Rotation(radians(-90.0), 4, 'Z')
 
-                view_layer.update()
+                    pose_bone.matrix = transform_matrix
+                    pose_bone.rotation_euler = transform_matrix.to_euler()
+
+                    view_layer.update()
 
-                pose_bone.keyframe_insert(data_path='location', group=pose_bone.name)
-                pose_bone.keyframe_insert(data_path='rotation_euler', group=pose_bone.name)
-                pose_bone.keyframe_insert(data_path='rotation_quaternion', group=pose_bone.name)
-                pose_bone.keyframe_insert(data_path='scale', group=pose_bone.name)
+                    pose_bone.keyframe_insert(data_path='location', group=pose_bone.name)
+                    pose_bone.keyframe_insert(data_path='rotation_euler', group=pose_bone.name)
+                    pose_bone.keyframe_insert(data_path='rotation_quaternion', group=pose_bone.name)
+                    pose_bone.keyframe_insert(data_path='scale', group=pose_bone.name)
 
     scene.frame_set(1)
     bpy.ops.object.mode_set(mode = 'OBJECT')
@@ -24,14 +24,49 @@
 #
 # ##### END MIT LICENSE BLOCK #####
 
+import os
 import bpy
 
-from .build_asset import build_asset
+from .process_scene import process_scene_actions
+from .build_asset import build_asset, get_output_path, write_asset
+from ..global_functions import global_functions, timing_report
 
-def write_file(context, filepath, report, extension, jma_version, game_title, generate_checksum, folder_structure, fix_rotations, use_maya_sorting, frame_rate_value, scale_value):
-    build_asset(context, filepath, report, extension, jma_version, game_title, generate_checksum, folder_structure, fix_rotations, use_maya_sorting, frame_rate_value, scale_value)
+def write_actions(context, filepath, report, extension, jma_version, game_title, generate_checksum, folder_structure, fix_rotations, use_maya_sorting, frame_rate_value, scale_value, evaluate_fcurves):
+    # One file per action named after the action and placed next to filepath. Each action is written on a worker thread while
+    # the next one is sampled.
+    directory = os.path.dirname(filepath)
+    action_count = 0
+    with global_functions.ExportWriterPool() as export_pool:
+        for action, JMA in process_scene_actions(context, extension, jma_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, scale_value, evaluate_fcurves, True, report):
+            JMA.version = jma_version
+            JMA.frame_rate = frame_rate_value
+
+            action_name = action.name.replace('/', '_').replace('\\', '_')
+            output_path = get_output_path(context, os.path.join(directory, action_name), extension, game_title, folder_structure)
+            export_pool.submit(write_asset, JMA, output_path, jma_version)
+            action_count += 1
+
+    return action_count
+
+def write_file(context, filepath, report, extension, jma_version, game_title, generate_checksum, folder_structure, fix_rotations, use_maya_sorting, frame_rate_value, scale_value, evaluate_fcurves=False, export_all_actions=False):
+    timing_report.start("JMA export")
+    if export_all_actions:
+        action_count = write_actions(context, filepath, report, extension, jma_version, game_title, generate_checksum, folder_structure, fix_rotations, use_maya_sorting, frame_rate_value, scale_value, evaluate_fcurves)
+        if action_count == 0:
+            report({'ERROR'}, "No actions were found for the exported armature")
+            timing_report.finish(filepath, report)
+
+            return {'CANCELLED'}
+
+        report({'INFO'}, "Exported %s actions" % action_count)
+        timing_report.finish(filepath, report)
+
+        return {'FINISHED'}
+
+    build_asset(context, filepath, report, extension, jma_version, game_title, generate_checksum, folder_structure, fix_rotations, use_maya_sorting, frame_rate_value, scale_value, evaluate_fcurves=evaluate_fcurves)
 
     report({'INFO'}, "Export completed successfully")
+    timing_report.finish(filepath, report)
 
     return {'FINISHED'}
 
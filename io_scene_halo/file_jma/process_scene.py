@@ -25,9 +25,12 @@
 # ##### END MIT LICENSE BLOCK #####
 
 import bpy
+import numpy as np
 
+from math import radians
+from mathutils import Matrix
 from .format import JMAAsset
-from ..global_functions import mesh_processing, global_functions, resource_management
+from ..global_functions import mesh_processing, global_functions, resource_management, animation_processing, timing_report
 
 def find_valid_armature(context, obj):
     valid_armature = None
@@ -46,10 +49,232 @@ def find_valid_armature(context, obj):
 
     return node_list, valid_armature
 
-def process_scene(context, extension, jma_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, scale_value):
-    JMA = JMAAsset()
-    JMA.node_checksum = 0
+def get_channel_frames(pose_bones, fcurve_index, property_name, component_count, frames):
+    # Values of one pose channel for every frame and bone. Components without an F-Curve keep the value they have right now.
+    bone_count = len(pose_bones)
+    current_values = np.empty(bone_count * component_count, dtype=np.float32)
+    pose_bones.foreach_get(property_name, current_values)
+    channel_frames = np.empty((len(frames), bone_count, component_count))
+    channel_frames[:] = current_values.reshape(bone_count, component_count)
+    for bone_idx, pose_bone in enumerate(pose_bones):
+        data_path = pose_bone.path_from_id(property_name)
+        for array_index in range(component_count):
+            fcurve = fcurve_index.get((data_path, array_index))
+            if not fcurve == None:
+                channel_frames[:, bone_idx, array_index] = [fcurve.evaluate(frame) for frame in frames]
+
+    return channel_frames
+
+def get_fcurve_bone_matrices(armature, first_frame, last_frame):
+    # Builds pose_bone.matrix for every bone and frame straight from the action F-Curves without touching the scene. Returns None
+    # when the rig uses anything the F-Curves alone can't reproduce so the caller can sample the scene frames instead.
+    animation_data = armature.animation_data
+    if animation_data == None or animation_data.action == None or len(animation_data.drivers) > 0 or len(armature.constraints) > 0:
+        return None
+
+    # Drivers on the armature data (bone properties, custom shapes, etc.) only resolve when the scene frame is evaluated.
+    data_animation_data = armature.data.animation_data
+    if not data_animation_data == None and len(data_animation_data.drivers) > 0:
+        return None
+
+    for nla_track in animation_data.nla_tracks:
+        if not nla_track.mute and len(nla_track.strips) > 0:
+            return None
+
+    object_transform_paths = ("location", "rotation_euler", "rotation_quaternion", "rotation_axis_angle", "scale",
+                              "delta_location", "delta_rotation_euler", "delta_rotation_quaternion", "delta_scale")
+    fcurve_index = global_functions.get_fcurve_index(animation_data.action)
+    for data_path, array_index in fcurve_index.keys():
+        if data_path in object_transform_paths:
+            return None
+
+    pose_bones = armature.pose.bones
+    for pose_bone in pose_bones:
+        bone = pose_bone.bone
+        if len(pose_bone.constraints) > 0 or pose_bone.rotation_mode == 'AXIS_ANGLE':
+            return None
+
+        if not bone.use_inherit_rotation or not bone.inherit_scale == 'FULL' or not bone.use_local_location:
+            return None
+
+    frames = range(first_frame, last_frame)
+    locations = get_channel_frames(pose_bones, fcurve_index, "location", 3, frames)
+    quaternions = get_channel_frames(pose_bones, fcurve_index, "rotation_quaternion", 4, frames)
+    eulers = get_channel_frames(pose_bones, fcurve_index, "rotation_euler", 3, frames)
+    scales = get_channel_frames(pose_bones, fcurve_index, "scale", 3, frames)
+
+    bone_count = len(pose_bones)
+    rotation_matrices = np.empty((len(frames), bone_count, 3, 3))
+    rotation_modes = [pose_bone.rotation_mode for pose_bone in pose_bones]
+    for rotation_mode in set(rotation_modes):
+        mode_indices = [bone_idx for bone_idx, bone_rotation_mode in enumerate(rotation_modes) if bone_rotation_mode == rotation_mode]
+        if rotation_mode == 'QUATERNION':
+            mode_quaternions = quaternions[:, mode_indices]
+            rotation_matrices[:, mode_indices] = animation_processing.get_quaternion_matrices(mode_quaternions / np.linalg.norm(mode_quaternions, axis=-1)[..., np.newaxis])
 
+        else:
+            rotation_matrices[:, mode_indices] = animation_processing.get_euler_matrices(eulers[:, mode_indices], rotation_mode)
+
+    basis_matrices = np.zeros((len(frames), bone_count, 4, 4))
+    basis_matrices[..., :3, :3] = rotation_matrices * scales[..., np.newaxis, :]
+    basis_matrices[..., :3, 3] = locations
+    basis_matrices[..., 3, 3] = 1.0
+
+    # Rest offset of every bone from its parent. Children are composed one hierarchy level at a time so each level is a single
+    # batched product over all frames.
+    offset_matrices = np.empty((bone_count, 4, 4))
+    parent_indices = []
+    bone_depths = []
+    for bone_idx, pose_bone in enumerate(pose_bones):
+        rest_matrix = np.array(pose_bone.bone.matrix_local)
+        parent_idx = -1
+        bone_depth = 0
+        if pose_bone.parent:
+            parent_idx = pose_bones.find(pose_bone.parent.name)
+            bone_depth = len(pose_bone.parent_recursive)
+            rest_matrix = np.linalg.inv(np.array(pose_bone.parent.bone.matrix_local)) @ rest_matrix
+
+        offset_matrices[bone_idx] = rest_matrix
+        parent_indices.append(parent_idx)
+        bone_depths.append(bone_depth)
+
+    bone_matrices = offset_matrices @ basis_matrices
+    parent_indices = np.array(parent_indices)
+    bone_depths = np.array(bone_depths)
+    for bone_depth in range(1, bone_depths.max(initial=0) + 1):
+        level_indices = np.flatnonzero(bone_depths == bone_depth)
+        bone_matrices[:, level_indices] = bone_matrices[:, parent_indices[level_indices]] @ bone_matrices[:, level_indices]
+
+    return bone_matrices
+
+def sample_node_matrices(context, armature, joined_list, first_frame, last_frame, jma_version, scale_value, fix_rotations, evaluate_fcurves=False, report=None):
+    # Sets every frame once and reads the pose of all nodes in one pass instead of re-evaluating the depsgraph for each node.
+    # With evaluate_fcurves the armature pose comes from the action F-Curves and the scene frame is never changed.
+    # Returns the same matrices get_matrix() builds for each node as a (frame, node, 4, 4) array.
+    frame_count = max(last_frame - first_frame, 0)
+    node_count = len(joined_list)
+    use_local = not jma_version >= global_functions.get_version_matrix_check('JMA', None)
+
+    rotation = 0.0
+    if fix_rotations:
+        rotation = 90.0
+
+    rotation_matrix = np.array(Matrix.Rotation(radians(rotation), 4, 'Z'))
+    scale_matrix = np.array(Matrix.Scale(scale_value, 4))
+    if node_count == 0:
+        return np.empty((frame_count, 0, 4, 4))
+
+    if armature:
+        pose_bones = armature.pose.bones
+        bone_count = len(pose_bones)
+        node_indices = np.array([pose_bones.find(node.name) for node in joined_list])
+        parent_indices = []
+        for node_idx in node_indices:
+            pose_bone = pose_bones[node_idx]
+            parent_idx = -1
+            if use_local and pose_bone.parent:
+                parent_idx = pose_bones.find(pose_bone.parent.name)
+
+            parent_indices.append(parent_idx)
+
+        parent_indices = np.array(parent_indices)
+        bone_matrices = None
+        if evaluate_fcurves:
+            bone_matrices = get_fcurve_bone_matrices(armature, first_frame, last_frame)
+            if bone_matrices is None and not report == None:
+                report({'WARNING'}, "F-Curves can't be evaluated directly for this rig. Falling back to sampling the scene frames")
+
+        if bone_matrices is None:
+            pose_buffer = np.empty(bone_count * 16, dtype=np.float32)
+            bone_matrices = np.empty((frame_count, bone_count, 4, 4))
+            armature_matrices = np.empty((frame_count, 4, 4))
+            for frame_idx, frame in enumerate(range(first_frame, last_frame)):
+                context.scene.frame_set(frame)
+                pose_bones.foreach_get("matrix", pose_buffer)
+                # Matrix properties come out of foreach_get one column at a time.
+                bone_matrices[frame_idx] = pose_buffer.reshape(bone_count, 4, 4).transpose(0, 2, 1)
+                armature_matrices[frame_idx] = global_functions.get_matrix(armature, armature, True, None, joined_list, False, jma_version, 'JMA', False, scale_value, fix_rotations)
+
+        else:
+            # Rigs that pass the F-Curve checks have no object level animation so the armature matrix is the same for every frame.
+            armature_matrix = global_functions.get_matrix(armature, armature, True, None, joined_list, False, jma_version, 'JMA', False, scale_value, fix_rotations)
+            armature_matrices = np.broadcast_to(np.array(armature_matrix), (frame_count, 4, 4))
+
+        node_matrices = bone_matrices[:, node_indices] @ rotation_matrix
+        local_matrices = node_matrices.copy()
+        has_parent = parent_indices >= 0
+        if has_parent.any():
+            #Files at or above 8205 use absolute transform instead of local transform for nodes
+            parent_matrices = bone_matrices[:, parent_indices[has_parent]] @ rotation_matrix
+            local_matrices[:, has_parent] = np.linalg.inv(parent_matrices) @ node_matrices[:, has_parent]
+
+        return armature_matrices[:, np.newaxis] @ (local_matrices @ scale_matrix)
+
+    parented_nodes = []
+    has_parent = np.zeros(node_count, dtype=bool)
+    if use_local:
+        for node_idx, node in enumerate(joined_list):
+            if node.parent:
+                parented_nodes.append(node)
+                has_parent[node_idx] = True
+
+    node_matrices = np.empty((frame_count, node_count, 4, 4))
+    parent_matrices = np.empty((frame_count, len(parented_nodes), 4, 4))
+    for frame_idx, frame in enumerate(range(first_frame, last_frame)):
+        context.scene.frame_set(frame)
+        node_matrices[frame_idx] = [node.matrix_world for node in joined_list]
+        if len(parented_nodes) > 0:
+            parent_matrices[frame_idx] = [node.parent.matrix_world for node in parented_nodes]
+
+    local_matrices = node_matrices.copy()
+    if len(parented_nodes) > 0:
+        #Files at or above 8205 use absolute transform instead of local transform for nodes
+        local_matrices[:, has_parent] = np.linalg.inv(parent_matrices) @ node_matrices[:, has_parent]
+
+    return local_matrices @ scale_matrix
+
+def decompose_node_matrices(node_matrices, jma_version):
+    # Vectorized get_dimensions() for the sampled node matrices. Returns translations, rotations as (i, j, k, w) and the first
+    # scale axis. The decompose runs in double precision where Matrix.decompose() works in single precision, so a written value
+    # can differ from the per node path in its last digit.
+    translations, quaternions, scales = animation_processing.decompose_matrices(node_matrices)
+    if global_functions.invert_rotations('JMA', jma_version):
+        quaternions[..., 1:] *= -1.0
+
+    rotations = np.concatenate((quaternions[..., 1:], quaternions[..., :1]), axis=-1)
+
+    return translations, rotations, scales[..., 0]
+
+def get_armature_actions(armature):
+    # Every action with at least one F-Curve on a bone of this armature.
+    bone_paths = tuple([pose_bone.path_from_id() for pose_bone in armature.pose.bones])
+    armature_actions = []
+    for action in bpy.data.actions:
+        for fcurve in action.fcurves:
+            if fcurve.data_path.startswith(bone_paths):
+                armature_actions.append(action)
+                break
+
+    return armature_actions
+
+def get_frame_range(context, action, use_action_range=False):
+    # Batch exports take the range from each action since the scene range only fits one of them.
+    first_frame = context.scene.frame_start
+    last_frame = context.scene.frame_end + 1
+    if action and (action.use_frame_range or use_action_range):
+        first_frame = int(action.frame_range[0])
+        last_frame = int(action.frame_range[1]) + 1
+
+    return first_frame, last_frame
+
+def process_scene(context, extension, jma_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, scale_value, evaluate_fcurves=False, report=None):
+    scene_actions = list(process_scene_actions(context, extension, jma_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, scale_value, evaluate_fcurves, report=report))
+
+    return scene_actions[0][1]
+
+def process_scene_actions(context, extension, jma_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, scale_value, evaluate_fcurves=False, export_all_actions=False, report=None):
+    # Yields an (action, JMA) pair for the active action or, with export_all_actions, for every action that animates the armature.
+    # The node list, sorting and checksum are only worked out once and shared by every JMA.
     hidden_geo = False
     nonrender_geo = True
 
@@ -57,6 +282,7 @@ def process_scene(context, extension, jma_version, game_title, generate_checksum
     object_list = []
 
     # Gather all scene resources that fit export criteria
+    timing_phase = timing_report.begin_phase("scene gather")
     resource_management.gather_scene_resources(context, layer_collection_list, object_list, hidden_geo, nonrender_geo)
 
     # Store visibility for all relevant resources
@@ -70,17 +296,11 @@ def process_scene(context, extension, jma_version, game_title, generate_checksum
     armature = None
     node_list = []
     armature_count = 0
-    first_frame = context.scene.frame_start
-    last_frame = context.scene.frame_end + 1
-    JMA.frame_count = context.scene.frame_end - first_frame + 1
-    
+
     active_object = context.view_layer.objects.active
+    active_action = None
     if active_object and active_object.animation_data:
-        action = active_object.animation_data.action
-        if action and action.use_frame_range:
-            first_frame = int(action.frame_start)
-            last_frame = int(action.frame_end) + 1
-            JMA.frame_count = last_frame - first_frame
+        active_action = active_object.animation_data.action
 
     mesh_frame_count = 0
     world_node_count = 0
@@ -111,11 +331,17 @@ def process_scene(context, extension, jma_version, game_title, generate_checksum
                 mesh_frame_count += 1
                 node_list.append(obj)
 
-    JMA.node_count = len(node_list)
-    sorted_list = global_functions.sort_list(node_list, armature, game_title, jma_version, True)
+    timing_phase.count("objects", len(object_list))
+    timing_report.end_phase(timing_phase)
+
+    with timing_report.phase("sorting") as timing_phase:
+        sorted_list = global_functions.sort_list(node_list, armature, game_title, jma_version, True)
+        timing_phase.count("nodes", len(node_list))
+
     joined_list = sorted_list[0]
     reversed_joined_list = sorted_list[1]
 
+    nodes = []
     for node in joined_list:
         is_bone = False
         if armature:
@@ -160,50 +386,72 @@ def process_scene(context, extension, jma_version, game_title, generate_checksum
             for child_node in current_node_children:
                 children.append(joined_list.index(bpy.data.objects[child_node]))
 
-        JMA.nodes.append(JMA.Node(name, parent, child, sibling))
+        nodes.append(JMAAsset.Node(name, parent, child, sibling))
 
-    if generate_checksum and len(JMA.nodes) > 0:
-        JMA.node_checksum = global_functions.node_hierarchy_checksum(JMA.nodes, JMA.nodes[0], JMA.node_checksum)
+    node_checksum = 0
+    if generate_checksum and len(nodes) > 0:
+        node_checksum = global_functions.node_hierarchy_checksum(nodes, nodes[0], node_checksum)
 
-    for frame in range(first_frame, last_frame):
-        transforms_for_frame = []
-        for node in joined_list:
-            context.scene.frame_set(frame)
-            is_bone = False
-            if armature:
-                is_bone = True
-                
-            bone_matrix = global_functions.get_matrix(node, node, True, armature, joined_list, True, jma_version, 'JMA', False, scale_value, fix_rotations)
-            full_matrix = bone_matrix
-            if armature:
-                armature_matrix = global_functions.get_matrix(armature, armature, True, None, joined_list, False, jma_version, 'JMA', False, scale_value, fix_rotations)
-                full_matrix = armature_matrix @ bone_matrix
+    scene_actions = [active_action]
+    created_animation_data = False
+    if export_all_actions:
+        scene_actions = []
+        if not armature == None:
+            if armature.animation_data == None:
+                armature.animation_data_create()
+                created_animation_data = True
 
-            mesh_dimensions = global_functions.get_dimensions(full_matrix, node, jma_version, is_bone, 'JMA', scale_value)
-            rotation = (mesh_dimensions.quaternion[0], mesh_dimensions.quaternion[1], mesh_dimensions.quaternion[2], mesh_dimensions.quaternion[3])
-            translation = (mesh_dimensions.position[0], mesh_dimensions.position[1], mesh_dimensions.position[2])
-            scale = (mesh_dimensions.scale[0])
+            stored_action = armature.animation_data.action
+            scene_actions = get_armature_actions(armature)
 
-            transforms_for_frame.append(JMA.Transform(translation, rotation, scale))
+    try:
+        for action in scene_actions:
+            if export_all_actions:
+                armature.animation_data.action = action
 
-        JMA.transforms.append(transforms_for_frame)
+            JMA = JMAAsset()
+            JMA.node_count = len(node_list)
+            JMA.nodes = nodes
+            JMA.node_checksum = node_checksum
 
-    armature_transform = False
-    if jma_version > 16394 and armature_transform:
-        for frame in range(JMA.frame_count):
-            context.scene.frame_set(frame)
-            armature_matrix = global_functions.get_matrix(armature, armature, True, None, joined_list, False, jma_version, 'JMA', False, scale_value, fix_rotations)
-            mesh_dimensions = global_functions.get_dimensions(armature_matrix, armature, jma_version, False, 'JMA', scale_value)
+            first_frame, last_frame = get_frame_range(context, action, export_all_actions)
+            JMA.frame_count = last_frame - first_frame
 
-            rotation = (mesh_dimensions.quaternion[0], mesh_dimensions.quaternion[1], mesh_dimensions.quaternion[2], mesh_dimensions.quaternion[3])
-            translation = (mesh_dimensions.position[0], mesh_dimensions.position[1], mesh_dimensions.position[2])
-            scale = (mesh_dimensions.scale[0])
+            timing_phase = timing_report.begin_phase("transform sampling")
+            node_matrices = sample_node_matrices(context, armature, joined_list, first_frame, last_frame, jma_version, scale_value, fix_rotations, evaluate_fcurves, report)
+            translations, rotations, scales = decompose_node_matrices(node_matrices, jma_version)
+            for frame_translations, frame_rotations, frame_scales in zip(translations.tolist(), rotations.tolist(), scales.tolist()):
+                JMA.transforms.append([JMA.Transform(tuple(translation), tuple(rotation), scale) for translation, rotation, scale in zip(frame_translations, frame_rotations, frame_scales)])
 
-            JMA.biped_controller_transforms.append(JMA.Transform(translation, rotation, scale))
+            armature_transform = False
+            if jma_version > 16394 and armature_transform:
+                for frame in range(JMA.frame_count):
+                    context.scene.frame_set(frame)
+                    armature_matrix = global_functions.get_matrix(armature, armature, True, None, joined_list, False, jma_version, 'JMA', False, scale_value, fix_rotations)
+                    mesh_dimensions = global_functions.get_dimensions(armature_matrix, armature, jma_version, False, 'JMA', scale_value)
 
-    # Restore visibility status for all resources
-    resource_management.restore_collection_visibility(stored_collection_visibility)
-    resource_management.restore_object_visibility(stored_object_visibility)
-    resource_management.restore_modifier_visibility(stored_modifier_visibility)
+                    rotation = (mesh_dimensions.quaternion[0], mesh_dimensions.quaternion[1], mesh_dimensions.quaternion[2], mesh_dimensions.quaternion[3])
+                    translation = (mesh_dimensions.position[0], mesh_dimensions.position[1], mesh_dimensions.position[2])
+                    scale = (mesh_dimensions.scale[0])
+
+                    JMA.biped_controller_transforms.append(JMA.Transform(translation, rotation, scale))
+
+            timing_phase.count("frames", len(JMA.transforms))
+            timing_phase.count("nodes", len(joined_list))
+            timing_report.end_phase(timing_phase)
+
+            yield action, JMA
+
+    finally:
+        if export_all_actions and not armature == None:
+            # Leave the armature without animation data again if it only got some so actions could be assigned to it.
+            if created_animation_data:
+                armature.animation_data_clear()
+
+            else:
+                armature.animation_data.action = stored_action
 
-    return JMA
+        # Restore visibility status for all resources
+        resource_management.restore_collection_visibility(stored_collection_visibility)
+        resource_management.restore_object_visibility(stored_object_visibility)
+        resource_management.restore_modifier_visibility(stored_modifier_visibility)
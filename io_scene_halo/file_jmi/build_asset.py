@@ -28,7 +28,7 @@ import os
 
 from ..file_jms import export_jms
 from .process_scene import process_scene
-from ..global_functions import resource_management
+from ..global_functions import global_functions, resource_management
 
 from .format import JMIAsset
 
@@ -86,44 +86,47 @@ def build_asset(
         file.write('\n')
         file.close()
 
-    for idx, world_nodes in enumerate(JMI.children_sets):
-        permutation_name = JMI.world_nodes[idx].jmi.permutation_ce
-        lod_setting = JMI.world_nodes[idx].jmi.level_of_detail_ce
-        world_name = world_nodes[0].name.split('!', 1)[1]
-        world_set = root_directory + os.sep + world_name
-        if not os.path.exists(world_set):
-            os.makedirs(world_set)
-
-        bulk_output = world_set + os.sep + world_name
-
-        export_jms.command_queue(
-            True,
-            context,
-            world_nodes,
-            bulk_output,
-            game_version,
-            JMS_args.jmi_version,
-            permutation_name,
-            lod_setting,
-            True,
-            True,
-            write_textures,
-            JMS_args.hidden_geo,
-            JMS_args.nonrender_geo,
-            JMS_args.export_render,
-            JMS_args.export_collision,
-            JMS_args.export_physics,
-            JMS_args.apply_modifiers,
-            JMS_args.triangulate_faces,
-            JMS_args.loop_normals,
-            JMS_args.clean_normalize_weights,
-            JMS_args.edge_split,
-            JMS_args.fix_rotations,
-            JMS_args.use_maya_sorting,
-            JMS_args.folder_type,
-            JMS_args.scale_value,
-            report
-        )
+    # Instances are pulled from the scene one at a time on this thread and each finished JMS is formatted and written by the pool.
+    with global_functions.ExportWriterPool() as export_pool:
+        for idx, world_nodes in enumerate(JMI.children_sets):
+            permutation_name = JMI.world_nodes[idx].jmi.permutation_ce
+            lod_setting = JMI.world_nodes[idx].jmi.level_of_detail_ce
+            world_name = world_nodes[0].name.split('!', 1)[1]
+            world_set = root_directory + os.sep + world_name
+            if not os.path.exists(world_set):
+                os.makedirs(world_set)
+
+            bulk_output = world_set + os.sep + world_name
+
+            export_jms.command_queue(
+                True,
+                context,
+                world_nodes,
+                bulk_output,
+                game_version,
+                JMS_args.jmi_version,
+                permutation_name,
+                lod_setting,
+                True,
+                True,
+                write_textures,
+                JMS_args.hidden_geo,
+                JMS_args.nonrender_geo,
+                JMS_args.export_render,
+                JMS_args.export_collision,
+                JMS_args.export_physics,
+                JMS_args.apply_modifiers,
+                JMS_args.triangulate_faces,
+                JMS_args.loop_normals,
+                JMS_args.clean_normalize_weights,
+                JMS_args.edge_split,
+                JMS_args.fix_rotations,
+                JMS_args.use_maya_sorting,
+                JMS_args.folder_type,
+                JMS_args.scale_value,
+                report,
+                export_pool=export_pool
+            )
 
     # Restore visibility status for all resources
     resource_management.restore_collection_visibility(stored_collection_visibility)
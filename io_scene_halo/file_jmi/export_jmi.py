@@ -28,7 +28,7 @@ import bpy
 
 from .format import JMIAsset
 from .build_asset import build_asset
-from ..global_functions import global_functions
+from ..global_functions import global_functions, timing_report
 
 def write_file(
     context,
@@ -55,6 +55,7 @@ def write_file(
     use_maya_sorting,
 ):
 
+    timing_report.start("JMI export")
     filename = global_functions.get_filename(None, None, None, None, None, True, filepath)
     root_directory = global_functions.get_directory(context, None, None, None, folder_type, None, filepath)
 
@@ -90,6 +91,8 @@ def write_file(
     )
 
     report({'INFO'}, "Export completed successfully")
+    timing_report.finish(filepath, report)
+
     return {'FINISHED'}
 
 if __name__ == '__main__':
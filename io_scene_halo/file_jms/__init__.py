@@ -185,6 +185,15 @@ class JMS_SceneProps(Panel):
         row.label(text='Use Maya Sorting:')
         row.prop(scene_jms, "use_maya_sorting", text='')
         row = col.row()
+        row.label(text='Weld Vertices:')
+        row.prop(scene_jms, "weld_vertices", text='')
+        row = col.row()
+        row.label(text='Stream Geometry:')
+        row.prop(scene_jms, "stream_geometry", text='')
+        row = col.row()
+        row.label(text='Reuse Unchanged Geometry:')
+        row.prop(scene_jms, "reuse_geometry", text='')
+        row = col.row()
         row.label(text='Use As Default Export Settings:')
         row.prop(scene_jms, "use_scene_properties", text='')
         if scene_jms.folder_structure == True and not scene_jms.game_title == "halo1":
@@ -208,6 +217,14 @@ class JMS_SceneProps(Panel):
             row.label(text='Sharp Edges:')
             row.prop(scene_jms, "use_edge_sharp", text='')
 
+        if scene_jms.weld_vertices == True:
+            box = layout.box()
+            box.label(text="Vertex Welding:")
+            col = box.column(align=True)
+            row = col.row()
+            row.label(text='Weld Epsilon:')
+            row.prop(scene_jms, "weld_epsilon", text='')
+
         box = layout.box()
         box.label(text="Scale:")
         row = box.row()
@@ -356,6 +373,32 @@ class JMS_ScenePropertiesGroup(PropertyGroup):
         default = False,
         )
 
+    weld_vertices: BoolProperty(
+        name ="Weld Vertices",
+        description = "Merge vertices that share position, normal, UVs, color, weights and region so triangles reuse them",
+        default = False,
+        )
+
+    weld_epsilon: FloatProperty(
+        name="Weld Epsilon",
+        description="Largest difference in any position, normal, UV, color or weight component between two vertices that are still merged. 0 only merges identical vertices",
+        default=0.0001,
+        min=0.0,
+        precision=6,
+        )
+
+    stream_geometry: BoolProperty(
+        name ="Stream Geometry",
+        description = "Spool vertices and triangles to a temporary file during export to keep memory use bounded on very large scenes",
+        default = False,
+        )
+
+    reuse_geometry: BoolProperty(
+        name ="Reuse Unchanged Geometry",
+        description = "Keep the extracted geometry of every object between exports and reuse it for objects that haven't changed since the last export. Ignored when streaming geometry",
+        default = False,
+        )
+
     use_scene_properties: BoolProperty(
         name ="Use scene properties",
         description = "Use the options set in the scene or uncheck this to override",
@@ -539,6 +582,32 @@ class ExportJMS(Operator, ExportHelper):
         default = False,
         )
 
+    weld_vertices: BoolProperty(
+        name ="Weld Vertices",
+        description = "Merge vertices that share position, normal, UVs, color, weights and region so triangles reuse them",
+        default = False,
+        )
+
+    weld_epsilon: FloatProperty(
+        name="Weld Epsilon",
+        description="Largest difference in any position, normal, UV, color or weight component between two vertices that are still merged. 0 only merges identical vertices",
+        default=0.0001,
+        min=0.0,
+        precision=6,
+        )
+
+    stream_geometry: BoolProperty(
+        name ="Stream Geometry",
+        description = "Spool vertices and triangles to a temporary file during export to keep memory use bounded on very large scenes",
+        default = False,
+        )
+
+    reuse_geometry: BoolProperty(
+        name ="Reuse Unchanged Geometry",
+        description = "Keep the extracted geometry of every object between exports and reuse it for objects that haven't changed since the last export. Ignored when streaming geometry",
+        default = False,
+        )
+
     use_scene_properties: BoolProperty(
         name ="Use scene properties",
         description = "Use the options set in the scene or uncheck this to override",
@@ -637,7 +706,7 @@ class ExportJMS(Operator, ExportHelper):
         scale_value = global_functions.set_scale(self.scale_enum, self.scale_float)
         edge_split = global_functions.EdgeSplit(self.edge_split, self.use_edge_angle, self.split_angle, self.use_edge_sharp)
 
-        return global_functions.run_code("export_jms.write_file(context, self.filepath, self.game_title, jms_version, self.permutation_ce, self.level_of_detail_ce, self.generate_checksum, self.folder_structure, self.write_textures, self.hidden_geo, self.nonrender_geo, self.export_render, self.export_collision, self.export_physics, self.apply_modifiers, self.triangulate_faces, self.loop_normals, self.clean_normalize_weights, edge_split, self.fix_rotations, self.use_maya_sorting, folder_type, scale_value, self.report)")
+        return global_functions.run_code("export_jms.write_file(context, self.filepath, self.game_title, jms_version, self.permutation_ce, self.level_of_detail_ce, self.generate_checksum, self.folder_structure, self.write_textures, self.hidden_geo, self.nonrender_geo, self.export_render, self.export_collision, self.export_physics, self.apply_modifiers, self.triangulate_faces, self.loop_normals, self.clean_normalize_weights, edge_split, self.fix_rotations, self.use_maya_sorting, folder_type, scale_value, self.report, self.weld_vertices, self.weld_epsilon, self.stream_geometry, self.reuse_geometry)")
 
     def draw(self, context):
         scene = context.scene
@@ -670,6 +739,10 @@ class ExportJMS(Operator, ExportHelper):
             self.edge_split = scene_jms.edge_split
             self.fix_rotations = scene_jms.fix_rotations
             self.use_maya_sorting = scene_jms.use_maya_sorting
+            self.weld_vertices = scene_jms.weld_vertices
+            self.weld_epsilon = scene_jms.weld_epsilon
+            self.stream_geometry = scene_jms.stream_geometry
+            self.reuse_geometry = scene_jms.reuse_geometry
             self.folder_type = scene_jms.folder_type
             self.use_edge_angle = scene_jms.use_edge_angle
             self.split_angle = scene_jms.split_angle
@@ -770,6 +843,18 @@ class ExportJMS(Operator, ExportHelper):
         row.label(text='Use Maya Sorting:')
         row.prop(self, "use_maya_sorting", text='')
         row = col.row()
+        row.enabled = is_enabled
+        row.label(text='Weld Vertices:')
+        row.prop(self, "weld_vertices", text='')
+        row = col.row()
+        row.enabled = is_enabled
+        row.label(text='Stream Geometry:')
+        row.prop(self, "stream_geometry", text='')
+        row = col.row()
+        row.enabled = is_enabled
+        row.label(text='Reuse Unchanged Geometry:')
+        row.prop(self, "reuse_geometry", text='')
+        row = col.row()
         row.label(text='Use Scene Export Settings:')
         row.prop(scene_jms, "use_scene_properties", text='')
         if self.folder_structure == True and not self.game_title == "halo1":
@@ -796,6 +881,15 @@ class ExportJMS(Operator, ExportHelper):
             row.label(text='Sharp Edges:')
             row.prop(self, "use_edge_sharp", text='')
 
+        if self.weld_vertices == True:
+            box = layout.box()
+            box.label(text="Vertex Welding:")
+            col = box.column(align=True)
+            row = col.row()
+            row.enabled = is_enabled
+            row.label(text='Weld Epsilon:')
+            row.prop(self, "weld_epsilon", text='')
+
         box = layout.box()
         box.label(text="Scale:")
         row = box.row()
@@ -28,7 +28,7 @@ import os
 import struct
 
 from .process_scene import process_scene
-from ..global_functions import global_functions
+from ..global_functions import global_functions, timing_report
 
 DECIMAL_POINT = "6"
 DECIMAL_1 = '\n%0.{decimal_point}f'.format(decimal_point=DECIMAL_POINT)
@@ -36,6 +36,40 @@ DECIMAL_2 = '\n%0.{decimal_point}f\t%0.{decimal_point}f'.format(decimal_point=DE
 DECIMAL_3 = '\n%0.{decimal_point}f\t%0.{decimal_point}f\t%0.{decimal_point}f'.format(decimal_point=DECIMAL_POINT)
 DECIMAL_4 = '\n%0.{decimal_point}f\t%0.{decimal_point}f\t%0.{decimal_point}f\t%0.{decimal_point}f'.format(decimal_point=DECIMAL_POINT)
 
+INT = struct.Struct('<i')
+VECTOR = struct.Struct('<fff')
+VERTEX_HEADER = struct.Struct('<ffffffi')
+NODE_WEIGHT = struct.Struct('<if')
+UV = struct.Struct('<ff')
+
+def pack_vertices_8205(JMS, write_color):
+    # Vertices are packed into one buffer with precompiled structs instead of a struct.pack call and write per field.
+    vertex_data = bytearray(INT.pack(len(JMS.vertices)))
+    for vertex in JMS.vertices:
+        vertex_data += VERTEX_HEADER.pack(*vertex.translation, *vertex.normal, len(vertex.node_set))
+        for node_index, node_weight in vertex.node_set:
+            vertex_data += NODE_WEIGHT.pack(node_index, node_weight)
+
+        vertex_data += INT.pack(len(vertex.uv_set))
+        for uv in vertex.uv_set:
+            vertex_data += UV.pack(uv[0], uv[1])
+
+        if write_color:
+            vertex_data += VECTOR.pack(vertex.color[0], vertex.color[1], vertex.color[2])
+
+    return bytes(vertex_data)
+
+def pack_triangles(JMS, write_region):
+    # Every triangle is a fixed run of ints so the whole section goes through a single pack call.
+    triangle_values = []
+    for triangle in JMS.triangles:
+        if write_region:
+            triangle_values.append(triangle.region)
+
+        triangle_values.extend((triangle.material_index, triangle.v0, triangle.v1, triangle.v2))
+
+    return INT.pack(len(JMS.triangles)) + struct.pack('<%si' % len(triangle_values), *triangle_values)
+
 def write_version(file, jms_version, version_bounds, binary, write_comments=False, write_whitespace=False):
     if binary:
         file.write(struct.pack('<i', jms_version))
@@ -683,9 +717,16 @@ def write_vertices_8197(file, JMS, binary, write_comments=False, write_whitespac
             if write_whitespace:
                 file.write('\n')
 
-        for idx, vertex in enumerate(JMS.vertices):
+        vertex_format = '\n%s\n%s' + DECIMAL_3 + DECIMAL_3 + '\n%s' + DECIMAL_1 + DECIMAL_2
+        if write_comments:
+            vertex_format = '\n;VERTEX %s' + vertex_format
+
+        if write_whitespace:
+            vertex_format += '\n'
+
+        def format_vertex(idx, vertex, values):
             if write_comments:
-                file.write('\n;VERTEX %s' % idx)
+                values.append(idx)
 
             node0 = (int(-1), float(0.0))
             if len(vertex.node_set) > 0:
@@ -700,15 +741,15 @@ def write_vertices_8197(file, JMS, binary, write_comments=False, write_whitespac
             node1_index = node1[0]
             node1_weight = node1[1]
 
-            file.write('\n%s' % vertex.region)
-            file.write('\n%s' % node0_index)
-            file.write(DECIMAL_3 % (vertex.translation[0], vertex.translation[1], vertex.translation[2]))
-            file.write(DECIMAL_3 % (vertex.normal[0], vertex.normal[1], vertex.normal[2]))
-            file.write('\n%s' % node1_index)
-            file.write(DECIMAL_1 % node1_weight)
-            file.write(DECIMAL_2 % (vertex.uv_set[0][0], vertex.uv_set[0][1]))
-            if write_whitespace:
-                file.write('\n')
+            values.extend((vertex.region, node0_index))
+            values.extend((vertex.translation[0], vertex.translation[1], vertex.translation[2]))
+            values.extend((vertex.normal[0], vertex.normal[1], vertex.normal[2]))
+            values.extend((node1_index, node1_weight))
+            values.extend((vertex.uv_set[0][0], vertex.uv_set[0][1]))
+
+            return vertex_format
+
+        global_functions.write_record_chunks(file, JMS.vertices, format_vertex)
 
 def write_vertices_8198(file, JMS, binary, write_comments=False, write_whitespace=False):
     if binary:
@@ -751,9 +792,16 @@ def write_vertices_8198(file, JMS, binary, write_comments=False, write_whitespac
             if write_whitespace:
                 file.write('\n')
 
-        for idx, vertex in enumerate(JMS.vertices):
+        vertex_format = '\n%s' + DECIMAL_3 + DECIMAL_3 + '\n%s' + DECIMAL_1 + DECIMAL_2 + '\n0'
+        if write_comments:
+            vertex_format = '\n;VERTEX %s' + vertex_format
+
+        if write_whitespace:
+            vertex_format += '\n'
+
+        def format_vertex(idx, vertex, values):
             if write_comments:
-                file.write('\n;VERTEX %s' % idx)
+                values.append(idx)
 
             node0 = (int(-1), float(0.0))
             if len(vertex.node_set) > 0:
@@ -768,15 +816,15 @@ def write_vertices_8198(file, JMS, binary, write_comments=False, write_whitespac
             node1_index = node1[0]
             node1_weight = node1[1]
 
-            file.write('\n%s' % node0_index)
-            file.write(DECIMAL_3 % (vertex.translation[0], vertex.translation[1], vertex.translation[2]))
-            file.write(DECIMAL_3 % (vertex.normal[0], vertex.normal[1], vertex.normal[2]))
-            file.write('\n%s' % node1_index)
-            file.write(DECIMAL_1 % node1_weight)
-            file.write(DECIMAL_2 % (vertex.uv_set[0][0], vertex.uv_set[0][1]))
-            file.write('\n%s' % 0)
-            if write_whitespace:
-                file.write('\n')
+            values.append(node0_index)
+            values.extend((vertex.translation[0], vertex.translation[1], vertex.translation[2]))
+            values.extend((vertex.normal[0], vertex.normal[1], vertex.normal[2]))
+            values.extend((node1_index, node1_weight))
+            values.extend((vertex.uv_set[0][0], vertex.uv_set[0][1]))
+
+            return vertex_format
+
+        global_functions.write_record_chunks(file, JMS.vertices, format_vertex)
 
 def write_vertices_8199(file, JMS, binary, write_comments=False, write_whitespace=False):
     if binary:
@@ -819,9 +867,16 @@ def write_vertices_8199(file, JMS, binary, write_comments=False, write_whitespac
             if write_whitespace:
                 file.write('\n')
 
-        for idx, vertex in enumerate(JMS.vertices):
+        vertex_format = '\n%s' + DECIMAL_3 + DECIMAL_3 + '\n%s' + DECIMAL_1 + DECIMAL_2 + '\n0'
+        if write_comments:
+            vertex_format = '\n;VERTEX %s' + vertex_format
+
+        if write_whitespace:
+            vertex_format += '\n'
+
+        def format_vertex(idx, vertex, values):
             if write_comments:
-                file.write('\n;VERTEX %s' % idx)
+                values.append(idx)
 
             node0 = (int(-1), float(0.0))
             if len(vertex.node_set) > 0:
@@ -836,15 +891,15 @@ def write_vertices_8199(file, JMS, binary, write_comments=False, write_whitespac
             node1_index = node1[0]
             node1_weight = node1[1]
 
-            file.write('\n%s' % node0_index)
-            file.write(DECIMAL_3 % (vertex.translation[0], vertex.translation[1], vertex.translation[2]))
-            file.write(DECIMAL_3 % (vertex.normal[0], vertex.normal[1], vertex.normal[2]))
-            file.write('\n%s' % node1_index)
-            file.write(DECIMAL_1 % node1_weight)
-            file.write(DECIMAL_2 % (vertex.uv_set[0][0], vertex.uv_set[0][1]))
-            file.write('\n%s' % 0)
-            if write_whitespace:
-                file.write('\n')
+            values.append(node0_index)
+            values.extend((vertex.translation[0], vertex.translation[1], vertex.translation[2]))
+            values.extend((vertex.normal[0], vertex.normal[1], vertex.normal[2]))
+            values.extend((node1_index, node1_weight))
+            values.extend((vertex.uv_set[0][0], vertex.uv_set[0][1]))
+
+            return vertex_format
+
+        global_functions.write_record_chunks(file, JMS.vertices, format_vertex)
 
 def write_vertices_8201(file, JMS, binary, write_comments=False, write_whitespace=False):
     if binary:
@@ -877,7 +932,11 @@ def write_vertices_8201(file, JMS, binary, write_comments=False, write_whitespac
             file.write('\n;###Vertices###')
 
         file.write('\n%s' % (len(JMS.vertices)))
-        for idx, vertex in enumerate(JMS.vertices):
+        vertex_format = '\n%s' + DECIMAL_3 + DECIMAL_3 + '\n%s' + DECIMAL_1 + DECIMAL_2 + '\n0'
+        if write_whitespace:
+            vertex_format += '\n'
+
+        def format_vertex(idx, vertex, values):
             node0 = (int(-1), float(0.0))
             if len(vertex.node_set) > 0:
                 node0 = vertex.node_set[0]
@@ -891,15 +950,15 @@ def write_vertices_8201(file, JMS, binary, write_comments=False, write_whitespac
             node1_index = node1[0]
             node1_weight = node1[1]
 
-            file.write('\n%s' % node0_index)
-            file.write(DECIMAL_3 % (vertex.translation[0], vertex.translation[1], vertex.translation[2]))
-            file.write(DECIMAL_3 % (vertex.normal[0], vertex.normal[1], vertex.normal[2]))
-            file.write('\n%s' % node1_index)
-            file.write(DECIMAL_1 % node1_weight)
-            file.write(DECIMAL_2 % (vertex.uv_set[0][0], vertex.uv_set[0][1]))
-            file.write('\n%s' % 0)
-            if write_whitespace:
-                file.write('\n')
+            values.append(node0_index)
+            values.extend((vertex.translation[0], vertex.translation[1], vertex.translation[2]))
+            values.extend((vertex.normal[0], vertex.normal[1], vertex.normal[2]))
+            values.extend((node1_index, node1_weight))
+            values.extend((vertex.uv_set[0][0], vertex.uv_set[0][1]))
+
+            return vertex_format
+
+        global_functions.write_record_chunks(file, JMS.vertices, format_vertex)
 
 def write_vertices_8202(file, JMS, binary, write_comments=False, write_whitespace=False):
     if binary:
@@ -963,7 +1022,11 @@ def write_vertices_8202(file, JMS, binary, write_comments=False, write_whitespac
             file.write('\n;###Vertices###')
 
         file.write('\n%s' % (len(JMS.vertices)))
-        for idx, vertex in enumerate(JMS.vertices):
+        vertex_format = '\n%s' + DECIMAL_3 + DECIMAL_3 + '\n%s' + DECIMAL_1 + DECIMAL_2 + DECIMAL_2 + DECIMAL_2 + DECIMAL_2 + '\n0'
+        if write_whitespace:
+            vertex_format += '\n'
+
+        def format_vertex(idx, vertex, values):
             node0 = (int(-1), float(0.0))
             if len(vertex.node_set) > 0:
                 node0 = vertex.node_set[0]
@@ -1005,18 +1068,15 @@ def write_vertices_8202(file, JMS, binary, write_comments=False, write_whitespac
                 tex_u_3 = uv_3[0]
                 tex_v_3 = uv_3[1]
 
-            file.write('\n%s' % node0_index)
-            file.write(DECIMAL_3 % (vertex.translation[0], vertex.translation[1], vertex.translation[2]))
-            file.write(DECIMAL_3 % (vertex.normal[0], vertex.normal[1], vertex.normal[2]))
-            file.write('\n%s' % node1_index)
-            file.write(DECIMAL_1 % node1_weight)
-            file.write(DECIMAL_2 % (tex_u_0, tex_v_0))
-            file.write(DECIMAL_2 % (tex_u_1, tex_v_1))
-            file.write(DECIMAL_2 % (tex_u_2, tex_v_2))
-            file.write(DECIMAL_2 % (tex_u_3, tex_v_3))
-            file.write('\n%s' % 0)
-            if write_whitespace:
-                file.write('\n')
+            values.append(node0_index)
+            values.extend((vertex.translation[0], vertex.translation[1], vertex.translation[2]))
+            values.extend((vertex.normal[0], vertex.normal[1], vertex.normal[2]))
+            values.extend((node1_index, node1_weight))
+            values.extend((tex_u_0, tex_v_0, tex_u_1, tex_v_1, tex_u_2, tex_v_2, tex_u_3, tex_v_3))
+
+            return vertex_format
+
+        global_functions.write_record_chunks(file, JMS.vertices, format_vertex)
 
 def write_vertices_8204(file, JMS, binary, write_comments=False, write_whitespace=False):
     if binary:
@@ -1100,7 +1160,11 @@ def write_vertices_8204(file, JMS, binary, write_comments=False, write_whitespac
             file.write('\n;###Vertices###')
 
         file.write('\n%s' % (len(JMS.vertices)))
-        for idx, vertex in enumerate(JMS.vertices):
+        vertex_format = '\n%s' + DECIMAL_1 + DECIMAL_3 + DECIMAL_3 + '\n%s' + DECIMAL_1 + '\n%s' + DECIMAL_1 + '\n%s' + DECIMAL_1 + DECIMAL_2 + DECIMAL_2 + DECIMAL_2 + DECIMAL_2 + '\n0'
+        if write_whitespace:
+            vertex_format += '\n'
+
+        def format_vertex(idx, vertex, values):
             node0 = (int(-1), float(0.0))
             if len(vertex.node_set) > 0:
                 node0 = vertex.node_set[0]
@@ -1157,40 +1221,38 @@ def write_vertices_8204(file, JMS, binary, write_comments=False, write_whitespac
                 tex_u_3 = uv_3[0]
                 tex_v_3 = uv_3[1]
 
-            file.write('\n%s' % node0_index)
-            file.write(DECIMAL_1 % node0_weight)
-            file.write(DECIMAL_3 % (vertex.translation[0], vertex.translation[1], vertex.translation[2]))
-            file.write(DECIMAL_3 % (vertex.normal[0], vertex.normal[1], vertex.normal[2]))
-            file.write('\n%s' % node1_index)
-            file.write(DECIMAL_1 % node1_weight)
-            file.write('\n%s' % node2_index)
-            file.write(DECIMAL_1 % node2_weight)
-            file.write('\n%s' % node3_index)
-            file.write(DECIMAL_1 % node3_weight)
-            file.write(DECIMAL_2 % (tex_u_0, tex_v_0))
-            file.write(DECIMAL_2 % (tex_u_1, tex_v_1))
-            file.write(DECIMAL_2 % (tex_u_2, tex_v_2))
-            file.write(DECIMAL_2 % (tex_u_3, tex_v_3))
-            file.write('\n%s' % 0)
-            if write_whitespace:
-                file.write('\n')
+            values.extend((node0_index, node0_weight))
+            values.extend((vertex.translation[0], vertex.translation[1], vertex.translation[2]))
+            values.extend((vertex.normal[0], vertex.normal[1], vertex.normal[2]))
+            values.extend((node1_index, node1_weight, node2_index, node2_weight, node3_index, node3_weight))
+            values.extend((tex_u_0, tex_v_0, tex_u_1, tex_v_1, tex_u_2, tex_v_2, tex_u_3, tex_v_3))
 
-def write_vertices_8205(file, JMS, binary, write_comments=False, write_whitespace=False):
-    if binary:
-        file.write(struct.pack('<i', len(JMS.vertices)))
-        for idx, vertex in enumerate(JMS.vertices):
-            file.write(struct.pack('<fff', *vertex.translation))
-            file.write(struct.pack('<fff', *vertex.normal))
-            file.write(struct.pack('<i', len(vertex.node_set)))
-            for node in vertex.node_set:
-                node_index, node_weight = node
-                file.write(struct.pack('<i', node_index))
-                file.write(struct.pack('<f', node_weight))
+            return vertex_format
 
-            file.write(struct.pack('<i', len(vertex.uv_set)))
-            for uv in vertex.uv_set:
-                file.write(struct.pack('<ff', *uv))
+        global_functions.write_record_chunks(file, JMS.vertices, format_vertex)
 
+def get_vertex_format_8205(vertex_formats, node_count, uv_count, write_comments, write_whitespace, write_color):
+    # Vertices only differ in their node and texture coordinate counts so the format for each combination is built once.
+    vertex_key = (node_count, uv_count)
+    vertex_format = vertex_formats.get(vertex_key)
+    if vertex_format == None:
+        vertex_format = DECIMAL_3 + DECIMAL_3 + '\n%s' + ('\n%s' + DECIMAL_1) * node_count + '\n%s' + DECIMAL_2 * uv_count
+        if write_comments:
+            vertex_format = '\n;VERTEX %s' + vertex_format
+
+        if write_color:
+            vertex_format += DECIMAL_3
+
+        if write_whitespace:
+            vertex_format += '\n'
+
+        vertex_formats[vertex_key] = vertex_format
+
+    return vertex_format
+
+def write_vertices_8205(file, JMS, binary, write_comments=False, write_whitespace=False):
+    if binary:
+        file.write(pack_vertices_8205(JMS, False))
 
     else:
         if write_comments:
@@ -1209,43 +1271,30 @@ def write_vertices_8205(file, JMS, binary, write_comments=False, write_whitespac
             if write_whitespace:
                 file.write('\n')
 
-        for idx, vertex in enumerate(JMS.vertices):
+        vertex_formats = {}
+        def format_vertex(idx, vertex, values):
             if write_comments:
-                file.write('\n;VERTEX %s' % idx)
-            
-            file.write(DECIMAL_3 % (vertex.translation[0], vertex.translation[1], vertex.translation[2]))
-            file.write(DECIMAL_3 % (vertex.normal[0], vertex.normal[1], vertex.normal[2]))
-            file.write('\n%s' % len(vertex.node_set))
+                values.append(idx)
+
+            values.extend((vertex.translation[0], vertex.translation[1], vertex.translation[2]))
+            values.extend((vertex.normal[0], vertex.normal[1], vertex.normal[2]))
+            values.append(len(vertex.node_set))
             for node in vertex.node_set:
                 node_index, node_weight = node
-                file.write('\n%s' % (node_index))
-                file.write(DECIMAL_1 % (node_weight))
+                values.extend((node_index, node_weight))
 
-            file.write('\n%s' % len(vertex.uv_set))
+            values.append(len(vertex.uv_set))
             for uv in vertex.uv_set:
                 uv_0, uv_1 = uv
-                file.write(DECIMAL_2 % (uv_0, uv_1))
+                values.extend((uv_0, uv_1))
 
-            if write_whitespace:
-                file.write('\n')
+            return get_vertex_format_8205(vertex_formats, len(vertex.node_set), len(vertex.uv_set), write_comments, write_whitespace, False)
+
+        global_functions.write_record_chunks(file, JMS.vertices, format_vertex)
 
 def write_vertices_8211(file, JMS, binary, write_comments=False, write_whitespace=False):
     if binary:
-        file.write(struct.pack('<i', len(JMS.vertices)))
-        for idx, vertex in enumerate(JMS.vertices):
-            file.write(struct.pack('<fff', *vertex.translation))
-            file.write(struct.pack('<fff', *vertex.normal))
-            file.write(struct.pack('<i', len(vertex.node_set)))
-            for node in vertex.node_set:
-                node_index, node_weight = node
-                file.write(struct.pack('<i', node_index))
-                file.write(struct.pack('<f', node_weight))
-
-            file.write(struct.pack('<i', len(vertex.uv_set)))
-            for uv in vertex.uv_set:
-                file.write(struct.pack('<ff', *uv))
-
-            file.write(struct.pack('<fff', *vertex.color))
+        file.write(pack_vertices_8205(JMS, True))
 
     else:
         if write_comments:
@@ -1265,33 +1314,56 @@ def write_vertices_8211(file, JMS, binary, write_comments=False, write_whitespac
             if write_whitespace:
                 file.write('\n')
 
-        for idx, vertex in enumerate(JMS.vertices):
+        vertex_formats = {}
+        def format_vertex(idx, vertex, values):
             if write_comments:
-                file.write('\n;VERTEX %s' % idx)
-            
-            file.write(DECIMAL_3 % (vertex.translation[0], vertex.translation[1], vertex.translation[2]))
-            file.write(DECIMAL_3 % (vertex.normal[0], vertex.normal[1], vertex.normal[2]))
-            file.write('\n%s' % len(vertex.node_set))
+                values.append(idx)
+
+            values.extend((vertex.translation[0], vertex.translation[1], vertex.translation[2]))
+            values.extend((vertex.normal[0], vertex.normal[1], vertex.normal[2]))
+            values.append(len(vertex.node_set))
             for node in vertex.node_set:
                 node_index, node_weight = node
-                file.write('\n%s' % (node_index))
-                file.write(DECIMAL_1 % (node_weight))
+                values.extend((node_index, node_weight))
 
-            file.write('\n%s' % len(vertex.uv_set))
+            values.append(len(vertex.uv_set))
             for uv in vertex.uv_set:
                 uv_0, uv_1 = uv
-                file.write(DECIMAL_2 % (uv_0, uv_1))
+                values.extend((uv_0, uv_1))
 
-            file.write(DECIMAL_3 % (vertex.color[0], vertex.color[1], vertex.color[2]))
-            if write_whitespace:
-                file.write('\n')
+            values.extend((vertex.color[0], vertex.color[1], vertex.color[2]))
+
+            return get_vertex_format_8205(vertex_formats, len(vertex.node_set), len(vertex.uv_set), write_comments, write_whitespace, True)
+
+        global_functions.write_record_chunks(file, JMS.vertices, format_vertex)
+
+def write_triangle_records(file, JMS, write_region, write_comments, write_whitespace):
+    triangle_format = '\n%s\n%s\t%s\t%s'
+    if write_region:
+        triangle_format = '\n%s' + triangle_format
+
+    if write_comments:
+        triangle_format = '\n;TRIANGLE %s' + triangle_format
+
+    if write_whitespace:
+        triangle_format += '\n'
+
+    def format_triangle(idx, triangle, values):
+        if write_comments:
+            values.append(idx)
+
+        if write_region:
+            values.append(triangle.region)
+
+        values.extend((triangle.material_index, triangle.v0, triangle.v1, triangle.v2))
+
+        return triangle_format
+
+    global_functions.write_record_chunks(file, JMS.triangles, format_triangle)
 
 def write_triangles_8197(file, JMS, binary, write_comments=False, write_whitespace=False):
     if binary:
-        file.write(struct.pack('<i', len(JMS.triangles)))
-        for idx, triangle in enumerate(JMS.triangles):
-            file.write(struct.pack('<i', triangle.material_index))
-            file.write(struct.pack('<iii', triangle.v0, triangle.v1, triangle.v2))
+        file.write(pack_triangles(JMS, False))
 
     else:
         if write_comments:
@@ -1304,22 +1376,11 @@ def write_triangles_8197(file, JMS, binary, write_comments=False, write_whitespa
             if write_whitespace:
                 file.write('\n')
 
-        for idx, triangle in enumerate(JMS.triangles):
-            if write_comments:
-                file.write('\n;TRIANGLE %s' % idx)
-
-            file.write('\n%s' % triangle.material_index)
-            file.write('\n%s\t%s\t%s' % (triangle.v0, triangle.v1, triangle.v2))
-            if write_whitespace:
-                file.write('\n')
+        write_triangle_records(file, JMS, False, write_comments, write_whitespace)
 
 def write_triangles_8198(file, JMS, binary, write_comments=False, write_whitespace=False):
     if binary:
-        file.write(struct.pack('<i', len(JMS.triangles)))
-        for idx, triangle in enumerate(JMS.triangles):
-            file.write(struct.pack('<i', triangle.region))
-            file.write(struct.pack('<i', triangle.material_index))
-            file.write(struct.pack('<iii', triangle.v0, triangle.v1, triangle.v2))
+        file.write(pack_triangles(JMS, True))
 
     else:
         if write_comments:
@@ -1333,23 +1394,11 @@ def write_triangles_8198(file, JMS, binary, write_comments=False, write_whitespa
             if write_whitespace:
                 file.write('\n')
 
-        for idx, triangle in enumerate(JMS.triangles):
-            if write_comments:
-                file.write('\n;TRIANGLE %s' % idx)
-
-            file.write('\n%s' % triangle.region)
-            file.write('\n%s' % triangle.material_index)
-            file.write('\n%s\t%s\t%s' % (triangle.v0, triangle.v1, triangle.v2))
-            if write_whitespace:
-                file.write('\n')
+        write_triangle_records(file, JMS, True, write_comments, write_whitespace)
 
 def write_triangles_8201(file, JMS, binary, write_comments=False, write_whitespace=False):
     if binary:
-        file.write(struct.pack('<i', len(JMS.triangles)))
-        for idx, triangle in enumerate(JMS.triangles):
-            file.write(struct.pack('<i', triangle.region))
-            file.write(struct.pack('<i', triangle.material_index))
-            file.write(struct.pack('<iii', triangle.v0, triangle.v1, triangle.v2))
+        file.write(pack_triangles(JMS, True))
 
     else:
         if write_comments:
@@ -1357,19 +1406,11 @@ def write_triangles_8201(file, JMS, binary, write_comments=False, write_whitespa
             file.write('\n;###Faces###')
 
         file.write('\n%s' % (len(JMS.triangles)))
-        for idx, triangle in enumerate(JMS.triangles):
-            file.write('\n%s' % triangle.region)
-            file.write('\n%s' % triangle.material_index)
-            file.write('\n%s\t%s\t%s' % (triangle.v0, triangle.v1, triangle.v2))
-            if write_whitespace:
-                file.write('\n')
+        write_triangle_records(file, JMS, True, False, write_whitespace)
 
 def write_triangles_8205(file, JMS, binary, write_comments=False, write_whitespace=False):
     if binary:
-        file.write(struct.pack('<i', len(JMS.triangles)))
-        for idx, triangle in enumerate(JMS.triangles):
-            file.write(struct.pack('<i', triangle.material_index))
-            file.write(struct.pack('<iii', triangle.v0, triangle.v1, triangle.v2))
+        file.write(pack_triangles(JMS, False))
 
     else:
         if write_comments:
@@ -1382,14 +1423,7 @@ def write_triangles_8205(file, JMS, binary, write_comments=False, write_whitespa
             if write_whitespace:
                 file.write('\n')
 
-        for idx, triangle in enumerate(JMS.triangles):
-            if write_comments:
-                file.write('\n;TRIANGLE %s' % idx)
-
-            file.write('\n%s' % triangle.material_index)
-            file.write('\n%s\t%s\t%s' % (triangle.v0, triangle.v1, triangle.v2))
-            if write_whitespace:
-                file.write('\n')
+        write_triangle_records(file, JMS, False, write_comments, write_whitespace)
 
 def write_spheres_8206(file, JMS, binary, write_comments=False, write_whitespace=False):
     if binary:
@@ -1642,7 +1676,6 @@ def write_convex_shapes_8206(file, JMS, binary, write_comments=False, write_whit
             file.write(struct.pack('<i', convex_shape.parent_index))
             file.write(struct.pack('<ffff', *convex_shape.rotation))
             file.write(struct.pack('<fff', *convex_shape.translation))
-            file.write(struct.pack('<f', convex_shape.height))
             file.write(struct.pack('<i', len(convex_shape.verts)))
             for vertex in convex_shape.verts:
                 file.write(struct.pack('<fff', *vertex.translation))
@@ -1686,7 +1719,6 @@ def write_convex_shapes_8207(file, JMS, binary, write_comments=False, write_whit
             file.write(struct.pack('<i', convex_shape.material_index))
             file.write(struct.pack('<ffff', *convex_shape.rotation))
             file.write(struct.pack('<fff', *convex_shape.translation))
-            file.write(struct.pack('<f', convex_shape.height))
             file.write(struct.pack('<i', len(convex_shape.verts)))
             for vertex in convex_shape.verts:
                 file.write(struct.pack('<fff', *vertex.translation))
@@ -2134,10 +2166,36 @@ def update_decimal():
     DECIMAL_3 = '\n%0.{decimal_point}f\t%0.{decimal_point}f\t%0.{decimal_point}f'.format(decimal_point=DECIMAL_POINT)
     DECIMAL_4 = '\n%0.{decimal_point}f\t%0.{decimal_point}f\t%0.{decimal_point}f\t%0.{decimal_point}f'.format(decimal_point=DECIMAL_POINT)
 
-def build_asset(context, blend_scene, filepath, jms_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, folder_structure, folder_type, model_type, is_jmi, permutation_ce, level_of_detail_ce, custom_scale, loop_normals, write_textures, report):
-    JMS = process_scene(context, jms_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, model_type, blend_scene, custom_scale, loop_normals, write_textures)
+def build_asset(context, blend_scene, filepath, jms_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, folder_structure, folder_type, model_type, is_jmi, permutation_ce, level_of_detail_ce, custom_scale, loop_normals, write_textures, report, weld_vertices=False, weld_epsilon=0.0, stream_geometry=False, geometry_cache=None, export_pool=None):
+    JMS = process_scene(context, jms_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, model_type, blend_scene, custom_scale, loop_normals, write_textures, weld_vertices, weld_epsilon, stream_geometry, geometry_cache)
+
+    filename = global_functions.get_filename(game_title, permutation_ce, level_of_detail_ce, folder_structure, model_type, False, filepath)
+    root_directory = global_functions.get_directory(context, game_title, model_type, folder_structure, folder_type, is_jmi, filepath)
+    output_path = os.path.join(root_directory, filename)
 
-    binary = False
+    # Everything past this point only reads the plain JMS asset so it can be handed off to a writer thread while the next
+    # asset is pulled from the scene.
+    if export_pool == None:
+        write_asset(JMS, output_path, jms_version, game_title, stream_geometry)
+        report({'INFO'}, "Export completed successfully")
+
+    else:
+        export_pool.submit(write_asset, JMS, output_path, jms_version, game_title, stream_geometry)
+
+def write_asset(JMS, output_path, jms_version, game_title, stream_geometry=False):
+    with timing_report.phase("serialization") as timing_phase:
+        write_asset_sections(JMS, output_path, jms_version, game_title)
+        timing_phase.count("vertices", len(JMS.vertices))
+        timing_phase.count("triangles", len(JMS.triangles))
+
+    if stream_geometry:
+        JMS.vertices.close()
+        JMS.triangles.close()
+
+def write_asset_sections(JMS, output_path, jms_version, game_title, binary=False):
+    # binary writes the IMBF intermediate to output_path with a B appended instead of a text JMS. It is internal only, the export
+    # operators never set it. process_file_binary reads it back for versions 8205 and up, which is what the round trip test and
+    # benchmarks/jms_binary.py use.
 
     version_bounds = '8197-8200'
     if game_title == "halo2":
@@ -2145,15 +2203,12 @@ def build_asset(context, blend_scene, filepath, jms_version, game_title, generat
     elif game_title == "halo3":
         version_bounds = '8197-8213'
 
-    filename = global_functions.get_filename(game_title, permutation_ce, level_of_detail_ce, folder_structure, model_type, False, filepath)
-    root_directory = global_functions.get_directory(context, game_title, model_type, folder_structure, folder_type, is_jmi, filepath)
-    output_path = os.path.join(root_directory, filename)
     if binary:
-        file = open(output_path + "B", 'wb')
+        file = global_functions.open_export_file(output_path + "B", True)
         file.write(struct.pack('<4s', bytes("IMBF", 'utf-8')))
 
     else:
-        file = open(output_path, 'w', encoding='utf_8')
+        file = global_functions.open_export_file(output_path)
 
     if jms_version == 8197:
         write_comments = False
@@ -2448,5 +2503,4 @@ def build_asset(context, blend_scene, filepath, jms_version, game_title, generat
     if not binary:
         file.write('\n')
 
-    report({'INFO'}, "Export completed successfully")
     file.close()
@@ -28,7 +28,7 @@ import os
 import bpy
 
 from .build_asset import build_asset
-from ..global_functions import mesh_processing, global_functions, resource_management, scene_validation
+from ..global_functions import mesh_processing, global_functions, resource_management, scene_validation, export_cache, timing_report
 from ..global_functions.global_functions import ModelTypeEnum
 
 def write_file(context,
@@ -54,7 +54,13 @@ def write_file(context,
                use_maya_sorting,
                folder_type,
                scale_value,
-               report):
+               report,
+               weld_vertices=False,
+               weld_epsilon=0.0,
+               stream_geometry=False,
+               reuse_geometry=False):
+
+    timing_report.start("JMS export")
 
     layer_collection_list = []
     object_list = []
@@ -62,16 +68,18 @@ def write_file(context,
     if not context.view_layer.objects.active == None:
         bpy.ops.object.mode_set(mode='OBJECT')
 
-    # Gather all scene resources that fit export criteria
-    resource_management.gather_scene_resources(context, layer_collection_list, object_list, hidden_geo, nonrender_geo)
+    with timing_report.phase("scene gather") as timing_phase:
+        # Gather all scene resources that fit export criteria
+        resource_management.gather_scene_resources(context, layer_collection_list, object_list, hidden_geo, nonrender_geo)
 
-    # Store visibility for all relevant resources
-    stored_collection_visibility = resource_management.store_collection_visibility(layer_collection_list)
-    stored_object_visibility = resource_management.store_object_visibility(object_list)
-    stored_modifier_visibility = resource_management.store_modifier_visibility(object_list)
+        # Store visibility for all relevant resources
+        stored_collection_visibility = resource_management.store_collection_visibility(layer_collection_list)
+        stored_object_visibility = resource_management.store_object_visibility(object_list)
+        stored_modifier_visibility = resource_management.store_modifier_visibility(object_list)
 
-    # Unhide all relevant resources for exporting
-    resource_management.unhide_relevant_resources(layer_collection_list, object_list)
+        # Unhide all relevant resources for exporting
+        resource_management.unhide_relevant_resources(layer_collection_list, object_list)
+        timing_phase.count("objects", len(object_list))
 
     # Execute export
     export_result = command_queue(False,
@@ -99,13 +107,19 @@ def write_file(context,
                                   use_maya_sorting,
                                   folder_type,
                                   scale_value,
-                                  report)
+                                  report,
+                                  weld_vertices,
+                                  weld_epsilon,
+                                  stream_geometry,
+                                  reuse_geometry)
 
     # Restore visibility status for all resources
     resource_management.restore_collection_visibility(stored_collection_visibility)
     resource_management.restore_object_visibility(stored_object_visibility)
     resource_management.restore_modifier_visibility(stored_modifier_visibility)
 
+    timing_report.finish(filepath, report)
+
     return export_result
 
 def command_queue(is_jmi,
@@ -133,7 +147,12 @@ def command_queue(is_jmi,
                   use_maya_sorting,
                   folder_type,
                   scale_value,
-                  report):
+                  report,
+                  weld_vertices=False,
+                  weld_epsilon=0.0,
+                  stream_geometry=False,
+                  reuse_geometry=False,
+                  export_pool=None):
 
     node_prefix_tuple = ('b ', 'b_', 'bone', 'frame', 'bip01')
     limit_value = 0.00000000009
@@ -168,15 +187,23 @@ def command_queue(is_jmi,
 
     level_of_detail_ce = mesh_processing.get_lod(level_of_detail_ce, game_title)
 
-    for obj in object_set:
-        if obj.type== 'MESH':
-            if clean_normalize_weights:
-                mesh_processing.vertex_group_clean_normalize(context, obj, limit_value)
+    with timing_report.phase("modifier eval"):
+        for obj in object_set:
+            if obj.type== 'MESH':
+                if clean_normalize_weights:
+                    mesh_processing.vertex_group_clean_normalize(context, obj, limit_value)
+
+                if apply_modifiers:
+                    mesh_processing.add_modifier(context, obj, triangulate_faces, edge_split, None)
 
-            if apply_modifiers:
-                mesh_processing.add_modifier(context, obj, triangulate_faces, edge_split, None)
+        depsgraph = context.evaluated_depsgraph_get()
+
+    # Streamed geometry is written straight to the file and never kept around, so there is nothing to hold on to for the next
+    # export.
+    geometry_cache = None
+    if reuse_geometry and not stream_geometry:
+        geometry_cache = export_cache.GeometryCache("JMS", depsgraph, apply_modifiers)
 
-    depsgraph = context.evaluated_depsgraph_get()
     for obj in object_set:
         name = obj.name.lower()
         parent_name = None
@@ -225,12 +252,10 @@ def command_queue(is_jmi,
             if export_collision:
                 if obj.parent and (obj.parent.type == 'ARMATURE' or parent_name.startswith(node_prefix_tuple)):
                     collision_count += 1
-                    if apply_modifiers:
-                        obj_for_convert = obj.evaluated_get(depsgraph)
-                        evaluted_mesh = obj_for_convert.to_mesh(preserve_all_data_layers=True, depsgraph=depsgraph)
-
-                    else:
-                        evaluted_mesh = obj.to_mesh(preserve_all_data_layers=True)
+                    # With the geometry cache on, meshes are only evaluated once process_scene finds the object changed.
+                    evaluted_mesh = None
+                    if geometry_cache == None:
+                        evaluted_mesh = export_cache.get_evaluated_mesh(obj, apply_modifiers, depsgraph)
 
                     collision_geometry_list.append((evaluted_mesh, obj))
 
@@ -291,12 +316,9 @@ def command_queue(is_jmi,
                 elif len(obj.data.polygons) > 0:
                     if obj.parent and (obj.parent.type == 'ARMATURE' or parent_name.startswith(node_prefix_tuple)):
                         render_count += 1
-                        if apply_modifiers:
-                            obj_for_convert = obj.evaluated_get(depsgraph)
-                            evaluted_mesh = obj_for_convert.to_mesh(preserve_all_data_layers=True, depsgraph=depsgraph)
-
-                        else:
-                            evaluted_mesh = obj.to_mesh(preserve_all_data_layers=True)
+                        evaluted_mesh = None
+                        if geometry_cache == None:
+                            evaluted_mesh = export_cache.get_evaluated_mesh(obj, apply_modifiers, depsgraph)
 
                         render_geometry_list.append((evaluted_mesh, obj))
 
@@ -307,17 +329,20 @@ def command_queue(is_jmi,
     if export_render and blend_scene.render_count > 0:
         model_type = ModelTypeEnum.render
 
-        build_asset(context, blend_scene, filepath, jms_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, folder_structure, folder_type, model_type, is_jmi, permutation_ce, level_of_detail_ce, scale_value, loop_normals, write_textures, report)
+        build_asset(context, blend_scene, filepath, jms_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, folder_structure, folder_type, model_type, is_jmi, permutation_ce, level_of_detail_ce, scale_value, loop_normals, write_textures, report, weld_vertices, weld_epsilon, stream_geometry, geometry_cache, export_pool)
 
     if export_collision and blend_scene.collision_count > 0:
         model_type = ModelTypeEnum.collision
 
-        build_asset(context, blend_scene, filepath, jms_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, folder_structure, folder_type, model_type, is_jmi, permutation_ce, level_of_detail_ce, scale_value, loop_normals, write_textures, report)
+        build_asset(context, blend_scene, filepath, jms_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, folder_structure, folder_type, model_type, is_jmi, permutation_ce, level_of_detail_ce, scale_value, loop_normals, write_textures, report, weld_vertices, weld_epsilon, stream_geometry, geometry_cache, export_pool)
 
     if export_physics and blend_scene.physics_count > 0:
         model_type = ModelTypeEnum.physics
 
-        build_asset(context, blend_scene, filepath, jms_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, folder_structure, folder_type, model_type, is_jmi, permutation_ce, level_of_detail_ce, scale_value, loop_normals, write_textures, report)
+        build_asset(context, blend_scene, filepath, jms_version, game_title, generate_checksum, fix_rotations, use_maya_sorting, folder_structure, folder_type, model_type, is_jmi, permutation_ce, level_of_detail_ce, scale_value, loop_normals, write_textures, report, weld_vertices, weld_epsilon, stream_geometry, geometry_cache, export_pool)
+
+    if not geometry_cache == None:
+        geometry_cache.finish()
 
     return {'FINISHED'}
 
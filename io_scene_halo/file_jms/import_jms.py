@@ -30,6 +30,7 @@ from io import TextIOWrapper
 from .format import JMSAsset
 from .build_scene_retail import build_scene_retail
 from .process_file_retail import process_file_retail
+from .process_file_binary import process_file_binary, is_binary_file
 from ..global_functions import mesh_processing, global_functions
 
 def load_file(context, filepath, game_version, reuse_armature, fix_parents, fix_rotations, empty_markers, report):
@@ -43,8 +44,13 @@ def load_file(context, filepath, game_version, reuse_armature, fix_parents, fix_
 
     retail_version_list = (8197, 8198, 8199, 8200, 8201, 8202, 8203, 8204, 8205, 8206, 8207, 8208, 8209, 8210, 8211, 8212, 8213)
 
-    JMS = JMSAsset(filepath)
-    JMS = process_file_retail(JMS, game_version, extension, retail_version_list, default_region, default_permutation)
+    if not isinstance(filepath, TextIOWrapper) and is_binary_file(filepath):
+        JMS = process_file_binary(filepath, game_version, extension, retail_version_list, default_region, default_permutation)
+
+    else:
+        JMS = JMSAsset(filepath)
+        JMS = process_file_retail(JMS, game_version, extension, retail_version_list, default_region, default_permutation)
+
     build_scene_retail(context, JMS, filepath, game_version, reuse_armature, fix_parents, fix_rotations, empty_markers, report)
 
     return {'FINISHED'}
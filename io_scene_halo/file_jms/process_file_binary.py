@@ -0,0 +1,357 @@
+# ##### BEGIN MIT LICENSE BLOCK #####
+#
+# MIT License
+#
+# Copyright (c) 2023 Steven Garcia & Jadeon Sheppard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# ##### END MIT LICENSE BLOCK #####
+
+import struct
+
+from .format import JMSAsset
+from mathutils import Vector, Quaternion
+from .process_file_retail import update_node_graph
+from ..global_functions import global_functions
+
+BINARY_SIGNATURE = b"IMBF"
+
+INT = struct.Struct('<i')
+FLOAT = struct.Struct('<f')
+VECTOR = struct.Struct('<fff')
+QUATERNION = struct.Struct('<ffff')
+VERTEX_HEADER = struct.Struct('<ffffffi')
+NODE_WEIGHT = struct.Struct('<if')
+UV = struct.Struct('<ff')
+
+def is_binary_file(filepath):
+    with open(filepath, 'rb') as input_file:
+        return input_file.read(len(BINARY_SIGNATURE)) == BINARY_SIGNATURE
+
+class BinaryStream():
+    # Reads the fields the binary branches of the JMS writer pack, in the same order.
+    def __init__(self, data):
+        self.data = data
+        self.offset = len(BINARY_SIGNATURE)
+
+    def unpack(self, struct_format):
+        try:
+            values = struct_format.unpack_from(self.data, self.offset)
+
+        except struct.error:
+            raise global_functions.ParseError("Binary file ended early")
+
+        self.offset += struct_format.size
+
+        return values
+
+    def next_int(self):
+        return self.unpack(INT)[0]
+
+    def next_float(self):
+        return self.unpack(FLOAT)[0]
+
+    def next_string(self):
+        string_end = self.data.find(b"\x00", self.offset)
+        if string_end == -1:
+            raise global_functions.ParseError("Binary file ended early")
+
+        value = self.data[self.offset:string_end].decode('utf-8')
+        self.offset = string_end + 1
+
+        return value
+
+    def next_vector(self):
+        return Vector(self.unpack(VECTOR))
+
+    def next_quaternion(self):
+        x, y, z, w = self.unpack(QUATERNION)
+
+        return Quaternion((w, x, y, z))
+
+    def next_transform(self):
+        rotation = self.next_quaternion()
+        translation = self.next_vector()
+
+        return JMSAsset.Transform(translation, rotation)
+
+    def left(self):
+        return len(self.data) - self.offset
+
+def process_file_binary(input_file, game_version, extension, version_list, default_region, default_permutation):
+    # Counterpart to process_file_retail for the binary intermediate written when build_asset runs with binary set. Only the
+    # layouts shared by versions 8205 and up are supported.
+    with open(input_file, 'rb') as binary_file:
+        JMS_STREAM = BinaryStream(binary_file.read())
+
+    JMS = JMSAsset()
+    JMS.filepath = input_file
+    JMS.version = JMS_STREAM.next_int()
+    JMS.game_version = game_version
+    if game_version == 'auto':
+        JMS.game_version = global_functions.get_game_title(JMS.version, 'JMS')
+
+    if not JMS.version in version_list:
+        raise global_functions.ParseError("Importer does not support this " + extension + " version")
+
+    if JMS.version < 8205:
+        raise global_functions.ParseError("Binary " + extension + " files are only supported for version 8205 and up")
+
+    node_count = JMS_STREAM.next_int()
+    transforms_for_frame = []
+    for node_idx in range(node_count):
+        name = JMS_STREAM.next_string()
+        parent = JMS_STREAM.next_int()
+        JMS.nodes.append(JMSAsset.Node(name, parent=parent))
+        transforms_for_frame.append(JMS_STREAM.next_transform())
+
+    JMS.transforms.append(transforms_for_frame)
+    material_count = JMS_STREAM.next_int()
+    for material in range(material_count):
+        name = JMS_STREAM.next_string()
+        material_definition = JMS_STREAM.next_string()
+        material_definition_items = material_definition.split()
+        lod, permutation, region = global_functions.material_definition_parser(True, material_definition_items, default_region, default_permutation)
+
+        JMS.materials.append(JMSAsset.Material(name, None, material, lod, permutation, region))
+
+    marker_count = JMS_STREAM.next_int()
+    for marker in range(marker_count):
+        name = JMS_STREAM.next_string()
+        parent = JMS_STREAM.next_int()
+        rotation = JMS_STREAM.next_quaternion()
+        translation = JMS_STREAM.next_vector()
+        radius = JMS_STREAM.next_float()
+
+        JMS.markers.append(JMSAsset.Marker(name, -1, parent, rotation, translation, radius))
+
+    xref_instance_count = JMS_STREAM.next_int()
+    for xref_idx in range(xref_instance_count):
+        xref_path = JMS_STREAM.next_string()
+        xref_name = ""
+        if JMS.version >= 8208:
+            xref_name = JMS_STREAM.next_string()
+
+        JMS.xref_instances.append(JMSAsset.XREF(xref_path, xref_name))
+
+    xref_markers_count = JMS_STREAM.next_int()
+    for xref_marker_idx in range(xref_markers_count):
+        name = JMS_STREAM.next_string()
+        unique_identifier = JMS_STREAM.next_int()
+        path_index = JMS_STREAM.next_int()
+        rotation = JMS_STREAM.next_quaternion()
+        translation = JMS_STREAM.next_vector()
+        JMS.xref_markers.append(JMSAsset.XREF_Marker(name, unique_identifier, path_index, rotation, translation))
+
+    vertex_count = JMS_STREAM.next_int()
+    for vertex in range(vertex_count):
+        vertex_header = JMS_STREAM.unpack(VERTEX_HEADER)
+        translation = Vector(vertex_header[0:3])
+        normal = Vector(vertex_header[3:6])
+        node_influence_count = vertex_header[6]
+        node_set = [list(JMS_STREAM.unpack(NODE_WEIGHT)) for node in range(node_influence_count)]
+        uv_set = [list(JMS_STREAM.unpack(UV)) for uv in range(JMS_STREAM.next_int())]
+        color = None
+        if JMS.version >= 8211:
+            color = JMS_STREAM.next_vector()
+
+        JMS.vertices.append(JMSAsset.Vertex(node_influence_count, node_set, None, translation, normal, color, uv_set))
+
+    # Triangles are a fixed four ints each so the whole section is unpacked in one call.
+    triangle_count = JMS_STREAM.next_int()
+    triangle_values = JMS_STREAM.unpack(struct.Struct('<%si' % (triangle_count * 4)))
+    for triangle_idx in range(0, triangle_count * 4, 4):
+        material_index, v0, v1, v2 = triangle_values[triangle_idx:triangle_idx + 4]
+        JMS.triangles.append(JMSAsset.Triangle(None, material_index, v0, v1, v2))
+
+    if JMS.version >= 8206:
+        sphere_count = JMS_STREAM.next_int()
+        for sphere in range(sphere_count):
+            name = JMS_STREAM.next_string()
+            parent_index = JMS_STREAM.next_int()
+            material_index = None
+            if JMS.version >= 8207:
+                material_index = JMS_STREAM.next_int()
+
+            rotation = JMS_STREAM.next_quaternion()
+            translation = JMS_STREAM.next_vector()
+            radius = JMS_STREAM.next_float()
+            JMS.spheres.append(JMSAsset.Sphere(name, parent_index, material_index, rotation, translation, radius))
+
+        boxes_count = JMS_STREAM.next_int()
+        for box in range(boxes_count):
+            name = JMS_STREAM.next_string()
+            parent_index = JMS_STREAM.next_int()
+            material_index = None
+            if JMS.version >= 8207:
+                material_index = JMS_STREAM.next_int()
+
+            rotation = JMS_STREAM.next_quaternion()
+            translation = JMS_STREAM.next_vector()
+            width = JMS_STREAM.next_float()
+            length = JMS_STREAM.next_float()
+            height = JMS_STREAM.next_float()
+            JMS.boxes.append(JMSAsset.Box(name, parent_index, material_index, rotation, translation, width, length, height))
+
+        capsules_count = JMS_STREAM.next_int()
+        for capsules in range(capsules_count):
+            name = JMS_STREAM.next_string()
+            parent_index = JMS_STREAM.next_int()
+            material_index = None
+            if JMS.version >= 8207:
+                material_index = JMS_STREAM.next_int()
+
+            rotation = JMS_STREAM.next_quaternion()
+            translation = JMS_STREAM.next_vector()
+            height = JMS_STREAM.next_float()
+            radius = JMS_STREAM.next_float()
+            JMS.capsules.append(JMSAsset.Capsule(name, parent_index, material_index, rotation, translation, height, radius))
+
+        convex_shape_count = JMS_STREAM.next_int()
+        for convex_shape in range(convex_shape_count):
+            name = JMS_STREAM.next_string()
+            parent_index = JMS_STREAM.next_int()
+            material_index = None
+            if JMS.version >= 8207:
+                material_index = JMS_STREAM.next_int()
+
+            rotation = JMS_STREAM.next_quaternion()
+            translation = JMS_STREAM.next_vector()
+            vert = [JMS_STREAM.next_vector() for vertex in range(JMS_STREAM.next_int())]
+
+            JMS.convex_shapes.append(JMSAsset.Convex_Shape(name, parent_index, material_index, rotation, translation, vert))
+
+        ragdoll_count = JMS_STREAM.next_int()
+        for ragdoll in range(ragdoll_count):
+            name = JMS_STREAM.next_string()
+            attached_index = JMS_STREAM.next_int()
+            referenced_index = JMS_STREAM.next_int()
+            attached_rotation = JMS_STREAM.next_quaternion()
+            attached_translation = JMS_STREAM.next_vector()
+            referenced_rotation = JMS_STREAM.next_quaternion()
+            referenced_translation = JMS_STREAM.next_vector()
+            min_twist = JMS_STREAM.next_float()
+            max_twist = JMS_STREAM.next_float()
+            min_cone = JMS_STREAM.next_float()
+            max_cone = JMS_STREAM.next_float()
+            min_plane = JMS_STREAM.next_float()
+            max_plane = JMS_STREAM.next_float()
+            friction_limit = 0.0
+            if JMS.version >= 8213:
+                friction_limit = JMS_STREAM.next_float()
+
+            JMS.ragdolls.append(JMSAsset.Ragdoll(name, attached_index, referenced_index, attached_rotation, attached_translation, referenced_rotation, referenced_translation, min_twist, max_twist, min_cone, max_cone, min_plane, max_plane, friction_limit))
+
+        hinge_count = JMS_STREAM.next_int()
+        for hinge in range(hinge_count):
+            name = JMS_STREAM.next_string()
+            body_a_index = JMS_STREAM.next_int()
+            body_b_index = JMS_STREAM.next_int()
+            body_a_rotation = JMS_STREAM.next_quaternion()
+            body_a_translation = JMS_STREAM.next_vector()
+            body_b_rotation = JMS_STREAM.next_quaternion()
+            body_b_translation = JMS_STREAM.next_vector()
+            is_limited = JMS_STREAM.next_int()
+            friction_limit = JMS_STREAM.next_float()
+            min_angle = JMS_STREAM.next_float()
+            max_angle = JMS_STREAM.next_float()
+
+            JMS.hinges.append(JMSAsset.Hinge(name, body_a_index, body_b_index, body_a_rotation, body_a_translation, body_b_rotation, body_b_translation, is_limited, friction_limit, min_angle, max_angle))
+
+    if JMS.version >= 8210:
+        car_wheel_count = JMS_STREAM.next_int()
+        for car_wheel in range(car_wheel_count):
+            name = JMS_STREAM.next_string()
+            chassis_index = JMS_STREAM.next_int()
+            wheel_index = JMS_STREAM.next_int()
+            chassis_rotation = JMS_STREAM.next_quaternion()
+            chassis_translation = JMS_STREAM.next_vector()
+            wheel_rotation = JMS_STREAM.next_quaternion()
+            wheel_translation = JMS_STREAM.next_vector()
+            suspension_rotation = JMS_STREAM.next_quaternion()
+            suspension_translation = JMS_STREAM.next_vector()
+            suspension_min_limit = JMS_STREAM.next_float()
+            suspension_max_limit = JMS_STREAM.next_float()
+            friction_limit = JMS_STREAM.next_float()
+            velocity = JMS_STREAM.next_float()
+            gain = JMS_STREAM.next_float()
+
+            JMS.car_wheels.append(JMSAsset.Car_Wheel(name, chassis_index, wheel_index, chassis_rotation, chassis_translation, wheel_rotation, wheel_translation, suspension_rotation, suspension_translation, suspension_min_limit, suspension_max_limit, friction_limit, velocity, gain))
+
+        point_to_point_count = JMS_STREAM.next_int()
+        for point_to_point in range(point_to_point_count):
+            name = JMS_STREAM.next_string()
+            body_a_index = JMS_STREAM.next_int()
+            body_b_index = JMS_STREAM.next_int()
+            body_a_rotation = JMS_STREAM.next_quaternion()
+            body_a_translation = JMS_STREAM.next_vector()
+            body_b_rotation = JMS_STREAM.next_quaternion()
+            body_b_translation = JMS_STREAM.next_vector()
+            constraint_type = JMS_STREAM.next_int()
+            x_min_limit = JMS_STREAM.next_float()
+            x_max_limit = JMS_STREAM.next_float()
+            y_min_limit = JMS_STREAM.next_float()
+            y_max_limit = JMS_STREAM.next_float()
+            z_min_limit = JMS_STREAM.next_float()
+            z_max_limit = JMS_STREAM.next_float()
+            spring_length = JMS_STREAM.next_float()
+
+            JMS.point_to_points.append(JMSAsset.Point_to_Point(name, body_a_index, body_b_index, body_a_rotation, body_a_translation, body_b_rotation, body_b_translation, constraint_type, x_min_limit, x_max_limit, y_min_limit, y_max_limit, z_min_limit, z_max_limit, spring_length))
+
+        prismatic_count = JMS_STREAM.next_int()
+        for prismatic in range(prismatic_count):
+            name = JMS_STREAM.next_string()
+            body_a_index = JMS_STREAM.next_int()
+            body_b_index = JMS_STREAM.next_int()
+            body_a_rotation = JMS_STREAM.next_quaternion()
+            body_a_translation = JMS_STREAM.next_vector()
+            body_b_rotation = JMS_STREAM.next_quaternion()
+            body_b_translation = JMS_STREAM.next_vector()
+            is_limited = JMS_STREAM.next_int()
+            friction_limit = JMS_STREAM.next_float()
+            min_limit = JMS_STREAM.next_float()
+            max_limit = JMS_STREAM.next_float()
+
+            JMS.prismatics.append(JMSAsset.Prismatic(name, body_a_index, body_b_index, body_a_rotation, body_a_translation, body_b_rotation, body_b_translation, is_limited, friction_limit, min_limit, max_limit))
+
+    if JMS.version >= 8209:
+        bounding_sphere_count = JMS_STREAM.next_int()
+        for bounding_sphere in range(bounding_sphere_count):
+            translation = JMS_STREAM.next_vector()
+            radius = JMS_STREAM.next_float()
+
+            JMS.bounding_spheres.append(JMSAsset.Bounding_Sphere(translation, radius))
+
+    if JMS.version >= 8212:
+        skylight_count = JMS_STREAM.next_int()
+        for skylight in range(skylight_count):
+            direction = JMS_STREAM.next_vector()
+            radiant_intensity = JMS_STREAM.next_vector()
+            solid_angle = JMS_STREAM.next_float()
+
+            JMS.skylights.append(JMSAsset.Skylight(direction, radiant_intensity, solid_angle))
+
+    if JMS_STREAM.left() != 0:
+        raise RuntimeError("%s bytes left after parse end" % JMS_STREAM.left())
+
+    # update node graph
+    update_node_graph(JMS, node_count)
+
+    return JMS
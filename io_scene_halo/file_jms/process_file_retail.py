@@ -489,6 +489,11 @@ def process_file_retail(JMS, game_version, extension, version_list, default_regi
         raise RuntimeError("%s elements left after parse end" % JMS.left())
 
     # update node graph
+    update_node_graph(JMS, node_count)
+
+    return JMS
+
+def update_node_graph(JMS, node_count):
     if JMS.version >= 8205:
         # loop over nodes and
         for node_idx in range(node_count):
@@ -534,5 +539,3 @@ def process_file_retail(JMS, game_version, extension, version_list, default_regi
 
                 else:
                     child_node = None
-
-    return JMS
@@ -26,25 +26,29 @@
 
 import os
 import bpy
+import numpy as np
 
 from math import degrees
 from .format import JMSAsset
 from random import seed, randint
 from mathutils import Vector, Matrix
-from ..global_functions import mesh_processing, global_functions
+from ..global_functions import mesh_processing, global_functions, export_cache, timing_report
 
-def process_scene(context, version, game_version, generate_checksum, fix_rotations, use_maya_sorting, model_type, blend_scene, custom_scale, loop_normals, write_textures):
+def process_scene(context, version, game_version, generate_checksum, fix_rotations, use_maya_sorting, model_type, blend_scene, custom_scale, loop_normals, write_textures, weld_vertices=False, weld_epsilon=0.0, stream_geometry=False, geometry_cache=None):
     JMS = JMSAsset()
     JMS.node_checksum = 0
 
     default_region = mesh_processing.get_default_region_permutation_name(game_version)
     default_permutation = mesh_processing.get_default_region_permutation_name(game_version)
 
-    region_list = ['unnamed']
-    permutation_list = []
-    material_list = []
+    region_list = global_functions.ExportRegistry(['unnamed'])
+    permutation_list = global_functions.ExportRegistry()
+    material_list = global_functions.ExportRegistry()
+
+    with timing_report.phase("sorting") as timing_phase:
+        sorted_list = global_functions.sort_list(blend_scene.node_list, blend_scene.armature, game_version, version, False)
+        timing_phase.count("nodes", len(blend_scene.node_list))
 
-    sorted_list = global_functions.sort_list(blend_scene.node_list, blend_scene.armature, game_version, version, False)
     joined_list = sorted_list[0]
     reversed_joined_list = sorted_list[1]
 
@@ -204,76 +208,154 @@ def process_scene(context, version, game_version, generate_checksum, fix_rotatio
         if model_type == global_functions.ModelTypeEnum.collision:
             geometry_list = blend_scene.collision_geometry_list
 
-        for idx, geometry in enumerate(geometry_list):
-            evaluted_mesh = geometry[0]
-            original_geo = geometry[1]
-            if (4, 1, 0) > bpy.app.version:
-                evaluted_mesh.calc_normals_split()
-
-            vertex_groups = original_geo.vertex_groups.keys()
-            original_geo_matrix = global_functions.get_matrix(original_geo, original_geo, False, blend_scene.armature, joined_list, False, version, "JMS", False, custom_scale, fix_rotations)
-            region_count = len(original_geo.region_list)
-            for idx, face in enumerate(evaluted_mesh.polygons):
-                face_set = (None, default_permutation, default_region)
-                region_index = -1
-                if game_version == "halo1":
-                    region_index = region_list.index(default_region)
-
-                lod = face_set[0]
-                permutation = face_set[1]
-                region = face_set[2]
-                if not original_geo.active_region == -1 and region_count > 0:
-                    region_idx = evaluted_mesh.get_custom_attribute().data[idx].value - 1
-                    if not region_idx == -1 and not region_idx >= region_count:
-                        face_set = mesh_processing.process_mesh_export_face_set(default_permutation, default_region, game_version, original_geo, region_idx)
-                        lod = face_set[0]
-                        permutation = face_set[1]
-                        region = face_set[2]
-                        if not region in region_list:
-                            region_list.append(region)
-
-                        region_index = region_list.index(region)
-                        if not game_version == "halo1":
-                            if not permutation in permutation_list:
-                                permutation_list.append(permutation)
-
-                material = global_functions.get_material(game_version, original_geo, face, evaluted_mesh, lod, region, permutation)
-                material_index = -1
-                if not material == -1:
-                    material_list = global_functions.gather_materials(game_version, material, material_list, "JMS")
-                    material_index = material_list.index(material)
-
-                vert_count = len(JMS.vertices)
-                v0 = vert_count
-                v1 = vert_count + 1
-                v2 = vert_count + 2
-                if original_geo_matrix.determinant() < 0.0:
-                    v0 = vert_count + 2
-                    v1 = vert_count + 1
-                    v2 = vert_count
-
-                JMS.triangles.append(JMSAsset.Triangle(region_index, material_index, v0, v1, v2))
-                for loop_index in face.loop_indices:
-                    point_idx = evaluted_mesh.loops[loop_index].vertex_index
-                    loop_data = evaluted_mesh.loops[loop_index]
-                    vertex_data = evaluted_mesh.vertices[loop_data.vertex_index]
-
-                    region = region_index
-                    normal = (original_geo_matrix.to_3x3() @ evaluted_mesh.corner_normals[loop_index].vector).normalized()
-                    if not loop_normals:
-                        normal = (original_geo_matrix.to_3x3() @ vertex_data.normal).normalized()
-
-                    if normal.length <= 0.0:
-                        normal = (original_geo_matrix.to_3x3() @ face.normal).normalized()
-
-                    scaled_translation = mesh_processing.process_mesh_export_vert(vertex_data, "JMS", original_geo_matrix, custom_scale)
-                    uv_set = mesh_processing.process_mesh_export_uv(evaluted_mesh, "JMS", loop_index, version)
-                    color = mesh_processing.process_mesh_export_color(evaluted_mesh, loop_index, point_idx)
-                    node_influence_count, node_set = mesh_processing.process_mesh_export_weights(vertex_data, blend_scene.armature, original_geo, vertex_groups, joined_list, "JMS")
-
-                    JMS.vertices.append(JMSAsset.Vertex(node_influence_count, node_set, region, scaled_translation, normal, color, uv_set))
-
-            original_geo.to_mesh_clear()
+        if stream_geometry:
+            JMS.vertices = global_functions.SpooledRecordList()
+            JMS.triangles = global_functions.SpooledRecordList()
+
+        registries = (region_list, permutation_list, material_list)
+
+        with timing_report.phase("geometry extraction") as timing_phase:
+            for idx, geometry in enumerate(geometry_list):
+                evaluted_mesh = geometry[0]
+                original_geo = geometry[1]
+                vertex_groups = original_geo.vertex_groups.keys()
+                original_geo_matrix = global_functions.get_matrix(original_geo, original_geo, False, blend_scene.armature, joined_list, False, version, "JMS", False, custom_scale, fix_rotations)
+                region_count = len(original_geo.region_list)
+                flip_winding = original_geo_matrix.determinant() < 0.0
+                weight_table = mesh_processing.VertexWeightTable(blend_scene.armature, original_geo, vertex_groups, joined_list, "JMS")
+
+                # Objects that haven't changed since the last export reuse their cached sections and skip to_mesh and the face walk.
+                object_hash = None
+                cache_entry = None
+                index_maps = None
+                if not geometry_cache == None:
+                    object_hash = geometry_cache.get_object_hash(original_geo, version, game_version, model_type.name, custom_scale, loop_normals, weld_vertices, weld_epsilon, tuple(map(tuple, original_geo_matrix)), weight_table.get_node_key())
+                    cache_entry = geometry_cache.load(original_geo, object_hash)
+                    if not cache_entry == None:
+                        index_maps = export_cache.replay_registries(registries, cache_entry.registry_entries)
+
+                if not index_maps == None:
+                    region_map, permutation_map, material_map = index_maps
+                    timing_phase.count("cached objects", 1)
+                    geometry_vertices = export_cache.get_cached_vertices(cache_entry.vertices, region_map, JMSAsset.Vertex)
+                    geometry_triangles = export_cache.get_cached_triangles(cache_entry.triangles, region_map, material_map, JMSAsset.Triangle)
+
+                else:
+                    if evaluted_mesh == None:
+                        evaluted_mesh = geometry_cache.get_evaluated_mesh(original_geo)
+
+                    if (4, 1, 0) > bpy.app.version:
+                        evaluted_mesh.calc_normals_split()
+
+                    if not object_hash == None:
+                        export_cache.start_recording(registries)
+
+                    loop_vertex_indices, translations, normals, uv_layers, colors = mesh_processing.get_mesh_export_columns(evaluted_mesh, original_geo_matrix, loop_normals)
+                    loop_vertex_list = loop_vertex_indices.tolist()
+                    translation_list = [tuple(translation) for translation in translations.tolist()]
+                    normal_list = [tuple(normal) for normal in normals.tolist()]
+                    uv_layer_list = [[tuple(uv) for uv in uv_layer.tolist()] for uv_layer in uv_layers]
+                    color_list = mesh_processing.get_export_color_list(colors)
+
+                    polygon_count = len(evaluted_mesh.polygons)
+                    polygon_loop_starts = np.empty(polygon_count, dtype=np.int32)
+                    polygon_loop_totals = np.empty(polygon_count, dtype=np.int32)
+                    polygon_material_indices = np.empty(polygon_count, dtype=np.int32)
+                    evaluted_mesh.polygons.foreach_get("loop_start", polygon_loop_starts)
+                    evaluted_mesh.polygons.foreach_get("loop_total", polygon_loop_totals)
+                    evaluted_mesh.polygons.foreach_get("material_index", polygon_material_indices)
+                    polygon_region_indices = np.full(polygon_count, -1, dtype=np.int32)
+                    if not original_geo.active_region == -1 and region_count > 0:
+                        evaluted_mesh.get_custom_attribute().data.foreach_get("value", polygon_region_indices)
+                        polygon_region_indices -= 1
+
+                    # Faces sharing a material slot and region resolve to the same region and material indices so each pair is only looked up once.
+                    face_set_cache = {}
+                    geometry_vertices = []
+                    geometry_triangles = []
+                    for idx, (loop_start, loop_total, face_material_index, region_idx) in enumerate(zip(polygon_loop_starts.tolist(), polygon_loop_totals.tolist(), polygon_material_indices.tolist(), polygon_region_indices.tolist())):
+                        face_set_key = (face_material_index, region_idx)
+                        face_indices = face_set_cache.get(face_set_key)
+                        if face_indices == None:
+                            face_set = (None, default_permutation, default_region)
+                            region_index = -1
+                            if game_version == "halo1":
+                                region_index = region_list.index(default_region)
+
+                            lod = face_set[0]
+                            permutation = face_set[1]
+                            region = face_set[2]
+                            if not region_idx == -1 and not region_idx >= region_count:
+                                face_set = mesh_processing.process_mesh_export_face_set(default_permutation, default_region, game_version, original_geo, region_idx)
+                                lod = face_set[0]
+                                permutation = face_set[1]
+                                region = face_set[2]
+                                if not region in region_list:
+                                    region_list.append(region)
+
+                                region_index = region_list.index(region)
+                                if not game_version == "halo1":
+                                    if not permutation in permutation_list:
+                                        permutation_list.append(permutation)
+
+                            material = global_functions.get_material(game_version, original_geo, evaluted_mesh.polygons[idx], evaluted_mesh, lod, region, permutation)
+                            material_index = -1
+                            if not material == -1:
+                                material_list = global_functions.gather_materials(game_version, material, material_list, "JMS")
+                                material_index = material_list.index(material)
+
+                            face_indices = (region_index, material_index)
+                            face_set_cache[face_set_key] = face_indices
+
+                        region_index, material_index = face_indices
+                        vert_count = len(geometry_vertices)
+                        v0 = vert_count
+                        v1 = vert_count + 1
+                        v2 = vert_count + 2
+                        if flip_winding:
+                            v0 = vert_count + 2
+                            v1 = vert_count + 1
+                            v2 = vert_count
+
+                        geometry_triangles.append(JMSAsset.Triangle(region_index, material_index, v0, v1, v2))
+                        for loop_index in range(loop_start, loop_start + loop_total):
+                            point_idx = loop_vertex_list[loop_index]
+                            uv_set = [uv_layer[loop_index] for uv_layer in uv_layer_list]
+                            if not uv_set and version <= 8204:
+                                uv_set = [(0.0, 0.0)]
+
+                            color = (0.0, 0.0, 0.0)
+                            if not color_list == None:
+                                color = color_list[loop_index]
+
+                            node_influence_count, node_set = weight_table.get_weights(evaluted_mesh.vertices, point_idx)
+                            geometry_vertices.append(JMSAsset.Vertex(node_influence_count, list(node_set), region_index, translation_list[point_idx], normal_list[loop_index], color, uv_set))
+
+                    original_geo.to_mesh_clear()
+
+                    # Each object is welded on its own and then handed to the asset so a streamed export only holds one object at a time.
+                    if weld_vertices:
+                        geometry_vertices = mesh_processing.weld_export_vertices(geometry_vertices, geometry_triangles, weld_epsilon)
+
+                    if not object_hash == None:
+                        registry_entries = export_cache.stop_recording(registries)
+                        cache_entry = export_cache.GeometryCacheEntry(object_hash, geometry_vertices, export_cache.get_triangle_records(geometry_triangles), registry_entries)
+
+                    if not geometry_cache == None:
+                        geometry_cache.store(original_geo, object_hash, cache_entry)
+
+                vertex_offset = len(JMS.vertices)
+                for triangle in geometry_triangles:
+                    triangle.v0 += vertex_offset
+                    triangle.v1 += vertex_offset
+                    triangle.v2 += vertex_offset
+
+                JMS.triangles.extend(geometry_triangles)
+                JMS.vertices.extend(geometry_vertices)
+
+            timing_phase.count("objects", len(geometry_list))
+            timing_phase.count("vertices", len(JMS.vertices))
+            timing_phase.count("triangles", len(JMS.triangles))
 
     if model_type == global_functions.ModelTypeEnum.physics:
         for spheres in blend_scene.sphere_list:
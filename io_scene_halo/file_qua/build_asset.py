@@ -25,6 +25,8 @@
 # ##### END MIT LICENSE BLOCK #####
 
 from .process_scene import process_scene
+from ..global_functions import timing_report
+
 DECIMAL_1 = '\n%s'
 DECIMAL_2 = '\n%s %s'
 DECIMAL_3 = '\n%s %s %s'
@@ -562,8 +564,10 @@ def write_h4_frames(file, QUA, is_segment=False):
                     )
 
 def build_asset(context, filepath, game_title, qua_version, qua_type, qua_revision, strip_identifier, hidden_geo, nonrender_geo, report):
-    QUA = process_scene(context, game_title, qua_version, qua_type, qua_revision, strip_identifier, hidden_geo, nonrender_geo, report)
+    with timing_report.phase("scene gather"):
+        QUA = process_scene(context, game_title, qua_version, qua_type, qua_revision, strip_identifier, hidden_geo, nonrender_geo, report)
 
+    timing_phase = timing_report.begin_phase("serialization")
     file = open(filepath, 'w', encoding="utf-8")
 
     if game_title == "halo3":
@@ -591,3 +595,4 @@ def build_asset(context, filepath, game_title, qua_version, qua_type, qua_revisi
 
     report({'INFO'}, "Export completed successfully")
     file.close()
+    timing_report.end_phase(timing_phase)
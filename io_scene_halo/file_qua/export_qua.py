@@ -27,11 +27,14 @@
 import bpy
 
 from .build_asset import build_asset
+from ..global_functions import timing_report
 
 def write_file(context, filepath, game_title, qua_version, qua_type, qua_revision, strip_identifier, hidden_geo, nonrender_geo, report):
+    timing_report.start("QUA export")
     build_asset(context, filepath, game_title, qua_version, qua_type, qua_revision, strip_identifier, hidden_geo, nonrender_geo, report)
 
     report({'INFO'}, "Export completed successfully")
+    timing_report.finish(filepath, report)
 
     return {'FINISHED'}
 
@@ -35,6 +35,7 @@ from bpy_extras.io_utils import (
 from bpy.types import Operator
 
 from bpy.props import (
+    IntProperty,
     BoolProperty,
     EnumProperty,
     StringProperty,
@@ -92,6 +93,19 @@ class ImportTag(Operator, ImportHelper):
         default = True,
         )
 
+    memory_mapped: BoolProperty(
+        name ="Memory Mapped Reading",
+        description = "Read the tag through a memory mapping instead of a buffered file. Block data is decoded straight from the mapping which helps with large BSP and lightmap tags",
+        default = False,
+        )
+
+    worker_count: IntProperty(
+        name ="Parse Workers",
+        description = "Number of processes used to parse the tags a scenario references in parallel. 0 uses one per CPU core and 1 parses everything on the main thread. Only used on Linux, other platforms always parse on the main thread",
+        default = 1,
+        min = 0,
+        )
+
     if (4, 1, 0) <= bpy.app.version:
         directory: StringProperty(
             subtype='FILE_PATH', 
@@ -120,7 +134,7 @@ class ImportTag(Operator, ImportHelper):
 
     def run_tag_code(self, filepath, context):
         from ..file_tag import import_tag
-        global_functions.run_code("import_tag.load_file(context, filepath, self.game_title, self.fix_rotations, self.empty_markers, self.report)")
+        global_functions.run_code("import_tag.load_file(context, filepath, self.game_title, self.fix_rotations, self.empty_markers, self.report, self.memory_mapped, self.worker_count)")
 
     if (4, 1, 0) <= bpy.app.version:
         def invoke(self, context, event):
@@ -152,6 +166,98 @@ class ImportTag(Operator, ImportHelper):
         row = col.row()
         row.label(text='Use Empties For Markers:')
         row.prop(self, "empty_markers", text='')
+        row = col.row()
+        row.label(text='Memory Mapped Reading:')
+        row.prop(self, "memory_mapped", text='')
+        row = col.row()
+        row.label(text='Parse Workers:')
+        row.prop(self, "worker_count", text='')
+
+class ImportTagBatch(Operator, ImportHelper):
+    """Import several tags or every tag in a directory, parsing them in parallel"""
+    bl_idname = "import_scene.tag_batch"
+    bl_label = "Import Tags"
+
+    game_title: EnumProperty(
+        name="Game:",
+        description="What game does the tag group belong to",
+        items=[ ('auto', "Auto", "Attempt to get the game title automatically. Defaults to Halo 1 if it fails."),
+                ('halo1', "Halo 1", "Use tag data from Halo 1"),
+                ('halo2', "Halo 2", "Use tag data from Halo 2"),
+                ('halo3', "Halo 3", "Use tag data from Halo 3"),
+            ]
+        )
+
+    fix_rotations: BoolProperty(
+        name ="Fix Rotations",
+        description = "Set rotations to match what you would visually see in 3DS Max. Rotates bones by 90 degrees on a local Z axis to match how Blender handles rotations",
+        default = False,
+        )
+
+    empty_markers: BoolProperty(
+        name ="Generate Empty Markers",
+        description = "Generate empty markers instead of UV spheres",
+        default = True,
+        )
+
+    memory_mapped: BoolProperty(
+        name ="Memory Mapped Reading",
+        description = "Read the tags through a memory mapping instead of a buffered file",
+        default = False,
+        )
+
+    worker_count: IntProperty(
+        name ="Parse Workers",
+        description = "Number of processes used to parse tags in parallel. 0 uses one per CPU core and 1 parses everything on the main thread. Only used on Linux, other platforms always parse on the main thread",
+        default = 1,
+        min = 0,
+        )
+
+    directory: StringProperty(
+        subtype='DIR_PATH',
+        options={'SKIP_SAVE'}
+        )
+
+    files: CollectionProperty(
+        type=bpy.types.OperatorFileListElement,
+        options={'SKIP_SAVE'}
+        )
+
+    def execute(self, context):
+        from ..file_tag import import_tag
+        file_paths = [os.path.join(self.directory, file.name) for file in self.files if file.name]
+        if len(file_paths) == 0:
+            # Nothing selected means the whole directory gets imported.
+            file_paths = [self.directory]
+
+        return global_functions.run_code("import_tag.load_files(context, file_paths, self.game_title, self.fix_rotations, self.empty_markers, self.report, self.memory_mapped, self.worker_count)")
+
+    def draw(self, context):
+        layout = self.layout
+
+        box = layout.box()
+        box.label(text="Game Title:")
+        col = box.column(align=True)
+        row = col.row()
+        row.prop(self, "game_title", text='')
+        col = box.column(align=True)
+
+        box = layout.box()
+        box.label(text="Import Options:")
+        col = box.column(align=True)
+
+        row = col.row()
+        row.label(text='Fix Rotations:')
+        row.prop(self, "fix_rotations", text='')
+        row = col.row()
+        row.label(text='Use Empties For Markers:')
+        row.prop(self, "empty_markers", text='')
+        row = col.row()
+        row.label(text='Memory Mapped Reading:')
+        row.prop(self, "memory_mapped", text='')
+        row = col.row()
+        row.label(text='Parse Workers:')
+        row.prop(self, "worker_count", text='')
 
 if (4, 1, 0) <= bpy.app.version:
     class ImportTag_FileHandler(FileHandler):
@@ -166,6 +272,7 @@ if (4, 1, 0) <= bpy.app.version:
 
 classeshalo = [
     ImportTag,
+    ImportTagBatch,
     ExportSCNR
 ]
 
@@ -177,6 +284,7 @@ def menu_func_export(self, context):
 
 def menu_func_import(self, context):
     self.layout.operator(ImportTag.bl_idname, text="Halo Tag (mode/mod2/coll/phys/antr/sbsp)")
+    self.layout.operator(ImportTagBatch.bl_idname, text="Halo Tags (Batch)")
 
 def register():
     for clshalo in classeshalo:
@@ -25,10 +25,11 @@
 # ##### END MIT LICENSE BLOCK #####
 
 import bpy
+import numpy as np
 
 from math import radians
 from mathutils import Matrix
-from ...global_functions import mesh_processing, global_functions
+from ...global_functions import mesh_processing, global_functions, animation_processing
 
 def find_base_animation(ANIMATION, current_animation):
     animation_index = -1
@@ -126,6 +127,15 @@ def create_overlay_animation(scene, armature, animation, nodes, fix_rotations, v
             pose_bone.keyframe_insert(data_path='rotation_quaternion', group=pose_bone.name)
             pose_bone.keyframe_insert(data_path='scale', group=pose_bone.name)
 
+def create_animation_keyframes(armature, action, animation, nodes, fix_rotations, is_inverted):
+    # Same result as create_animation() but every bone and frame is worked out at once and written straight into the F-Curves.
+    pose_bones = [armature.pose.bones[node.name] for node in nodes]
+    frames = np.arange(1, len(animation.frame_data) + 1)
+    translations, quaternions, scales = animation_processing.get_transform_arrays(animation.frame_data, range(len(nodes)), is_inverted)
+    transform_matrices = animation_processing.get_transform_matrices(translations, quaternions, scales)
+    pose_matrices = animation_processing.get_pose_matrices(pose_bones, transform_matrices, True, fix_rotations)
+    animation_processing.keyframe_pose_bones(action, pose_bones, frames, pose_matrices)
+
 def build_scene(context, ANIMATION, game_version, game_title, file_version, fix_rotations, empty_markers, report):
     scene = context.scene
     view_layer = context.view_layer
@@ -157,6 +167,9 @@ def build_scene(context, ANIMATION, game_version, game_title, file_version, fix_
         if game_title == "halo1":
             is_inverted = True
 
+        # Rigs with constraints or Euler bones still pose and key every bone frame by frame.
+        bulk_keyframes = animation_processing.can_bulk_keyframe(armature.pose.bones, True)
+
         for animation in ANIMATION.animations:
             if len(animation.frame_data) == 0:
                 continue
@@ -176,7 +189,10 @@ def build_scene(context, ANIMATION, game_version, game_title, file_version, fix_
 
             bpy.ops.object.mode_set(mode = 'POSE')
 
-            if animation.type == 1:
+            if bulk_keyframes:
+                create_animation_keyframes(armature, action, animation, nodes, fix_rotations, is_inverted)
+
+            elif animation.type == 1:
                 base_transforms = None
                 animation_index = find_base_animation(ANIMATION, animation)
                 if not animation_index == -1:
@@ -32,7 +32,7 @@ from sys import float_info
 from math import radians, log
 from mathutils import Matrix, Vector
 from ..h2.file_scenario_structure_bsp.format import ClusterPortalFlags as H2ClusterPortalFlags, SurfaceFlags as H2SurfaceFlags, PartFlags, PropertyTypeEnum
-from ...global_functions import shader_processing, mesh_processing, global_functions
+from ...global_functions import shader_processing, mesh_processing, global_functions, tag_format
 from ..h1.file_scenario_structure_bsp.format import ClusterPortalFlags as H1ClusterPortalFlags, SurfaceFlags as H1SurfaceFlags
 
 PLANE_PARALLEL_ANGLE_EPSILON = 0.0001
@@ -282,14 +282,23 @@ def build_scene(context, LEVEL, game_version, game_title, file_version, fix_rota
 
                         triangle_indices = []
                         triangles = []
-                        vertices = [vertex.translation for vertex in material.uncompressed_render_vertices]
-                        normals = [vertex.normal for vertex in material.uncompressed_render_vertices]
+                        vertex_columns = isinstance(material.uncompressed_render_vertices, tag_format.TagBlockColumns)
+                        if vertex_columns:
+                            vertices = material.uncompressed_render_vertices.get_column("translation")
+                            normals = material.uncompressed_render_vertices.get_column("normal")
+                        else:
+                            vertices = [vertex.translation for vertex in material.uncompressed_render_vertices]
+                            normals = [vertex.normal for vertex in material.uncompressed_render_vertices]
 
                         for idx in range(material.surface_count):
                             surface_idx = start_index + idx
                             triangles.append([surfaces[surface_idx].v2, surfaces[surface_idx].v1, surfaces[surface_idx].v0]) # Reversed order to fix facing normals
 
-                        mesh.from_pydata(vertices, [], triangles)
+                        if vertex_columns:
+                            triangle_array = mesh_processing.mesh_from_vertex_columns(mesh, vertices, triangles)
+                        else:
+                            mesh.from_pydata(vertices, [], triangles)
+
                         for tri_idx, poly in enumerate(mesh.polygons):
                             poly.use_smooth = True
 
@@ -317,6 +326,8 @@ def build_scene(context, LEVEL, game_version, game_title, file_version, fix_rota
                             mat.diffuse_color = random_color_gen.next()
                             material_index = object_mesh.data.materials.keys().index(material_name)
                             mesh.polygons[triangle_idx].material_index = material_index
+                            if vertex_columns:
+                                continue
 
                             render_vertex_list = [material.uncompressed_render_vertices[triangle[0]], material.uncompressed_render_vertices[triangle[1]], material.uncompressed_render_vertices[triangle[2]]]
                             for vertex_idx, vertex in enumerate(render_vertex_list):
@@ -346,6 +357,11 @@ def build_scene(context, LEVEL, game_version, game_title, file_version, fix_rota
 
                                     layer_uv_lightmap.data[loop_index].uv = (U_L, V_L)
 
+                        if vertex_columns:
+                            mesh_processing.set_loop_uvs_from_columns(mesh, 'UVMap_%s' % 0, material.uncompressed_render_vertices.get_column("UV"), triangle_array)
+                            if has_lightmap:
+                                mesh_processing.set_loop_uvs_from_columns(mesh, 'UVMap_Lightmap_%s' % 0, material.uncompressed_lightmap_vertices.get_column("UV"), triangle_array, False)
+
                         bm.from_mesh(mesh)
                         bpy.data.meshes.remove(mesh)
 
@@ -572,39 +572,39 @@ def generate_object_elements(context, level_root, collection_name, H1_ASSET, gam
         ASSET = parse_tag(palette_element, report, "halo1", "retail")
         if not ASSET == None:
             if collection_name == "Scenery":
-                MODEL = parse_tag(ASSET.model, report, "halo1", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo1", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
                     ob = get_object(asset_collection, MODEL, game_version, object_name, random_color_gen, report)
             elif collection_name == "Bipeds":
-                MODEL = parse_tag(ASSET.model, report, "halo1", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo1", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
                     ob = get_object(asset_collection, MODEL, game_version, object_name, random_color_gen, report)
             elif collection_name == "Vehicles":
-                MODEL = parse_tag(ASSET.model, report, "halo1", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo1", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
                     ob = get_object(asset_collection, MODEL, game_version, object_name, random_color_gen, report)
             elif collection_name == "Equipment":
-                MODEL = parse_tag(ASSET.model, report, "halo1", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo1", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
                     ob = get_object(asset_collection, MODEL, game_version, object_name, random_color_gen, report)
             elif collection_name == "Weapons":
-                MODEL = parse_tag(ASSET.model, report, "halo1", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo1", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
                     ob = get_object(asset_collection, MODEL, game_version, object_name, random_color_gen, report)
             elif collection_name == "Machines":
-                MODEL = parse_tag(ASSET.model, report, "halo1", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo1", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
                     ob = get_object(asset_collection, MODEL, game_version, object_name, random_color_gen, report)
             elif collection_name == "Controls":
-                MODEL = parse_tag(ASSET.model, report, "halo1", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo1", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
                     ob = get_object(asset_collection, MODEL, game_version, object_name, random_color_gen, report)
             elif collection_name == "Light Fixtures":
-                MODEL = parse_tag(ASSET.model, report, "halo1", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo1", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
                     ob = get_object(asset_collection, MODEL, game_version, object_name, random_color_gen, report)
             elif collection_name == "Sound Scenery":
-                MODEL = parse_tag(ASSET.model, report, "halo1", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo1", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
                     ob = get_object(asset_collection, MODEL, game_version, object_name, random_color_gen, report)
 
@@ -669,13 +669,13 @@ def generate_netgame_equipment_elements(context, level_root, H1_ASSET, game_vers
         if not ASSET == None:
             if len(ASSET.item_permutations) > 0:
                 item_perutation_element = ASSET.item_permutations[0]
-                ITEM = parse_tag(item_perutation_element.item, report, "halo1", "retail")
+                ITEM = parse_tag(item_perutation_element.item, report, "halo1", "retail", parent_tagref=element.item_collection)
                 if item_perutation_element.item.tag_group == "eqip":
-                    MODEL = parse_tag(ITEM.model, report, "halo1", "retail")
+                    MODEL = parse_tag(ITEM.model, report, "halo1", "retail", parent_tagref=item_perutation_element.item)
                     if not MODEL == None:
                         ob = get_object(asset_collection, MODEL, game_version, object_name, random_color_gen, report)
                 elif item_perutation_element.item.tag_group == "weap":
-                    MODEL = parse_tag(ITEM.model, report, "halo1", "retail")
+                    MODEL = parse_tag(ITEM.model, report, "halo1", "retail", parent_tagref=item_perutation_element.item)
                     if not MODEL == None:
                         ob = get_object(asset_collection, MODEL, game_version, object_name, random_color_gen, report)
 
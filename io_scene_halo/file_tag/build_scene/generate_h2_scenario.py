@@ -182,63 +182,63 @@ def generate_object_elements(level_root, collection_name, palette, tag_block, co
         ASSET = parse_tag(palette_element, report, "halo2", "retail")
         if not ASSET == None:
             if collection_name == "Scenery":
-                MODEL = parse_tag(ASSET.model, report, "halo2", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo2", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
-                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail")
+                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail", parent_tagref=ASSET.model)
                     if not RENDER == None:
                         ob = get_object(asset_collection, RENDER, game_version, object_name, random_color_gen, report)
             elif collection_name == "Biped":
-                MODEL = parse_tag(ASSET.model, report, "halo2", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo2", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
-                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail")
+                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail", parent_tagref=ASSET.model)
                     if not RENDER == None:
                         ob = get_object(asset_collection, RENDER, game_version, object_name, random_color_gen, report)
             elif collection_name == "Vehicle":
-                MODEL = parse_tag(ASSET.model, report, "halo2", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo2", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
-                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail")
+                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail", parent_tagref=ASSET.model)
                     if not RENDER == None:
                         ob = get_object(asset_collection, RENDER, game_version, object_name, random_color_gen, report)
             elif collection_name == "Equipment":
-                MODEL = parse_tag(ASSET.model, report, "halo2", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo2", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
-                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail")
+                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail", parent_tagref=ASSET.model)
                     if not RENDER == None:
                         ob = get_object(asset_collection, RENDER, game_version, object_name, random_color_gen, report)
             elif collection_name == "Weapons":
-                MODEL = parse_tag(ASSET.model, report, "halo2", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo2", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
-                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail")
+                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail", parent_tagref=ASSET.model)
                     if not RENDER == None:
                         ob = get_object(asset_collection, RENDER, game_version, object_name, random_color_gen, report)
             elif collection_name == "Machines":
-                MODEL = parse_tag(ASSET.model, report, "halo2", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo2", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
-                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail")
+                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail", parent_tagref=ASSET.model)
                     if not RENDER == None:
                         ob = get_object(asset_collection, RENDER, game_version, object_name, random_color_gen, report)
             elif collection_name == "Controls":
-                MODEL = parse_tag(ASSET.model, report, "halo2", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo2", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
-                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail")
+                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail", parent_tagref=ASSET.model)
                     if not RENDER == None:
                         ob = get_object(asset_collection, RENDER, game_version, object_name, random_color_gen, report)
             elif collection_name == "Light Fixtures":
-                MODEL = parse_tag(ASSET.model, report, "halo2", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo2", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
-                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail")
+                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail", parent_tagref=ASSET.model)
                     if not RENDER == None:
                         ob = get_object(asset_collection, RENDER, game_version, object_name, random_color_gen, report)
             elif collection_name == "Sound Scenery":
-                MODEL = parse_tag(ASSET.model, report, "halo2", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo2", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
-                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail")
+                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail", parent_tagref=ASSET.model)
                     if not RENDER == None:
                         ob = get_object(asset_collection, RENDER, game_version, object_name, random_color_gen, report)
             elif collection_name == "Crates":
-                MODEL = parse_tag(ASSET.model, report, "halo2", "retail")
+                MODEL = parse_tag(ASSET.model, report, "halo2", "retail", parent_tagref=palette_element)
                 if not MODEL == None:
-                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail")
+                    RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail", parent_tagref=ASSET.model)
                     if not RENDER == None:
                         ob = get_object(asset_collection, RENDER, game_version, object_name, random_color_gen, report)
 
@@ -390,27 +390,27 @@ def generate_netgame_equipment_elements(level_root, tag_block, context, game_ver
                 perutation_element = COLLECTION.permutations[0]
                 if element.item_vehicle_collection.tag_group == "itmc":
                     perutation_element = COLLECTION.permutations[0]
-                    ITEM = parse_tag(perutation_element.item, report, "halo2", "retail")
+                    ITEM = parse_tag(perutation_element.item, report, "halo2", "retail", parent_tagref=element.item_vehicle_collection)
                     if not ITEM == None:
                         if perutation_element.item.tag_group == "eqip":
-                            MODEL = parse_tag(ITEM.model, report, "halo2", "retail")
+                            MODEL = parse_tag(ITEM.model, report, "halo2", "retail", parent_tagref=perutation_element.item)
                             if not MODEL == None:
-                                RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail")
+                                RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail", parent_tagref=ITEM.model)
                                 if not RENDER == None:
                                     ob = get_object(asset_collection, RENDER, game_version, object_name, random_color_gen, report)
                         elif perutation_element.item.tag_group == "weap":
-                            MODEL = parse_tag(ITEM.model, report, "halo2", "retail")
+                            MODEL = parse_tag(ITEM.model, report, "halo2", "retail", parent_tagref=perutation_element.item)
                             if not MODEL == None:
-                                RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail")
+                                RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail", parent_tagref=ITEM.model)
                                 if not RENDER == None:
                                     ob = get_object(asset_collection, RENDER, game_version, object_name, random_color_gen, report)
 
                 elif element.item_vehicle_collection.tag_group == "vehc":
-                    VEHICLE = parse_tag(perutation_element.item, report, "halo2", "retail")
+                    VEHICLE = parse_tag(perutation_element.item, report, "halo2", "retail", parent_tagref=element.item_vehicle_collection)
                     if not VEHICLE == None:
-                        MODEL = parse_tag(VEHICLE.model, report, "halo2", "retail")
+                        MODEL = parse_tag(VEHICLE.model, report, "halo2", "retail", parent_tagref=perutation_element.item)
                         if not MODEL == None:
-                            RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail")
+                            RENDER = parse_tag(MODEL.render_model, report, "halo2", "retail", parent_tagref=VEHICLE.model)
                             if not RENDER == None:
                                 ob = get_object(asset_collection, RENDER, game_version, object_name, random_color_gen, report)
 
@@ -631,6 +631,11 @@ def scenario_get_resources(H2_ASSET, report):
             elif reference.tag_group == "*eap":
                 weapons_resource = reference
 
+    resource_references = [ai_resource, bipeds_resource, cinematics_resource, cluster_data_resource, comments_resource, creature_resource,
+                           decals_resource, decorators_resource, devices_resource, equipment_resource, lights_resource, scenery_resource,
+                           sound_scenery_resource, structure_lighting_resource, trigger_volumes_resource, vehicles_resource, weapons_resource]
+    prefetch_tags([resource for resource in resource_references if resource], report, "halo2")
+
     if ai_resource:
         RESOURCE_ASSET = parse_tag(ai_resource, report, "halo2", "retail")
         if not RESOURCE_ASSET == None:
@@ -793,6 +798,12 @@ def generate_scenario_scene(context, H2_ASSET, game_version, game_title, file_ve
         levels_collection = bpy.data.collections.new("BSPs")
         context.scene.collection.children.link(levels_collection)
 
+    level_references = []
+    for bsp_element in H2_ASSET.structure_bsps:
+        level_references.append(bsp_element.structure_bsp)
+        level_references.append(bsp_element.structure_lightmap)
+
+    prefetch_tags(level_references, report, "halo2")
     for bsp_idx, bsp_element in enumerate(H2_ASSET.structure_bsps):
         bsp = bsp_element.structure_bsp
         lightmap = bsp_element.structure_lightmap
@@ -24,7 +24,6 @@
 #
 # ##### END MIT LICENSE BLOCK #####
 
-from xml.dom import minidom
 from .format import (
     BipedAsset,
     ObjectFlags,
@@ -50,7 +49,7 @@ def process_file(input_stream, report):
     TAG.is_legacy = False
 
     if XML_OUTPUT:
-        TAG.xml_doc = minidom.Document()
+        TAG.xml_doc = tag_format.XMLStreamDocument()
 
     BIPED.header = TAG.Header().read(input_stream, TAG)
 
@@ -260,11 +259,8 @@ def process_file(input_stream, report):
         report({'WARNING'}, "%s elements left after parse end" % (EOF - current_position))
 
     if XML_OUTPUT:
-        xml_str = TAG.xml_doc.toprettyxml(indent ="\t")
-
         save_path_file = tag_format.get_xml_path(input_stream.name, BIPED.header.tag_group, TAG.is_legacy)
 
-        with open(save_path_file, "w") as f:
-            f.write(xml_str)
+        TAG.xml_doc.write_xml(save_path_file)
 
     return BIPED
@@ -26,11 +26,13 @@
 
 import os
 import bpy
+import copy
 import bmesh
+import numpy as np
 
 from mathutils import Vector
 from .format import ModelFlags
-from ....global_functions import shader_processing, mesh_processing, global_functions
+from ....global_functions import shader_processing, mesh_processing, global_functions, tag_format
 
 def decompress_normal32(n):
     i = (n&1023) / 1023
@@ -42,16 +44,48 @@ def decompress_normal32(n):
 
     return Vector((i, j, k))
 
+def decompress_normal32_column(normals):
+    n = normals.astype(np.int64) & 0xFFFFFFFF
+    decompressed_normals = np.empty((len(n), 3))
+    decompressed_normals[:, 0] = ((n & 1023) / 1023) - ((n >> 10) & 1)
+    decompressed_normals[:, 1] = (((n >> 11) & 1023) / 1023) - ((n >> 21) & 1)
+    decompressed_normals[:, 2] = (((n >> 22) & 511) / 511) - ((n >> 31) & 1)
+
+    return decompressed_normals
+
+def uncompress_vertex_columns(compressed_vertices):
+    # Decompresses into a copy. Tag assets are shared between every placement of a model so the compressed block must stay as read.
+    vertices = compressed_vertices.copy()
+    for attribute_name in ("normal", "binormal", "tangent"):
+        vertices.set_column(attribute_name, decompress_normal32_column(compressed_vertices.get_column(attribute_name)), tag_format.layout_vector)
+
+    vertices.set_column("UV", compressed_vertices.get_column("UV") / 32767)
+    vertices.set_column("node_0_index", (compressed_vertices.get_column("node_0_index") / 3).astype(np.int32))
+    vertices.set_column("node_1_index", (compressed_vertices.get_column("node_1_index") / 3).astype(np.int32))
+    node_0_weight = compressed_vertices.get_column("node_0_weight") / 32767
+    vertices.set_column("node_0_weight", node_0_weight)
+    vertices.set_column("node_1_weight", 1 - node_0_weight)
+
+    return vertices
+
 def uncompress_vertices(compressed_vertices):
-    for vertex in compressed_vertices:
-        vertex.normal = decompress_normal32(vertex.normal)
-        vertex.binormal = decompress_normal32(vertex.binormal)
-        vertex.tangent = decompress_normal32(vertex.tangent)
-        vertex.UV = ((vertex.UV[0] / 32767), (vertex.UV[1] /32767))
-        vertex.node_0_index = int(vertex.node_0_index / 3)
-        vertex.node_1_index = int(vertex.node_1_index / 3)
-        vertex.node_0_weight = vertex.node_0_weight / 32767
+    if isinstance(compressed_vertices, tag_format.TagBlockColumns):
+        return uncompress_vertex_columns(compressed_vertices)
+
+    vertices = []
+    for compressed_vertex in compressed_vertices:
+        vertex = copy.copy(compressed_vertex)
+        vertex.normal = decompress_normal32(compressed_vertex.normal)
+        vertex.binormal = decompress_normal32(compressed_vertex.binormal)
+        vertex.tangent = decompress_normal32(compressed_vertex.tangent)
+        vertex.UV = ((compressed_vertex.UV[0] / 32767), (compressed_vertex.UV[1] /32767))
+        vertex.node_0_index = int(compressed_vertex.node_0_index / 3)
+        vertex.node_1_index = int(compressed_vertex.node_1_index / 3)
+        vertex.node_0_weight = compressed_vertex.node_0_weight / 32767
         vertex.node_1_weight = 1 - vertex.node_0_weight
+        vertices.append(vertex)
+
+    return vertices
 
 def build_mesh_layout(asset, geometry, region_name, object_name, game_version, is_triangle_list, random_color_gen, armature, materials):
     vertex_groups = []
@@ -75,13 +109,19 @@ def build_mesh_layout(asset, geometry, region_name, object_name, game_version, i
 
         vertex_data = part.uncompressed_vertices
         if len(vertex_data) == 0:
-            uncompress_vertices(part.compressed_vertices)
-            vertex_data = part.compressed_vertices
+            vertex_data = uncompress_vertices(part.compressed_vertices)
 
         triangle_indices = []
         triangles = []
-        vertices = [vertex.translation for vertex in vertex_data]
-        vertex_normals = [vertex.normal for vertex in vertex_data]
+        vertex_columns = isinstance(vertex_data, tag_format.TagBlockColumns)
+        if vertex_columns:
+            vertices = vertex_data.get_column("translation")
+            vertex_normals = vertex_data.get_column("normal")
+            vertex_weights = zip(vertex_data.get_column("node_0_index").tolist(), vertex_data.get_column("node_1_index").tolist(), vertex_data.get_column("node_0_weight").tolist(), vertex_data.get_column("node_1_weight").tolist())
+        else:
+            vertices = [vertex.translation for vertex in vertex_data]
+            vertex_normals = [vertex.normal for vertex in vertex_data]
+            vertex_weights = [(vertex.node_0_index, vertex.node_1_index, vertex.node_0_weight, vertex.node_1_weight) for vertex in vertex_data]
 
         if is_triangle_list:
             for triangle in part.triangles:
@@ -109,18 +149,18 @@ def build_mesh_layout(asset, geometry, region_name, object_name, game_version, i
                 if (reversed_triangle[0] == reversed_triangle[1]) or (reversed_triangle[1] == reversed_triangle[2]) or (reversed_triangle[0] == reversed_triangle[2]):
                     del triangles[triangles.index(reversed_triangle)]
 
-        mesh.from_pydata(vertices, [], triangles)
+        if vertex_columns:
+            triangle_array = mesh_processing.mesh_from_vertex_columns(mesh, vertices, triangles)
+        else:
+            mesh.from_pydata(vertices, [], triangles)
+
         for poly in mesh.polygons:
             poly.use_smooth = True
 
         region_attribute = mesh.get_custom_attribute()
         mesh.normals_split_custom_set_from_vertices(vertex_normals)
 
-        for vertex_idx, vertex in enumerate(vertex_data):
-            node_0_index = vertex.node_0_index
-            node_1_index = vertex.node_1_index
-            node_0_weight = vertex.node_0_weight
-            node_1_weight = vertex.node_1_weight
+        for vertex_idx, (node_0_index, node_1_index, node_0_weight, node_1_weight) in enumerate(vertex_weights):
             if uses_local_nodes:
                 if not node_0_index == -1:
                     node_0_index = part.local_nodes[node_0_index]
@@ -181,6 +221,8 @@ def build_mesh_layout(asset, geometry, region_name, object_name, game_version, i
 
             region_index = active_region_permutations.index(current_region_permutation)
             region_attribute.data[triangle_idx].value = region_index + 1
+            if vertex_columns:
+                continue
 
             vertex_list = [vertex_data[triangle[0]], vertex_data[triangle[1]], vertex_data[triangle[2]]]
             for vertex_idx, vertex in enumerate(vertex_list):
@@ -200,6 +242,16 @@ def build_mesh_layout(asset, geometry, region_name, object_name, game_version, i
 
                 layer_uv.data[loop_index].uv = (U, 1 - V)
 
+        if vertex_columns:
+            uvs = vertex_data.get_column("UV").astype(np.float32)
+            if not asset.base_map_u_scale == 0.0:
+                uvs[:, 0] *= asset.base_map_u_scale
+
+            if not asset.base_map_v_scale == 0.0:
+                uvs[:, 1] *= asset.base_map_v_scale
+
+            mesh_processing.set_loop_uvs_from_columns(mesh, 'UVMap_%s' % 0, uvs, triangle_array)
+
         vert_count += len(vertex_data)
 
         bm.from_mesh(mesh)
@@ -243,6 +295,7 @@ def get_geometry_layout(context, collection, import_file, armature, game_version
 
         materials.append(mat)
 
+    visited_geometries = set()
     for region in import_file.regions:
         for permutation in region.permutations:
             superlow_geometry_index = permutation.superlow_geometry_block
@@ -252,27 +305,27 @@ def get_geometry_layout(context, collection, import_file, armature, game_version
             superhigh_geometry_index = permutation.superhigh_geometry_block
 
             geometry_count = len(import_file.geometries)
-            if not superhigh_geometry_index == -1 and superhigh_geometry_index < geometry_count and not import_file.geometries[superhigh_geometry_index].visited:
-                import_file.geometries[superhigh_geometry_index].visited = True
+            if not superhigh_geometry_index == -1 and superhigh_geometry_index < geometry_count and not superhigh_geometry_index in visited_geometries:
+                visited_geometries.add(superhigh_geometry_index)
                 superhigh_geometry = import_file.geometries[superhigh_geometry_index]
                 build_object(context, collection, superhigh_geometry, armature, 'superhigh', region.name, permutation.name, game_version, import_file, is_triangle_list, random_color_gen, materials)
 
-            if not high_geometry_index == -1 and high_geometry_index < geometry_count and not import_file.geometries[high_geometry_index].visited:
-                import_file.geometries[high_geometry_index].visited = True
+            if not high_geometry_index == -1 and high_geometry_index < geometry_count and not high_geometry_index in visited_geometries:
+                visited_geometries.add(high_geometry_index)
                 high_geometry = import_file.geometries[high_geometry_index]
                 build_object(context, collection, high_geometry, armature, 'high', region.name, permutation.name, game_version, import_file, is_triangle_list, random_color_gen, materials)
 
-            if not medium_geometry_index == -1 and medium_geometry_index < geometry_count and not import_file.geometries[medium_geometry_index].visited:
-                import_file.geometries[medium_geometry_index].visited = True
+            if not medium_geometry_index == -1 and medium_geometry_index < geometry_count and not medium_geometry_index in visited_geometries:
+                visited_geometries.add(medium_geometry_index)
                 medium_geometry = import_file.geometries[medium_geometry_index]
                 build_object(context, collection, medium_geometry, armature, 'medium', region.name, permutation.name, game_version, import_file, is_triangle_list, random_color_gen, materials)
 
-            if not low_geometry_index == -1 and low_geometry_index < geometry_count and not import_file.geometries[low_geometry_index].visited:
-                import_file.geometries[low_geometry_index].visited = True
+            if not low_geometry_index == -1 and low_geometry_index < geometry_count and not low_geometry_index in visited_geometries:
+                visited_geometries.add(low_geometry_index)
                 low_geometry = import_file.geometries[low_geometry_index]
                 build_object(context, collection, low_geometry, armature, 'low', region.name, permutation.name, game_version, import_file, is_triangle_list, random_color_gen, materials)
 
-            if not superlow_geometry_index == -1 and superlow_geometry_index < geometry_count and not import_file.geometries[superlow_geometry_index].visited:
-                import_file.geometries[superlow_geometry_index].visited = True
+            if not superlow_geometry_index == -1 and superlow_geometry_index < geometry_count and not superlow_geometry_index in visited_geometries:
+                visited_geometries.add(superlow_geometry_index)
                 superlow_geometry = import_file.geometries[superlow_geometry_index]
                 build_object(context, collection, superlow_geometry, armature, 'superlow', region.name, permutation.name, game_version, import_file, is_triangle_list, random_color_gen, materials)
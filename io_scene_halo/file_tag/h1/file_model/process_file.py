@@ -24,11 +24,40 @@
 #
 # ##### END MIT LICENSE BLOCK #####
 
-from xml.dom import minidom
 from ....global_functions import tag_format
 from .format import ModelAsset, ModelFlags, PermutationFlags, PartFlags
 
 XML_OUTPUT = False
+VERTEX_COLUMNS = True
+
+UNCOMPRESSED_VERTEX_LAYOUT = tag_format.TagBlockLayout(68, (
+    ("translation", "position", "point_3d", 0, True),
+    ("normal", "normal", "vector", 12),
+    ("binormal", "binormal", "vector", 24),
+    ("tangent", "tangent", "vector", 36),
+    ("UV", "texture coords", "point_2d", 48),
+    ("node_0_index", "node0 index", "signed_short", 56),
+    ("node_1_index", "node1 index", "signed_short", 58),
+    ("node_0_weight", "node0 weight", "float", 60),
+    ("node_1_weight", "node1 weight", "float", 64),
+    ))
+
+COMPRESSED_VERTEX_LAYOUT = tag_format.TagBlockLayout(32, (
+    ("translation", "position", "point_3d", 0, True),
+    ("normal", "normal[11.11.10-bit]", "signed_integer", 12),
+    ("binormal", "binormal[11.11.10-bit]", "signed_integer", 16),
+    ("tangent", "tangent[11.11.10-bit]", "signed_integer", 20),
+    ("UV", ("texture coordinate u[16-bit]", "texture coordinate v[16-bit]"), "signed_short_pair", 24),
+    ("node_0_index", "node0 index(x3)", "signed_byte", 28),
+    ("node_1_index", "node1 index(x3)", "signed_byte", 29),
+    ("node_0_weight", "node0 weight[16-bit]", "signed_short", 30),
+    ))
+
+TRIANGLE_LAYOUT = tag_format.TagBlockLayout(6, (
+    ("v0", "vertex0 index", "signed_short", 0),
+    ("v1", "vertex1 index", "signed_short", 2),
+    ("v2", "vertex2 index", "signed_short", 4),
+    ))
 
 def process_file(input_stream, report):
     TAG = tag_format.TagAsset()
@@ -36,7 +65,7 @@ def process_file(input_stream, report):
     TAG.is_legacy = False
 
     if XML_OUTPUT:
-        TAG.xml_doc = minidom.Document()
+        TAG.xml_doc = tag_format.XMLStreamDocument()
 
     MODEL.header = TAG.Header().read(input_stream, TAG)
     # refinery extracted stubbs the zombie model_collision
@@ -289,60 +318,11 @@ def process_file(input_stream, report):
             uncompressed_vertex_node = tag_format.get_xml_node(XML_OUTPUT, part.uncompressed_vertices_tag_block.count, part_element_node, "name", "uncompressed vertices")
             compressed_vertex_node = tag_format.get_xml_node(XML_OUTPUT, part.compressed_vertices_tag_block.count, part_element_node, "name", "compressed vertices")
             triangle_node = tag_format.get_xml_node(XML_OUTPUT, part.triangles_tag_block.count, part_element_node, "name", "triangles")
-            for uncompressed_vertex_idx in range(part.uncompressed_vertices_tag_block.count):
-                uncompressed_vertex_element_node = None
-                if XML_OUTPUT:
-                    uncompressed_vertex_element_node = TAG.xml_doc.createElement('element')
-                    uncompressed_vertex_element_node.setAttribute('index', str(uncompressed_vertex_idx))
-                    uncompressed_vertex_node.appendChild(uncompressed_vertex_element_node)
-
-                uncompressed_vertex = MODEL.Vertices()
-                uncompressed_vertex.translation = TAG.read_point_3d(input_stream, TAG, tag_format.XMLData(uncompressed_vertex_element_node, "position"), True)
-                uncompressed_vertex.normal = TAG.read_vector(input_stream, TAG, tag_format.XMLData(uncompressed_vertex_element_node, "normal"))
-                uncompressed_vertex.binormal = TAG.read_vector(input_stream, TAG, tag_format.XMLData(uncompressed_vertex_element_node, "binormal"))
-                uncompressed_vertex.tangent = TAG.read_vector(input_stream, TAG, tag_format.XMLData(uncompressed_vertex_element_node, "tangent"))
-                uncompressed_vertex.UV = TAG.read_point_2d(input_stream, TAG, tag_format.XMLData(uncompressed_vertex_element_node, "texture coords"))
-                uncompressed_vertex.node_0_index = TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(uncompressed_vertex_element_node, "node0 index"))
-                uncompressed_vertex.node_1_index = TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(uncompressed_vertex_element_node, "node1 index"))
-                uncompressed_vertex.node_0_weight = TAG.read_float(input_stream, TAG, tag_format.XMLData(uncompressed_vertex_element_node, "node0 weight"))
-                uncompressed_vertex.node_1_weight = TAG.read_float(input_stream, TAG, tag_format.XMLData(uncompressed_vertex_element_node, "node1 weight"))
-
-                part.uncompressed_vertices.append(uncompressed_vertex)
-
-            for compressed_vertex_idx in range(part.compressed_vertices_tag_block.count):
-                compressed_vertex_element_node = None
-                if XML_OUTPUT:
-                    compressed_vertex_element_node = TAG.xml_doc.createElement('element')
-                    compressed_vertex_element_node.setAttribute('index', str(compressed_vertex_idx))
-                    compressed_vertex_node.appendChild(compressed_vertex_element_node)
-
-                compressed_vertex = MODEL.Vertices()
-                compressed_vertex.translation = TAG.read_point_3d(input_stream, TAG, tag_format.XMLData(compressed_vertex_element_node, "position"), True)
-                compressed_vertex.normal = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(compressed_vertex_element_node, "normal[11.11.10-bit]"))
-                compressed_vertex.binormal = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(compressed_vertex_element_node, "binormal[11.11.10-bit]"))
-                compressed_vertex.tangent = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(compressed_vertex_element_node, "tangent[11.11.10-bit]"))
-                U = TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(compressed_vertex_element_node, "texture coordinate u[16-bit]"))
-                V = TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(compressed_vertex_element_node, "texture coordinate v[16-bit]"))
-                compressed_vertex.UV = (U, V)
-                compressed_vertex.node_0_index = TAG.read_signed_byte(input_stream, TAG, tag_format.XMLData(compressed_vertex_element_node, "node0 index(x3)"))
-                compressed_vertex.node_1_index = TAG.read_signed_byte(input_stream, TAG, tag_format.XMLData(compressed_vertex_element_node, "node1 index(x3)"))
-                compressed_vertex.node_0_weight = TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(compressed_vertex_element_node, "node0 weight[16-bit]"))
-
-                part.compressed_vertices.append(compressed_vertex)
-
-            for triangle_idx in range(part.triangles_tag_block.count):
-                triangle_element_node = None
-                if XML_OUTPUT:
-                    triangle_element_node = TAG.xml_doc.createElement('element')
-                    triangle_element_node.setAttribute('index', str(triangle_idx))
-                    triangle_node.appendChild(triangle_element_node)
+            part.uncompressed_vertices = UNCOMPRESSED_VERTEX_LAYOUT.read(input_stream, TAG, part.uncompressed_vertices_tag_block.count, MODEL.Vertices, uncompressed_vertex_node, VERTEX_COLUMNS)
 
-                triangle = MODEL.Triangle()
-                triangle.v0 = TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(triangle_element_node, "vertex0 index"))
-                triangle.v1 = TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(triangle_element_node, "vertex1 index"))
-                triangle.v2 = TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(triangle_element_node, "vertex2 index"))
+            part.compressed_vertices = COMPRESSED_VERTEX_LAYOUT.read(input_stream, TAG, part.compressed_vertices_tag_block.count, MODEL.Vertices, compressed_vertex_node, VERTEX_COLUMNS)
 
-                part.triangles.append(triangle)
+            part.triangles = TRIANGLE_LAYOUT.read(input_stream, TAG, part.triangles_tag_block.count, MODEL.Triangle, triangle_node)
 
     MODEL.shaders = []
     shader_node = tag_format.get_xml_node(XML_OUTPUT, MODEL.shaders_tag_block.count, tag_node, "name", "shaders")
@@ -377,11 +357,8 @@ def process_file(input_stream, report):
         report({'WARNING'}, "%s elements left after parse end" % (EOF - current_position))
 
     if XML_OUTPUT:
-        xml_str = TAG.xml_doc.toprettyxml(indent ="\t")
-
         save_path_file = tag_format.get_xml_path(input_stream.name, MODEL.header.tag_group, TAG.is_legacy)
 
-        with open(save_path_file, "w") as f:
-            f.write(xml_str)
+        TAG.xml_doc.write_xml(save_path_file)
 
     return MODEL
@@ -29,9 +29,8 @@ import bpy
 import copy
 import struct
 import binascii
+import numpy as np
 
-from math import sqrt
-from xml.dom import minidom
 from mathutils import Vector, Matrix, Quaternion, Euler
 from ....global_functions import tag_format, global_functions
 from .format import AnimationAsset, AnimationTagFlags, FunctionEnum, FunctionControlsEnum, NodeJointFlags, AnimationTypeEnum, AnimationFrameInfoTypeEnum, AnimationFlags
@@ -303,368 +302,178 @@ def apply_root_node_info_to_states(animation_element, undo=False):
 
     animation_element.frame_info_applied = not undo
 
-def decompress_quaternion48(word_0, word_1, word_2):
-    '''Decompress a ones-signed 6byte quaternion to floats'''
-    comp_rot = (word_2 & 0xFFff) | ((word_1 & 0xFFff)<<16) | ((word_0 & 0xFFff)<<32)
-    w =  comp_rot & 4095
-    k = (comp_rot >> 12) & 4095
-    j = (comp_rot >> 24) & 4095
-    i = (comp_rot >> 36) & 4095
+def decompress_quaternions48(words):
+    '''Decompress an array of ones-signed 6byte quaternions to floats'''
+    words = np.asarray(words, dtype=np.uint64).reshape(-1, 3)
+    comp_rot = (words[:, 2] & 0xFFff) | ((words[:, 1] & 0xFFff) << np.uint64(16)) | ((words[:, 0] & 0xFFff) << np.uint64(32))
+    components = np.stack(((comp_rot >> np.uint64(36)) & 4095,
+                           (comp_rot >> np.uint64(24)) & 4095,
+                           (comp_rot >> np.uint64(12)) & 4095,
+                           comp_rot & 4095), axis=1).astype(np.int64)
+
+    components = np.where(components & 0x800, components - 4095, components).astype(np.float64)
+    lengths = np.sqrt(np.sum(components ** 2, axis=1))
+
     # avoid division by zero
-    if i | j | k | w:
-        if i & 0x800: i -= 4095
-        if j & 0x800: j -= 4095
-        if k & 0x800: k -= 4095
-        if w & 0x800: w -= 4095
-        length = 1.0 / sqrt(i**2 + j**2 + k**2 + w**2)
-        return i * length, j * length, k * length, w * length
-    return 0.0, 0.0, 0.0, 1.0
+    quaternions = np.zeros((len(words), 4), dtype=np.float64)
+    quaternions[:, 3] = 1.0
+    valid = lengths > 0
+    quaternions[valid] = components[valid] / lengths[valid, None]
+
+    return quaternions
 
 def lerp_blend_vectors(v0, v1, ratio):
-    r1 = max(0.0, min(1.0, ratio))
+    r1 = np.clip(ratio, 0.0, 1.0)[..., None]
     r0 = 1.0 - r1
-    return [a*r0 + b*r1 for a, b in zip(v0, v1)]
-
+    return v0 * r0 + v1 * r1
 
 def nlerp_blend_quaternions(q0, q1, ratio):
-    r1 = max(0.0, min(1.0, ratio))
+    r1 = np.clip(ratio, 0.0, 1.0)
     r0 = 1.0 - ratio
 
-    i0, j0, k0, w0 = q0
-    i1, j1, k1, w1 = q1
+    cos_half_theta = np.sum(q0 * q1, axis=-1)
+    # need to change the vector rotations to be 2pi - rot
+    r1 = np.where(cos_half_theta < 0, -r1, r1)
 
-    cos_half_theta = i0*i1 + j0*j1 + k0*k1 + w0*w1
-    if cos_half_theta < 0:
-        # need to change the vector rotations to be 2pi - rot
-        r1 = -r1
+    return q0 * r0[..., None] + q1 * r1[..., None]
 
-    return [i0*r0 + i1*r1, j0*r0 + j1*r1, k0*r0 + k1*r1, w0*r0 + w1*r1]
+def get_keyframe_indices_of_frames(frames, keyframes):
+    # Index of the last keyframe at or before each frame. keyframes must be sorted.
+    return np.searchsorted(keyframes, frames, side='right') - 1
 
-def get_keyframe_index_of_frame(frame, keyframes, keyframe_count=None, offset=0):
-    if keyframe_count is None:
-        keyframe_count = len(keyframes) - offset
+def read_keyframe_array(frame_data, dtype, count, width=1):
+    dtype = np.dtype(dtype)
+    return np.frombuffer(frame_data.read(count * width * dtype.itemsize), dtype=dtype).reshape(count, width)
 
-    # TODO: make this more efficent using a binary search
-    for i in range(offset, offset + keyframe_count - 1):
-        if keyframes[i] <= frame and frame < keyframes[i + 1]:
-            return i
+def read_keyframe_section(frame_data, flags, default_dtype, default_width, data_dtype, data_width, flagged_defaults=False):
+    # Layout is a header for each flagged node, the keyframe numbers of every flagged node, the defaults and then the keyframe data.
+    flagged_count = flags.count(True)
+    keyframe_headers = read_keyframe_array(frame_data, '<u4', flagged_count)[:, 0].astype(np.int64)
+    keyframe_counts = keyframe_headers & 4095
+    keyframe_offsets = keyframe_headers >> 12
 
-    raise ValueError(
-        "No keyframes pairs containing frame %s" % frame)
+    keyframe_total = int(keyframe_counts.sum())
+    keyframes = read_keyframe_array(frame_data, '<u2', keyframe_total)[:, 0].astype(np.int64)
 
-def deserialize_compressed_frame_data(animation_element, frame_data):
-    rot_keyframes_by_nodes = []
-    trans_keyframes_by_nodes = []
-    scale_keyframes_by_nodes = []
+    default_count = len(flags)
+    if flagged_defaults:
+        default_count = flagged_count
 
-    keyframes = (rot_keyframes_by_nodes,
-                 trans_keyframes_by_nodes,
-                 scale_keyframes_by_nodes)
+    default_data = read_keyframe_array(frame_data, default_dtype, default_count, default_width)
+    keyframe_data = read_keyframe_array(frame_data, data_dtype, keyframe_total, data_width)
 
-    # make a bunch of frames we can fill in below
-    frames = [[AnimationAsset.FrameTransform() for n in range(animation_element.node_count)]
-              for f in range(animation_element.frame_count + 1)]
+    return keyframe_counts, keyframe_offsets, keyframes, default_data, keyframe_data
 
-    rot_flags, trans_flags, scale_flags = get_anim_flags(animation_element)
+def interpolate_keyframes(frame_count, flags, keyframe_counts, keyframe_offsets, keyframes, default_data, keyframe_data, blend):
+    # Each node gets its own run of keyframes with its default placed at frame 0 ahead of the stored keyframes. Runs are
+    # searched together by offsetting every node into its own frame range.
+    node_count = len(flags)
+    flagged_nodes = np.flatnonzero(flags)[:len(keyframe_counts)]
 
-    # get the keyframe counts and keyframe offsets
-    frame_data.seek(animation_element.offset_to_compressed_data, 0)
-    translation_keyframe_offset, scale_keyframe_offset = struct.unpack('<12xI12xI12x', frame_data.read(44))
+    node_keyframe_counts = np.zeros(node_count, dtype=np.int64)
+    node_keyframe_offsets = np.zeros(node_count, dtype=np.int64)
+    node_keyframe_counts[flagged_nodes] = keyframe_counts
+    node_keyframe_offsets[flagged_nodes] = keyframe_offsets
 
-    data_size = animation_element.frame_data_tag_data.size
+    run_lengths = node_keyframe_counts + 1
+    run_ends = np.cumsum(run_lengths)
+    run_starts = run_ends - run_lengths
+    run_nodes = np.repeat(np.arange(node_count), run_lengths)
+    run_positions = np.arange(len(run_nodes)) - run_starts[run_nodes]
 
-    rot_keyframes = []
-    trans_keyframes = []
-    scale_keyframes = []
+    is_default = run_positions == 0
+    keyframe_indices = node_keyframe_offsets[run_nodes[~is_default]] + run_positions[~is_default] - 1
 
-    rot_def_data = []
-    trans_def_data = []
-    scale_def_data = [1.0 for node_idx in range(animation_element.node_count)]
+    run_frames = np.zeros(len(run_nodes), dtype=np.int64)
+    run_frames[~is_default] = keyframes[keyframe_indices]
+    run_values = np.empty((len(run_nodes), default_data.shape[1]), dtype=np.float64)
+    run_values[is_default] = default_data
+    run_values[~is_default] = keyframe_data[keyframe_indices]
 
-    rot_keyframe_data = []
-    trans_keyframe_data = []
-    scale_keyframe_data = []
+    stride = max(int(run_frames.max(initial=0)), frame_count) + 1
+    frame_indices = np.arange(frame_count)[:, None]
+    run_indices = get_keyframe_indices_of_frames(np.arange(node_count) * stride + frame_indices, run_nodes * stride + run_frames)
 
-    rot_keyframe_headers   = []
-    trans_keyframe_headers = []
-    scale_keyframe_headers = []
+    # frames at or past the last keyframe repeat it to the end
+    last_indices = run_ends - 1
+    is_last = run_indices == last_indices
+    next_indices = np.minimum(run_indices + 1, last_indices)
 
-    rotation_offset = animation_element.offset_to_compressed_data + 44
-    if data_size > rotation_offset:
-        frame_data.seek(rotation_offset, 0)
-        for node_idx in range(animation_element.node_count):
-            if rot_flags[node_idx] == True:
-                rotation_keyframe_count = struct.unpack('<I', frame_data.read(4))[0]
-                header = (rotation_keyframe_count & 4095, rotation_keyframe_count >> 12)
-                rot_keyframe_headers.append(header)
+    frame_0 = run_frames[run_indices]
+    frame_1 = run_frames[next_indices]
+    ratio = np.where(is_last, 0.0, (frame_indices - frame_0) / np.where(is_last, 1, frame_1 - frame_0))
 
-        index = 0
-        for node_idx in range(animation_element.node_count):
-            if rot_flags[node_idx] == True:
-                rotation_keyframe_count = rot_keyframe_headers[index][0]
-                for rotation_frame in range(rotation_keyframe_count):
-                    rot_keyframes.append(struct.unpack('<H', frame_data.read(2))[0])
+    values = blend(run_values[run_indices], run_values[next_indices], ratio)
 
-                index += 1
+    # first frame only uses default data
+    if frame_count > 0:
+        values[0] = default_data
 
-        for node_idx in range(animation_element.node_count):
-            default_x, default_y, default_z = struct.unpack('<HHH', frame_data.read(6))
-            rot_def_data.append(default_x)
-            rot_def_data.append(default_y)
-            rot_def_data.append(default_z)
+    return values
 
-        index = 0
-        for node_idx in range(animation_element.node_count):
-            if rot_flags[node_idx] == True:
-                rotation_keyframe_count = rot_keyframe_headers[index][0]
-                for rotation_frame in range(rotation_keyframe_count):
-                    x, y, z = struct.unpack('<HHH', frame_data.read(6))
-                    rot_keyframe_data.append(x)
-                    rot_keyframe_data.append(y)
-                    rot_keyframe_data.append(z)
+def deserialize_compressed_frame_data(animation_element, frame_data):
+    node_count = animation_element.node_count
+    frame_count = animation_element.frame_count
 
-                index += 1
+    # make a bunch of frames we can fill in below
+    frames = [[AnimationAsset.FrameTransform() for n in range(node_count)]
+              for f in range(frame_count + 1)]
 
-    translation_offset = animation_element.offset_to_compressed_data + translation_keyframe_offset
-    if data_size > translation_offset:
-        frame_data.seek(translation_offset, 0)
-        for node_idx in range(animation_element.node_count):
-            if trans_flags[node_idx] == True:
-                translation_keyframe_count = struct.unpack('<I', frame_data.read(4))[0]
-                header = (translation_keyframe_count & 4095, translation_keyframe_count >> 12)
-                trans_keyframe_headers.append(header)
+    rot_flags, trans_flags, scale_flags = get_anim_flags(animation_element)
 
-        index = 0
-        for node_idx in range(animation_element.node_count):
-            if trans_flags[node_idx] == True:
-                translation_keyframe_count = trans_keyframe_headers[index][0]
-                for translation_frame in range(translation_keyframe_count):
-                    trans_keyframes.append(struct.unpack('<H', frame_data.read(2))[0])
+    # get the keyframe counts and keyframe offsets
+    frame_data.seek(animation_element.offset_to_compressed_data, 0)
+    translation_keyframe_offset, scale_keyframe_offset = struct.unpack('<12xI12xI12x', frame_data.read(44))
 
-                index += 1
+    data_size = animation_element.frame_data_tag_data.size
 
-        for node_idx in range(animation_element.node_count):
-            default_x, default_y, default_z = struct.unpack('<fff', frame_data.read(12))
-            trans_def_data.append(default_x)
-            trans_def_data.append(default_y)
-            trans_def_data.append(default_z)
+    empty_headers = np.zeros(0, dtype=np.int64)
+    rot_section = (empty_headers, empty_headers, empty_headers, np.zeros((node_count, 3), dtype=np.uint16), np.zeros((0, 3), dtype=np.uint16))
+    trans_section = (empty_headers, empty_headers, empty_headers, np.zeros((node_count, 3), dtype=np.float32), np.zeros((0, 3), dtype=np.float32))
+    scale_section = (empty_headers, empty_headers, empty_headers, np.zeros((0, 1), dtype=np.float32), np.zeros((0, 1), dtype=np.float32))
 
-        index = 0
-        for node_idx in range(animation_element.node_count):
-            if trans_flags[node_idx] == True:
-                translation_keyframe_count = trans_keyframe_headers[index][0]
-                for translation_frame in range(translation_keyframe_count):
-                    x, y, z = struct.unpack('<fff', frame_data.read(12))
-                    trans_keyframe_data.append(x)
-                    trans_keyframe_data.append(y)
-                    trans_keyframe_data.append(z)
+    rotation_offset = animation_element.offset_to_compressed_data + 44
+    if data_size > rotation_offset:
+        frame_data.seek(rotation_offset, 0)
+        rot_section = read_keyframe_section(frame_data, rot_flags, '<u2', 3, '<u2', 3)
 
-                index += 1
+    translation_offset = animation_element.offset_to_compressed_data + translation_keyframe_offset
+    if data_size > translation_offset:
+        frame_data.seek(translation_offset, 0)
+        trans_section = read_keyframe_section(frame_data, trans_flags, '<f4', 3, '<f4', 3)
 
     scale_offset = animation_element.offset_to_compressed_data + scale_keyframe_offset
     if data_size > scale_offset:
         frame_data.seek(scale_offset, 0)
-        for node_idx in range(animation_element.node_count):
-            if scale_flags[node_idx] == True:
-                scale_keyframe_count = struct.unpack('<I', frame_data.read(4))[0]
-                header = (scale_keyframe_count & 4095, scale_keyframe_count >> 12)
-                scale_keyframe_headers.append(header)
-        index = 0
-        for node_idx in range(animation_element.node_count):
-            if scale_flags[node_idx] == True:
-                scale_keyframe_count = scale_keyframe_headers[index][0]
-                for scale_frame in range(scale_keyframe_count):
-                    scale_keyframes.append(struct.unpack('<H', frame_data.read(2))[0])
+        scale_section = read_keyframe_section(frame_data, scale_flags, '<f4', 1, '<f4', 1, True)
 
-                index += 1
+    rot_kf_cts, rot_kf_offs, rot_keyframes, rot_def_data, rot_keyframe_data = rot_section
+    rot_def_data = decompress_quaternions48(rot_def_data)
+    rot_keyframe_data = decompress_quaternions48(rot_keyframe_data)
 
-        for node_idx in range(animation_element.node_count):
-            if scale_flags[node_idx] == True:
-                default_scale = struct.unpack('<f', frame_data.read(4))[0]
-                scale_def_data[node_idx] = default_scale
+    # scale defaults are only stored for flagged nodes
+    scale_kf_cts, scale_kf_offs, scale_keyframes, flagged_scale_def_data, scale_keyframe_data = scale_section
+    scale_def_data = np.ones((node_count, 1), dtype=np.float64)
+    scale_def_data[np.flatnonzero(scale_flags)[:len(flagged_scale_def_data)]] = flagged_scale_def_data
 
-        index = 0
-        for node_idx in range(animation_element.node_count):
-            if scale_flags[node_idx] == True:
-                scale_keyframe_count = scale_keyframe_headers[index][0]
-                for scale_frame in range(scale_keyframe_count):
-                    scale = struct.unpack('<f', frame_data.read(4))[0]
-                    scale_keyframe_data.append(scale)
-
-                index += 1
-
-    decomp_quat = decompress_quaternion48
-    blend_trans = lerp_blend_vectors
-    blend_quats = nlerp_blend_quaternions
-
-    ri = ti = si = 0
-    for ni in range(animation_element.node_count):
-        rot_kf_ct  = trans_kf_ct  = scale_kf_ct  = 0
-        rot_kf_off = trans_kf_off = scale_kf_off = 0
-
-        rot_def = decomp_quat(*rot_def_data[3 * ni: 3 * (ni + 1)])
-        trans_def = trans_def_data[3 * ni: 3 * (ni + 1)]
-        scale_def = 1.0
-
-        if rot_flags[ni]:
-            rot_kf_ct, rot_kf_off = rot_keyframe_headers[ri]
-            ri += 1
-
-        if trans_flags[ni]:
-            trans_kf_ct, trans_kf_off = trans_keyframe_headers[ti]
-            ti += 1
-
-        if scale_flags[ni]:
-            scale_kf_ct, scale_kf_off = scale_keyframe_headers[si]
-            si += 1
-            scale_def = scale_def_data[ni]
-
-        # add this nodes keyframes to the keyframe lists in the jma_anim
-        for kf_ct, kf_off, all_kfs, kfs_by_nodes in (
-                (rot_kf_ct, rot_kf_off, rot_keyframes,
-                 rot_keyframes_by_nodes),
-                (trans_kf_ct, trans_kf_off, trans_keyframes,
-                 trans_keyframes_by_nodes),
-                (scale_kf_ct, scale_kf_off, scale_keyframes,
-                 scale_keyframes_by_nodes)):
-            kfs_by_nodes.append(list(all_kfs[kf_off: kf_off + kf_ct]))
-
-
-        if rot_kf_ct:
-            rot_first_kf = rot_keyframes[rot_kf_off]
-            rot_last_kf  = rot_keyframes[rot_kf_off + rot_kf_ct - 1]
-            rot_first = decomp_quat(*rot_keyframe_data[
-                3 * rot_kf_off:
-                3 * (rot_kf_off + 1)])
-            rot_last = decomp_quat(*rot_keyframe_data[
-                3 * (rot_kf_off + rot_kf_ct - 1):
-                3 * (rot_kf_off + rot_kf_ct)])
-
-        if trans_kf_ct:
-            trans_first_kf = trans_keyframes[trans_kf_off]
-            trans_last_kf  = trans_keyframes[trans_kf_off + trans_kf_ct - 1]
-            trans_first = trans_keyframe_data[
-                3 * trans_kf_off:
-                3 * (trans_kf_off + 1)]
-            trans_last = trans_keyframe_data[
-                3 * (trans_kf_off + trans_kf_ct - 1):
-                3 * (trans_kf_off + trans_kf_ct)]
-
-        if scale_kf_ct:
-            scale_first_kf = scale_keyframes[scale_kf_off]
-            scale_last_kf  = scale_keyframes[scale_kf_off + scale_kf_ct - 1]
-            scale_first = scale_keyframe_data[scale_kf_off]
-            scale_last  = scale_keyframe_data[scale_kf_off + scale_kf_ct - 1]
-
-        for fi in range(animation_element.frame_count):
+    rotations = interpolate_keyframes(frame_count, rot_flags, rot_kf_cts, rot_kf_offs, rot_keyframes, rot_def_data, rot_keyframe_data, nlerp_blend_quaternions)
+    translations = interpolate_keyframes(frame_count, trans_flags, *trans_section, lerp_blend_vectors)
+    scales = interpolate_keyframes(frame_count, scale_flags, scale_kf_cts, scale_kf_offs, scale_keyframes, scale_def_data, scale_keyframe_data, lerp_blend_vectors)
+
+    nmag = np.sqrt(np.sum(rotations ** 2, axis=-1))
+    has_rotation = (nmag > 0).tolist()
+    rotations = (rotations[..., (3, 0, 1, 2)] / np.where(nmag > 0, nmag, 1.0)[..., None]).tolist()
+    translations = (translations * 100).tolist()
+    scales = scales[..., 0].tolist()
+
+    for fi in range(frame_count):
+        for ni in range(node_count):
             node_frame = frames[fi][ni]
+            if has_rotation[fi][ni]:
+                node_frame.rotation = Quaternion(rotations[fi][ni])
 
-            if not rot_kf_ct or fi == 0:
-                # first frame OR only default data stored for this node
-                i, j, k, w = rot_def
-            elif fi == rot_last_kf:
-                # frame is the last keyframe. repeat it to the end
-                i, j, k, w = rot_last
-            elif fi < rot_first_kf:
-                # frame is before the first stored keyframe.
-                # blend from default data to first keyframe.
-                i, j, k, w = blend_quats(
-                    rot_def, rot_first, fi / rot_first_kf)
-            else:
-                # frame is at/past the first stored keyframe.
-                # don't need to use default data at all.
-                kf_i = get_keyframe_index_of_frame(
-                    fi, rot_keyframes, rot_kf_ct, rot_kf_off)
-                kf0 = rot_keyframes[kf_i]
-                q0 = decomp_quat(
-                    *rot_keyframe_data[kf_i * 3: (kf_i + 1) * 3])
-
-                if fi == kf0:
-                    # this keyframe is the frame we want.
-                    # no blending required
-                    i, j, k, w = q0
-                else:
-                    kf1 = rot_keyframes[kf_i + 1]
-                    ratio = (fi - kf0) / (kf1 - kf0)
-                    kf_i += 1
-                    q1 = decomp_quat(
-                        *rot_keyframe_data[kf_i * 3: (kf_i + 1) * 3])
-                    i, j, k, w = blend_quats(q0, q1, ratio)
-
-
-            if not trans_kf_ct or fi == 0:
-                # first frame OR only default data stored for this node
-                x, y, z = trans_def
-            elif fi == trans_last_kf:
-                # frame is the last keyframe. repeat it to the end
-                x, y, z = trans_last
-            elif fi < trans_first_kf:
-                # frame is before the first stored keyframe.
-                # blend from default data to first keyframe.
-                x, y, z = blend_trans(
-                    trans_def, trans_first, fi / trans_first_kf)
-            else:
-                # frame is at/past the first stored keyframe.
-                # don't need to use default data at all.
-                kf_i = get_keyframe_index_of_frame(
-                    fi, trans_keyframes, trans_kf_ct, trans_kf_off)
-                kf0 = trans_keyframes[kf_i]
-                p0 = trans_keyframe_data[kf_i * 3: (kf_i + 1) * 3]
-
-                if fi == kf0:
-                    # this keyframe is the frame we want.
-                    # no blending required
-                    x, y, z = p0
-                else:
-                    kf1 = trans_keyframes[kf_i + 1]
-                    ratio = (fi - kf0) / (kf1 - kf0)
-
-                    kf_i += 1
-                    p1 = trans_keyframe_data[kf_i * 3: (kf_i + 1) * 3]
-                    x, y, z = blend_trans(p0, p1, ratio)
-
-
-            if not scale_kf_ct or fi == 0:
-                # first frame OR only default data stored for this node
-                scale = scale_def
-            elif fi == scale_last_kf:
-                # frame is the last keyframe. repeat it to the end
-                scale = scale_last
-            elif fi < scale_first_kf:
-                # frame is before the first stored keyframe.
-                # blend from default data to first keyframe.
-                ratio = fi / scale_first_kf
-                scale = scale_def * (1 - ratio) + scale_first * ratio
-            else:
-                # frame is at/past the first stored keyframe.
-                # don't need to use default data at all.
-                kf_i = get_keyframe_index_of_frame(
-                    fi, scale_keyframes, scale_kf_ct, scale_kf_off)
-
-                if fi == kf0:
-                    # this keyframe is the frame we want.
-                    # no blending required
-                    scale = scale_keyframes[kf_i]
-                else:
-                    ratio = ((fi - scale_keyframes[kf_i]) /
-                             (scale_keyframes[kf_i + 1] -
-                              scale_keyframes[kf_i]))
-                    scale = (
-                        scale_keyframe_data[kf_i] * (1 - ratio) +
-                        scale_keyframe_data[kf_i + 1] * ratio)
-
-
-            nmag = i**2 + j**2 + k**2 + w**2
-            if nmag:
-                nmag = 1 / sqrt(nmag)
-                i = i * nmag
-                j = j * nmag
-                k = k * nmag
-                w = w * nmag
-                node_frame.rotation = Quaternion((w, i, j, k))
-
-            node_frame.translation = Vector((x, y, z)) * 100
-            node_frame.scale = scale
+            node_frame.translation = Vector(translations[fi][ni])
+            node_frame.scale = scales[fi][ni]
 
     if not AnimationTypeEnum(animation_element.type) == AnimationTypeEnum.overlay:
         # duplicate the first frame to the last frame for non-overlays
@@ -1161,9 +970,9 @@ def get_animation_data(input_stream, ANIMATION, TAG, node_element, transforms):
         default_data_node = tag_format.get_xml_node(XML_OUTPUT, animation_element.frame_count, animation_element_node, "name", "default data")
         frame_data_node = tag_format.get_xml_node(XML_OUTPUT, animation_element.frame_count, animation_element_node, "name", "frame data")
         if XML_OUTPUT:
-            frame_info_field_text = minidom.Document().createTextNode("checksum: %s" % str(hex(frame_info_crc32)).split("0x", 1)[1])
-            default_field_text = minidom.Document().createTextNode("checksum: %s" % str(hex(default_data_crc32)).split("0x", 1)[1])
-            frame_field_text = minidom.Document().createTextNode("checksum: %s" % str(hex(frame_data_crc32)).split("0x", 1)[1])
+            frame_info_field_text = TAG.xml_doc.createTextNode("checksum: %s" % str(hex(frame_info_crc32)).split("0x", 1)[1])
+            default_field_text = TAG.xml_doc.createTextNode("checksum: %s" % str(hex(default_data_crc32)).split("0x", 1)[1])
+            frame_field_text = TAG.xml_doc.createTextNode("checksum: %s" % str(hex(frame_data_crc32)).split("0x", 1)[1])
             frame_info_node.appendChild(frame_info_field_text)
             default_data_node.appendChild(default_field_text)
             frame_data_node.appendChild(frame_field_text)
@@ -1253,7 +1062,7 @@ def process_file(input_stream, report):
     TAG.is_legacy = False
 
     if XML_OUTPUT:
-        TAG.xml_doc = minidom.Document()
+        TAG.xml_doc = tag_format.XMLStreamDocument()
 
     ANIMATION.header = TAG.Header().read(input_stream, TAG)
 
@@ -1285,11 +1094,8 @@ def process_file(input_stream, report):
         report({'WARNING'}, "%s elements left after parse end" % (EOF - current_position))
 
     if XML_OUTPUT:
-        xml_str = TAG.xml_doc.toprettyxml(indent ="\t")
-
         save_path_file = tag_format.get_xml_path(input_stream.name, ANIMATION.header.tag_group, TAG.is_legacy)
 
-        with open(save_path_file, "w") as f:
-            f.write(xml_str)
+        TAG.xml_doc.write_xml(save_path_file)
 
     return ANIMATION
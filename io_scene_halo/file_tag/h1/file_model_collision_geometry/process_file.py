@@ -24,18 +24,37 @@
 #
 # ##### END MIT LICENSE BLOCK #####
 
-from xml.dom import minidom
 from ....global_functions import tag_format
 from .format import CollisionAsset, CollisionFlags, MaterialTypeEnum, ShieldFailureFunctionEnum, MaterialFlags, RegionFlags, LeafFlags, SurfaceFlags
 
 XML_OUTPUT = False
 
+BSP3D_NODE_LAYOUT = tag_format.TagBlockLayout(12, (
+    ("plane", "plane", "signed_integer", 0),
+    ("back_child", "back child", "signed_integer", 4),
+    ("front_child", "front child", "signed_integer", 8),
+    ))
+
+EDGE_LAYOUT = tag_format.TagBlockLayout(24, (
+    ("start_vertex", "start vertex", "signed_integer", 0),
+    ("end_vertex", "end vertex", "signed_integer", 4),
+    ("forward_edge", "forward edge", "signed_integer", 8),
+    ("reverse_edge", "reverse edge", "signed_integer", 12),
+    ("left_surface", "left surface", "signed_integer", 16),
+    ("right_surface", "right surface", "signed_integer", 20),
+    ))
+
+VERTEX_LAYOUT = tag_format.TagBlockLayout(16, (
+    ("translation", "position", "point_3d", 0, True),
+    ("first_edge", "first edge", "signed_integer", 12),
+    ))
+
 def process_file(input_stream, report):
     TAG = tag_format.TagAsset()
     COLLISION = CollisionAsset()
 
     if XML_OUTPUT:
-        TAG.xml_doc = minidom.Document()
+        TAG.xml_doc = tag_format.XMLStreamDocument()
 
     COLLISION.header = TAG.Header().read(input_stream, TAG)
     # refinery extracted stubbs the zombie model_collision
@@ -314,19 +333,7 @@ def process_file(input_stream, report):
             surface_node = tag_format.get_xml_node(XML_OUTPUT, bsp.surfaces_tag_block.count, bsp_element_node, "name", "surfaces")
             edge_node = tag_format.get_xml_node(XML_OUTPUT, bsp.edges_tag_block.count, bsp_element_node, "name", "edges")
             vertex_node = tag_format.get_xml_node(XML_OUTPUT, bsp.vertices_tag_block.count, bsp_element_node, "name", "vertices")
-            for bsp3d_node_idx in range(bsp.bsp3d_nodes_tag_block.count):
-                bsp3d_element_node = None
-                if XML_OUTPUT:
-                    bsp3d_element_node = TAG.xml_doc.createElement('element')
-                    bsp3d_element_node.setAttribute('index', str(bsp3d_node_idx))
-                    bsp3d_node.appendChild(bsp3d_element_node)
-
-                bsp_3d_node = COLLISION.BSP3DNode()
-                bsp_3d_node.plane = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(bsp3d_element_node, "plane"))
-                bsp_3d_node.back_child = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(bsp3d_element_node, "back child"))
-                bsp_3d_node.front_child = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(bsp3d_element_node, "front child"))
-
-                bsp.bsp_3d_nodes.append(bsp_3d_node)
+            bsp.bsp_3d_nodes = BSP3D_NODE_LAYOUT.read(input_stream, TAG, bsp.bsp3d_nodes_tag_block.count, COLLISION.BSP3DNode, bsp3d_node)
 
             for plane_idx in range(bsp.planes_tag_block.count):
                 plane_element_node = None
@@ -394,35 +401,9 @@ def process_file(input_stream, report):
 
                 bsp.surfaces.append(surface)
 
-            for edge_idx in range(bsp.edges_tag_block.count):
-                edge_element_node = None
-                if XML_OUTPUT:
-                    edge_element_node = TAG.xml_doc.createElement('element')
-                    edge_element_node.setAttribute('index', str(edge_idx))
-                    edge_node.appendChild(edge_element_node)
-
-                edge = COLLISION.Edge()
-                edge.start_vertex = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(surface_element_node, "start vertex"))
-                edge.end_vertex = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(surface_element_node, "end vertex"))
-                edge.forward_edge = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(surface_element_node, "forward edge"))
-                edge.reverse_edge = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(surface_element_node, "reverse edge"))
-                edge.left_surface = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(surface_element_node, "left surface"))
-                edge.right_surface = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(surface_element_node, "right surface"))
-
-                bsp.edges.append(edge)
-
-            for vertex_idx in range(bsp.vertices_tag_block.count):
-                vertex_element_node = None
-                if XML_OUTPUT:
-                    vertex_element_node = TAG.xml_doc.createElement('element')
-                    vertex_element_node.setAttribute('index', str(vertex_idx))
-                    vertex_node.appendChild(vertex_element_node)
+            bsp.edges = EDGE_LAYOUT.read(input_stream, TAG, bsp.edges_tag_block.count, COLLISION.Edge, edge_node)
 
-                vertex = COLLISION.Vertex()
-                vertex.translation = TAG.read_point_3d(input_stream, TAG, tag_format.XMLData(vertex_element_node, "position"), True)
-                vertex.first_edge = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(vertex_element_node, "first edge"))
-
-                bsp.vertices.append(vertex)
+            bsp.vertices = VERTEX_LAYOUT.read(input_stream, TAG, bsp.vertices_tag_block.count, COLLISION.Vertex, vertex_node)
 
     current_position = input_stream.tell()
     EOF = input_stream.seek(0, 2)
@@ -430,11 +411,8 @@ def process_file(input_stream, report):
         report({'WARNING'}, "%s elements left after parse end" % (EOF - current_position))
 
     if XML_OUTPUT:
-        xml_str = TAG.xml_doc.toprettyxml(indent ="\t")
-
         save_path_file = tag_format.get_xml_path(input_stream.name, COLLISION.header.tag_group, TAG.is_legacy)
 
-        with open(save_path_file, "w") as f:
-            f.write(xml_str)
+        TAG.xml_doc.write_xml(save_path_file)
 
     return COLLISION
@@ -24,7 +24,6 @@
 #
 # ##### END MIT LICENSE BLOCK #####
 
-from xml.dom import minidom
 from ....global_functions import tag_format
 from .format import ScaleEnum, ColorEnum, FunctionFlags, FunctionScaleEnum, FunctionEnum, MapEnum, BoundsModeEnum, ColorChangeFlags, ResourceTypeEnum
 
@@ -26,11 +26,13 @@
 
 import os
 import bpy
+import copy
 import bmesh
 
 from mathutils import Vector
 from ....h1.file_model.format import ModelFlags
-from .....global_functions import shader_processing
+from ....h1.file_model.build_mesh import uncompress_vertex_columns
+from .....global_functions import shader_processing, tag_format
 
 def decompress_normal32(n):
     i = (n&1023) / 1023
@@ -43,15 +45,23 @@ def decompress_normal32(n):
     return Vector((i, j, k))
 
 def uncompress_vertices(compressed_vertices):
-    for vertex in compressed_vertices:
-        vertex.normal = decompress_normal32(vertex.normal)
-        vertex.binormal = decompress_normal32(vertex.binormal)
-        vertex.tangent = decompress_normal32(vertex.tangent)
-        vertex.UV = ((vertex.UV[0] / 32767), (vertex.UV[1] /32767))
-        vertex.node_0_index = int(vertex.node_0_index / 3)
-        vertex.node_1_index = int(vertex.node_1_index / 3)
-        vertex.node_0_weight = vertex.node_0_weight / 32767
+    if isinstance(compressed_vertices, tag_format.TagBlockColumns):
+        return uncompress_vertex_columns(compressed_vertices)
+
+    vertices = []
+    for compressed_vertex in compressed_vertices:
+        vertex = copy.copy(compressed_vertex)
+        vertex.normal = decompress_normal32(compressed_vertex.normal)
+        vertex.binormal = decompress_normal32(compressed_vertex.binormal)
+        vertex.tangent = decompress_normal32(compressed_vertex.tangent)
+        vertex.UV = ((compressed_vertex.UV[0] / 32767), (compressed_vertex.UV[1] /32767))
+        vertex.node_0_index = int(compressed_vertex.node_0_index / 3)
+        vertex.node_1_index = int(compressed_vertex.node_1_index / 3)
+        vertex.node_0_weight = compressed_vertex.node_0_weight / 32767
         vertex.node_1_weight = 1 - vertex.node_0_weight
+        vertices.append(vertex)
+
+    return vertices
 
 def build_mesh_layout(asset, geometry, region_name, random_color_gen, object_mesh, materials):
     is_triangle_list = False
@@ -73,8 +83,7 @@ def build_mesh_layout(asset, geometry, region_name, random_color_gen, object_mes
 
         vertex_data = part.uncompressed_vertices
         if len(vertex_data) == 0:
-            uncompress_vertices(part.compressed_vertices)
-            vertex_data = part.compressed_vertices
+            vertex_data = uncompress_vertices(part.compressed_vertices)
 
         triangle_indices = []
         triangles = []
@@ -235,6 +244,7 @@ def get_object(collection, import_file, game_version, object_name, random_color_
     if (4, 1, 0) > bpy.app.version:
         object_mesh.data.use_auto_smooth = True
 
+    visited_geometries = set()
     for region in import_file.regions:
         region_name = "unnamed"
         if not region_name == "__unnamed":
@@ -242,8 +252,8 @@ def get_object(collection, import_file, game_version, object_name, random_color_
 
         for permutation in region.permutations:
             superhigh_geometry_index = permutation.superhigh_geometry_block
-            if not superhigh_geometry_index == -1 and superhigh_geometry_index < geometry_count and not import_file.geometries[superhigh_geometry_index].visited:
-                import_file.geometries[superhigh_geometry_index].visited = True
+            if not superhigh_geometry_index == -1 and superhigh_geometry_index < geometry_count and not superhigh_geometry_index in visited_geometries:
+                visited_geometries.add(superhigh_geometry_index)
                 superhigh_geometry = import_file.geometries[superhigh_geometry_index]
                 build_mesh_layout(import_file, superhigh_geometry, region_name, random_color_gen, object_mesh, materials)
 
@@ -26,12 +26,39 @@
 
 import struct
 
-from xml.dom import minidom
 from mathutils import Vector, Quaternion
 from ....global_functions import tag_format
 from .format import LevelAsset, LeafFlags, SurfaceFlags
+from ..file_model_collision_geometry.process_file import BSP3D_NODE_LAYOUT, EDGE_LAYOUT, VERTEX_LAYOUT
 
 XML_OUTPUT = False
+VERTEX_COLUMNS = True
+
+UNCOMPRESSED_RENDER_VERTEX_LAYOUT = tag_format.TagBlockLayout(56, (
+    ("translation", "position", "point_3d", 0, True),
+    ("normal", "normal", "vector", 12),
+    ("binormal", "binormal", "vector", 24),
+    ("tangent", "tangent", "vector", 36),
+    ("UV", "uv", "point_2d", 48),
+    ))
+
+UNCOMPRESSED_LIGHTMAP_VERTEX_LAYOUT = tag_format.TagBlockLayout(20, (
+    ("normal", "normal", "vector", 0),
+    ("UV", "uv", "point_2d", 12),
+    ))
+
+COMPRESSED_RENDER_VERTEX_LAYOUT = tag_format.TagBlockLayout(32, (
+    ("translation", "position", "point_3d", 0, True),
+    ("normal", "normal", "unsigned_integer", 12),
+    ("binormal", "binormal", "unsigned_integer", 16),
+    ("tangent", "tangent", "unsigned_integer", 20),
+    ("UV", "uv", "point_2d", 24),
+    ))
+
+COMPRESSED_LIGHTMAP_VERTEX_LAYOUT = tag_format.TagBlockLayout(8, (
+    ("normal", "normal", "unsigned_integer", 0),
+    ("UV", "uv", "point_2d_short", 4),
+    ))
 
 def get_collision_material(input_stream, LEVEL, TAG, node_element):
     collision_material = LEVEL.CollisionMaterial()
@@ -59,7 +86,7 @@ def process_file(input_stream, report):
     TAG.is_legacy = False
 
     if XML_OUTPUT:
-        TAG.xml_doc = minidom.Document()
+        TAG.xml_doc = tag_format.XMLStreamDocument()
 
     LEVEL.header = TAG.Header().read(input_stream, TAG)
 
@@ -208,19 +235,7 @@ def process_file(input_stream, report):
         surface_node = tag_format.get_xml_node(XML_OUTPUT, collision_bsp.surfaces_tag_block.count, collision_bsp_element_node, "name", "surfaces")
         edge_node = tag_format.get_xml_node(XML_OUTPUT, collision_bsp.edges_tag_block.count, collision_bsp_element_node, "name", "edges")
         vertex_node = tag_format.get_xml_node(XML_OUTPUT, collision_bsp.vertices_tag_block.count, collision_bsp_element_node, "name", "vertices")
-        for bsp3d_node_idx in range(collision_bsp.bsp3d_nodes_tag_block.count):
-            bsp3d_node_element_node = None
-            if XML_OUTPUT:
-                bsp3d_node_element_node = TAG.xml_doc.createElement('element')
-                bsp3d_node_element_node.setAttribute('index', str(bsp3d_node_idx))
-                bsp3d_node.appendChild(bsp3d_node_element_node)
-
-            bsp_3d_node = LEVEL.BSP3DNode()
-            bsp_3d_node.plane = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(bsp3d_node_element_node, "plane"))
-            bsp_3d_node.back_child = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(bsp3d_node_element_node, "back child"))
-            bsp_3d_node.front_child = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(bsp3d_node_element_node, "front child"))
-
-            collision_bsp.bsp3d_nodes.append(bsp_3d_node)
+        collision_bsp.bsp3d_nodes = BSP3D_NODE_LAYOUT.read(input_stream, TAG, collision_bsp.bsp3d_nodes_tag_block.count, LEVEL.BSP3DNode, bsp3d_node)
 
         for plane_idx in range(collision_bsp.planes_tag_block.count):
             plane_element_node = None
@@ -288,35 +303,9 @@ def process_file(input_stream, report):
 
             collision_bsp.surfaces.append(surface)
 
-        for edge_idx in range(collision_bsp.edges_tag_block.count):
-            edge_element_node = None
-            if XML_OUTPUT:
-                edge_element_node = TAG.xml_doc.createElement('element')
-                edge_element_node.setAttribute('index', str(edge_idx))
-                edge_node.appendChild(edge_element_node)
-
-            edge = LEVEL.Edge()
-            edge.start_vertex = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(surface_element_node, "start vertex"))
-            edge.end_vertex = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(surface_element_node, "end vertex"))
-            edge.forward_edge = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(surface_element_node, "forward edge"))
-            edge.reverse_edge = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(surface_element_node, "reverse edge"))
-            edge.left_surface = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(surface_element_node, "left surface"))
-            edge.right_surface = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(surface_element_node, "right surface"))
-
-            collision_bsp.edges.append(edge)
-
-        for vertex_idx in range(collision_bsp.vertices_tag_block.count):
-            vertex_element_node = None
-            if XML_OUTPUT:
-                vertex_element_node = TAG.xml_doc.createElement('element')
-                vertex_element_node.setAttribute('index', str(vertex_idx))
-                vertex_node.appendChild(vertex_element_node)
-
-            vertex = LEVEL.Vertex()
-            vertex.translation = TAG.read_point_3d(input_stream, TAG, tag_format.XMLData(vertex_element_node, "position"), True)
-            vertex.first_edge = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(vertex_element_node, "first edge"))
+        collision_bsp.edges = EDGE_LAYOUT.read(input_stream, TAG, collision_bsp.edges_tag_block.count, LEVEL.Edge, edge_node)
 
-            collision_bsp.vertices.append(vertex)
+        collision_bsp.vertices = VERTEX_LAYOUT.read(input_stream, TAG, collision_bsp.vertices_tag_block.count, LEVEL.Vertex, vertex_node)
 
     nodes_node = tag_format.get_xml_node(XML_OUTPUT, LEVEL.nodes_tag_block.count, tag_node, "name", "nodes")
     for node_idx in range(LEVEL.nodes_tag_block.count):
@@ -482,63 +471,13 @@ def process_file(input_stream, report):
 
             TAG.big_endian = False
 
-            for uncompressed_render_vertex_idx in range(material.vertices_count):
-                uncompressed_render_vertex_element_node = None
-                if XML_OUTPUT:
-                    uncompressed_render_vertex_element_node = TAG.xml_doc.createElement('element')
-                    uncompressed_render_vertex_element_node.setAttribute('index', str(uncompressed_render_vertex_idx))
-                    uncompressed_render_element_node.appendChild(uncompressed_render_vertex_element_node)
-
-                uncompressed_render_vertex = LEVEL.Vertices()
-                uncompressed_render_vertex.translation = TAG.read_point_3d(input_stream, TAG, tag_format.XMLData(uncompressed_render_vertex_element_node, "position"), True)
-                uncompressed_render_vertex.normal = TAG.read_vector(input_stream, TAG, tag_format.XMLData(uncompressed_render_vertex_element_node, "normal"))
-                uncompressed_render_vertex.binormal = TAG.read_vector(input_stream, TAG, tag_format.XMLData(uncompressed_render_vertex_element_node, "binormal"))
-                uncompressed_render_vertex.tangent = TAG.read_vector(input_stream, TAG, tag_format.XMLData(uncompressed_render_vertex_element_node, "tangent"))
-                uncompressed_render_vertex.UV = TAG.read_point_2d(input_stream, TAG, tag_format.XMLData(uncompressed_render_vertex_element_node, "uv"))
+            material.uncompressed_render_vertices = UNCOMPRESSED_RENDER_VERTEX_LAYOUT.read(input_stream, TAG, material.vertices_count, LEVEL.Vertices, uncompressed_render_element_node, VERTEX_COLUMNS)
 
-                material.uncompressed_render_vertices.append(uncompressed_render_vertex)
-
-            for uncompressed_lightmap_vertex_idx in range(material.lightmap_vertices_count):
-                uncompressed_lightmap_vertex_element_node = None
-                if XML_OUTPUT:
-                    uncompressed_lightmap_vertex_element_node = TAG.xml_doc.createElement('element')
-                    uncompressed_lightmap_vertex_element_node.setAttribute('index', str(uncompressed_lightmap_vertex_idx))
-                    uncompressed_lightmap_element_node.appendChild(uncompressed_lightmap_vertex_element_node)
+            material.uncompressed_lightmap_vertices = UNCOMPRESSED_LIGHTMAP_VERTEX_LAYOUT.read(input_stream, TAG, material.lightmap_vertices_count, LEVEL.Vertices, uncompressed_lightmap_element_node, VERTEX_COLUMNS)
 
-                uncompressed_lightmap_vertex = LEVEL.Vertices()
-                uncompressed_lightmap_vertex.normal = TAG.read_vector(input_stream, TAG, tag_format.XMLData(uncompressed_lightmap_vertex_element_node, "normal"))
-                uncompressed_lightmap_vertex.UV = TAG.read_point_2d(input_stream, TAG, tag_format.XMLData(uncompressed_lightmap_vertex_element_node, "uv"))
+            material.compressed_render_vertices = COMPRESSED_RENDER_VERTEX_LAYOUT.read(input_stream, TAG, material.vertices_count, LEVEL.Vertices, compressed_render_element_node, VERTEX_COLUMNS)
 
-                material.uncompressed_lightmap_vertices.append(uncompressed_lightmap_vertex)
-
-            for compressed_render_vertex_idx in range(material.vertices_count):
-                compressed_render_vertex_element_node = None
-                if XML_OUTPUT:
-                    compressed_render_vertex_element_node = TAG.xml_doc.createElement('element')
-                    compressed_render_vertex_element_node.setAttribute('index', str(compressed_render_vertex_idx))
-                    compressed_render_element_node.appendChild(compressed_render_vertex_element_node)
-
-                compressed_render_vertex = LEVEL.Vertices()
-                compressed_render_vertex.translation = TAG.read_point_3d(input_stream, TAG, tag_format.XMLData(compressed_render_vertex_element_node, "position"), True)
-                compressed_render_vertex.normal = TAG.read_unsigned_integer(input_stream, TAG, tag_format.XMLData(compressed_render_vertex_element_node, "normal"))
-                compressed_render_vertex.binormal = TAG.read_unsigned_integer(input_stream, TAG, tag_format.XMLData(compressed_render_vertex_element_node, "binormal"))
-                compressed_render_vertex.tangent = TAG.read_unsigned_integer(input_stream, TAG, tag_format.XMLData(compressed_render_vertex_element_node, "tangent"))
-                compressed_render_vertex.UV = TAG.read_point_2d(input_stream, TAG, tag_format.XMLData(compressed_render_vertex_element_node, "uv"))
-
-                material.compressed_render_vertices.append(compressed_render_vertex)
-
-            for compressed_lightmap_vertex_idx in range(material.lightmap_vertices_count):
-                compressed_lightmap_vertex_element_node = None
-                if XML_OUTPUT:
-                    compressed_lightmap_vertex_element_node = TAG.xml_doc.createElement('element')
-                    compressed_lightmap_vertex_element_node.setAttribute('index', str(compressed_lightmap_vertex_idx))
-                    compressed_lightmap_element_node.appendChild(compressed_lightmap_vertex_element_node)
-
-                compressed_lightmap_vertex = LEVEL.Vertices()
-                compressed_lightmap_vertex.normal = TAG.read_unsigned_integer(input_stream, TAG, tag_format.XMLData(compressed_lightmap_vertex_element_node, "normal"))
-                compressed_lightmap_vertex.UV = TAG.read_point_2d_short(input_stream, TAG, tag_format.XMLData(compressed_lightmap_vertex_element_node, "uv"))
-
-                material.compressed_lightmap_vertices.append(compressed_lightmap_vertex)
+            material.compressed_lightmap_vertices = COMPRESSED_LIGHTMAP_VERTEX_LAYOUT.read(input_stream, TAG, material.lightmap_vertices_count, LEVEL.Vertices, compressed_lightmap_element_node, VERTEX_COLUMNS)
 
             TAG.big_endian = True
 
@@ -965,11 +904,8 @@ def process_file(input_stream, report):
         report({'WARNING'}, "%s elements left after parse end" % (EOF - current_position))
 
     if XML_OUTPUT:
-        xml_str = TAG.xml_doc.toprettyxml(indent ="\t")
-
         save_path_file = tag_format.get_xml_path(input_stream.name, LEVEL.header.tag_group, TAG.is_legacy)
 
-        with open(save_path_file, "w") as f:
-            f.write(xml_str)
+        TAG.xml_doc.write_xml(save_path_file)
 
     return LEVEL
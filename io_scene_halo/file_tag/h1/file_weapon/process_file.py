@@ -26,7 +26,6 @@
 
 import os
 
-from xml.dom import minidom
 from ....global_functions import tag_format
 from ..file_object.format import ObjectFlags, ObjectFunctionEnum, ResourceTypeEnum
 from ..file_object.process_file import read_attachments, read_widgets, read_functions, read_change_colors, read_predicted_resources
@@ -398,7 +397,7 @@ def process_file(input_stream, report):
     TAG.is_legacy = False
 
     if XML_OUTPUT:
-        TAG.xml_doc = minidom.Document()
+        TAG.xml_doc = tag_format.XMLStreamDocument()
 
     WEAPON.header = TAG.Header().read(input_stream, TAG)
     tag_node = None
@@ -546,11 +545,8 @@ def process_file(input_stream, report):
         report({'WARNING'}, "%s elements left after parse end" % (EOF - current_position))
 
     if XML_OUTPUT:
-        xml_str = TAG.xml_doc.toprettyxml(indent ="\t")
-
         save_path_file = tag_format.get_xml_path(input_stream.name, WEAPON.header.tag_group, TAG.is_legacy)
 
-        with open(save_path_file, "w") as f:
-            f.write(xml_str)
+        TAG.xml_doc.write_xml(save_path_file)
 
     return WEAPON
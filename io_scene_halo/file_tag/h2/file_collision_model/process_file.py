@@ -24,7 +24,6 @@
 #
 # ##### END MIT LICENSE BLOCK #####
 
-from xml.dom import minidom
 from .format import CollisionAsset, CollisionFlags, ReportTypeEnum, ReportFlags, LeafFlags, SurfaceFlags, PathfindingSphereFlags
 from ....global_functions import tag_format
 
@@ -746,7 +745,7 @@ def process_file(input_stream, report):
     TAG.big_endian = False
 
     if XML_OUTPUT:
-        TAG.xml_doc = minidom.Document()
+        TAG.xml_doc = tag_format.XMLStreamDocument()
 
     COLLISION.header = TAG.Header().read(input_stream, TAG)
 
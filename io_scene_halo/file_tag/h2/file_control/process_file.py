@@ -24,7 +24,6 @@
 #
 # ##### END MIT LICENSE BLOCK #####
 
-from xml.dom import minidom
 from ....global_functions import tag_format
 from ..file_object.format import ObjectFlags, LightmapShadowModeEnum, SweetenerSizeEnum
 from ..file_device.format import DeviceFlags, LightmapFlags
@@ -201,7 +200,7 @@ def process_file(input_stream, report):
     TAG.big_endian = False
 
     if XML_OUTPUT:
-        TAG.xml_doc = minidom.Document()
+        TAG.xml_doc = tag_format.XMLStreamDocument()
 
     CONTROL.header = TAG.Header().read(input_stream, TAG)
     tag_node = None
@@ -252,11 +251,8 @@ def process_file(input_stream, report):
         report({'WARNING'}, "%s elements left after parse end" % (EOF - current_position))
 
     if XML_OUTPUT:
-        xml_str = TAG.xml_doc.toprettyxml(indent ="\t")
-
         save_path_file = tag_format.get_xml_path(input_stream.name, CONTROL.header.tag_group, TAG.is_legacy)
 
-        with open(save_path_file, "w") as f:
-            f.write(xml_str)
+        TAG.xml_doc.write_xml(save_path_file)
 
     return CONTROL
@@ -297,6 +297,7 @@ def get_geometry_layout(context, collection, import_file, armature, report):
 
         materials.append(mat)
 
+    visited_sections = set()
     for region in import_file.regions:
         for permutation in region.permutations:
             l1_geometry_index = permutation.l1_section_index
@@ -307,32 +308,32 @@ def get_geometry_layout(context, collection, import_file, armature, report):
             l6_geometry_index = permutation.l6_section_index
 
             geometry_count = len(import_file.sections)
-            if not l6_geometry_index == -1 and l6_geometry_index < geometry_count and not import_file.sections[l6_geometry_index].visited:
-                import_file.sections[l6_geometry_index].visited = True
+            if not l6_geometry_index == -1 and l6_geometry_index < geometry_count and not l6_geometry_index in visited_sections:
+                visited_sections.add(l6_geometry_index)
                 l6_geometry = import_file.sections[l6_geometry_index]
                 build_object(context, collection, l6_geometry, armature, 'L6', region.name, permutation.name, import_file, random_color_gen, materials)
 
-            if not l5_geometry_index == -1 and l5_geometry_index < geometry_count and not import_file.sections[l5_geometry_index].visited:
-                import_file.sections[l5_geometry_index].visited = True
+            if not l5_geometry_index == -1 and l5_geometry_index < geometry_count and not l5_geometry_index in visited_sections:
+                visited_sections.add(l5_geometry_index)
                 l5_geometry = import_file.sections[l5_geometry_index]
                 build_object(context, collection, l5_geometry, armature, 'L5', region.name, permutation.name, import_file, random_color_gen, materials)
 
-            if not l4_geometry_index == -1 and l4_geometry_index < geometry_count and not import_file.sections[l4_geometry_index].visited:
-                import_file.sections[l4_geometry_index].visited = True
+            if not l4_geometry_index == -1 and l4_geometry_index < geometry_count and not l4_geometry_index in visited_sections:
+                visited_sections.add(l4_geometry_index)
                 l4_geometry = import_file.sections[l4_geometry_index]
                 build_object(context, collection, l4_geometry, armature, 'L4', region.name, permutation.name, import_file, random_color_gen, materials)
 
-            if not l3_geometry_index == -1 and l3_geometry_index < geometry_count and not import_file.sections[l3_geometry_index].visited:
-                import_file.sections[l3_geometry_index].visited = True
+            if not l3_geometry_index == -1 and l3_geometry_index < geometry_count and not l3_geometry_index in visited_sections:
+                visited_sections.add(l3_geometry_index)
                 l3_geometry = import_file.sections[l3_geometry_index]
                 build_object(context, collection, l3_geometry, armature, 'L3', region.name, permutation.name, import_file, random_color_gen, materials)
 
-            if not l2_geometry_index == -1 and l2_geometry_index < geometry_count and not import_file.sections[l2_geometry_index].visited:
-                import_file.sections[l2_geometry_index].visited = True
+            if not l2_geometry_index == -1 and l2_geometry_index < geometry_count and not l2_geometry_index in visited_sections:
+                visited_sections.add(l2_geometry_index)
                 l2_geometry = import_file.sections[l2_geometry_index]
                 build_object(context, collection, l2_geometry, armature, 'L2', region.name, permutation.name, import_file, random_color_gen, materials)
 
-            if not l1_geometry_index == -1 and l1_geometry_index < geometry_count and not import_file.sections[l1_geometry_index].visited:
-                import_file.sections[l1_geometry_index].visited = True
+            if not l1_geometry_index == -1 and l1_geometry_index < geometry_count and not l1_geometry_index in visited_sections:
+                visited_sections.add(l1_geometry_index)
                 l1_geometry = import_file.sections[l1_geometry_index]
                 build_object(context, collection, l1_geometry, armature, 'L1', region.name, permutation.name, import_file, random_color_gen, materials)
@@ -24,7 +24,6 @@
 #
 # ##### END MIT LICENSE BLOCK #####
 
-from xml.dom import minidom
 from ....global_functions import tag_format
 from .format import (
     RenderAsset,
@@ -44,6 +43,54 @@ from .format import (
     )
 
 XML_OUTPUT = False
+VERTEX_COLUMNS = True
+
+RAW_POINT_FIELDS = (
+    ("position", "position", "point_3d", 0, True),
+    ("node_index_0_old", "node index 0 old", "signed_integer", 12),
+    ("node_index_1_old", "node index 1 old", "signed_integer", 16),
+    ("node_index_2_old", "node index 2 old", "signed_integer", 20),
+    ("node_index_3_old", "node index 3 old", "signed_integer", 24),
+    ("node_weight_0", "node weight 0", "float", 28),
+    ("node_weight_1", "node weight 1", "float", 32),
+    ("node_weight_2", "node weight 2", "float", 36),
+    ("node_weight_3", "node weight 3", "float", 40),
+    ("node_index_0_new", "node index 0 new", "signed_integer", 44),
+    ("node_index_1_new", "node index 1 new", "signed_integer", 48),
+    ("node_index_2_new", "node index 2 new", "signed_integer", 52),
+    ("node_index_3_new", "node index 3 new", "signed_integer", 56),
+    ("uses_new_node_indices", "uses new node indices", "signed_integer", 60),
+    ("adjusted_compound_node_index", "adjusted compound node index", "signed_integer", 64),
+    )
+
+RAW_POINT_LAYOUT = tag_format.TagBlockLayout(68, RAW_POINT_FIELDS)
+RAW_VERTEX_LAYOUT = tag_format.TagBlockLayout(196, RAW_POINT_FIELDS + (
+    ("texcoord", "texcoord", "point_2d", 68),
+    ("normal", "normal", "vector", 76),
+    ("binormal", "binormal", "vector", 88),
+    ("tangent", "tangent", "vector", 100),
+    ("anisotropic_binormal", "anisotropic tangent", "vector", 112),
+    ("secondary_texcoord", "secondary texcoord", "point_2d", 124),
+    ("primary_lightmap_color_RGBA", "primary lightmap color", "rgb", 132),
+    ("primary_lightmap_texcoord", "primary lightmap texcoord", "point_2d", 144),
+    ("primary_lightmap_incident_direction", "primary lightmap incident direction", "vector", 152),
+    ))
+
+SUBPART_LAYOUT = tag_format.TagBlockLayout(8, (
+    ("indices_start_index", "indices start index", "signed_short", 0),
+    ("indices_length", "indices length", "signed_short", 2),
+    ("visibility_bounds_index", "visibility bounds index", "signed_short", 4),
+    ("part_index", "part index", "signed_short", 6),
+    ))
+
+VISIBILITY_BOUNDS_LAYOUT = tag_format.TagBlockLayout(20, (
+    ("position", "position", "point_3d", 0),
+    ("radius", "radius", "float", 12),
+    ("node_0", "node 0", "signed_short", 16),
+    ))
+
+INDEX_LAYOUT = tag_format.TagBlockLayout(2, (("index", "index", "signed_short", 0),))
+NODE_MAP_LAYOUT = tag_format.TagBlockLayout(1, (("node_index", "node index", "signed_byte", 0),))
 
 def initilize_render(RENDER):
     RENDER.import_info = []
@@ -396,105 +443,31 @@ def read_subparts(RENDER, section_data, TAG, input_stream, node_element):
     if section_data.subparts_tag_block.count > 0:
         subparts_node = tag_format.get_xml_node(XML_OUTPUT, section_data.subparts_tag_block.count, node_element, "name", "subparts")
         section_data.subparts_header = TAG.TagBlockHeader().read(input_stream, TAG)
-        for subpart_idx in range(section_data.subparts_tag_block.count):
-            subpart_element_node = None
-            if XML_OUTPUT:
-                subpart_element_node = TAG.xml_doc.createElement('element')
-                subpart_element_node.setAttribute('index', str(subpart_idx))
-                subparts_node.appendChild(subpart_element_node)
-
-            sub_part = RENDER.SubPart()
-            sub_part.indices_start_index = TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(subpart_element_node, "indices start index"))
-            sub_part.indices_length = TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(subpart_element_node, "indices length"))
-            sub_part.visibility_bounds_index = TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(subpart_element_node, "visibility bounds index"))
-            sub_part.part_index = TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(subpart_element_node, "part index"))
-
-            section_data.subparts.append(sub_part)
+        section_data.subparts = SUBPART_LAYOUT.read(input_stream, TAG, section_data.subparts_tag_block.count, RENDER.SubPart, subparts_node)
 
 def read_visibility_bounds(RENDER, section_data, TAG, input_stream, node_element):
     if section_data.visibility_bounds_tag_block.count > 0:
         visibility_bounds_node = tag_format.get_xml_node(XML_OUTPUT, section_data.visibility_bounds_tag_block.count, node_element, "name", "visibility bounds")
         section_data.subparts_header = TAG.TagBlockHeader().read(input_stream, TAG)
-        for visibility_bound_idx in range(section_data.visibility_bounds_tag_block.count):
-            visibility_bound_element_node = None
-            if XML_OUTPUT:
-                visibility_bound_element_node = TAG.xml_doc.createElement('element')
-                visibility_bound_element_node.setAttribute('index', str(visibility_bound_idx))
-                visibility_bounds_node.appendChild(visibility_bound_element_node)
-
-            visibility_bound = RENDER.VisibilityBounds()
-            visibility_bound.position = TAG.read_point_3d(input_stream, TAG, tag_format.XMLData(visibility_bound_element_node, "position"))
-            visibility_bound.radius = TAG.read_float(input_stream, TAG, tag_format.XMLData(visibility_bound_element_node, "radius"))
-            visibility_bound.node_0 = TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(visibility_bound_element_node, "node 0"))
-            input_stream.read(2) # Padding?
-
-            section_data.visibility_bounds.append(visibility_bound)
+        section_data.visibility_bounds = VISIBILITY_BOUNDS_LAYOUT.read(input_stream, TAG, section_data.visibility_bounds_tag_block.count, RENDER.VisibilityBounds, visibility_bounds_node)
 
 def read_raw_vertices(RENDER, section_data, TAG, input_stream, node_element):
     if section_data.raw_vertices_tag_block.count > 0:
         raw_vertices_node = tag_format.get_xml_node(XML_OUTPUT, section_data.raw_vertices_tag_block.count, node_element, "name", "raw vertices")
         section_data.raw_vertices_header = TAG.TagBlockHeader().read(input_stream, TAG)
-        for raw_vertex_idx in range(section_data.raw_vertices_tag_block.count):
-            raw_vertex_element_node = None
-            if XML_OUTPUT:
-                raw_vertex_element_node = TAG.xml_doc.createElement('element')
-                raw_vertex_element_node.setAttribute('index', str(raw_vertex_idx))
-                raw_vertices_node.appendChild(raw_vertex_element_node)
-
-            raw_vertex = RENDER.RawVertex()
-            raw_vertex.position = TAG.read_point_3d(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "position"), True)
-            raw_vertex.node_index_0_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 0 old"))
-            raw_vertex.node_index_1_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 1 old"))
-            raw_vertex.node_index_2_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 2 old"))
-            raw_vertex.node_index_3_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 3 old"))
-            raw_vertex.node_weight_0 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node weight 0"))
-            raw_vertex.node_weight_1 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node weight 1"))
-            raw_vertex.node_weight_2 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node weight 2"))
-            raw_vertex.node_weight_3 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node weight 3"))
-            raw_vertex.node_index_0_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 0 new"))
-            raw_vertex.node_index_1_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 1 new"))
-            raw_vertex.node_index_2_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 2 new"))
-            raw_vertex.node_index_3_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 3 new"))
-            raw_vertex.uses_new_node_indices = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "uses new node indices"))
-            raw_vertex.adjusted_compound_node_index = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "adjusted compound node index"))
-            raw_vertex.texcoord = TAG.read_point_2d(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "texcoord"))
-            raw_vertex.normal = TAG.read_vector(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "normal"))
-            raw_vertex.binormal = TAG.read_vector(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "binormal"))
-            raw_vertex.tangent = TAG.read_vector(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "tangent"))
-            raw_vertex.anisotropic_binormal = TAG.read_vector(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "anisotropic tangent"))
-            raw_vertex.secondary_texcoord = TAG.read_point_2d(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "secondary texcoord"))
-            raw_vertex.primary_lightmap_color_RGBA = TAG.read_rgb(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "primary lightmap color"))
-            raw_vertex.primary_lightmap_texcoord = TAG.read_point_2d(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "primary lightmap texcoord"))
-            raw_vertex.primary_lightmap_incident_direction = TAG.read_vector(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "primary lightmap incident direction"))
-            input_stream.read(32) # Padding?
-
-            section_data.raw_vertices.append(raw_vertex)
+        section_data.raw_vertices = RAW_VERTEX_LAYOUT.read(input_stream, TAG, section_data.raw_vertices_tag_block.count, RENDER.RawVertex, raw_vertices_node, VERTEX_COLUMNS)
 
 def read_strip_indices(RENDER, section_data, TAG, input_stream, node_element):
     if section_data.strip_indices_tag_block.count > 0:
         strip_indices_node = tag_format.get_xml_node(XML_OUTPUT, section_data.strip_indices_tag_block.count, node_element, "name", "strip indices")
         section_data.strip_indices_header = TAG.TagBlockHeader().read(input_stream, TAG)
-        for strip_index_idx in range(section_data.strip_indices_tag_block.count):
-            strip_index_element_node = None
-            if XML_OUTPUT:
-                strip_index_element_node = TAG.xml_doc.createElement('element')
-                strip_index_element_node.setAttribute('index', str(strip_index_idx))
-                strip_indices_node.appendChild(strip_index_element_node)
-
-            section_data.strip_indices.append(TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(strip_index_element_node, "index")))
+        section_data.strip_indices = INDEX_LAYOUT.read_values(input_stream, TAG, section_data.strip_indices_tag_block.count, strip_indices_node)
 
 def read_mopp_reorder_table(RENDER, section_data, TAG, input_stream, node_element):
     if section_data.mopp_reorder_table_tag_block.count > 0:
         mopp_reorder_table_node = tag_format.get_xml_node(XML_OUTPUT, section_data.mopp_reorder_table_tag_block.count, node_element, "name", "mopp reorder table")
         section_data.mopp_reorder_table_header = TAG.TagBlockHeader().read(input_stream, TAG)
-        for mopp_reorder_table_idx in range(section_data.mopp_reorder_table_tag_block.count):
-            mopp_reorder_table_element_node = None
-            if XML_OUTPUT:
-                mopp_reorder_table_element_node = TAG.xml_doc.createElement('element')
-                mopp_reorder_table_element_node.setAttribute('index', str(mopp_reorder_table_idx))
-                mopp_reorder_table_node.appendChild(mopp_reorder_table_element_node)
-
-            section_data.mopp_reorder_table.append(TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(mopp_reorder_table_element_node, "index")))
+        section_data.mopp_reorder_table = INDEX_LAYOUT.read_values(input_stream, TAG, section_data.mopp_reorder_table_tag_block.count, mopp_reorder_table_node)
 
 def read_vertex_buffers(RENDER, section_data, TAG, input_stream, node_element):
     if section_data.vertex_buffers_tag_block.count > 0:
@@ -513,31 +486,7 @@ def read_raw_points(RENDER, section_data, TAG, input_stream, node_element):
     if section_data.raw_points_tag_block.count > 0:
         raw_points_node = tag_format.get_xml_node(XML_OUTPUT, section_data.raw_points_tag_block.count, node_element, "name", "raw points")
         section_data.raw_points_header = TAG.TagBlockHeader().read(input_stream, TAG)
-        for raw_point_idx in range(section_data.raw_points_tag_block.count):
-            raw_point_element_node = None
-            if XML_OUTPUT:
-                raw_point_element_node = TAG.xml_doc.createElement('element')
-                raw_point_element_node.setAttribute('index', str(raw_point_idx))
-                raw_points_node.appendChild(raw_point_element_node)
-
-            raw_point = RENDER.RawPoint()
-            raw_point.position = TAG.read_point_3d(input_stream, TAG, tag_format.XMLData(raw_point_element_node, "position"), True)
-            raw_point.node_index_0_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_point_element_node, "node index 0 old"))
-            raw_point.node_index_1_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_point_element_node, "node index 1 old"))
-            raw_point.node_index_2_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_point_element_node, "node index 2 old"))
-            raw_point.node_index_3_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_point_element_node, "node index 3 old"))
-            raw_point.node_weight_0 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_point_element_node, "node weight 0"))
-            raw_point.node_weight_1 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_point_element_node, "node weight 1"))
-            raw_point.node_weight_2 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_point_element_node, "node weight 2"))
-            raw_point.node_weight_3 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_point_element_node, "node weight 3"))
-            raw_point.node_index_0_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_point_element_node, "node index 0 new"))
-            raw_point.node_index_1_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_point_element_node, "node index 1 new"))
-            raw_point.node_index_2_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_point_element_node, "node index 2 new"))
-            raw_point.node_index_3_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_point_element_node, "node index 3 new"))
-            raw_point.uses_new_node_indices = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_point_element_node, "uses new node indices"))
-            raw_point.adjusted_compound_node_index = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_point_element_node, "adjusted compound node index"))
-
-            section_data.raw_points.append(raw_point)
+        section_data.raw_points = RAW_POINT_LAYOUT.read(input_stream, TAG, section_data.raw_points_tag_block.count, RENDER.RawPoint, raw_points_node)
 
 def read_rigid_point_groups(RENDER, section_data, TAG, input_stream, node_element):
     if section_data.rigid_point_groups_tag_block.count > 0:
@@ -561,27 +510,13 @@ def read_vertex_point_indices(RENDER, section_data, TAG, input_stream, node_elem
     if section_data.vertex_point_indices_tag_block.count > 0:
         vertex_point_indices_node = tag_format.get_xml_node(XML_OUTPUT, section_data.vertex_point_indices_tag_block.count, node_element, "name", "vertex point indices")
         section_data.vertex_point_indices_header = TAG.TagBlockHeader().read(input_stream, TAG)
-        for vertex_point_idx in range(section_data.vertex_point_indices_tag_block.count):
-            vertex_point_element_node = None
-            if XML_OUTPUT:
-                vertex_point_element_node = TAG.xml_doc.createElement('element')
-                vertex_point_element_node.setAttribute('index', str(vertex_point_idx))
-                vertex_point_indices_node.appendChild(vertex_point_element_node)
-
-            section_data.vertex_point_indices.append(TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(vertex_point_element_node, "index")))
+        section_data.vertex_point_indices = INDEX_LAYOUT.read_values(input_stream, TAG, section_data.vertex_point_indices_tag_block.count, vertex_point_indices_node)
 
 def read_section_node_map(RENDER, section_data, TAG, input_stream, node_element):
     if section_data.node_map_tag_block.count > 0:
         node_map_node = tag_format.get_xml_node(XML_OUTPUT, section_data.node_map_tag_block.count, node_element, "name", "node map")
         section_data.node_map_header = TAG.TagBlockHeader().read(input_stream, TAG)
-        for node_map_idx in range(section_data.node_map_tag_block.count):
-            node_map_element_node = None
-            if XML_OUTPUT:
-                node_map_element_node = TAG.xml_doc.createElement('element')
-                node_map_element_node.setAttribute('index', str(node_map_idx))
-                node_map_node.appendChild(node_map_element_node)
-
-            section_data.node_map.append(TAG.read_signed_byte(input_stream, TAG, tag_format.XMLData(node_map_element_node, "node index")))
+        section_data.node_map = NODE_MAP_LAYOUT.read_values(input_stream, TAG, section_data.node_map_tag_block.count, node_map_node)
 
 def read_sections_v0(RENDER, TAG, input_stream, tag_node, XML_OUTPUT):
     if RENDER.sections_tag_block.count > 0:
@@ -1665,7 +1600,7 @@ def process_file(input_stream, report):
     TAG.big_endian = False
 
     if XML_OUTPUT:
-        TAG.xml_doc = minidom.Document()
+        TAG.xml_doc = tag_format.XMLStreamDocument()
 
     RENDER.header = TAG.Header().read(input_stream, TAG)
 
@@ -1730,11 +1665,8 @@ def process_file(input_stream, report):
         report({'WARNING'}, "%s elements left after parse end" % (EOF - current_position))
 
     if XML_OUTPUT:
-        xml_str = TAG.xml_doc.toprettyxml(indent ="\t")
-
         save_path_file = tag_format.get_xml_path(input_stream.name, RENDER.header.tag_group, TAG.is_legacy)
 
-        with open(save_path_file, "w") as f:
-            f.write(xml_str)
+        TAG.xml_doc.write_xml(save_path_file)
 
     return RENDER
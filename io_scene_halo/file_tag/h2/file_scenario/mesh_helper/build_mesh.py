@@ -197,6 +197,7 @@ def get_object(collection, import_file, game_version, object_name, random_color_
     if (4, 1, 0) > bpy.app.version:
         object_mesh.data.use_auto_smooth = True
     
+    visited_sections = set()
     for region in import_file.regions:
         region_name = "unnamed"
         if not region_name == "__unnamed":
@@ -204,8 +205,8 @@ def get_object(collection, import_file, game_version, object_name, random_color_
 
         for permutation in region.permutations:
             l6_section_index = permutation.l6_section_index
-            if not l6_section_index == -1 and l6_section_index < section_count and not import_file.sections[l6_section_index].visited:
-                import_file.sections[l6_section_index].visited = True
+            if not l6_section_index == -1 and l6_section_index < section_count and not l6_section_index in visited_sections:
+                visited_sections.add(l6_section_index)
                 l6_section = import_file.sections[l6_section_index]
                 build_mesh_layout(import_file, l6_section, region_name, random_color_gen, object_mesh, materials)
 
@@ -24,8 +24,8 @@
 #
 # ##### END MIT LICENSE BLOCK #####
 
-from xml.dom import minidom
 from ....global_functions import tag_format
+from ..file_render_model.process_file import RAW_VERTEX_LAYOUT, INDEX_LAYOUT
 from .format import (
         LevelAsset,
         LeafFlags,
@@ -61,6 +61,55 @@ from .format import (
         )
 
 XML_OUTPUT = False
+VERTEX_COLUMNS = True
+
+# Skim descriptors for the blocks that can be read lazily. See tag_format.skim_tag_block.
+PATHFINDING_DATA_SKIM_FIELDS = (
+    ("block", 0, ()), # sectors
+    ("block", 12, ()), # links
+    ("block", 24, ()), # refs
+    ("block", 36, ()), # bsp2d nodes
+    ("block", 48, ()), # surface flags
+    ("block", 60, ()), # vertices
+    ("block", 72, ( # object refs
+        ("block", 12, ()), # bsps
+        ("block", 24, ()), # nodes
+        )),
+    ("block", 84, ()), # pathfinding hints
+    ("block", 96, ()), # instanced geometry refs
+    ("block", 144, ( # user placed hints
+        ("block", 0, ()), # point geometry
+        ("block", 12, ()), # ray geometry
+        ("block", 24, ()), # line segment geometry
+        ("block", 36, ()), # parallelogram geometry
+        ("block", 48, (("block", 4, ()),)), # polygon geometry
+        ("block", 60, ()), # jump hints
+        ("block", 72, ()), # climb hints
+        ("block", 84, (("block", 4, ()),)), # well hints
+        ("block", 96, (("block", 0, ()),)), # flight hints
+        )),
+    )
+
+LEAF_MAP_LEAVES_SKIM_FIELDS = (
+    ("block", 0, (("block", 4, ()),)), # faces
+    ("block", 12, ()), # connection indices
+    )
+
+LEAF_MAP_CONNECTIONS_SKIM_FIELDS = (
+    ("block", 12, ()), # vertices
+    )
+
+ERRORS_SKIM_FIELDS = (
+    ("block", 668, ( # reports
+        ("data", 4, None), # text
+        ("block", 60, ()), # vertices
+        ("block", 72, ()), # vectors
+        ("block", 84, ()), # lines
+        ("block", 96, ()), # triangles
+        ("block", 108, ()), # quads
+        ("block", 120, (("data", 0, None),)), # comments
+        )),
+    )
 
 def initilize_scenario(LEVEL):
     LEVEL.import_info = []
@@ -941,67 +990,19 @@ def read_clusters(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT):
                     if cluster_data.raw_vertices_tag_block.count > 0:
                         raw_vertices_node = tag_format.get_xml_node(XML_OUTPUT, cluster_data.raw_vertices_tag_block.count, cluster_data_element_node, "name", "raw vertices")
                         cluster_data.raw_vertices_header = TAG.TagBlockHeader().read(input_stream, TAG)
-                        for raw_vertex_idx in range(cluster_data.raw_vertices_tag_block.count):
-                            raw_vertex_element_node = None
-                            if XML_OUTPUT:
-                                raw_vertex_element_node = TAG.xml_doc.createElement('element')
-                                raw_vertex_element_node.setAttribute('index', str(raw_vertex_idx))
-                                raw_vertices_node.appendChild(raw_vertex_element_node)
-
-                            raw_vertex = LEVEL.RawVertex()
-                            raw_vertex.position = TAG.read_point_3d(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "position"), True)
-                            raw_vertex.node_index_0_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 0 old"))
-                            raw_vertex.node_index_1_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 1 old"))
-                            raw_vertex.node_index_2_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 2 old"))
-                            raw_vertex.node_index_3_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 3 old"))
-                            raw_vertex.node_weight_0 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node weight 0"))
-                            raw_vertex.node_weight_1 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node weight 1"))
-                            raw_vertex.node_weight_2 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node weight 2"))
-                            raw_vertex.node_weight_3 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node weight 3"))
-                            raw_vertex.node_index_0_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 0 new"))
-                            raw_vertex.node_index_1_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 1 new"))
-                            raw_vertex.node_index_2_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 2 new"))
-                            raw_vertex.node_index_3_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 3 new"))
-                            raw_vertex.uses_new_node_indices = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "uses new node indices"))
-                            raw_vertex.adjusted_compound_node_index = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "adjusted compound node index"))
-                            raw_vertex.texcoord = TAG.read_point_2d(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "texcoord"))
-                            raw_vertex.normal = TAG.read_vector(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "normal"))
-                            raw_vertex.binormal = TAG.read_vector(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "binormal"))
-                            raw_vertex.tangent = TAG.read_vector(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "tangent"))
-                            raw_vertex.anisotropic_binormal = TAG.read_vector(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "anisotropic tangent"))
-                            raw_vertex.secondary_texcoord = TAG.read_point_2d(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "secondary texcoord"))
-                            raw_vertex.primary_lightmap_color_RGBA = TAG.read_rgb(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "primary lightmap color"))
-                            raw_vertex.primary_lightmap_texcoord = TAG.read_point_2d(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "primary lightmap texcoord"))
-                            raw_vertex.primary_lightmap_incident_direction = TAG.read_vector(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "primary lightmap incident direction"))
-                            input_stream.read(32) # Padding?
-
-                            cluster_data.raw_vertices.append(raw_vertex)
+                        cluster_data.raw_vertices = RAW_VERTEX_LAYOUT.read(input_stream, TAG, cluster_data.raw_vertices_tag_block.count, LEVEL.RawVertex, raw_vertices_node, VERTEX_COLUMNS)
 
                     if cluster_data.strip_indices_tag_block.count > 0:
                         strip_indices_node = tag_format.get_xml_node(XML_OUTPUT, cluster_data.strip_indices_tag_block.count, cluster_data_element_node, "name", "strip indices")
                         cluster_data.strip_indices_header = TAG.TagBlockHeader().read(input_stream, TAG)
-                        for strip_index_idx in range(cluster_data.strip_indices_tag_block.count):
-                            strip_index_element_node = None
-                            if XML_OUTPUT:
-                                strip_index_element_node = TAG.xml_doc.createElement('element')
-                                strip_index_element_node.setAttribute('index', str(strip_index_idx))
-                                strip_indices_node.appendChild(strip_index_element_node)
-
-                            cluster_data.strip_indices.append(TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(strip_index_element_node, "index")))
+                        cluster_data.strip_indices = INDEX_LAYOUT.read_values(input_stream, TAG, cluster_data.strip_indices_tag_block.count, strip_indices_node)
 
                     cluster_data.visibility_mopp_code = input_stream.read(cluster_data.visibility_mopp_code_data.size)
 
                     if cluster_data.mopp_reorder_table_tag_block.count > 0:
                         mopp_reorder_table_node = tag_format.get_xml_node(XML_OUTPUT, cluster_data.mopp_reorder_table_tag_block.count, cluster_data_element_node, "name", "mopp reorder table")
                         cluster_data.mopp_reorder_table_header = TAG.TagBlockHeader().read(input_stream, TAG)
-                        for mopp_reorder_table_idx in range(cluster_data.mopp_reorder_table_tag_block.count):
-                            mopp_reorder_table_element_node = None
-                            if XML_OUTPUT:
-                                mopp_reorder_table_element_node = TAG.xml_doc.createElement('element')
-                                mopp_reorder_table_element_node.setAttribute('index', str(mopp_reorder_table_idx))
-                                mopp_reorder_table_node.appendChild(mopp_reorder_table_element_node)
-
-                            cluster_data.mopp_reorder_table.append(TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(mopp_reorder_table_element_node, "index")))
+                        cluster_data.mopp_reorder_table = INDEX_LAYOUT.read_values(input_stream, TAG, cluster_data.mopp_reorder_table_tag_block.count, mopp_reorder_table_node)
 
                     if cluster_data.vertex_buffers_tag_block.count > 0:
                         vertex_buffers_node = tag_format.get_xml_node(XML_OUTPUT, cluster_data.vertex_buffers_tag_block.count, cluster_data_element_node, "name", "vertex buffers")
@@ -2567,67 +2568,19 @@ def read_instanced_geometry_definition(LEVEL, TAG, input_stream, tag_node, XML_O
                     if render_data.raw_vertices_tag_block.count > 0:
                         raw_vertices_node = tag_format.get_xml_node(XML_OUTPUT, render_data.raw_vertices_tag_block.count, render_data_element_node, "name", "raw vertices")
                         render_data.raw_vertices_header = TAG.TagBlockHeader().read(input_stream, TAG)
-                        for raw_vertex_idx in range(render_data.raw_vertices_tag_block.count):
-                            raw_vertex_element_node = None
-                            if XML_OUTPUT:
-                                raw_vertex_element_node = TAG.xml_doc.createElement('element')
-                                raw_vertex_element_node.setAttribute('index', str(raw_vertex_idx))
-                                raw_vertices_node.appendChild(raw_vertex_element_node)
-
-                            raw_vertex = LEVEL.RawVertex()
-                            raw_vertex.position = TAG.read_point_3d(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "position"), True)
-                            raw_vertex.node_index_0_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 0 old"))
-                            raw_vertex.node_index_1_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 1 old"))
-                            raw_vertex.node_index_2_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 2 old"))
-                            raw_vertex.node_index_3_old = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 3 old"))
-                            raw_vertex.node_weight_0 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node weight 0"))
-                            raw_vertex.node_weight_1 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node weight 1"))
-                            raw_vertex.node_weight_2 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node weight 2"))
-                            raw_vertex.node_weight_3 = TAG.read_float(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node weight 3"))
-                            raw_vertex.node_index_0_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 0 new"))
-                            raw_vertex.node_index_1_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 1 new"))
-                            raw_vertex.node_index_2_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 2 new"))
-                            raw_vertex.node_index_3_new = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "node index 3 new"))
-                            raw_vertex.uses_new_node_indices = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "uses new node indices"))
-                            raw_vertex.adjusted_compound_node_index = TAG.read_signed_integer(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "adjusted compound node index"))
-                            raw_vertex.texcoord = TAG.read_point_2d(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "texcoord"))
-                            raw_vertex.normal = TAG.read_vector(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "normal"))
-                            raw_vertex.binormal = TAG.read_vector(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "binormal"))
-                            raw_vertex.tangent = TAG.read_vector(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "tangent"))
-                            raw_vertex.anisotropic_binormal = TAG.read_vector(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "anisotropic tangent"))
-                            raw_vertex.secondary_texcoord = TAG.read_point_2d(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "secondary texcoord"))
-                            raw_vertex.primary_lightmap_color_RGBA = TAG.read_rgb(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "primary lightmap color"))
-                            raw_vertex.primary_lightmap_texcoord = TAG.read_point_2d(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "primary lightmap texcoord"))
-                            raw_vertex.primary_lightmap_incident_direction = TAG.read_vector(input_stream, TAG, tag_format.XMLData(raw_vertex_element_node, "primary lightmap incident direction"))
-                            input_stream.read(32) # Padding?
-
-                            render_data.raw_vertices.append(raw_vertex)
+                        render_data.raw_vertices = RAW_VERTEX_LAYOUT.read(input_stream, TAG, render_data.raw_vertices_tag_block.count, LEVEL.RawVertex, raw_vertices_node, VERTEX_COLUMNS)
 
                     if render_data.strip_indices_tag_block.count > 0:
                         strip_indices_node = tag_format.get_xml_node(XML_OUTPUT, render_data.strip_indices_tag_block.count, render_data_element_node, "name", "strip indices")
                         render_data.strip_indices_header = TAG.TagBlockHeader().read(input_stream, TAG)
-                        for strip_index_idx in range(render_data.strip_indices_tag_block.count):
-                            strip_index_element_node = None
-                            if XML_OUTPUT:
-                                strip_index_element_node = TAG.xml_doc.createElement('element')
-                                strip_index_element_node.setAttribute('index', str(strip_index_idx))
-                                strip_indices_node.appendChild(strip_index_element_node)
-
-                            render_data.strip_indices.append(TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(strip_index_element_node, "index")))
+                        render_data.strip_indices = INDEX_LAYOUT.read_values(input_stream, TAG, render_data.strip_indices_tag_block.count, strip_indices_node)
 
                     render_data.visibility_mopp_code = input_stream.read(render_data.visibility_mopp_code_data.size)
 
                     if render_data.mopp_reorder_table_tag_block.count > 0:
                         mopp_reorder_table_node = tag_format.get_xml_node(XML_OUTPUT, render_data.mopp_reorder_table_tag_block.count, render_data_element_node, "name", "mopp reorder table")
                         render_data.mopp_reorder_table_header = TAG.TagBlockHeader().read(input_stream, TAG)
-                        for mopp_reorder_table_idx in range(render_data.mopp_reorder_table_tag_block.count):
-                            mopp_reorder_table_element_node = None
-                            if XML_OUTPUT:
-                                mopp_reorder_table_element_node = TAG.xml_doc.createElement('element')
-                                mopp_reorder_table_element_node.setAttribute('index', str(mopp_reorder_table_idx))
-                                mopp_reorder_table_node.appendChild(mopp_reorder_table_element_node)
-
-                            render_data.mopp_reorder_table.append(TAG.read_signed_short(input_stream, TAG, tag_format.XMLData(mopp_reorder_table_element_node, "index")))
+                        render_data.mopp_reorder_table = INDEX_LAYOUT.read_values(input_stream, TAG, render_data.mopp_reorder_table_tag_block.count, mopp_reorder_table_node)
 
                     if render_data.vertex_buffers_tag_block.count > 0:
                         vertex_buffers_node = tag_format.get_xml_node(XML_OUTPUT, render_data.vertex_buffers_tag_block.count, render_data_element_node, "name", "vertex buffers")
@@ -2897,14 +2850,14 @@ def read_instanced_geometry_instances(LEVEL, TAG, input_stream, tag_node, XML_OU
             if instanced_geometry_instance.name_length > 0:
                 instanced_geometry_instance.name = TAG.read_variable_string_no_terminator(input_stream, instanced_geometry_instance.name_length, TAG, tag_format.XMLData(instanced_geometry_instance_element_node, "name"))
 
-def process_file(input_stream, report):
+def process_file(input_stream, report, lazy_blocks=False):
     TAG = tag_format.TagAsset()
     LEVEL = LevelAsset()
     TAG.is_legacy = False
     TAG.big_endian = False
 
     if XML_OUTPUT:
-        TAG.xml_doc = minidom.Document()
+        TAG.xml_doc = tag_format.XMLStreamDocument()
 
     LEVEL.header = TAG.Header().read(input_stream, TAG)
 
@@ -2912,6 +2865,9 @@ def process_file(input_stream, report):
     if XML_OUTPUT:
         tag_node = TAG.xml_doc.childNodes[0]
 
+    # Blocks the scene builders never look at are skimmed and only decoded on first access. The XML dump needs everything.
+    lazy_blocks = lazy_blocks and not XML_OUTPUT
+
     initilize_scenario(LEVEL)
     read_bsp_body(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
     read_import_info(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
@@ -2931,8 +2887,14 @@ def process_file(input_stream, report):
     read_sky_owner_cluster(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
     read_conveyor_surfaces(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
     read_breakable_surfaces(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
-    read_pathfinding_data(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
-    read_pathfinding_edges(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
+    if lazy_blocks:
+        tag_format.read_lazy_tag_block(LEVEL, TAG, input_stream, "pathfinding_data", read_pathfinding_data, PATHFINDING_DATA_SKIM_FIELDS)
+    else:
+        read_pathfinding_data(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
+    if lazy_blocks:
+        tag_format.read_lazy_tag_block(LEVEL, TAG, input_stream, "pathfinding_edges", read_pathfinding_edges, ())
+    else:
+        read_pathfinding_edges(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
     read_background_sound_palette(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
     read_sound_environment_palette(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
     LEVEL.sound_pas_data = input_stream.read(LEVEL.sound_pas_raw_data.size)
@@ -2941,9 +2903,18 @@ def process_file(input_stream, report):
     read_environment_object_palette(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
     read_environment_object(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
     read_lightmaps(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
-    read_leaf_map_leaves(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
-    read_leaf_map_connections(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
-    read_errors(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
+    if lazy_blocks:
+        tag_format.read_lazy_tag_block(LEVEL, TAG, input_stream, "leaf_map_leaves", read_leaf_map_leaves, LEAF_MAP_LEAVES_SKIM_FIELDS)
+    else:
+        read_leaf_map_leaves(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
+    if lazy_blocks:
+        tag_format.read_lazy_tag_block(LEVEL, TAG, input_stream, "leaf_map_connections", read_leaf_map_connections, LEAF_MAP_CONNECTIONS_SKIM_FIELDS)
+    else:
+        read_leaf_map_connections(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
+    if lazy_blocks:
+        tag_format.read_lazy_tag_block(LEVEL, TAG, input_stream, "errors", read_errors, ERRORS_SKIM_FIELDS)
+    else:
+        read_errors(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
     read_precomputed_lighting(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
     read_instanced_geometry_definition(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
     read_instanced_geometry_instances(LEVEL, TAG, input_stream, tag_node, XML_OUTPUT)
@@ -2954,11 +2925,8 @@ def process_file(input_stream, report):
         report({'WARNING'}, "%s elements left after parse end" % (EOF - current_position))
 
     if XML_OUTPUT:
-        xml_str = TAG.xml_doc.toprettyxml(indent ="\t")
-
         save_path_file = tag_format.get_xml_path(input_stream.name, LEVEL.header.tag_group, TAG.is_legacy)
 
-        with open(save_path_file, "w") as f:
-            f.write(xml_str)
+        TAG.xml_doc.write_xml(save_path_file)
 
     return LEVEL
@@ -27,7 +27,9 @@
 import os
 import bpy
 
-from ..global_functions import tag_format
+from functools import partial
+from ..global_functions import tag_format, tag_cache, timing_report
+from ..global_functions.parse_tags import TagResolver, parse_tag_files
 
 from .build_scene import build_mesh as build_scene_model
 from .build_scene import build_physics as build_scene_physics
@@ -73,14 +75,43 @@ from ..global_functions.shader_processing import generate_shader_transparent_met
 from ..global_functions.shader_generation.shader_environment import generate_shader_environment
 from ..global_functions.shader_generation.shader_model import generate_shader_model
 
-def load_file(context, file_path, game_title, fix_rotations, empty_markers, report):
-    tag_name = os.path.basename(file_path).rsplit(".", 1)[0]
-    input_stream = open(file_path, "rb")
+# Parser and scene builder for every tag group the importer supports, per game title. Shaders have no scene builder and instead get a
+# material generator in SHADER_GENERATORS.
+TAG_IMPORTERS = {
+    "mode": (build_scene_model, {"halo1": process_mode, "halo2": process_h2_mode}),
+    "mod2": (build_scene_model, {"halo1": process_mod2, "halo2": process_h2_mode}),
+    "coll": (build_scene_collision, {"halo1": process_collision, "halo2": process_h2_collision}),
+    "phys": (build_scene_physics, {"halo1": process_physics}),
+    "antr": (build_scene_animation, {"halo1": process_h1_animation}),
+    "sbsp": (build_scene_level, {"halo1": process_level, "halo2": partial(process_h2_level, lazy_blocks=True)}),
+    "ltmp": (build_scene_lightmap, {"halo2": process_h2_lightmap}),
+    "scnr": (build_scenario, {"halo1": process_h1_scenario, "halo2": process_h2_scenario}),
+    "trak": (build_camera_track, {"halo1": process_camera_track, "halo2": process_h2_camera_track, "halo3": process_h2_camera_track}),
+    "senv": (None, {"halo1": process_shader_environment, "halo2": process_shader_environment, "halo3": process_shader_environment}),
+    "soso": (None, {"halo1": process_shader_model, "halo2": process_shader_model, "halo3": process_shader_model}),
+    "sgla": (None, {"halo1": process_shader_transparent_glass, "halo2": process_shader_transparent_glass, "halo3": process_shader_transparent_glass}),
+    "smet": (None, {"halo1": process_shader_transparent_meter, "halo2": process_shader_transparent_meter, "halo3": process_shader_transparent_meter}),
+    }
+
+SHADER_GENERATORS = {
+    "senv": lambda mat, ASSET, report: generate_shader_environment(mat, ASSET, 0, report),
+    "soso": generate_shader_model,
+    "sgla": generate_shader_transparent_glass,
+    "smet": generate_shader_transparent_meter,
+    }
+
+IMPORT_TAG_EXTENSIONS = (".model", ".gbxmodel", ".render_model", ".model_collision_geometry", ".collision_model", ".physics", ".model_animations",
+                         ".scenario_structure_bsp", ".scenario_structure_lightmap", ".scenario", ".camera_track", ".shader_environment",
+                         ".shader_model", ".shader_transparent_glass", ".shader_transparent_meter")
+
+def read_tag_header(file_path, game_title, report, memory_mapped=False):
+    # Returns the game title and tag group of a tag or None for both after reporting why the tag can't be imported.
+    input_stream = tag_format.open_tag_stream(file_path, memory_mapped)
     if tag_format.check_file_size(input_stream) < 64: # Size of the header for all tags
         input_stream.close()
         report({'ERROR'}, "File size does not meet the minimum amount required. File is either not a tag or corrupted")
 
-        return {'CANCELLED'}
+        return None, None
 
     if game_title == "auto":
         tag_group, group_is_valid, engine_tag = tag_format.check_group(input_stream, True)
@@ -94,165 +125,124 @@ def load_file(context, file_path, game_title, fix_rotations, empty_markers, repo
         is_big_endian = False
 
     tag_group, group_is_valid, engine_tag = tag_format.check_group(input_stream, is_big_endian)
+    input_stream.close()
     if not group_is_valid:
-        input_stream.close()
         print(file_path)
         print(tag_group)
         report({'ERROR'}, "File does not have a valid tag class. Make sure you are importing a tag supported by the toolset")
 
-        return {'CANCELLED'}
+        return None, None
 
-    if tag_group == "mode" or tag_group == "mod2":
-        build_scene = build_scene_model
-        if game_title == "halo1":
-            if tag_group == "mode":
-                ASSET = process_mode(input_stream, report)
+    return game_title, tag_group
 
-            else:
-                ASSET = process_mod2(input_stream, report)
+def get_tag_importer(tag_group, game_title):
+    build_scene, process_files = TAG_IMPORTERS.get(tag_group, (None, {}))
 
-        elif game_title == "halo2":
-            ASSET = process_h2_mode(input_stream, report)
+    return process_files.get(game_title), build_scene
 
-        else:
-            input_stream.close()
-            report({'ERROR'}, "Not implemented")
-
-            return {'CANCELLED'}
-
-    elif tag_group == "coll":
-        build_scene = build_scene_collision
-        if game_title == "halo1":
-            ASSET = process_collision(input_stream, report)
-
-        elif game_title == "halo2":
-            ASSET = process_h2_collision(input_stream, report)
-
-        else:
-            input_stream.close()
-            report({'ERROR'}, "Not implemented")
-
-            return {'CANCELLED'}
-
-    elif tag_group == "phys":
-        build_scene = build_scene_physics
-        if game_title == "halo1":
-            ASSET = process_physics(input_stream, report)
-
-        else:
-            input_stream.close()
-            report({'ERROR'}, "Not implemented")
-
-            return {'CANCELLED'}
-
-    elif tag_group == "antr":
-        build_scene = build_scene_animation
-        if game_title == "halo1":
-            ASSET = process_h1_animation(input_stream, report)
-
-        else:
-            input_stream.close()
-            report({'ERROR'}, "Not implemented")
+def build_file(context, file_path, ASSET, tag_group, game_title, fix_rotations, empty_markers, report, memory_mapped=False, worker_count=1):
+    tag_name = os.path.basename(file_path).rsplit(".", 1)[0]
+    process_file, build_scene = get_tag_importer(tag_group, game_title)
+    if tag_group == "scnr":
+        context.scene.halo.game_title = game_title
+        context.scene.tag_scenario.scenario_path = file_path
 
-            return {'CANCELLED'}
+    if tag_group in SHADER_GENERATORS:
+        mat = bpy.data.materials.new(name=tag_name)
+        SHADER_GENERATORS[tag_group](mat, ASSET, report)
 
-    elif tag_group == "sbsp":
-        build_scene = build_scene_level
-        if game_title == "halo1":
-            ASSET = process_level(input_stream, report)
+    elif build_scene:
+        # Scenarios and models pull in the same models, bitmaps and shaders many times over. Parse each of them once per import.
+        with TagResolver(memory_mapped, worker_count):
+            build_scene.build_scene(context, ASSET, "retail", game_title, 0, fix_rotations, empty_markers, report)
 
-        elif game_title == "halo2":
-            ASSET = process_h2_level(input_stream, report)
+def load_file(context, file_path, game_title, fix_rotations, empty_markers, report, memory_mapped=False, worker_count=1):
+    timing_report.start("tag import")
+    with timing_report.phase("tag header"):
+        game_title, tag_group = read_tag_header(file_path, game_title, report, memory_mapped)
 
-        else:
-            input_stream.close()
-            report({'ERROR'}, "Not implemented")
+    if tag_group == None:
+        return {'CANCELLED'}
 
-            return {'CANCELLED'}
+    process_file, build_scene = get_tag_importer(tag_group, game_title)
+    if process_file == None:
+        report({'ERROR'}, "Not implemented")
 
-    elif tag_group == "ltmp":
-        build_scene = build_scene_lightmap
-        if game_title == "halo2":
-            ASSET = process_h2_lightmap(input_stream, report)
+        return {'CANCELLED'}
 
-        else:
-            input_stream.close()
-            report({'ERROR'}, "Not implemented")
+    with timing_report.phase("tag parse") as timing_phase:
+        ASSET = tag_cache.parse_tag_file(file_path, process_file, report, memory_mapped)
+        timing_phase.count("tags", 1)
 
-            return {'CANCELLED'}
+    with timing_report.phase("scene build"):
+        build_file(context, file_path, ASSET, tag_group, game_title, fix_rotations, empty_markers, report, memory_mapped, worker_count)
 
-    elif tag_group == "scnr":
-        context.scene.halo.game_title = game_title
-        context.scene.tag_scenario.scenario_path = file_path
-        build_scene = build_scenario
-        if game_title == "halo1":
-            ASSET = process_h1_scenario(input_stream, report)
+    timing_report.finish(file_path, report, True)
 
-        elif game_title == "halo2":
-            ASSET = process_h2_scenario(input_stream, report)
+def load_files(context, file_paths, game_title, fix_rotations, empty_markers, report, memory_mapped=False, worker_count=1):
+    # Batch import. The tags are parsed in worker processes and only the scene building runs on the main thread. A directory in
+    # file_paths is expanded to the importable tags directly inside it.
+    tag_paths = []
+    for file_path in file_paths:
+        if os.path.isdir(file_path):
+            for file_name in sorted(os.listdir(file_path)):
+                if file_name.lower().endswith(IMPORT_TAG_EXTENSIONS):
+                    tag_paths.append(os.path.join(file_path, file_name))
 
         else:
-            input_stream.close()
-            report({'ERROR'}, "Not implemented")
+            tag_paths.append(file_path)
 
-            return {'CANCELLED'}
+    timing_report.start("tag import")
+    timing_phase = timing_report.begin_phase("tag header")
+    import_tags = []
+    tag_files = []
+    for tag_path in tag_paths:
+        tag_game_title, tag_group = read_tag_header(tag_path, game_title, report, memory_mapped)
+        if tag_group == None:
+            continue
 
-    elif tag_group == "trak":
-        build_scene = build_camera_track
-        if game_title == "halo1":
-            ASSET = process_camera_track(input_stream, report)
+        process_file, build_scene = get_tag_importer(tag_group, tag_game_title)
+        if process_file == None:
+            report({'WARNING'}, "Skipping %s. Importing %s tags is not implemented" % (os.path.basename(tag_path), tag_group))
+            continue
 
-        else:
-            ASSET = process_h2_camera_track(input_stream, report)
+        import_tags.append((tag_path, tag_group, tag_game_title))
+        tag_files.append((tag_path, process_file, memory_mapped))
 
-    elif tag_group == "senv":
-        build_scene = None
-        ASSET = process_shader_environment(input_stream, report)
-        mat = bpy.data.materials.new(name=tag_name)
-        generate_shader_environment(mat, ASSET, 0, report)
+    timing_phase.count("tags", len(tag_paths))
+    timing_report.end_phase(timing_phase)
 
-    elif tag_group == "soso":
-        build_scene = None
-        ASSET = process_shader_model(input_stream, report)
-        mat = bpy.data.materials.new(name=tag_name)
-        generate_shader_model(mat, ASSET, report)
-
-    #elif tag_group == "schi":
-        #generate_shader_transparent_chicago(mat, shader, report)
-
-    #elif tag_group == "scex":
-        #generate_shader_transparent_chicago_extended(mat, shader, report)
+    if len(tag_files) == 0:
+        report({'ERROR'}, "No importable tags were found")
 
-    #elif tag_group == "sotr":
-        #generate_shader_transparent_generic(mat, shader, report)
+        return {'CANCELLED'}
 
-    elif tag_group == "sgla":
-        build_scene = None
-        ASSET = process_shader_transparent_glass(input_stream, report)
-        mat = bpy.data.materials.new(name=tag_name)
-        generate_shader_transparent_glass(mat, ASSET, report)
+    window_manager = context.window_manager
+    window_manager.progress_begin(0, len(tag_files) * 2)
+    try:
+        def parse_progress(parsed_count, tag_count):
+            window_manager.progress_update(parsed_count)
 
-    elif tag_group == "smet":
-        build_scene = None
-        ASSET = process_shader_transparent_meter(input_stream, report)
-        mat = bpy.data.materials.new(name=tag_name)
-        generate_shader_transparent_meter(mat, ASSET, report)
+        with timing_report.phase("tag parse") as timing_phase:
+            assets = parse_tag_files(tag_files, report, worker_count, parse_progress)
+            timing_phase.count("tags", len(tag_files))
 
-    #elif tag_group == "spla":
-        #generate_shader_transparent_plasma(mat, shader, report)
+        with timing_report.phase("scene build") as timing_phase:
+            for import_idx, import_tag in enumerate(import_tags):
+                tag_path, tag_group, tag_game_title = import_tag
+                build_file(context, tag_path, assets[import_idx], tag_group, tag_game_title, fix_rotations, empty_markers, report, memory_mapped, worker_count)
+                window_manager.progress_update(len(tag_files) + import_idx + 1)
 
-    #elif tag_group == "swat":
-        #generate_shader_transparent_water(mat, shader, report)
+            timing_phase.count("tags", len(import_tags))
 
-    else:
-        input_stream.close()
-        report({'ERROR'}, "Not implemented")
+    finally:
+        window_manager.progress_end()
 
-        return {'CANCELLED'}
+    report({'INFO'}, "Imported %s tags" % len(import_tags))
+    # Batch imports name the report after the first tag that was imported.
+    timing_report.finish(import_tags[0][0], report, True)
 
-    input_stream.close()
-    if build_scene:
-        build_scene.build_scene(context, ASSET, "retail", game_title, 0, fix_rotations, empty_markers, report)
+    return {'FINISHED'}
 
 if __name__ == '__main__':
     bpy.ops.import_scene.model()
@@ -0,0 +1,243 @@
+# ##### BEGIN MIT LICENSE BLOCK #####
+#
+# MIT License
+#
+# Copyright (c) 2023 Steven Garcia
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# ##### END MIT LICENSE BLOCK #####
+
+import numpy as np
+
+from math import radians
+from mathutils import Matrix
+
+def get_quaternion_matrices(quaternions):
+    # Quaternion.to_matrix() for an array of (w, i, j, k) quaternions. Like mathutils the quaternions are used as is so normalize
+    # them first if they might not be unit length.
+    w = quaternions[..., 0]
+    x = quaternions[..., 1]
+    y = quaternions[..., 2]
+    z = quaternions[..., 3]
+
+    return np.stack((np.stack((1.0 - 2.0 * (y * y + z * z), 2.0 * (x * y - z * w), 2.0 * (x * z + y * w)), axis=-1),
+                     np.stack((2.0 * (x * y + z * w), 1.0 - 2.0 * (x * x + z * z), 2.0 * (y * z - x * w)), axis=-1),
+                     np.stack((2.0 * (x * z - y * w), 2.0 * (y * z + x * w), 1.0 - 2.0 * (x * x + y * y)), axis=-1)), axis=-2)
+
+def get_euler_matrices(eulers, rotation_mode):
+    # The first axis in the rotation mode is applied first so it ends up on the right side of the product.
+    axis_matrices = []
+    for axis_idx in range(3):
+        cosine = np.cos(eulers[..., axis_idx])
+        sine = np.sin(eulers[..., axis_idx])
+        zero = np.zeros_like(cosine)
+        one = np.ones_like(cosine)
+        if axis_idx == 0:
+            rows = ((one, zero, zero), (zero, cosine, -sine), (zero, sine, cosine))
+
+        elif axis_idx == 1:
+            rows = ((cosine, zero, sine), (zero, one, zero), (-sine, zero, cosine))
+
+        else:
+            rows = ((cosine, -sine, zero), (sine, cosine, zero), (zero, zero, one))
+
+        axis_matrices.append(np.stack([np.stack(row, axis=-1) for row in rows], axis=-2))
+
+    rotation_matrices = axis_matrices["XYZ".index(rotation_mode[0])]
+    for axis_name in rotation_mode[1:]:
+        rotation_matrices = axis_matrices["XYZ".index(axis_name)] @ rotation_matrices
+
+    return rotation_matrices
+
+def get_matrix_quaternions(rotation_matrices):
+    # Matrix.to_quaternion() for an array of normalized 3x3 matrices. Returns (w, i, j, k) with W never negative like mathutils.
+    m00 = rotation_matrices[..., 0, 0]
+    m01 = rotation_matrices[..., 0, 1]
+    m02 = rotation_matrices[..., 0, 2]
+    m10 = rotation_matrices[..., 1, 0]
+    m11 = rotation_matrices[..., 1, 1]
+    m12 = rotation_matrices[..., 1, 2]
+    m20 = rotation_matrices[..., 2, 0]
+    m21 = rotation_matrices[..., 2, 1]
+    m22 = rotation_matrices[..., 2, 2]
+
+    # Four times the product of every pair of quaternion components. The row of the largest diagonal entry gives the most
+    # precise result.
+    wx = m21 - m12
+    wy = m02 - m20
+    wz = m10 - m01
+    xy = m01 + m10
+    xz = m02 + m20
+    yz = m12 + m21
+    diagonal = np.stack((1.0 + m00 + m11 + m22, 1.0 + m00 - m11 - m22, 1.0 - m00 + m11 - m22, 1.0 - m00 - m11 + m22), axis=-1)
+    products = np.stack((np.stack((diagonal[..., 0], wx, wy, wz), axis=-1),
+                         np.stack((wx, diagonal[..., 1], xy, xz), axis=-1),
+                         np.stack((wy, xy, diagonal[..., 2], yz), axis=-1),
+                         np.stack((wz, xz, yz, diagonal[..., 3]), axis=-1)), axis=-2)
+
+    largest = diagonal.argmax(axis=-1)[..., np.newaxis]
+    largest_product = np.take_along_axis(diagonal, largest, axis=-1)
+    quaternions = np.take_along_axis(products, largest[..., np.newaxis], axis=-2)[..., 0, :] / (2.0 * np.sqrt(largest_product))
+    quaternions[quaternions[..., 0] < 0.0] *= -1.0
+    quaternions /= np.linalg.norm(quaternions, axis=-1)[..., np.newaxis]
+
+    return quaternions
+
+def get_matrix_eulers(matrices):
+    # Matrix.to_euler() in XYZ order for an array of matrices. Of the two possible solutions the one closest to zero is used.
+    basis = matrices[..., :3, :3]
+    column_lengths = np.linalg.norm(basis, axis=-2)
+    basis = basis / np.where(column_lengths == 0.0, 1.0, column_lengths)[..., np.newaxis, :]
+
+    cy = np.hypot(basis[..., 0, 0], basis[..., 1, 0])
+    is_degenerate = cy <= 16.0 * np.finfo(np.float32).eps
+    eulers_a = np.stack((np.where(is_degenerate, np.arctan2(-basis[..., 1, 2], basis[..., 1, 1]), np.arctan2(basis[..., 2, 1], basis[..., 2, 2])),
+                         np.arctan2(-basis[..., 2, 0], cy),
+                         np.where(is_degenerate, 0.0, np.arctan2(basis[..., 1, 0], basis[..., 0, 0]))), axis=-1)
+    eulers_b = np.stack((np.arctan2(-basis[..., 2, 1], -basis[..., 2, 2]),
+                         np.arctan2(-basis[..., 2, 0], -cy),
+                         np.arctan2(-basis[..., 1, 0], -basis[..., 0, 0])), axis=-1)
+    eulers_b[is_degenerate] = eulers_a[is_degenerate]
+    use_b = np.abs(eulers_a).sum(axis=-1) > np.abs(eulers_b).sum(axis=-1)
+
+    return np.where(use_b[..., np.newaxis], eulers_b, eulers_a)
+
+def decompose_matrices(matrices):
+    # Matrix.decompose() for an array of matrices. Returns translations, (w, i, j, k) quaternions and scales.
+    translations = matrices[..., :3, 3]
+    basis = matrices[..., :3, :3]
+    scales = np.linalg.norm(basis, axis=-2)
+    rotation_matrices = basis / np.where(scales == 0.0, 1.0, scales)[..., np.newaxis, :]
+    is_negative = np.linalg.det(rotation_matrices) < 0.0
+    rotation_matrices[is_negative] *= -1.0
+    scales[is_negative] *= -1.0
+
+    return translations, get_matrix_quaternions(rotation_matrices), scales
+
+def get_transform_arrays(frame_transforms, node_indices, is_inverted=False):
+    # Pulls the translation, rotation and uniform scale of the given nodes out of a [frame_idx][node_idx] transform list.
+    translations = np.array([[tuple(frame[node_idx].translation) for node_idx in node_indices] for frame in frame_transforms], dtype=np.float64)
+    quaternions = np.array([[tuple(frame[node_idx].rotation) for node_idx in node_indices] for frame in frame_transforms], dtype=np.float64)
+    scales = np.array([[frame[node_idx].scale for node_idx in node_indices] for frame in frame_transforms], dtype=np.float64)
+    if is_inverted:
+        quaternions[..., 1:] *= -1.0
+        quaternions /= np.sum(quaternions * quaternions, axis=-1)[..., np.newaxis]
+
+    return translations, quaternions, scales
+
+def get_transform_matrices(translations, quaternions, scales):
+    # Translation @ rotation @ uniform scale for every frame and node.
+    transform_matrices = np.zeros(translations.shape[:-1] + (4, 4))
+    transform_matrices[..., :3, :3] = get_quaternion_matrices(quaternions) * scales[..., np.newaxis, np.newaxis]
+    transform_matrices[..., :3, 3] = translations
+    transform_matrices[..., 3, 3] = 1.0
+
+    return transform_matrices
+
+def can_bulk_keyframe(pose_bones, quaternion_only):
+    # Writing F-Curves directly assumes the pose is nothing but the rest pose and the keyed channels. Anything that changes how
+    # pose_bone.matrix maps to those channels keeps the frame by frame import.
+    for pose_bone in pose_bones:
+        bone = pose_bone.bone
+        if len(pose_bone.constraints) > 0 or not bone.use_inherit_rotation or not bone.inherit_scale == 'FULL' or not bone.use_local_location:
+            return False
+
+        if quaternion_only and not pose_bone.rotation_mode == 'QUATERNION':
+            return False
+
+    return True
+
+def get_pose_matrices(pose_bones, transform_matrices, is_relative, fix_rotations):
+    # Does what setting pose_bone.matrix frame by frame does for the imported transforms. Relative transforms are put on top of
+    # the parent pose and fix_rotations undoes the 90 degree Z rotation the exporter adds to bones.
+    rotation_matrix = np.array(Matrix.Rotation(radians(90.0), 4, 'Z'))
+    inverse_rotation_matrix = np.array(Matrix.Rotation(radians(-90.0), 4, 'Z'))
+    bone_order = sorted(range(len(pose_bones)), key=lambda bone_idx: len(pose_bones[bone_idx].parent_recursive))
+    pose_matrices = {}
+    for bone_idx in bone_order:
+        pose_bone = pose_bones[bone_idx]
+        pose_matrix = transform_matrices[:, bone_idx]
+        if is_relative and pose_bone.parent:
+            parent_matrix = pose_matrices.get(pose_bone.parent.name)
+            if parent_matrix is None:
+                parent_matrix = np.array(pose_bone.parent.matrix)
+
+            if fix_rotations:
+                parent_matrix = parent_matrix @ rotation_matrix
+
+            pose_matrix = parent_matrix @ pose_matrix
+
+        if fix_rotations:
+            pose_matrix = pose_matrix @ inverse_rotation_matrix
+
+        pose_matrices[pose_bone.name] = pose_matrix
+
+    return pose_matrices
+
+def get_basis_matrices(pose_bones, pose_matrices):
+    # pose_bone.matrix_basis for every keyed bone given its pose matrix. Parents that aren't keyed keep the pose they have now.
+    basis_matrices = {}
+    for pose_bone in pose_bones:
+        rest_matrix = np.array(pose_bone.bone.matrix_local)
+        if pose_bone.parent:
+            parent_matrix = pose_matrices.get(pose_bone.parent.name)
+            if parent_matrix is None:
+                parent_matrix = np.array(pose_bone.parent.matrix)
+
+            rest_matrix = parent_matrix @ (np.linalg.inv(np.array(pose_bone.parent.bone.matrix_local)) @ rest_matrix)
+
+        basis_matrices[pose_bone.name] = np.linalg.inv(rest_matrix) @ pose_matrices[pose_bone.name]
+
+    return basis_matrices
+
+def set_fcurve_keyframes(action, data_path, array_index, group_name, frames, values):
+    # Replaces the F-Curve with one keyframe per frame in a single foreach_set instead of a keyframe_insert per frame.
+    fcurve = action.fcurves.find(data_path, index=array_index)
+    if not fcurve == None:
+        action.fcurves.remove(fcurve)
+
+    fcurve = action.fcurves.new(data_path, index=array_index, action_group=group_name)
+    keyframe_count = len(frames)
+    keyframe_coordinates = np.empty(keyframe_count * 2, dtype=np.float32)
+    keyframe_coordinates[0::2] = frames
+    keyframe_coordinates[1::2] = values
+    fcurve.keyframe_points.add(keyframe_count)
+    fcurve.keyframe_points.foreach_set("co", keyframe_coordinates)
+    fcurve.update()
+
+def keyframe_pose_bones(action, pose_bones, frames, pose_matrices, pose_eulers=None):
+    # Keys location, rotation and scale of every bone like keyframe_insert would after setting pose_bone.matrix. The rotation
+    # channel the bone doesn't use keeps its current value unless pose_eulers gives the Euler values to key.
+    basis_matrices = get_basis_matrices(pose_bones, pose_matrices)
+    frame_count = len(frames)
+    for pose_bone in pose_bones:
+        translations, quaternions, scales = decompose_matrices(basis_matrices[pose_bone.name])
+        eulers = np.broadcast_to(np.array(pose_bone.rotation_euler), (frame_count, 3))
+        if not pose_eulers == None:
+            eulers = pose_eulers[pose_bone.name]
+
+        if not pose_bone.rotation_mode == 'QUATERNION':
+            quaternions = np.broadcast_to(np.array(pose_bone.rotation_quaternion), (frame_count, 4))
+
+        channels = (("location", translations), ("rotation_euler", eulers), ("rotation_quaternion", quaternions), ("scale", scales))
+        for property_name, channel_values in channels:
+            data_path = pose_bone.path_from_id(property_name)
+            for array_index in range(channel_values.shape[-1]):
+                set_fcurve_keyframes(action, data_path, array_index, pose_bone.name, frames, channel_values[:, array_index])
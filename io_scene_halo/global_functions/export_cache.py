@@ -0,0 +1,313 @@
+# ##### BEGIN MIT LICENSE BLOCK #####
+#
+# MIT License
+#
+# Copyright (c) 2023 Steven Garcia & Jadeon Sheppard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# ##### END MIT LICENSE BLOCK #####
+
+
+import bpy
+import hashlib
+import numpy as np
+
+from collections import OrderedDict
+from bpy.app.handlers import persistent
+from . import timing_report
+
+# Geometry extracted by earlier exports in this Blender session. Entries are keyed by file type and object name and are only
+# reused while the content hash of the object still matches. Entries are kept in least recently used order and the oldest ones
+# are dropped once the cache holds more than GEOMETRY_CACHE_VERTEX_LIMIT vertices.
+GEOMETRY_CACHE = OrderedDict()
+GEOMETRY_CACHE_STATE = {"vertex_count": 0}
+GEOMETRY_CACHE_VERTEX_LIMIT = 2000000
+
+ATTRIBUTE_FIELDS = {
+    'FLOAT': ("value", 1, np.float32),
+    'INT': ("value", 1, np.int32),
+    'INT8': ("value", 1, np.int8),
+    'BOOLEAN': ("value", 1, np.bool_),
+    'FLOAT2': ("vector", 2, np.float32),
+    'INT32_2D': ("value", 2, np.int32),
+    'FLOAT_VECTOR': ("vector", 3, np.float32),
+    'FLOAT_COLOR': ("color", 4, np.float32),
+    'BYTE_COLOR': ("color", 4, np.float32),
+    'QUATERNION': ("value", 4, np.float32),
+    'FLOAT4X4': ("value", 16, np.float32),
+}
+
+class MaterialReference():
+    # Registry entries can hold Blender materials. Cached entries only keep the material name so a removed material can't be
+    # touched later, the name is resolved again when the entry is replayed.
+    def __init__(self, name):
+        self.name = name
+
+class GeometryCacheEntry():
+    def __init__(self, object_hash, vertices, triangles, registry_entries, node_index_list=None, material_index=-1):
+        self.object_hash = object_hash
+        self.vertices = vertices
+        self.triangles = triangles
+        self.registry_entries = registry_entries
+        self.node_index_list = node_index_list
+        self.material_index = material_index
+
+class GeometryCache():
+    # Created once per export. It hashes everything about an object that goes into its vertex and triangle sections, hands back
+    # the sections from the last export if nothing changed and otherwise evaluates the mesh so the caller can extract it.
+    def __init__(self, file_type, depsgraph, apply_modifiers):
+        self.file_type = file_type
+        self.depsgraph = depsgraph
+        self.apply_modifiers = apply_modifiers
+        self.used_keys = set()
+
+    def get_evaluated_mesh(self, obj):
+        return get_evaluated_mesh(obj, self.apply_modifiers, self.depsgraph)
+
+    def get_object_hash(self, obj, *object_settings):
+        object_hash = hashlib.sha1(repr((self.apply_modifiers, object_settings)).encode("utf-8"))
+        modifier_key = ()
+        if self.apply_modifiers:
+            modifier_key = get_modifier_key(obj)
+            if modifier_key == None:
+                return None
+
+        slot_materials = []
+        for slot in obj.material_slots:
+            material_name = None
+            if slot.material:
+                material_name = slot.material.name
+
+            slot_materials.append((slot.link, material_name))
+
+        region_names = [region.name for region in obj.region_list]
+        object_key = (obj.data.as_pointer(), tuple(map(tuple, obj.matrix_world)), modifier_key, slot_materials, obj.vertex_groups.keys(), region_names, obj.active_region)
+        object_hash.update(repr(object_key).encode("utf-8"))
+        update_mesh_hash(object_hash, obj.data, len(obj.vertex_groups) > 0)
+
+        return object_hash.hexdigest()
+
+    def load(self, obj, object_hash):
+        cache_key = (self.file_type, obj.name_full)
+        self.used_keys.add(cache_key)
+        cache_entry = None
+        if not object_hash == None:
+            cache_entry = GEOMETRY_CACHE.get(cache_key)
+            if not cache_entry == None:
+                if cache_entry.object_hash == object_hash:
+                    GEOMETRY_CACHE.move_to_end(cache_key)
+
+                else:
+                    cache_entry = None
+
+        return cache_entry
+
+    def store(self, obj, object_hash, cache_entry):
+        cache_key = (self.file_type, obj.name_full)
+        self.used_keys.add(cache_key)
+        remove_cache_entry(cache_key)
+        if not object_hash == None:
+            add_cache_entry(cache_key, cache_entry)
+
+    def finish(self):
+        # Called once the export is done. Entries for objects this export didn't touch were deleted, renamed or left out of the
+        # scene so they are dropped instead of being held until the file is closed.
+        for cache_key in list(GEOMETRY_CACHE.keys()):
+            if cache_key[0] == self.file_type and not cache_key in self.used_keys:
+                remove_cache_entry(cache_key)
+
+def add_cache_entry(cache_key, cache_entry):
+    vertex_count = len(cache_entry.vertices)
+    if vertex_count > GEOMETRY_CACHE_VERTEX_LIMIT:
+        return
+
+    GEOMETRY_CACHE[cache_key] = cache_entry
+    GEOMETRY_CACHE_STATE["vertex_count"] += vertex_count
+    while GEOMETRY_CACHE_STATE["vertex_count"] > GEOMETRY_CACHE_VERTEX_LIMIT:
+        oldest_key = next(iter(GEOMETRY_CACHE))
+        remove_cache_entry(oldest_key)
+
+def remove_cache_entry(cache_key):
+    cache_entry = GEOMETRY_CACHE.pop(cache_key, None)
+    if not cache_entry == None:
+        GEOMETRY_CACHE_STATE["vertex_count"] -= len(cache_entry.vertices)
+
+def clear_geometry_cache():
+    GEOMETRY_CACHE.clear()
+    GEOMETRY_CACHE_STATE["vertex_count"] = 0
+
+@persistent
+def clear_geometry_cache_on_load(dummy):
+    # Object names in a newly loaded file have nothing to do with the cached ones.
+    clear_geometry_cache()
+
+def get_evaluated_mesh(obj, apply_modifiers, depsgraph):
+    with timing_report.phase("modifier eval") as timing_phase:
+        if apply_modifiers:
+            obj_for_convert = obj.evaluated_get(depsgraph)
+            evaluted_mesh = obj_for_convert.to_mesh(preserve_all_data_layers=True, depsgraph=depsgraph)
+
+        else:
+            evaluted_mesh = obj.to_mesh(preserve_all_data_layers=True)
+
+        timing_phase.count("meshes", 1)
+
+    return evaluted_mesh
+
+def get_modifier_key(obj):
+    # Returns None for objects that can't be cached. A modifier that points at another ID, like an armature or a node group,
+    # changes the evaluated mesh whenever that ID changes and there is no cheap way to tell when that happens.
+    modifier_key = []
+    for modifier in obj.modifiers:
+        modifier_settings = []
+        for modifier_property in modifier.bl_rna.properties:
+            property_name = modifier_property.identifier
+            if property_name == "rna_type" or modifier_property.type == 'COLLECTION':
+                continue
+
+            property_value = getattr(modifier, property_name)
+            if modifier_property.type == 'POINTER':
+                if isinstance(property_value, bpy.types.ID):
+                    return None
+
+                continue
+
+            if getattr(modifier_property, "is_array", False):
+                property_value = tuple(property_value)
+
+            modifier_settings.append((property_name, property_value))
+
+        modifier_key.append(tuple(modifier_settings))
+
+    return tuple(modifier_key)
+
+def update_array_hash(object_hash, collection, attribute_name, component_count, dtype):
+    array_data = np.empty(len(collection) * component_count, dtype=dtype)
+    collection.foreach_get(attribute_name, array_data)
+    object_hash.update(array_data.tobytes())
+
+def update_mesh_hash(object_hash, mesh, write_weights):
+    update_array_hash(object_hash, mesh.edges, "vertices", 2, np.int32)
+    update_array_hash(object_hash, mesh.loops, "vertex_index", 1, np.int32)
+    update_array_hash(object_hash, mesh.polygons, "loop_start", 1, np.int32)
+    update_array_hash(object_hash, mesh.polygons, "loop_total", 1, np.int32)
+    for attribute in mesh.attributes:
+        object_hash.update(("%s|%s|%s" % (attribute.name, attribute.data_type, attribute.domain)).encode("utf-8"))
+        attribute_field = ATTRIBUTE_FIELDS.get(attribute.data_type)
+        if not attribute_field == None:
+            field_name, component_count, dtype = attribute_field
+            update_array_hash(object_hash, attribute.data, field_name, component_count, dtype)
+
+    active_color_name = ""
+    if not mesh.attributes.active_color == None:
+        active_color_name = mesh.attributes.active_color.name
+
+    object_hash.update(active_color_name.encode("utf-8"))
+    if mesh.has_custom_normals:
+        if (4, 1, 0) > bpy.app.version:
+            mesh.calc_normals_split()
+            update_array_hash(object_hash, mesh.loops, "normal", 3, np.float32)
+
+        else:
+            update_array_hash(object_hash, mesh.corner_normals, "vector", 3, np.float32)
+
+    if mesh.shape_keys:
+        for key_block in mesh.shape_keys.key_blocks:
+            object_hash.update(repr((key_block.name, key_block.value, key_block.mute, key_block.vertex_group, key_block.relative_key.name)).encode("utf-8"))
+            update_array_hash(object_hash, key_block.data, "co", 3, np.float32)
+
+    # Vertex weights are not exposed as attributes so they are the one part of the mesh that is read per vertex.
+    if write_weights:
+        vertex_weights = []
+        for vertex in mesh.vertices:
+            vertex_weights.append(len(vertex.groups))
+            for vertex_group in vertex.groups:
+                vertex_weights.append(vertex_group.group)
+                vertex_weights.append(vertex_group.weight)
+
+        object_hash.update(np.array(vertex_weights, dtype=np.float64).tobytes())
+
+def pack_registry_entry(entry):
+    if isinstance(entry, list):
+        return [pack_registry_entry(entry_value) for entry_value in entry]
+
+    elif isinstance(entry, bpy.types.Material):
+        return MaterialReference(entry.name)
+
+    return entry
+
+def unpack_registry_entry(entry):
+    if isinstance(entry, list):
+        return [unpack_registry_entry(entry_value) for entry_value in entry]
+
+    elif isinstance(entry, MaterialReference):
+        material = bpy.data.materials.get(entry.name)
+        if material == None:
+            raise KeyError(entry.name)
+
+        return material
+
+    return entry
+
+def start_recording(registries):
+    for registry in registries:
+        registry.start_recording()
+
+def stop_recording(registries):
+    # Each recorded entry is stored with the index it had when the object was extracted so cached indices can be remapped.
+    registry_entries = []
+    for registry in registries:
+        registry_entries.append([(registry.index(entry), pack_registry_entry(entry)) for entry in registry.stop_recording()])
+
+    return registry_entries
+
+def replay_registries(registries, registry_entries):
+    # Appends the recorded entries in their original order, which leaves every registry exactly as extracting the object would
+    # have, and returns a map from the cached indices to the current ones for each registry. Returns None if a material the
+    # object used no longer exists.
+    index_maps = []
+    try:
+        unpacked_entries = [[(entry_index, unpack_registry_entry(entry)) for entry_index, entry in entries] for entries in registry_entries]
+
+    except KeyError:
+        return None
+
+    for registry, entries in zip(registries, unpacked_entries):
+        index_map = {-1: -1}
+        for entry_index, entry in entries:
+            registry.append(entry)
+            index_map[entry_index] = registry.index(entry)
+
+        index_maps.append(index_map)
+
+    return index_maps
+
+def get_cached_vertices(vertices, region_map, vertex_class):
+    # Cached vertices are shared with the new asset unless a region moved to a different index since they were extracted.
+    if all(region_index == cached_index for cached_index, region_index in region_map.items()):
+        return list(vertices)
+
+    return [vertex_class(vertex.node_influence_count, vertex.node_set, region_map[vertex.region], vertex.translation, vertex.normal, vertex.color, vertex.uv_set) for vertex in vertices]
+
+def get_cached_triangles(triangles, region_map, material_map, triangle_class):
+    return [triangle_class(region_map[region], material_map[material_index], v0, v1, v2) for region, material_index, v0, v1, v2 in triangles]
+
+def get_triangle_records(triangles):
+    return [(triangle.region, triangle.material_index, triangle.v0, triangle.v1, triangle.v2) for triangle in triangles]
@@ -30,12 +30,16 @@ import sys
 import math
 import colorsys
 import re
+import pickle
 import operator
+import tempfile
+import threading
 
 from decimal import *
 from math import radians
 from enum import Enum, auto
 from io import TextIOWrapper
+from concurrent.futures import ThreadPoolExecutor
 from ..global_functions.parse_tags import parse_tag
 from mathutils import Vector, Euler, Quaternion, Matrix
 
@@ -118,6 +122,74 @@ class EdgeSplit():
         self.split_angle = split_angle
         self.use_edge_sharp = use_edge_sharp
 
+def open_export_file(output_path, binary=False):
+    if binary:
+        return open(output_path, 'wb')
+
+    return open(output_path, 'w', encoding='utf_8')
+
+def write_record_chunks(file, records, format_record, chunk_size=4096):
+    # Writes a section of records such as vertices or triangles. format_record adds the values for a record to the chunk and returns
+    # its format string. Each chunk is formatted with a single % and written at once, so the text is identical to formatting and
+    # writing every record on its own.
+    chunk_formats = []
+    chunk_values = []
+    for record_idx, record in enumerate(records):
+        chunk_formats.append(format_record(record_idx, record, chunk_values))
+        if len(chunk_formats) >= chunk_size:
+            file.write(''.join(chunk_formats) % tuple(chunk_values))
+            chunk_formats = []
+            chunk_values = []
+
+    if len(chunk_formats) > 0:
+        file.write(''.join(chunk_formats) % tuple(chunk_values))
+
+class ExportWriterPool():
+    # Runs asset writers on worker threads while the main thread keeps pulling the next asset out of Blender. Only plain asset
+    # data may be handed to a writer since bpy is not safe to touch off the main thread. submit() blocks once pending_count
+    # writers are queued so finished assets don't pile up in memory, and the first writer error is raised again from wait().
+    def __init__(self, worker_count=None, pending_count=None):
+        if worker_count == None:
+            worker_count = os.cpu_count() or 1
+
+        if pending_count == None:
+            pending_count = worker_count * 2
+
+        self.executor = ThreadPoolExecutor(max_workers=worker_count)
+        self.pending_slots = threading.BoundedSemaphore(pending_count)
+        self.futures = []
+
+    def submit(self, writer, *args):
+        self.pending_slots.acquire()
+        try:
+            future = self.executor.submit(writer, *args)
+
+        except:
+            self.pending_slots.release()
+            raise
+
+        future.add_done_callback(lambda finished_future: self.pending_slots.release())
+        self.futures.append(future)
+
+        return future
+
+    def wait(self):
+        futures = self.futures
+        self.futures = []
+        for future in futures:
+            future.result()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        try:
+            if exc_type == None:
+                self.wait()
+
+        finally:
+            self.executor.shutdown(wait=True)
+
 class ParentIDFix():
     def __init__(self, pelvis = None, thigh0 = None, thigh1 = None, spine1 = None, clavicle0 = None, clavicle1 = None):
         self.pelvis = pelvis
@@ -481,6 +553,15 @@ def get_true_extension(filepath, extension, is_import):
 
     return true_extension
 
+def get_fcurve_index(action):
+    # Maps (data_path, array_index) to its F-Curve so channels can be looked up without searching action.fcurves every time.
+    fcurve_index = {}
+    if not action == None:
+        for fcurve in action.fcurves:
+            fcurve_index[(fcurve.data_path, fcurve.array_index)] = fcurve
+
+    return fcurve_index
+
 def generate_fcurve_matrix(bone, action, frame_idx):
     dpath_loc = bone.path_from_id("location")
     dpath_rot_quat = bone.path_from_id("rotation_quaternion")
@@ -764,6 +845,124 @@ def invert_rotations(filetype, file_version):
 
     return invert_rotations
 
+class ExportRegistry():
+    # Insertion ordered collection of unique entries that keeps a dict of entry positions so membership tests and index() are
+    # constant time. Halo 2 and 3 materials are [material, lod, region, permutation] lists so list entries are keyed by their
+    # contents. Entries can only be appended, the list is wrapped rather than subclassed so nothing can reorder or remove entries
+    # behind the position dict. While recording, every entry that is looked up or appended is kept in the order it was first seen
+    # so the export cache can replay the registry changes an object made without walking its faces again.
+    def __init__(self, entries=()):
+        self.entries = []
+        self.entry_indices = {}
+        self.recorded_entries = None
+        for entry in entries:
+            self.append(entry)
+
+    def get_key(self, entry):
+        if isinstance(entry, list):
+            return tuple(entry)
+
+        return entry
+
+    def record(self, entry_key, entry):
+        if not self.recorded_entries == None and not entry_key in self.recorded_entries:
+            self.recorded_entries[entry_key] = entry
+
+    def append(self, entry):
+        entry_key = self.get_key(entry)
+        self.record(entry_key, entry)
+        if not entry_key in self.entry_indices:
+            self.entry_indices[entry_key] = len(self.entries)
+            self.entries.append(entry)
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def index(self, entry):
+        entry_key = self.get_key(entry)
+        entry_index = self.entry_indices.get(entry_key)
+        if entry_index == None:
+            raise ValueError("%s is not in registry" % (entry,))
+
+        self.record(entry_key, entry)
+
+        return entry_index
+
+    def start_recording(self):
+        self.recorded_entries = {}
+
+    def stop_recording(self):
+        recorded_entries = list(self.recorded_entries.values())
+        self.recorded_entries = None
+
+        return recorded_entries
+
+    def __contains__(self, entry):
+        entry_key = self.get_key(entry)
+        self.record(entry_key, entry)
+
+        return entry_key in self.entry_indices
+
+    def __iter__(self):
+        return iter(self.entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __getitem__(self, entry_idx):
+        return self.entries[entry_idx]
+
+class SpooledRecordList():
+    # Append only record list for streamed exports. Only the newest spool_size records stay in memory, older ones are pickled in
+    # batches to a temporary section file and read back in order when the list is iterated. len() covers both so vertex indices
+    # and section counts come out the same as with a plain list.
+    def __init__(self, spool_size=65536):
+        self.spool_size = spool_size
+        self.records = []
+        self.spool_file = None
+        self.spooled_count = 0
+
+    def append(self, record):
+        self.records.append(record)
+        if len(self.records) >= self.spool_size:
+            self.spool()
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def spool(self):
+        if self.spool_file == None:
+            self.spool_file = tempfile.TemporaryFile()
+
+        self.spool_file.seek(0, os.SEEK_END)
+        pickle.dump(self.records, self.spool_file, pickle.HIGHEST_PROTOCOL)
+        self.spooled_count += len(self.records)
+        self.records = []
+
+    def close(self):
+        if not self.spool_file == None:
+            self.spool_file.close()
+            self.spool_file = None
+
+        self.spooled_count = 0
+        self.records = []
+
+    def __len__(self):
+        return self.spooled_count + len(self.records)
+
+    def __iter__(self):
+        if not self.spool_file == None:
+            self.spool_file.seek(0)
+            read_count = 0
+            while read_count < self.spooled_count:
+                records = pickle.load(self.spool_file)
+                read_count += len(records)
+                yield from records
+
+        yield from self.records
+
 def gather_materials(game_version, material, material_list, export_type):
     assigned_materials_list = []
     if material is not None:
@@ -28,10 +28,12 @@ import io
 import bpy
 import bmesh
 import struct
+import itertools
+import numpy as np
 
-from math import radians
+from math import radians, floor
 from mathutils import Vector, Matrix
-from ..global_functions import global_functions, shader_processing, mesh_processing
+from ..global_functions import global_functions, shader_processing, mesh_processing, tag_format
 from ..file_tag.h2.file_render_model.format import DetailLevelsFlags
 
 
@@ -805,75 +807,97 @@ def generate_mesh_retail(context, asset, object_vertices, object_triangles, obje
 
     return vertex_weights_sets, region_list
 
-def process_mesh_export_weights(vert, armature, original_geo, vertex_groups, joined_list, file_type, node_index_list=None):
-    if len(vert.groups) != 0 and len(vert.groups) <= len(vertex_groups):
-        object_vert_group_list = []
-        vertex_vert_group_list = []
-        for group_index in range(len(vert.groups)):
-            vert_group = vert.groups[group_index].group
-            if not vert_group >= len(vertex_groups):
-                object_vertex_group = vertex_groups[vert_group]
-                if armature:
-                    if object_vertex_group in armature.data.bones:
-                        vertex_vert_group_list.append(group_index)
-                        if armature.data.bones[object_vertex_group] in joined_list:
-                            object_vert_group_list.append(vert_group)
+class VertexWeightTable():
+    # Resolves the node every vertex group of an object exports to once so vertex weights only cost a list lookup per influence.
+    # Weights are also cached per vertex index since every loop of a shared vertex resolves to the same node set.
+    def __init__(self, armature, original_geo, vertex_groups, joined_list, file_type, node_index_list=None):
+        self.armature = armature
+        self.original_geo = original_geo
+        self.joined_list = joined_list
+        self.file_type = file_type
+        self.node_index_list = node_index_list
+        self.group_count = len(vertex_groups)
+        self.group_nodes = []
+        self.node_positions = {}
+        self.vertex_weights = {}
+        self.parent_weights = None
+        for object_vertex_group in vertex_groups:
+            node_obj = None
+            if armature:
+                node_obj = armature.data.bones.get(object_vertex_group)
 
-                else:
-                    if object_vertex_group in bpy.data.objects:
-                        vertex_vert_group_list.append(group_index)
-                        if bpy.data.objects[object_vertex_group] in joined_list:
-                            object_vert_group_list.append(vert_group)
+            else:
+                node_obj = bpy.data.objects.get(object_vertex_group)
 
-        value = len(object_vert_group_list)
-        if value > 4:
-            value = 4
+            node_index = -1
+            if not node_obj == None and node_obj in joined_list:
+                node_index = joined_list.index(node_obj)
 
-        node_influence_count = int(value)
-        node_set = []
-        if len(object_vert_group_list) != 0:
-            for idx, group_index in enumerate(object_vert_group_list):
-                vert_index = int(vertex_vert_group_list[idx])
-                vert_group = vert.groups[vert_index].group
-                object_vertex_group = vertex_groups[vert_group]
-                if armature:
-                    node_obj = armature.data.bones[object_vertex_group]
+            self.group_nodes.append(node_index)
 
-                else:
-                    node_obj = bpy.data.objects[object_vertex_group]
+    def get_node_index(self, node_index):
+        if self.file_type == 'ASS':
+            node_index += 1
+            if not self.node_index_list == None:
+                node_position = self.node_positions.get(node_index)
+                if node_position == None:
+                    # node_index_list is shared between objects and only ever appended to so a position never goes stale.
+                    if not node_index in self.node_index_list:
+                        self.node_index_list.append(node_index)
 
-                node_index = int(joined_list.index(node_obj))
-                if file_type == 'ASS':
-                    node_index += 1
-                    if not node_index_list == None and not node_index in node_index_list:
-                        node_index_list.append(node_index)
+                    node_position = self.node_index_list.index(node_index)
+                    self.node_positions[node_index] = node_position
 
-                    node_index = node_index_list.index(node_index)
+                node_index = node_position
 
-                node_weight = float(vert.groups[vert_index].weight)
-                node_set.append([node_index, node_weight])
+        return node_index
 
-        else:
-            node_set = []
-            node_influence_count = int(0)
-            if file_type == 'JMS':
-                parent_index = global_functions.get_parent(armature, original_geo, joined_list, 0)
-                node_influence_count = int(1)
-                node_index = int(parent_index[0])
-                node_weight = float(1.0000000000)
-                node_set.append([node_index, node_weight])
+    def get_parent_index(self):
+        if self.parent_weights == None:
+            parent_index = global_functions.get_parent(self.armature, self.original_geo, self.joined_list, 0)
+            self.parent_weights = int(parent_index[0])
 
-    else:
-        node_set = []
+        return self.parent_weights
+
+    def get_parent_weights(self):
         node_influence_count = int(0)
-        if file_type == 'JMS':
-            parent_index = global_functions.get_parent(armature, original_geo, joined_list, 0)
+        node_set = []
+        if self.file_type == 'JMS':
             node_influence_count = int(1)
-            node_index = int(parent_index[0])
-            node_weight = float(1.0000000000)
-            node_set.append([node_index, node_weight])
+            node_set.append([self.get_parent_index(), float(1.0000000000)])
+
+        return node_influence_count, node_set
+
+    def get_node_key(self):
+        # Everything outside of the mesh that decides which nodes its vertices end up weighted to.
+        parent_index = None
+        if self.file_type == 'JMS':
+            parent_index = self.get_parent_index()
+
+        return tuple(self.group_nodes), parent_index
+
+    def get_weights(self, vertices, vertex_index):
+        vertex_weights = self.vertex_weights.get(vertex_index)
+        if vertex_weights == None:
+            vertex_weights = self.process_weights(vertices[vertex_index])
+            self.vertex_weights[vertex_index] = vertex_weights
+
+        return vertex_weights
+
+    def process_weights(self, vert):
+        if len(vert.groups) != 0 and len(vert.groups) <= self.group_count:
+            node_set = []
+            for vertex_group in vert.groups:
+                vert_group = vertex_group.group
+                if not vert_group >= self.group_count:
+                    node_index = self.group_nodes[vert_group]
+                    if not node_index == -1:
+                        node_set.append([self.get_node_index(node_index), float(vertex_group.weight)])
+
+            if len(node_set) != 0:
+                return int(min(len(node_set), 4)), node_set
 
-    return node_influence_count, node_set
+        return self.get_parent_weights()
 
 def process_mesh_export_color(evaluted_mesh, loop_index, vertex_index):
     color = (0.0, 0.0, 0.0)
@@ -911,6 +935,188 @@ def process_mesh_export_vert(vertex_data, file_type, original_geo_matrix, custom
 
     return final_translation
 
+def get_mesh_export_columns(evaluted_mesh, original_geo_matrix, loop_normals):
+    # Bulk counterpart to process_mesh_export_vert, process_mesh_export_uv and process_mesh_export_color for JMS exports. Mesh data
+    # is read with one foreach_get per attribute and transformed with a single matrix multiply instead of once per loop. The math
+    # runs in double precision and is rounded back to single precision at the end, while mathutils rounds its intermediate
+    # results, so a value can differ from the per loop path in its last digit.
+    vertex_count = len(evaluted_mesh.vertices)
+    loop_count = len(evaluted_mesh.loops)
+    polygon_count = len(evaluted_mesh.polygons)
+    geo_matrix = np.array(original_geo_matrix, dtype=np.float64)
+    normal_matrix = geo_matrix[:3, :3]
+
+    loop_vertex_indices = np.empty(loop_count, dtype=np.int32)
+    evaluted_mesh.loops.foreach_get("vertex_index", loop_vertex_indices)
+
+    positions = np.empty(vertex_count * 3, dtype=np.float32)
+    evaluted_mesh.vertices.foreach_get("co", positions)
+    translations = (positions.reshape(-1, 3) @ normal_matrix.T + geo_matrix[:3, 3]).astype(np.float32)
+
+    if loop_normals:
+        loop_normal_data = np.empty(loop_count * 3, dtype=np.float32)
+        if (4, 1, 0) > bpy.app.version:
+            evaluted_mesh.loops.foreach_get("normal", loop_normal_data)
+
+        else:
+            evaluted_mesh.corner_normals.foreach_get("vector", loop_normal_data)
+
+        loop_normal_data = loop_normal_data.reshape(-1, 3)
+
+    else:
+        vertex_normal_data = np.empty(vertex_count * 3, dtype=np.float32)
+        evaluted_mesh.vertices.foreach_get("normal", vertex_normal_data)
+        loop_normal_data = vertex_normal_data.reshape(-1, 3)[loop_vertex_indices]
+
+    polygon_normal_data = np.empty(polygon_count * 3, dtype=np.float32)
+    evaluted_mesh.polygons.foreach_get("normal", polygon_normal_data)
+    polygon_loop_totals = np.empty(polygon_count, dtype=np.int32)
+    evaluted_mesh.polygons.foreach_get("loop_total", polygon_loop_totals)
+    loop_polygon_indices = np.repeat(np.arange(polygon_count, dtype=np.int32), polygon_loop_totals)
+
+    normals = normalize_columns(loop_normal_data @ normal_matrix.T)
+    face_normals = normalize_columns(polygon_normal_data.reshape(-1, 3) @ normal_matrix.T)[loop_polygon_indices]
+    degenerate_normals = ~np.any(normals, axis=1)
+    normals[degenerate_normals] = face_normals[degenerate_normals]
+
+    uv_layers = []
+    for uv_layer in evaluted_mesh.uv_layers:
+        uv_data = np.empty(loop_count * 2, dtype=np.float32)
+        uv_layer.data.foreach_get("uv", uv_data)
+        uv_layers.append(uv_data.reshape(-1, 2))
+
+    colors = None
+    active_color = evaluted_mesh.attributes.active_color
+    if not active_color == None:
+        element_count = loop_count
+        if active_color.domain == "POINT":
+            element_count = vertex_count
+
+        color_data = np.empty(element_count * 4, dtype=np.float32)
+        active_color.data.foreach_get("color", color_data)
+        colors = color_data.reshape(-1, 4)
+        if active_color.domain == "POINT":
+            colors = colors[loop_vertex_indices]
+
+    return loop_vertex_indices, translations, normals, uv_layers, colors
+
+def normalize_columns(vectors):
+    # Zero length rows stay zero the same way Vector.normalized() leaves them.
+    lengths = np.sqrt(np.einsum("ij,ij->i", vectors, vectors))
+    normalized_vectors = np.zeros(vectors.shape, dtype=np.float64)
+    valid_rows = lengths > 0.0
+    normalized_vectors[valid_rows] = vectors[valid_rows] / lengths[valid_rows, None]
+
+    return normalized_vectors.astype(np.float32)
+
+def get_export_color_list(colors):
+    # Applies the same placeholder color check as process_mesh_export_color to a column of loop colors.
+    if colors is None:
+        return None
+
+    color_list = [tuple(color) for color in colors.tolist()]
+    for loop_index in np.flatnonzero((colors[:, 0] == 0.0) & (colors[:, 2] == 0.0)).tolist():
+        if "{:.2f}".format(color_list[loop_index][1]) == "0.01":
+            color_list[loop_index] = (-65536.0000000000, -65536.0000000000, -65536.0000000000, 1.0)
+
+    return color_list
+
+def get_weld_key(vertex):
+    return (vertex.region,
+            vertex.node_influence_count,
+            tuple(vertex.node_set),
+            tuple(vertex.translation),
+            tuple(vertex.normal),
+            tuple(vertex.color),
+            tuple(tuple(uv) for uv in vertex.uv_set))
+
+def get_weld_cell(translation, weld_scale):
+    return (floor(translation[0] * weld_scale), floor(translation[1] * weld_scale), floor(translation[2] * weld_scale))
+
+def is_within_epsilon(values, other_values, weld_epsilon):
+    for value, other_value in zip(values, other_values):
+        if abs(value - other_value) > weld_epsilon:
+            return False
+
+    return True
+
+def is_weld_match(vertex, other_vertex, weld_epsilon):
+    # Every value has to be within weld_epsilon of the kept vertex. Region, node indices and the number of nodes and UVs have to match
+    # exactly.
+    if not vertex.region == other_vertex.region or not vertex.node_influence_count == other_vertex.node_influence_count:
+        return False
+
+    if not len(vertex.node_set) == len(other_vertex.node_set) or not len(vertex.uv_set) == len(other_vertex.uv_set):
+        return False
+
+    for node, other_node in zip(vertex.node_set, other_vertex.node_set):
+        if not node[0] == other_node[0] or abs(node[1] - other_node[1]) > weld_epsilon:
+            return False
+
+    if not is_within_epsilon(vertex.translation, other_vertex.translation, weld_epsilon):
+        return False
+
+    if not is_within_epsilon(vertex.normal, other_vertex.normal, weld_epsilon):
+        return False
+
+    if not is_within_epsilon(vertex.color, other_vertex.color, weld_epsilon):
+        return False
+
+    for uv, other_uv in zip(vertex.uv_set, other_vertex.uv_set):
+        if not is_within_epsilon(uv, other_uv, weld_epsilon):
+            return False
+
+    return True
+
+def weld_export_vertices(vertices, triangles, weld_epsilon):
+    # Merges every vertex into an earlier kept vertex whose region and node indices match and whose position, normal, color, UVs and
+    # weights are all within weld_epsilon of it, then points the triangles at the vertex that was kept. Kept vertices are bucketed by
+    # position in cells twice the size of weld_epsilon so a match can only be in the same or a neighbouring cell, and each candidate
+    # is confirmed by comparing the actual values. Only indices are remapped so the winding of every triangle is left as it was.
+    welded_vertices = []
+    vertex_remap = []
+    if weld_epsilon > 0.0:
+        weld_scale = 1.0 / (weld_epsilon * 2.0)
+        weld_cells = {}
+        for vertex in vertices:
+            weld_cell = get_weld_cell(vertex.translation, weld_scale)
+            cell_x, cell_y, cell_z = weld_cell
+            welded_index = None
+            for neighbor_cell in itertools.product((cell_x - 1, cell_x, cell_x + 1), (cell_y - 1, cell_y, cell_y + 1), (cell_z - 1, cell_z, cell_z + 1)):
+                for candidate_index in weld_cells.get(neighbor_cell, ()):
+                    if is_weld_match(vertex, welded_vertices[candidate_index], weld_epsilon):
+                        welded_index = candidate_index
+                        break
+
+                if not welded_index == None:
+                    break
+
+            if welded_index == None:
+                welded_index = len(welded_vertices)
+                weld_cells.setdefault(weld_cell, []).append(welded_index)
+                welded_vertices.append(vertex)
+
+            vertex_remap.append(welded_index)
+
+    else:
+        welded_indices = {}
+        for vertex in vertices:
+            weld_key = get_weld_key(vertex)
+            welded_index = welded_indices.get(weld_key)
+            if welded_index == None:
+                welded_index = len(welded_vertices)
+                welded_indices[weld_key] = welded_index
+                welded_vertices.append(vertex)
+
+            vertex_remap.append(welded_index)
+
+    for triangle in triangles:
+        triangle.v0 = vertex_remap[triangle.v0]
+        triangle.v1 = vertex_remap[triangle.v1]
+        triangle.v2 = vertex_remap[triangle.v2]
+
+    return welded_vertices
+
 def process_mesh_export_face_set(default_permutation, default_region, game_version, original_geo, region_idx):
     if game_version == "halo1":
         if not region_idx == -1:
@@ -998,12 +1204,46 @@ def get_bone_distance(import_file_prerelease, import_file_main, current_idx, fil
 
     return bone_distance
 
+def mesh_from_vertex_columns(mesh, positions, triangles):
+    # Counterpart to from_pydata for vertex data held in a TagBlockColumns store. Everything goes through foreach_set in one call per
+    # attribute. Returns the triangles as an (n, 3) array so loop data can be laid out with the same ordering.
+    triangle_array = np.asarray(triangles, dtype=np.int32).reshape(-1, 3)
+    triangle_count = len(triangle_array)
+    mesh.vertices.add(len(positions))
+    mesh.loops.add(triangle_count * 3)
+    mesh.polygons.add(triangle_count)
+    mesh.vertices.foreach_set("co", np.ascontiguousarray(positions, dtype=np.float32).ravel())
+    mesh.loops.foreach_set("vertex_index", triangle_array.ravel())
+    # Polygon sizes are derived from loop_start so loop_total doesn't need to be written.
+    mesh.polygons.foreach_set("loop_start", np.arange(0, triangle_count * 3, 3, dtype=np.int32))
+    mesh.update(calc_edges=True)
+
+    return triangle_array
+
+def set_loop_uvs_from_columns(mesh, uv_name, uvs, triangle_array, flip_v=True):
+    if len(triangle_array) > 0:
+        layer_uv = mesh.uv_layers.get(uv_name)
+        if layer_uv is None:
+            layer_uv = mesh.uv_layers.new(name=uv_name)
+
+        loop_uvs = np.asarray(uvs, dtype=np.float32)[triangle_array.ravel()]
+        if flip_v:
+            loop_uvs[:, 1] = 1 - loop_uvs[:, 1]
+
+        layer_uv.data.foreach_set("uv", loop_uvs.ravel())
+
 def get_mesh_data(ASSET, section_data, mesh, material_count, materials, random_color_gen, part_flags):
     for section_data in section_data:
         triangles = []
         triangle_mat_indices = []
-        vertices = [raw_vertex.position for raw_vertex in section_data.raw_vertices]
-        vertex_normals = [raw_vertex.normal for raw_vertex in section_data.raw_vertices]
+        vertex_columns = isinstance(section_data.raw_vertices, tag_format.TagBlockColumns)
+        if vertex_columns:
+            vertices = section_data.raw_vertices.get_column("position")
+            vertex_normals = section_data.raw_vertices.get_column("normal")
+        else:
+            vertices = [raw_vertex.position for raw_vertex in section_data.raw_vertices]
+            vertex_normals = [raw_vertex.normal for raw_vertex in section_data.raw_vertices]
+
         for part_idx, part in enumerate(section_data.parts):
             triangle_part = []
 
@@ -1040,7 +1280,11 @@ def get_mesh_data(ASSET, section_data, mesh, material_count, materials, random_c
                     triangle_mat_indices.append(part.material_index)
                     triangles.append(tri)
 
-        mesh.from_pydata(vertices, [], triangles)
+        if vertex_columns:
+            triangle_array = mesh_from_vertex_columns(mesh, vertices, triangles)
+        else:
+            mesh.from_pydata(vertices, [], triangles)
+
         for tri_idx, poly in enumerate(mesh.polygons):
             poly.use_smooth = True
 
@@ -1073,6 +1317,9 @@ def get_mesh_data(ASSET, section_data, mesh, material_count, materials, random_c
                     material_index = mesh.materials.values().index(mat)
                     mesh.polygons[triangle_idx].material_index = material_index
 
+            if vertex_columns:
+                continue
+
             vertex_list = [section_data.raw_vertices[triangle[0]], section_data.raw_vertices[triangle[1]], section_data.raw_vertices[triangle[2]]]
             for vertex_idx, vertex in enumerate(vertex_list):
                 loop_index = (3 * triangle_idx) + vertex_idx
@@ -1082,3 +1329,6 @@ def get_mesh_data(ASSET, section_data, mesh, material_count, materials, random_c
                     layer_uv = mesh.uv_layers.new(name=uv_name)
 
                 layer_uv.data[loop_index].uv = (vertex.texcoord[0], 1 - vertex.texcoord[1])
+
+        if vertex_columns:
+            set_loop_uvs_from_columns(mesh, 'UVMap_%s' % 0, section_data.raw_vertices.get_column("texcoord"), triangle_array)
@@ -25,8 +25,16 @@
 # ##### END MIT LICENSE BLOCK #####
 
 import os
+import sys
 import bpy
+import struct
+import pickle
+import multiprocessing
 
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from ..global_functions import tag_cache
 from ..file_tag.h1.file_scenario.process_file import process_file as process_h1_scenario
 from ..file_tag.h1.file_scenario_structure_bsp.process_file import process_file as process_h1_structure_bsp
 from ..file_tag.h1.file_actor_variant.process_file import process_file as process_actor_variant
@@ -94,448 +102,290 @@ from ..file_tag.h2.file_scenario_trigger_volumes_resource.process_file import pr
 from ..file_tag.h2.file_scenario_vehicles_resource.process_file import process_file as process_h2_scenario_vehicles_resource
 from ..file_tag.h2.file_scenario_weapons_resource.process_file import process_file as process_h2_scenario_weapons_resource
 
-def parse_tag(tagref, report, game_title, game_version):
-    ASSET = None
-    if game_title == "halo1":
-        if tagref.tag_group == "actv":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.actor_variant" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_actor_variant(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "sky ":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.sky" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_sky(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "bitm":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.bitmap" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_bitmap(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "scen":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.scenery" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h1_scenery(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "bipd":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.biped" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_biped(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "vehi":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.vehicle" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_vehicle(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "mach":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.device_machine" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_machine(input_stream, report)
-                input_stream.close()
+H1_TAG_GROUPS = {
+    "actv": ((".actor_variant", process_actor_variant),),
+    "sky ": ((".sky", process_sky),),
+    "bitm": ((".bitmap", process_bitmap),),
+    "scen": ((".scenery", process_h1_scenery),),
+    "bipd": ((".biped", process_biped),),
+    "vehi": ((".vehicle", process_vehicle),),
+    "mach": ((".device_machine", process_machine),),
+    "ctrl": ((".device_control", process_control),),
+    "lifi": ((".device_light_fixture", process_light_fixture),),
+    "ssce": ((".sound_scenery", process_sound_scenery),),
+    "eqip": ((".equipment", process_equipment),),
+    "weap": ((".weapon", process_weapon),),
+    "itmc": ((".item_collection", process_item_collection),),
+    "mod2": ((".gbxmodel", process_mod2), (".model", process_mode)),
+    "mode": ((".gbxmodel", process_mod2), (".model", process_mode)),
+    "sbsp": ((".scenario_structure_bsp", process_h1_structure_bsp),),
+    "senv": ((".shader_environment", process_shader_environment),),
+    "soso": ((".shader_model", process_shader_model),),
+    "schi": ((".shader_transparent_chicago", process_shader_transparent_chicago),),
+    "scex": ((".shader_transparent_chicago_extended", process_shader_transparent_chicago_extended),),
+    "sotr": ((".shader_transparent_generic", process_shader_transparent_generic),),
+    "sgla": ((".shader_transparent_glass", process_shader_transparent_glass),),
+    "smet": ((".shader_transparent_meter", process_shader_transparent_meter),),
+    "spla": ((".shader_transparent_plasma", process_shader_transparent_plasma),),
+    "swat": ((".shader_transparent_water", process_shader_transparent_water),),
+    "scnr": ((".scenario", process_h1_scenario),),
+    }
+
+H2_TAG_GROUPS = {
+    "sky ": ((".sky", process_h2_sky),),
+    "sbsp": ((".scenario_structure_bsp", process_h2_structure_bsp),),
+    "ltmp": ((".scenario_structure_lightmap", process_h2_structure_lightmap),),
+    "bitm": ((".bitmap", process_h2_bitmap),),
+    "shad": ((".shader", process_h2_shader),),
+    "stem": ((".shader_template", process_h2_shader_template),),
+    "hlmt": ((".model", process_h2_model),),
+    "mode": ((".render_model", process_h2_render),),
+    "scen": ((".scenery", process_h2_scenery),),
+    "bloc": ((".crate", process_h2_crate),),
+    "bipd": ((".biped", process_h2_biped),),
+    "vehi": ((".vehicle", process_h2_vehicle),),
+    "eqip": ((".equipment", process_h2_equipment),),
+    "weap": ((".weapon", process_h2_weapon),),
+    "mach": ((".device_machine", process_h2_machine),),
+    "ctrl": ((".device_control", process_h2_control),),
+    "ssce": ((".sound_scenery", process_h2_sound_scenery),),
+    "itmc": ((".item_collection", process_h2_item_collection),),
+    "vehc": ((".vehicle_collection", process_h2_vehicle_collection),),
+    "ligh": ((".light", process_h2_light),),
+    "ai**": ((".scenario_ai_resource", process_h2_scenario_ai_resource),),
+    "*ipd": ((".scenario_bipeds_resource", process_h2_scenario_bipeds_resource),),
+    "cin*": ((".scenario_cinematics_resource", process_h2_scenario_cinematics_resource),),
+    "clu*": ((".scenario_cluster_data_resource", process_h2_scenario_cluster_data_resource),),
+    "/**/": ((".scenario_comments_resource", process_h2_scenario_comments_resource),),
+    "*rea": ((".scenario_creature_resource", process_h2_scenario_creature_resource),),
+    "dec*": ((".scenario_decals_resource", process_h2_scenario_decals_resource),),
+    "dc*s": ((".scenario_decorators_resource", process_h2_scenario_decorators_resource),),
+    "dgr*": ((".scenario_devices_resource", process_h2_scenario_devices_resource),),
+    "*qip": ((".scenario_equipment_resource", process_h2_scenario_equipment_resource),),
+    "*igh": ((".scenario_lights_resource", process_h2_scenario_lights_resource),),
+    "*cen": ((".scenario_scenery_resource", process_h2_scenario_scenery_resource),),
+    "*sce": ((".scenario_sound_scenery_resource", process_h2_scenario_sound_scenery_resource),),
+    "sslt": ((".scenario_structure_lighting_resource", process_h2_scenario_structure_lighting_resource),),
+    "trg*": ((".scenario_trigger_volumes_resource", process_h2_scenario_trigger_volumes_resource),),
+    "*ehi": ((".scenario_vehicles_resource", process_h2_scenario_vehicles_resource),),
+    "*eap": ((".scenario_weapons_resource", process_h2_scenario_weapons_resource),),
+    }
+
+TAG_GROUPS = {
+    "halo1": ("halo_1_tag_path", H1_TAG_GROUPS),
+    "halo2": ("halo_2_tag_path", H2_TAG_GROUPS),
+    }
+
+ACTIVE_RESOLVERS = []
+PROCESS_POOL_STATE = {"enabled": True}
+
+def get_worker_count(worker_count=0):
+    if worker_count <= 0:
+        worker_count = os.cpu_count() or 1
+
+    return worker_count
+
+def get_process_pool_context():
+    # Workers have to be forked. A spawned interpreter starts without bpy or mathutils and can't import the addon. Forking is only
+    # done on Linux, Blender on macOS and Windows either can't fork or runs threads that don't survive it. Everywhere else, and for the
+    # rest of the session once a worker result fails to transfer, tags are parsed one after another on the main thread. A thread pool
+    # wouldn't help since parsing is pure Python and holds the GIL.
+    process_pool_context = None
+    if PROCESS_POOL_STATE["enabled"] and sys.platform.startswith("linux") and "fork" in multiprocessing.get_all_start_methods():
+        process_pool_context = multiprocessing.get_context("fork")
+
+    return process_pool_context
+
+def parse_tag_worker(input_file, process_file, memory_mapped):
+    # Runs in a worker. Reports can't be sent back as a bound operator method so they are collected and replayed by the caller. The
+    # worker pickles the asset itself so a failure to transfer it is told apart from a failure to parse the tag.
+    messages = []
+    def report(message_type, message):
+        messages.append((message_type, message))
+
+    ASSET = tag_cache.parse_tag_file(input_file, process_file, report, memory_mapped)
+    try:
+        return pickle.dumps(ASSET, pickle.HIGHEST_PROTOCOL), messages, None
+
+    except (pickle.PicklingError, AttributeError, TypeError, RecursionError) as error:
+        return None, messages, str(error)
+
+def parse_tag_files(tag_files, report, worker_count=1, progress_callback=None):
+    # Parses a list of (input_file, process_file, memory_mapped) entries and returns the assets in the same order. Parsing is spread
+    # over a process pool when more than one worker was asked for, there is more than one tag and the platform can fork. Anything
+    # the pool couldn't handle is reported and parsed again on the main thread.
+    assets = [None] * len(tag_files)
+    parsed_files = [False] * len(tag_files)
+    parsed_count = 0
+    worker_count = min(get_worker_count(worker_count), len(tag_files))
+    process_pool_context = get_process_pool_context()
+    if worker_count > 1 and not process_pool_context == None:
+        try:
+            with ProcessPoolExecutor(max_workers=worker_count, mp_context=process_pool_context) as executor:
+                futures = {}
+                for tag_file_idx, tag_file in enumerate(tag_files):
+                    futures[executor.submit(parse_tag_worker, *tag_file)] = tag_file_idx
+
+                for future in as_completed(futures):
+                    tag_file_idx = futures[future]
+                    input_file = tag_files[tag_file_idx][0]
+                    try:
+                        ASSET, messages, transfer_error = future.result()
+
+                    except BrokenProcessPool as error:
+                        report({'WARNING'}, "Parse workers stopped unexpectedly, parsing the remaining tags on the main thread: %s" % error)
+                        break
+
+                    except (pickle.PicklingError, OSError, EOFError, AttributeError, TypeError, ValueError, IndexError, KeyError, struct.error, RecursionError) as error:
+                        report({'WARNING'}, "Parse worker failed on %s, parsing it again on the main thread: %s" % (input_file, error))
+                        continue
+
+                    for message_type, message in messages:
+                        report(message_type, message)
+
+                    if not transfer_error == None:
+                        # Every later result would fail the same way so stop handing tags to workers for the rest of the session.
+                        report({'WARNING'}, "Parsed tag %s could not be sent back from a worker, parse workers are disabled: %s" % (input_file, transfer_error))
+                        PROCESS_POOL_STATE["enabled"] = False
+                        executor.shutdown(wait=False, cancel_futures=True)
+                        break
+
+                    assets[tag_file_idx] = pickle.loads(ASSET)
+                    parsed_files[tag_file_idx] = True
+                    parsed_count += 1
+                    if progress_callback:
+                        progress_callback(parsed_count, len(tag_files))
+
+        except (BrokenProcessPool, OSError) as error:
+            report({'WARNING'}, "Parse workers could not be started, parsing on the main thread: %s" % error)
+
+    for tag_file_idx, tag_file in enumerate(tag_files):
+        if not parsed_files[tag_file_idx]:
+            input_file, process_file, memory_mapped = tag_file
+            assets[tag_file_idx] = tag_cache.parse_tag_file(input_file, process_file, report, memory_mapped)
+            parsed_count += 1
+            if progress_callback:
+                progress_callback(parsed_count, len(tag_files))
+
+    return assets
+
+class TagResolver():
+    # Resolves tag references to parsed assets. While a resolver is active through a with statement every parse_tag call goes through
+    # it, so a tag referenced many times during one operation is only read once. The references followed from one tag to another are
+    # kept in dependencies.
+    def __init__(self, memory_mapped=False, worker_count=1):
+        self.memory_mapped = memory_mapped
+        self.worker_count = worker_count
+        self.assets = {}
+        self.dependencies = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __enter__(self):
+        ACTIVE_RESOLVERS.append(self)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        ACTIVE_RESOLVERS.remove(self)
+        self.assets.clear()
+
+    def get_key(self, tagref, game_title):
+        return (game_title, tagref.tag_group, tagref.name)
+
+    def resolve(self, tagref, report, game_title, game_version, memory_mapped=False, parent_tagref=None):
+        tag_key = self.get_key(tagref, game_title)
+        if not parent_tagref == None:
+            self.dependencies.setdefault(self.get_key(parent_tagref, game_title), set()).add(tag_key)
+
+        if tag_key in self.assets:
+            self.hits += 1
+            return self.assets[tag_key]
+
+        ASSET = None
+        input_file, process_file = get_tag_file(tagref, game_title)
+        if not input_file == None:
+            ASSET = tag_cache.load_tag_file(input_file, process_file)
+
+        if ASSET == None:
+            self.misses += 1
+            if not input_file == None:
+                ASSET = tag_cache.parse_tag_file(input_file, process_file, report, memory_mapped or self.memory_mapped)
+                tag_cache.save_tag_file(input_file, process_file, ASSET, report)
+
+        else:
+            self.disk_hits += 1
+
+        self.assets[tag_key] = ASSET
+
+        return ASSET
+
+    def prefetch(self, tagrefs, report, game_title, memory_mapped=False):
+        # Parses every tag in tagrefs that isn't resolved yet in parallel, so the parse_tag calls that follow are all hits.
+        tag_keys = []
+        tag_files = []
+        for tagref in tagrefs:
+            tag_key = self.get_key(tagref, game_title)
+            if tag_key in self.assets or tag_key in tag_keys:
+                continue
+
+            input_file, process_file = get_tag_file(tagref, game_title)
+            if input_file == None:
+                continue
+
+            ASSET = tag_cache.load_tag_file(input_file, process_file)
+            if ASSET == None:
+                tag_keys.append(tag_key)
+                tag_files.append((input_file, process_file, memory_mapped or self.memory_mapped))
 
-        elif tagref.tag_group == "ctrl":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.device_control" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_control(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "lifi":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.device_light_fixture" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_light_fixture(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "ssce":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.sound_scenery" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_sound_scenery(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "eqip":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.equipment" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_equipment(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "weap":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.weapon" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_weapon(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "itmc":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.item_collection" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_item_collection(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "mod2" or tagref.tag_group == "mode":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.gbxmodel" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_mod2(input_stream, report)
-                input_stream.close()
             else:
-                input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.model" % tagref.name)
-                if os.path.exists(input_file):
-                    input_stream = open(input_file, 'rb')
-                    ASSET = process_mode(input_stream, report)
-                    input_stream.close()
-
-        elif tagref.tag_group == "sbsp":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.scenario_structure_bsp" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h1_structure_bsp(input_stream, report)
-                input_stream.close()
+                self.disk_hits += 1
+                self.assets[tag_key] = ASSET
 
-        elif tagref.tag_group == "senv":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.shader_environment" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_shader_environment(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "soso":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.shader_model" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_shader_model(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "schi":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.shader_transparent_chicago" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_shader_transparent_chicago(input_stream, report)
-                input_stream.close()
+        for tag_key, tag_file, ASSET in zip(tag_keys, tag_files, parse_tag_files(tag_files, report, self.worker_count)):
+            tag_cache.save_tag_file(tag_file[0], tag_file[1], ASSET, report)
+            self.misses += 1
+            self.assets[tag_key] = ASSET
 
-        elif tagref.tag_group == "scex":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.shader_transparent_chicago_extended" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_shader_transparent_chicago_extended(input_stream, report)
-                input_stream.close()
+    def get_dependents(self, tagref, game_title):
+        tag_key = self.get_key(tagref, game_title)
+        return [parent_key for parent_key, child_keys in self.dependencies.items() if tag_key in child_keys]
 
-        elif tagref.tag_group == "sotr":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.shader_transparent_generic" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_shader_transparent_generic(input_stream, report)
-                input_stream.close()
+    def get_statistics(self):
+        # hits were already resolved in memory, disk_hits were loaded from the tag cache and misses had to be parsed.
+        lookup_count = self.hits + self.disk_hits + self.misses
+        hit_rate = 0.0
+        if lookup_count > 0:
+            hit_rate = self.hits / lookup_count
 
-        elif tagref.tag_group == "sgla":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.shader_transparent_glass" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_shader_transparent_glass(input_stream, report)
-                input_stream.close()
+        return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "hit_rate": hit_rate, "assets": len(self.assets)}
 
-        elif tagref.tag_group == "smet":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.shader_transparent_meter" % tagref.name)
+def get_tag_file(tagref, game_title):
+    # Returns the path and parser for the tag a reference points to, or None for both if it doesn't exist.
+    tag_path_setting, tag_groups = TAG_GROUPS.get(game_title, (None, {}))
+    if not tag_path_setting == None:
+        tag_directory = getattr(bpy.context.preferences.addons["io_scene_halo"].preferences, tag_path_setting)
+        for tag_extension, process_file in tag_groups.get(tagref.tag_group, ()):
+            input_file = os.path.join(tag_directory, "%s%s" % (tagref.name, tag_extension))
             if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_shader_transparent_meter(input_stream, report)
-                input_stream.close()
+                return input_file, process_file
 
-        elif tagref.tag_group == "spla":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.shader_transparent_plasma" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_shader_transparent_plasma(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "swat":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.shader_transparent_water" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_shader_transparent_water(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "scnr":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path, "%s.scenario" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h1_scenario(input_stream, report)
-                input_stream.close()
-
-    elif game_title == "halo2":
-        if tagref.tag_group == "sky ":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.sky" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_sky(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "sbsp":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_structure_bsp" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_structure_bsp(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "ltmp":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_structure_lightmap" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_structure_lightmap(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "bitm":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.bitmap" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_bitmap(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "shad":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.shader" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_shader(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "stem":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.shader_template" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_shader_template(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "hlmt":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.model" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_model(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "mode":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.render_model" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_render(input_stream, report)
-                input_stream.close()
+    return None, None
 
-        elif tagref.tag_group == "scen":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenery" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenery(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "bloc":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.crate" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_crate(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "bipd":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.biped" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_biped(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "vehi":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.vehicle" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_vehicle(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "eqip":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.equipment" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_equipment(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "weap":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.weapon" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_weapon(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "mach":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.device_machine" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_machine(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "ctrl":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.device_control" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_control(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "ssce":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.sound_scenery" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_sound_scenery(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "itmc":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.item_collection" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_item_collection(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "vehc":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.vehicle_collection" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_vehicle_collection(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "ligh":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.light" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_light(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "ai**":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_ai_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_ai_resource(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "*ipd":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_bipeds_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_bipeds_resource(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "cin*":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_cinematics_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_cinematics_resource(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "clu*":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_cluster_data_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_cluster_data_resource(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "/**/":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_comments_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_comments_resource(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "*rea":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_creature_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_creature_resource(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "dec*":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_decals_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_decals_resource(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "dc*s":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_decorators_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_decorators_resource(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "dgr*":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_devices_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_devices_resource(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "*qip":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_equipment_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_equipment_resource(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "*igh":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_lights_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_lights_resource(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "*cen":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_scenery_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_scenery_resource(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "*sce":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_sound_scenery_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_sound_scenery_resource(input_stream, report)
-                input_stream.close()
-
-        elif tagref.tag_group == "sslt":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_structure_lighting_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_structure_lighting_resource(input_stream, report)
-                input_stream.close()
+def read_tag(tagref, report, game_title, memory_mapped=False):
+    ASSET = None
+    input_file, process_file = get_tag_file(tagref, game_title)
+    if not input_file == None:
+        ASSET = tag_cache.read_tag_file(input_file, process_file, report, memory_mapped)
 
-        elif tagref.tag_group == "trg*":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_trigger_volumes_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_trigger_volumes_resource(input_stream, report)
-                input_stream.close()
+    return ASSET
 
-        elif tagref.tag_group == "*ehi":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_vehicles_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_vehicles_resource(input_stream, report)
-                input_stream.close()
+def parse_tag(tagref, report, game_title, game_version, memory_mapped=False, parent_tagref=None):
+    if len(ACTIVE_RESOLVERS) > 0:
+        return ACTIVE_RESOLVERS[-1].resolve(tagref, report, game_title, game_version, memory_mapped, parent_tagref)
 
-        elif tagref.tag_group == "*eap":
-            input_file = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, "%s.scenario_weapons_resource" % tagref.name)
-            if os.path.exists(input_file):
-                input_stream = open(input_file, 'rb')
-                ASSET = process_h2_scenario_weapons_resource(input_stream, report)
-                input_stream.close()
+    return read_tag(tagref, report, game_title, memory_mapped)
 
-    return ASSET
+def prefetch_tags(tagrefs, report, game_title, memory_mapped=False):
+    if len(ACTIVE_RESOLVERS) > 0:
+        ACTIVE_RESOLVERS[-1].prefetch(tagrefs, report, game_title, memory_mapped)
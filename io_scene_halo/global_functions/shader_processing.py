@@ -49,7 +49,7 @@ from ..file_tag.h2.file_shader.format import (
         PeriodicExponentEnum,
         )
 from ..global_functions.parse_tags import parse_tag
-from . import tag_format, global_functions, mesh_processing
+from . import tag_format, global_functions, mesh_processing, tag_index
 from ..file_tag.h2.file_particle.format import OutputModifierInputEnum
 from .shader_generation.shader_helper import (
     get_bitmap, 
@@ -1136,21 +1136,10 @@ def find_h1_shader_tag(import_filepath, material_name):
                     break
 
         if shader_path == None:
-            for root, dirs, filenames in os.walk(tag_path):
-                for filename in filenames:
-                    file = os.path.join(root, filename).lower()
-
-                    file_name = os.path.basename(file)
-                    extension = None
-                    result = file_name.rsplit(".", 1)
-                    if len(result) == 2:
-                        file_name = result[0]
-                        extension = result[1]
-
-                    if material_name == file_name and extension in shader_extensions:
-                        shader_path = file
-                        shader_extension = extension
-                        break
+            shader_index = tag_index.get_tag_index(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_1_tag_path)
+            shader_path = shader_index.find(["%s.%s" % (material_name, extension) for extension in shader_extensions])
+            if not shader_path == None:
+                shader_extension = shader_path.rsplit(".", 1)[1]
 
         if not shader_path == None:
             tag_group = ""
@@ -1200,17 +1189,9 @@ def find_h2_shader_tag(import_filepath, material_name):
     shader_tag = None
 
     if not global_functions.string_empty_check(data_path) and not global_functions.string_empty_check(tag_path):
-        shader_collection_dic = {}
         shader_collection_path = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path, r"scenarios\shaders\shader_collections.shader_collections")
-        if os.path.isfile(shader_collection_path):
-            shader_collection_file = open(shader_collection_path, "r")
-            for line in shader_collection_file.readlines():
-                if not global_functions.string_empty_check(line) and not line.startswith(";"):
-                    split_result = line.split()
-                    if len(split_result) == 2:
-                        prefix = split_result[0]
-                        path = split_result[1]
-                        shader_collection_dic[prefix] = path
+        shader_collection_dic = tag_index.get_shader_collections(shader_collection_path)
+        shader_index = tag_index.get_tag_index(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_2_tag_path)
 
         processed_name, processed_parameters = mesh_processing.gather_parameters(material_name.lower())
         symbols_list, processed_name = mesh_processing.gather_symbols("", processed_name, "halo2")
@@ -1228,21 +1209,7 @@ def find_h2_shader_tag(import_filepath, material_name):
         if not collection == None:
             shader_directory = shader_collection_dic.get(collection)
             if not shader_directory == None:
-                import_shader_directory = os.path.join(tag_path, shader_directory.lower())
-                for root, dirs, filenames in os.walk(import_shader_directory):
-                    for filename in filenames:
-                        file = os.path.join(root, filename).lower()
-
-                        file_name = os.path.basename(file)
-                        extension = None
-                        result = file_name.rsplit(".", 1)
-                        if len(result) == 2:
-                            file_name = result[0]
-                            extension = result[1]
-
-                        if shader_name == file_name and extension == "shader":
-                            shader_path = file
-                            break
+                shader_path = shader_index.find(["%s.shader" % shader_name], shader_directory)
 
         if shader_path == None:
             import_directory = os.path.dirname(os.path.dirname(import_filepath)).lower()
@@ -1267,20 +1234,7 @@ def find_h2_shader_tag(import_filepath, material_name):
                             break
                         
         if shader_path == None:
-            for root, dirs, filenames in os.walk(tag_path):
-                for filename in filenames:
-                    file = os.path.join(root, filename).lower()
-
-                    file_name = os.path.basename(file)
-                    extension = None
-                    result = file_name.rsplit(".", 1)
-                    if len(result) == 2:
-                        file_name = result[0]
-                        extension = result[1]
-
-                    if shader_name == file_name and extension in "shader":
-                        shader_path = file
-                        break
+            shader_path = shader_index.find(["%s.shader" % shader_name])
 
         if not shader_path == None:
             local_path = shader_path.split(tag_path)[1].rsplit(".", 1)[0]
@@ -1311,17 +1265,9 @@ def find_h3_shader_tag(import_filepath, material_name):
     shader_path = None
 
     if not global_functions.string_empty_check(data_path) and not global_functions.string_empty_check(tag_path):
-        shader_collection_dic = {}
         shader_collection_path = os.path.join(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_3_tag_path, r"levels\shader_collections.txt")
-        if os.path.isfile(shader_collection_path):
-            shader_collection_file = open(shader_collection_path, "r")
-            for line in shader_collection_file.readlines():
-                if not global_functions.string_empty_check(line) and not line.startswith(";"):
-                    split_result = line.split()
-                    if len(split_result) == 2:
-                        prefix = split_result[0]
-                        path = split_result[1]
-                        shader_collection_dic[prefix] = path
+        shader_collection_dic = tag_index.get_shader_collections(shader_collection_path)
+        shader_index = tag_index.get_tag_index(bpy.context.preferences.addons["io_scene_halo"].preferences.halo_3_tag_path)
 
         processed_name, processed_parameters = mesh_processing.gather_parameters(material_name.lower())
         symbols_list, processed_name = mesh_processing.gather_symbols("", processed_name, "halo3")
@@ -1339,21 +1285,7 @@ def find_h3_shader_tag(import_filepath, material_name):
         if not collection == None:
             shader_directory = shader_collection_dic.get(collection)
             if not shader_directory == None:
-                import_shader_directory = os.path.join(tag_path, shader_directory.lower())
-                for root, dirs, filenames in os.walk(import_shader_directory):
-                    for filename in filenames:
-                        file = os.path.join(root, filename).lower()
-
-                        file_name = os.path.basename(file)
-                        extension = None
-                        result = file_name.rsplit(".", 1)
-                        if len(result) == 2:
-                            file_name = result[0]
-                            extension = result[1]
-
-                        if shader_name == file_name and extension in shader_extensions:
-                            shader_path = file
-                            break
+                shader_path = shader_index.find(["%s.%s" % (shader_name, extension) for extension in shader_extensions], shader_directory)
 
         if shader_path == None:
             import_directory = os.path.dirname(os.path.dirname(import_filepath)).lower()
@@ -1378,20 +1310,7 @@ def find_h3_shader_tag(import_filepath, material_name):
                             break
                         
         if shader_path == None:
-            for root, dirs, filenames in os.walk(tag_path):
-                for filename in filenames:
-                    file = os.path.join(root, filename).lower()
-
-                    file_name = os.path.basename(file)
-                    extension = None
-                    result = file_name.rsplit(".", 1)
-                    if len(result) == 2:
-                        file_name = result[0]
-                        extension = result[1]
-
-                    if shader_name == file_name and extension in shader_extensions:
-                        shader_path = file
-                        break
+            shader_path = shader_index.find(["%s.%s" % (shader_name, extension) for extension in shader_extensions])
 
         if not shader_path == None:
             local_path = shader_path.split(tag_path)[1].rsplit(".", 1)[0]
@@ -0,0 +1,293 @@
+# ##### BEGIN MIT LICENSE BLOCK #####
+#
+# MIT License
+#
+# Copyright (c) 2023 Steven Garcia & Jadeon Sheppard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# ##### END MIT LICENSE BLOCK #####
+
+import os
+import sys
+import bpy
+import hmac
+import pickle
+import copyreg
+import hashlib
+import secrets
+
+from mathutils import Vector, Quaternion, Euler, Matrix, Color
+from ..global_functions import tag_format
+
+CACHE_EXTENSION = ".tagcache"
+DEFAULT_CACHE_DIRECTORY = os.path.join(os.path.expanduser("~"), "blender_halo_tag_cache")
+CACHE_KEY_FILENAME = "halo_tag_cache.key"
+CACHE_KEY_STATE = {"key": None}
+# Source hash of the modules a tag reader is built from, keyed by the module name of its process_file.
+PARSER_VERSIONS = {}
+
+def reduce_math_value(value):
+    return type(value), (tuple(value),)
+
+def reduce_euler(euler):
+    return Euler, (tuple(euler), euler.order)
+
+def reduce_matrix(matrix):
+    return Matrix, (tuple(tuple(row) for row in matrix),)
+
+# mathutils types can't be pickled on their own and tag readers store them all over parsed assets. Rebuilding them from plain tuples
+# lets assets go to the disk cache and come back from parse workers.
+copyreg.pickle(Vector, reduce_math_value)
+copyreg.pickle(Quaternion, reduce_math_value)
+copyreg.pickle(Color, reduce_math_value)
+copyreg.pickle(Euler, reduce_euler)
+copyreg.pickle(Matrix, reduce_matrix)
+
+def get_cache_settings():
+    addon_prefs = bpy.context.preferences.addons["io_scene_halo"].preferences
+    cache_directory = bpy.path.abspath(addon_prefs.tag_cache_path)
+    if len(cache_directory) == 0:
+        cache_directory = DEFAULT_CACHE_DIRECTORY
+
+    return addon_prefs.enable_tag_cache, cache_directory, addon_prefs.tag_cache_size * 1048576
+
+def get_reader_function(process_file):
+    # Tag groups can be registered with a functools.partial to pass reader options like lazy_blocks.
+    return getattr(process_file, "func", process_file)
+
+def get_reader_options(process_file):
+    # Everything that changes what a reader stores on the asset. Partial arguments plus the module level switches of the reader
+    # like XML_OUTPUT, XML_RAW_DATA_OUTPUT and VERTEX_COLUMNS.
+    reader_function = get_reader_function(process_file)
+    reader_module = sys.modules.get(reader_function.__module__)
+    module_flags = []
+    if not reader_module == None:
+        for attribute_name, attribute_value in sorted(vars(reader_module).items()):
+            if attribute_name.isupper() and isinstance(attribute_value, bool):
+                module_flags.append((attribute_name, attribute_value))
+
+    partial_args = getattr(process_file, "args", ())
+    partial_keywords = sorted(getattr(process_file, "keywords", {}).items())
+
+    return "%s.%s|%s|%s|%s" % (reader_function.__module__, reader_function.__qualname__, partial_args, partial_keywords, module_flags)
+
+def get_parser_version(process_file):
+    # Hash of the sources of the reader package and the shared tag_format module. Any change to a reader invalidates every
+    # entry it wrote without anyone having to remember to bump a version number.
+    module_name = get_reader_function(process_file).__module__
+    parser_version = PARSER_VERSIONS.get(module_name)
+    if parser_version == None:
+        source_hash = hashlib.sha1()
+        reader_module = sys.modules.get(module_name)
+        source_paths = [tag_format.__file__]
+        if not reader_module == None and not getattr(reader_module, "__file__", None) == None:
+            reader_directory = os.path.dirname(reader_module.__file__)
+            source_paths.extend(os.path.join(reader_directory, file_name) for file_name in sorted(os.listdir(reader_directory)) if file_name.endswith(".py"))
+
+        for source_path in source_paths:
+            with open(source_path, 'rb') as source_file:
+                source_hash.update(source_file.read())
+
+        parser_version = source_hash.hexdigest()
+        PARSER_VERSIONS[module_name] = parser_version
+
+    return parser_version
+
+def is_xml_output(process_file):
+    reader_module = sys.modules.get(get_reader_function(process_file).__module__)
+    return getattr(reader_module, "XML_OUTPUT", False) or getattr(reader_module, "XML_RAW_DATA_OUTPUT", False)
+
+def get_cache_path(cache_directory, input_file, file_stat, process_file):
+    # Entries for the same tag share a prefix so a stale entry can be found and dropped once the tag changes on disk.
+    path_key = hashlib.sha1(os.path.normcase(os.path.abspath(input_file)).encode("utf-8")).hexdigest()
+    version_key = hashlib.sha1(("%s|%s|%s|%s" % (file_stat.st_mtime_ns, file_stat.st_size, get_parser_version(process_file), get_reader_options(process_file))).encode("utf-8")).hexdigest()
+
+    return path_key, os.path.join(cache_directory, "%s_%s%s" % (path_key, version_key[:16], CACHE_EXTENSION))
+
+def get_cache_key():
+    # Cache entries are unpickled on load, and unpickling runs whatever code the data asks for. Every entry is signed with a
+    # random key kept in the Blender config directory, away from the cache, and anything without a valid signature is ignored.
+    cache_key = CACHE_KEY_STATE["key"]
+    if cache_key == None:
+        key_path = os.path.join(bpy.utils.user_resource('CONFIG'), CACHE_KEY_FILENAME)
+        try:
+            with open(key_path, 'rb') as key_file:
+                cache_key = key_file.read()
+
+        except FileNotFoundError:
+            cache_key = secrets.token_bytes(32)
+            os.makedirs(os.path.dirname(key_path), exist_ok=True)
+            try:
+                key_handle = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+                with os.fdopen(key_handle, 'wb') as key_file:
+                    key_file.write(cache_key)
+
+            except FileExistsError:
+                # Another Blender instance created the key first.
+                with open(key_path, 'rb') as key_file:
+                    cache_key = key_file.read()
+
+        CACHE_KEY_STATE["key"] = cache_key
+
+    return cache_key
+
+def is_trusted_file(file_path):
+    # On POSIX systems a signed entry is still only read if it belongs to the current user and nobody else can write to it.
+    if hasattr(os, "getuid"):
+        file_stat = os.stat(file_path)
+        if not file_stat.st_uid == os.getuid() or file_stat.st_mode & 0o022:
+            return False
+
+    return True
+
+def read_signed_file(file_path):
+    # Returns the data of a file written by write_signed_file, or None if it is missing, untrusted or the signature doesn't match.
+    if not is_trusted_file(file_path):
+        return None
+
+    with open(file_path, 'rb') as signed_file:
+        signature = signed_file.read(hashlib.sha256().digest_size)
+        file_data = signed_file.read()
+
+    if not hmac.compare_digest(signature, hmac.new(get_cache_key(), file_data, hashlib.sha256).digest()):
+        return None
+
+    return file_data
+
+def write_signed_file(file_path, file_data):
+    # Written through a temp file so a reader never sees a partial entry.
+    temp_path = "%s.%s.tmp" % (file_path, os.getpid())
+    try:
+        temp_handle = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(temp_handle, 'wb') as signed_file:
+            signed_file.write(hmac.new(get_cache_key(), file_data, hashlib.sha256).digest())
+            signed_file.write(file_data)
+
+        os.replace(temp_path, file_path)
+
+    except OSError:
+        remove_cache_file(temp_path)
+        raise
+
+def make_cache_directory(cache_directory):
+    os.makedirs(cache_directory, mode=0o700, exist_ok=True)
+
+def load_cached_asset(cache_path):
+    ASSET = None
+    try:
+        asset_data = read_signed_file(cache_path)
+        if asset_data == None:
+            return None
+
+        ASSET = pickle.loads(asset_data)
+
+        # The modified time of an entry doubles as its last access time for eviction.
+        os.utime(cache_path)
+
+    except FileNotFoundError:
+        pass
+
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError, TypeError):
+        remove_cache_file(cache_path)
+
+    return ASSET
+
+def store_cached_asset(cache_directory, cache_path, path_key, ASSET, cache_size, report, input_file):
+    try:
+        asset_data = pickle.dumps(ASSET, pickle.HIGHEST_PROTOCOL)
+
+    except (pickle.PicklingError, AttributeError, TypeError, RecursionError) as error:
+        report({'WARNING'}, "Tag cache could not store %s: %s" % (input_file, error))
+        return
+
+    try:
+        make_cache_directory(cache_directory)
+        for cache_name in os.listdir(cache_directory):
+            if cache_name.startswith(path_key):
+                remove_cache_file(os.path.join(cache_directory, cache_name))
+
+        write_signed_file(cache_path, asset_data)
+
+    except OSError as error:
+        report({'WARNING'}, "Tag cache could not write %s: %s" % (cache_path, error))
+        return
+
+    evict_cache_entries(cache_directory, cache_size)
+
+def evict_cache_entries(cache_directory, cache_size):
+    cache_entries = []
+    total_size = 0
+    for cache_entry in os.scandir(cache_directory):
+        if cache_entry.name.endswith(CACHE_EXTENSION):
+            try:
+                entry_stat = cache_entry.stat()
+
+            except OSError:
+                continue
+
+            cache_entries.append((entry_stat.st_mtime, entry_stat.st_size, cache_entry.path))
+            total_size += entry_stat.st_size
+
+    cache_entries.sort()
+    for entry_time, entry_size, entry_path in cache_entries:
+        if total_size <= cache_size:
+            break
+
+        remove_cache_file(entry_path)
+        total_size -= entry_size
+
+def remove_cache_file(cache_path):
+    try:
+        os.remove(cache_path)
+
+    except OSError:
+        pass
+
+def load_tag_file(input_file, process_file):
+    # Returns the cached asset for a tag or None if caching is off or the tag changed since it was stored. The cache is skipped
+    # while a reader dumps XML since the dump is written as the tag is parsed.
+    ASSET = None
+    enable_tag_cache, cache_directory, cache_size = get_cache_settings()
+    if enable_tag_cache and not is_xml_output(process_file):
+        path_key, cache_path = get_cache_path(cache_directory, input_file, os.stat(input_file), process_file)
+        ASSET = load_cached_asset(cache_path)
+
+    return ASSET
+
+def save_tag_file(input_file, process_file, ASSET, report):
+    enable_tag_cache, cache_directory, cache_size = get_cache_settings()
+    if enable_tag_cache and not ASSET == None and not is_xml_output(process_file):
+        path_key, cache_path = get_cache_path(cache_directory, input_file, os.stat(input_file), process_file)
+        store_cached_asset(cache_directory, cache_path, path_key, ASSET, cache_size, report, input_file)
+
+def parse_tag_file(input_file, process_file, report, memory_mapped=False):
+    input_stream = tag_format.open_tag_stream(input_file, memory_mapped)
+    ASSET = process_file(input_stream, report)
+    input_stream.close()
+
+    return ASSET
+
+def read_tag_file(input_file, process_file, report, memory_mapped=False):
+    ASSET = load_tag_file(input_file, process_file)
+    if ASSET == None:
+        ASSET = parse_tag_file(input_file, process_file, report, memory_mapped)
+        save_tag_file(input_file, process_file, ASSET, report)
+
+    return ASSET
@@ -26,9 +26,11 @@
 
 import os
 import bpy
+import mmap
 import struct
+import numpy as np
 
-from xml.dom import minidom
+from xml.sax.saxutils import escape
 from math import degrees, sqrt, radians
 from mathutils import Vector, Quaternion, Euler
 
@@ -120,7 +122,28 @@ h1_tag_groups = (
 h1_tag_groups_dic = {k: v for k, v, d in h1_tag_groups}
 h1_tag_extensions_dic = {v: k for k, v, d in h1_tag_groups}
 
-class XMLData:
+field_formats = ('b', 'B', 'h', 'H', '2h', 'hh', 'i', 'I', 'f', 'ff', '3f', '4f', '4h', '4B', '31sx', '255sx', '4s3I', 'iII', '4siii', 'iiii',
+                 'iiIII', 'hbb32s4siiiihbb4s')
+
+big_endian_structs = {}
+little_endian_structs = {}
+
+def get_struct(big_endian, format_string):
+    # Compiled structs are cached per endianness so field readers don't rebuild and reparse a format string on every call.
+    struct_cache = little_endian_structs
+    if big_endian:
+        struct_cache = big_endian_structs
+
+    compiled_struct = struct_cache.get(format_string)
+    if compiled_struct == None:
+        compiled_struct = struct.Struct('%s%s' % (get_endian_symbol(big_endian), format_string))
+        struct_cache[format_string] = compiled_struct
+
+    return compiled_struct
+
+class XMLNodeData:
+    __slots__ = ("xml_node", "element_name", "enum_class", "block_count", "block_name")
+
     def __init__(self, xml_node=None, element_name="", enum_class=None, block_count=0, block_name=""):
         self.xml_node = xml_node
         self.element_name = element_name
@@ -128,6 +151,15 @@ class XMLData:
         self.block_count = block_count
         self.block_name = block_name
 
+empty_xml_data = XMLNodeData()
+
+def XMLData(xml_node=None, element_name="", enum_class=None, block_count=0, block_name=""):
+    # Element nodes are None whenever XML output is off so every field read can share one empty record instead of allocating its own.
+    if xml_node == None:
+        return empty_xml_data
+
+    return XMLNodeData(xml_node, element_name, enum_class, block_count, block_name)
+
 def get_xml_node(XML_OUTPUT, block_count, element_node, attribute_name, attribute_value):
     xml_node = None
     if XML_OUTPUT and block_count > 0:
@@ -212,33 +244,102 @@ def append_xml_node(xml_data, value_type, value):
     xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", value_type)], value))
 
 def create_xml_node(node_type, node_attributes=[], node_value=None, set_flags=[]):
-    field_node = minidom.Document().createElement(node_type)
+    return append_xml_attributes(XMLStreamElement(node_type), node_attributes, node_value, set_flags)
+
+def append_xml_attributes(field_node, node_attributes=[], node_value=None, set_flags=[]):
     for node_attribute in node_attributes:
         field_node.setAttribute(node_attribute[0], str(node_attribute[1]))
 
     if not node_value == None:
-        field_text = minidom.Document().createTextNode(str(node_value))
-        field_node.appendChild(field_text)
+        field_node.appendChild(str(node_value))
 
         for flag in set_flags:
-            field_text = minidom.Document().createTextNode(str(flag.name))
-            field_node.appendChild(field_text)
+            field_node.appendChild(str(flag.name))
 
     return field_node
 
-def append_xml_attributes(field_node, node_attributes=[], node_value=None, set_flags=[]):
-    for node_attribute in node_attributes:
-        field_node.setAttribute(node_attribute[0], str(node_attribute[1]))
+XML_ESCAPE_ENTITIES = {'"': "&quot;"}
 
-    if not node_value == None:
-        field_text = minidom.Document().createTextNode(str(node_value))
-        field_node.appendChild(field_text)
+class XMLStreamElement:
+    # Stand-in for the few xml.dom.minidom Element methods the tag readers use. Text children are kept as plain strings and nothing
+    # else is stored per node, which keeps the tree for a large tag a fraction of the size of a minidom DOM.
+    __slots__ = ("tagName", "attributes", "childNodes")
 
-        for flag in set_flags:
-            field_text = minidom.Document().createTextNode(str(flag.name))
-            field_node.appendChild(field_text)
+    def __init__(self, tag_name):
+        self.tagName = tag_name
+        self.attributes = []
+        self.childNodes = []
 
-    return field_node
+    def setAttribute(self, attribute_name, attribute_value):
+        for attribute_idx, attribute in enumerate(self.attributes):
+            if attribute[0] == attribute_name:
+                self.attributes[attribute_idx] = (attribute_name, attribute_value)
+                return
+
+        self.attributes.append((attribute_name, attribute_value))
+
+    def getAttribute(self, attribute_name):
+        for attribute in self.attributes:
+            if attribute[0] == attribute_name:
+                return attribute[1]
+
+        return ""
+
+    def appendChild(self, child_node):
+        self.childNodes.append(child_node)
+
+        return child_node
+
+    def write_xml(self, write, indent, add_indent, new_line):
+        # Same layout as minidom's Element.writexml so dumps still diff cleanly against ones written by toprettyxml.
+        write("%s<%s" % (indent, self.tagName))
+        for attribute_name, attribute_value in self.attributes:
+            write(' %s="%s"' % (attribute_name, escape(attribute_value, XML_ESCAPE_ENTITIES)))
+
+        if self.childNodes:
+            write(">")
+            if len(self.childNodes) == 1 and isinstance(self.childNodes[0], str):
+                write(escape(self.childNodes[0], XML_ESCAPE_ENTITIES))
+
+            else:
+                write(new_line)
+                child_indent = indent + add_indent
+                for child_node in self.childNodes:
+                    if isinstance(child_node, str):
+                        write(escape("%s%s%s" % (child_indent, child_node, new_line), XML_ESCAPE_ENTITIES))
+
+                    else:
+                        child_node.write_xml(write, child_indent, add_indent, new_line)
+
+                write(indent)
+
+            write("</%s>%s" % (self.tagName, new_line))
+
+        else:
+            write("/>%s" % new_line)
+
+class XMLStreamDocument:
+    # Document used for XML_OUTPUT. write_xml streams the tree straight to disk instead of building the whole text in memory the way
+    # toprettyxml does.
+    def __init__(self):
+        self.childNodes = []
+
+    def createElement(self, tag_name):
+        return XMLStreamElement(tag_name)
+
+    def createTextNode(self, text):
+        return text
+
+    def appendChild(self, child_node):
+        self.childNodes.append(child_node)
+
+        return child_node
+
+    def write_xml(self, file_path, indent="\t", new_line="\n"):
+        with open(file_path, "w") as xml_file:
+            xml_file.write('<?xml version="1.0" ?>%s' % new_line)
+            for child_node in self.childNodes:
+                child_node.write_xml(xml_file.write, "", indent, new_line)
 
 def get_tag_path(file_path, is_legacy):
     local_path = file_path
@@ -305,6 +406,59 @@ def check_group(input_stream, is_big_endian=True):
 
     return tag_group, group_match, engine_tag
 
+class MappedTagStream:
+    # Read only file object backed by mmap. read and tell are the mapping's own methods so field readers work on it exactly as they do
+    # on a file from open(). read_view hands out memoryview slices of the mapping so block readers can decode without a copy.
+    def __init__(self, file_path):
+        self.name = file_path
+        self.tag_file = open(file_path, 'rb')
+        self.mapped_file = mmap.mmap(self.tag_file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.view = memoryview(self.mapped_file)
+        self.read = self.mapped_file.read
+        self.tell = self.mapped_file.tell
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def seek(self, offset, whence=0):
+        # mmap.seek returns None on older Pythons. process_file takes the end of the tag from seek(0, 2) the way a file object returns it.
+        self.mapped_file.seek(offset, whence)
+
+        return self.mapped_file.tell()
+
+    def read_view(self, size):
+        offset = self.mapped_file.tell()
+        end_offset = min(offset + size, len(self.mapped_file))
+        self.mapped_file.seek(end_offset)
+
+        return self.view[offset:end_offset]
+
+    def close(self):
+        try:
+            self.view.release()
+            self.mapped_file.close()
+        except BufferError:
+            # A view handed out by read_view is still alive. The mapping is unmapped once the last one goes away.
+            pass
+
+        self.tag_file.close()
+
+def open_tag_stream(file_path, memory_mapped=False):
+    # Returns a stream for process_file. Memory mapping is opt in per call and skipped for empty files since those can't be mapped.
+    if memory_mapped and os.path.getsize(file_path) > 0:
+        return MappedTagStream(file_path)
+
+    return open(file_path, 'rb')
+
+def read_block_data(input_stream, size):
+    if isinstance(input_stream, MappedTagStream):
+        return input_stream.read_view(size)
+
+    return input_stream.read(size)
+
 def get_endian_symbol(big_endian):
     endian_type = "<"
     if big_endian:
@@ -312,6 +466,10 @@ def get_endian_symbol(big_endian):
 
     return endian_type
 
+for field_format in field_formats:
+    get_struct(True, field_format)
+    get_struct(False, field_format)
+
 def get_patch_set(patch_txt_path):
     upgrade_patches = None
     if os.path.isfile(patch_txt_path):
@@ -397,6 +555,591 @@ def string_empty_check(string):
 
     return is_empty
 
+def xml_real(float_value):
+    return '%0.6f' % round(float_value, 6)
+
+def layout_scalar(values):
+    return values[0]
+
+def layout_tuple(values):
+    return values
+
+def layout_vector(values):
+    return Vector(values)
+
+def layout_rgb(values):
+    return (values[0], values[1], values[2], 1)
+
+# Field type: (struct format, value count, value converter, XML type, XML formatter). Types are named after the TagAsset reader they stand in for.
+layout_field_types = {
+    "signed_byte": ('b', 1, layout_scalar, "char integer", str),
+    "unsigned_byte": ('B', 1, layout_scalar, "char integer", str),
+    "signed_short": ('h', 1, layout_scalar, "short integer", str),
+    "unsigned_short": ('H', 1, layout_scalar, "short integer", str),
+    "signed_integer": ('i', 1, layout_scalar, "long integer", str),
+    "unsigned_integer": ('I', 1, layout_scalar, "long integer", str),
+    "float": ('f', 1, layout_scalar, "real", xml_real),
+    "point_2d": ('ff', 2, layout_tuple, "real point 2d", lambda values: xml_2d(values[0], values[1])),
+    "point_2d_short": ('hh', 2, layout_tuple, "short point 2d", lambda values: xml_bounds_short(values[0], values[1])),
+    "signed_short_pair": ('hh', 2, layout_tuple, "short integer", str),
+    "point_3d": ('3f', 3, layout_vector, "real point 3d", xml_vector),
+    "vector": ('3f', 3, layout_vector, "real vector 3d", xml_vector),
+    "rgb": ('3f', 3, layout_rgb, "rgb color", xml_vector),
+    }
+
+class TagBlockElementView:
+    # Attribute style access to a single element of a TagBlockColumns store. Views are created on access so existing per-element code
+    # keeps working without a Python object being built for every element in the block.
+    __slots__ = ('block_columns', 'element_index')
+
+    def __init__(self, block_columns, element_index):
+        object.__setattr__(self, 'block_columns', block_columns)
+        object.__setattr__(self, 'element_index', element_index)
+
+    def __getattr__(self, attribute_name):
+        return self.block_columns.get_value(attribute_name, self.element_index)
+
+    def __setattr__(self, attribute_name, value):
+        self.block_columns.set_value(attribute_name, self.element_index, value)
+
+class TagBlockColumns:
+    # Column store for a tag block. Every field is kept as a contiguous NumPy array with one row per element so mesh building can hand
+    # positions, normals, UVs and weights straight to foreach_set. Indexing or iterating yields TagBlockElementView objects.
+    def __init__(self, element_class, count):
+        self.count = count
+        self.columns = {}
+        self.converters = {}
+        self.element_overrides = {}
+        self.element_defaults = element_class()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for element_idx in range(self.count):
+            yield TagBlockElementView(self, element_idx)
+
+    def __getitem__(self, element_idx):
+        if element_idx < 0:
+            element_idx += self.count
+
+        if not 0 <= element_idx < self.count:
+            raise IndexError("Tag block element index out of range")
+
+        return TagBlockElementView(self, element_idx)
+
+    def copy(self):
+        # Columns are shared with the copy until set_column replaces them, so a tag asset shared between builds keeps its data.
+        block_columns = TagBlockColumns.__new__(TagBlockColumns)
+        block_columns.count = self.count
+        block_columns.columns = dict(self.columns)
+        block_columns.converters = dict(self.converters)
+        block_columns.element_overrides = {element_idx: dict(element_override) for element_idx, element_override in self.element_overrides.items()}
+        block_columns.element_defaults = self.element_defaults
+
+        return block_columns
+
+    def set_column(self, attribute_name, column, converter=layout_tuple):
+        self.columns[attribute_name] = column
+        self.converters[attribute_name] = converter
+
+    def get_column(self, attribute_name):
+        return self.columns[attribute_name]
+
+    def get_columns(self, attribute_names, dtype=None):
+        # Stack several scalar columns such as node indices or weights into a single (count, len(attribute_names)) array.
+        return np.column_stack([self.columns[attribute_name] for attribute_name in attribute_names]).astype(dtype or self.columns[attribute_names[0]].dtype, copy=False)
+
+    def get_value(self, attribute_name, element_idx):
+        column = self.columns.get(attribute_name)
+        if column is None:
+            element_override = self.element_overrides.get(element_idx)
+            if not element_override == None and attribute_name in element_override:
+                return element_override[attribute_name]
+
+            return getattr(self.element_defaults, attribute_name)
+
+        value = column[element_idx].tolist()
+        if column.ndim > 1:
+            value = self.converters[attribute_name](tuple(value))
+
+        return value
+
+    def set_value(self, attribute_name, element_idx, value):
+        column = self.columns.get(attribute_name)
+        if column is None:
+            self.element_overrides.setdefault(element_idx, {})[attribute_name] = value
+
+        elif column.ndim > 1:
+            column[element_idx] = tuple(value)[:column.shape[1]]
+
+        else:
+            column[element_idx] = value
+
+class TagBlockLayout:
+    # Declarative layout for tag block elements whose fields sit at fixed offsets. The whole block is read in a single call and decoded
+    # with struct.iter_unpack instead of one stream read per field. Fields are (attribute name, XML name, field type, offset) with an
+    # optional fifth entry to apply the same increase_scale the point readers take. Pair types take a tuple of XML names and write one
+    # field per component.
+    def __init__(self, element_size, fields):
+        self.element_size = element_size
+        self.fields = sorted(fields, key=lambda field: field[3])
+        self.field_readers = []
+        self.dtypes = {}
+        format_string = ""
+        position = 0
+        value_index = 0
+        for field in self.fields:
+            attribute_name, xml_name, field_type, offset = field[:4]
+            increase_scale = len(field) > 4 and field[4]
+            field_format, value_count, converter, xml_type, xml_formatter = layout_field_types[field_type]
+            if offset < position:
+                raise ValueError("Field %s overlaps the previous field in the block layout" % attribute_name)
+
+            if offset > position:
+                format_string += "%sx" % (offset - position)
+
+            format_string += field_format
+            position = offset + struct.calcsize("<%s" % field_format)
+            self.field_readers.append((attribute_name, xml_name, value_index, value_count, converter, increase_scale, xml_type, xml_formatter))
+            value_index += value_count
+
+        if position > element_size:
+            raise ValueError("Block layout fields run past the element size of %s bytes" % element_size)
+
+        if element_size > position:
+            format_string += "%sx" % (element_size - position)
+
+        self.format_string = format_string
+
+    def get_dtype(self, big_endian):
+        dtype = self.dtypes.get(big_endian)
+        if dtype is None:
+            endian_symbol = get_endian_symbol(big_endian)
+            names = []
+            formats = []
+            offsets = []
+            for field in self.fields:
+                attribute_name, xml_name, field_type, offset = field[:4]
+                field_format, value_count = layout_field_types[field_type][:2]
+                field_dtype = "%s%s" % (endian_symbol, field_format[-1])
+                if value_count > 1:
+                    field_dtype = (field_dtype, (value_count,))
+
+                names.append(attribute_name)
+                formats.append(field_dtype)
+                offsets.append(offset)
+
+            dtype = np.dtype({'names': names, 'formats': formats, 'offsets': offsets, 'itemsize': self.element_size})
+            self.dtypes[big_endian] = dtype
+
+        return dtype
+
+    def read_xml(self, TAG, block_node, element_idx, values):
+        element_node = TAG.xml_doc.createElement('element')
+        element_node.setAttribute('index', str(element_idx))
+        block_node.appendChild(element_node)
+        for attribute_name, xml_name, value_index, value_count, converter, increase_scale, xml_type, xml_formatter in self.field_readers:
+            if isinstance(xml_name, tuple):
+                for component_idx, component_name in enumerate(xml_name):
+                    element_node.appendChild(create_xml_node("field", [("name", component_name), ("type", xml_type)], xml_formatter(values[value_index + component_idx])))
+
+                continue
+
+            if value_count == 1:
+                xml_value = xml_formatter(values[value_index])
+            else:
+                xml_value = xml_formatter(values[value_index:value_index + value_count])
+
+            element_node.appendChild(create_xml_node("field", [("name", xml_name), ("type", xml_type)], xml_value))
+
+    def read(self, input_stream, TAG, count, element_class, block_node=None, columns=False):
+        if columns:
+            return self.read_columns(input_stream, TAG, count, element_class, block_node)
+
+        elements = []
+        if count > 0:
+            compiled_struct = get_struct(TAG.big_endian, self.format_string)
+            write_xml = not TAG.xml_doc == None and not block_node == None
+            field_readers = self.field_readers
+            for element_idx, values in enumerate(compiled_struct.iter_unpack(read_block_data(input_stream, count * self.element_size))):
+                element = element_class()
+                for attribute_name, xml_name, value_index, value_count, converter, increase_scale, xml_type, xml_formatter in field_readers:
+                    if value_count == 1:
+                        value = values[value_index]
+                    else:
+                        value = converter(values[value_index:value_index + value_count])
+
+                    if increase_scale:
+                        value = value * 100
+
+                    setattr(element, attribute_name, value)
+
+                if write_xml:
+                    self.read_xml(TAG, block_node, element_idx, values)
+
+                elements.append(element)
+
+        return elements
+
+    def read_columns(self, input_stream, TAG, count, element_class, block_node=None):
+        block_columns = TagBlockColumns(element_class, count)
+        block_data = read_block_data(input_stream, count * self.element_size)
+        if count > 0 and not TAG.xml_doc == None and not block_node == None:
+            for element_idx, values in enumerate(get_struct(TAG.big_endian, self.format_string).iter_unpack(block_data)):
+                self.read_xml(TAG, block_node, element_idx, values)
+
+        records = np.frombuffer(block_data, dtype=self.get_dtype(TAG.big_endian), count=count)
+        for attribute_name, xml_name, value_index, value_count, converter, increase_scale, xml_type, xml_formatter in self.field_readers:
+            record_column = records[attribute_name]
+            column = record_column.astype(record_column.dtype.newbyteorder('='))
+            if increase_scale:
+                column *= 100
+
+            block_columns.set_column(attribute_name, column, converter)
+
+        return block_columns
+
+    def read_values(self, input_stream, TAG, count, block_node=None):
+        # Single field blocks such as index lists decode straight to a list of values.
+        values_list = []
+        if count > 0:
+            compiled_struct = get_struct(TAG.big_endian, self.format_string)
+            values_list = [values[0] for values in compiled_struct.iter_unpack(read_block_data(input_stream, count * self.element_size))]
+            if not TAG.xml_doc == None and not block_node == None:
+                for element_idx, value in enumerate(values_list):
+                    self.read_xml(TAG, block_node, element_idx, (value,))
+
+        return values_list
+
+def skim_tag_block(input_stream, TAG, count, skim_fields):
+    # Moves the stream past a tag block and everything nested under it without decoding any elements. Only the fields that pull in
+    # data after the block need to be described: ("block", offset, child skim fields), ("tag_reference", offset, None) and
+    # ("data", offset, None), in the order they sit in the element.
+    if count > 0:
+        block_header = TAG.TagBlockHeader().read(input_stream, TAG)
+        if not skim_fields:
+            input_stream.seek(count * block_header.size, 1)
+
+        else:
+            element_data = read_block_data(input_stream, count * block_header.size)
+            integer_struct = get_struct(TAG.big_endian, 'i')
+            for element_idx in range(count):
+                element_offset = element_idx * block_header.size
+                for field_type, field_offset, child_skim_fields in skim_fields:
+                    if field_type == "block":
+                        skim_tag_block(input_stream, TAG, integer_struct.unpack_from(element_data, element_offset + field_offset)[0], child_skim_fields)
+
+                    elif field_type == "tag_reference":
+                        name_length = integer_struct.unpack_from(element_data, element_offset + field_offset + 8)[0]
+                        if name_length > 0:
+                            input_stream.seek(name_length + 1, 1)
+
+                    elif field_type == "data":
+                        input_stream.seek(integer_struct.unpack_from(element_data, element_offset + field_offset)[0], 1)
+
+def get_file_signature(file_path):
+    file_stat = os.stat(file_path)
+
+    return (file_stat.st_size, file_stat.st_mtime_ns)
+
+def read_lazy_tag_block(ASSET, TAG, input_stream, attribute_name, block_reader, skim_fields):
+    # Skims a top level block and stores a LazyTagBlock in its place. Only where the block starts is kept, the block reader is run on
+    # the tag file itself if something touches the block.
+    block_offset = input_stream.tell()
+    skim_tag_block(input_stream, TAG, getattr(ASSET, "%s_tag_block" % attribute_name).count, skim_fields)
+    setattr(ASSET, attribute_name, LazyTagBlock(ASSET, TAG, attribute_name, block_reader, input_stream.name, block_offset))
+
+class LazyTagBlock:
+    # Stand-in for a top level tag block list. The skim pass only records the tag file and the offset of the block. The first time
+    # the list is used the file is opened again at that offset and handed to the block's usual reader, after which the asset
+    # attribute holds the decoded list. The size and modification time of the file are checked first so a tag that was saved
+    # since it was parsed is never decoded with the old layout.
+    def __init__(self, ASSET, TAG, attribute_name, block_reader, file_path, block_offset):
+        self.ASSET = ASSET
+        self.TAG = TAG
+        self.attribute_name = attribute_name
+        self.block_reader = block_reader
+        self.file_path = file_path
+        self.block_offset = block_offset
+        self.file_signature = get_file_signature(file_path)
+        self.elements = None
+
+    def materialize(self):
+        if self.elements is None:
+            if not get_file_signature(self.file_path) == self.file_signature:
+                raise RuntimeError("%s changed after it was parsed so its %s block can't be read. Import the tag again" % (self.file_path, self.attribute_name))
+
+            setattr(self.ASSET, self.attribute_name, [])
+            with open(self.file_path, 'rb') as input_stream:
+                input_stream.seek(self.block_offset)
+                self.block_reader(self.ASSET, self.TAG, input_stream, None, False)
+
+            self.elements = getattr(self.ASSET, self.attribute_name)
+
+        return self.elements
+
+    def __len__(self):
+        return len(self.materialize())
+
+    def __iter__(self):
+        return iter(self.materialize())
+
+    def __getitem__(self, element_idx):
+        return self.materialize()[element_idx]
+
+    def __setitem__(self, element_idx, value):
+        self.materialize()[element_idx] = value
+
+    def __contains__(self, value):
+        return value in self.materialize()
+
+    def __getattr__(self, attribute_name):
+        # Dunder lookups come from copy and pickle on a bare instance, so they must not try to materialize.
+        if attribute_name.startswith("__"):
+            raise AttributeError(attribute_name)
+
+        return getattr(self.materialize(), attribute_name)
+
+# Field readers for tags parsed without XML output. TagAsset binds these over its own readers while xml_doc is None so the XML
+# check is made once per tag instead of once per field.
+def read_signed_byte_no_xml(input_stream, tag, xml_data=None):
+    return (get_struct(tag.big_endian, 'b').unpack(input_stream.read(1)))[0]
+
+def read_block_index_signed_byte_no_xml(input_stream, tag, xml_data=None):
+    return (get_struct(tag.big_endian, 'b').unpack(input_stream.read(1)))[0]
+
+def read_flag_unsigned_byte_no_xml(input_stream, tag, xml_data=None):
+    return (get_struct(tag.big_endian, 'B').unpack(input_stream.read(1)))[0]
+
+def read_enum_unsigned_byte_no_xml(input_stream, tag, xml_data=None):
+    return (get_struct(tag.big_endian, 'B').unpack(input_stream.read(1)))[0]
+
+def read_signed_short_no_xml(input_stream, tag, xml_data=None):
+    return (get_struct(tag.big_endian, 'h').unpack(input_stream.read(2)))[0]
+
+def read_min_max_signed_short_no_xml(input_stream, tag, xml_data=None):
+    short_values = get_struct(tag.big_endian, '2h').unpack(input_stream.read(4))
+    short_min = short_values[0]
+    short_max = short_values[1]
+
+    return (short_min, short_max)
+
+def read_unsigned_short_no_xml(input_stream, tag, xml_data=None):
+    return (get_struct(tag.big_endian, 'H').unpack(input_stream.read(2)))[0]
+
+def read_enum_unsigned_short_no_xml(input_stream, tag, xml_data=None):
+    return (get_struct(tag.big_endian, 'H').unpack(input_stream.read(2)))[0]
+
+def read_block_index_signed_short_no_xml(input_stream, tag, xml_data=None):
+    return (get_struct(tag.big_endian, 'h').unpack(input_stream.read(2)))[0]
+
+def read_flag_unsigned_short_no_xml(input_stream, tag, xml_data=None):
+    return (get_struct(tag.big_endian, 'H').unpack(input_stream.read(2)))[0]
+
+def read_point_2d_short_no_xml(input_stream, tag, xml_data=None):
+    short_a, short_b = get_struct(tag.big_endian, 'hh').unpack(input_stream.read(4))
+
+    return (short_a, short_b)
+
+def read_signed_integer_no_xml(input_stream, tag, xml_data=None):
+    return (get_struct(tag.big_endian, 'i').unpack(input_stream.read(4)))[0]
+
+def read_unsigned_integer_no_xml(input_stream, tag, xml_data=None):
+    return (get_struct(tag.big_endian, 'I').unpack(input_stream.read(4)))[0]
+
+def read_flag_unsigned_integer_no_xml(input_stream, tag, xml_data=None):
+    return (get_struct(tag.big_endian, 'I').unpack(input_stream.read(4)))[0]
+
+def read_block_index_signed_integer_no_xml(input_stream, tag, xml_data=None):
+    return (get_struct(tag.big_endian, 'i').unpack(input_stream.read(4)))[0]
+
+def read_enum_unsigned_integer_no_xml(input_stream, tag, xml_data=None):
+    return (get_struct(tag.big_endian, 'I').unpack(input_stream.read(4)))[0]
+
+def read_float_no_xml(input_stream, tag, xml_data=None, increase_scale=False):
+    float_value = (get_struct(tag.big_endian, 'f').unpack(input_stream.read(4)))[0]
+    if increase_scale:
+        float_value = float_value * 100
+
+    return float_value
+
+def read_min_max_no_xml(input_stream, tag, xml_data=None, increase_scale=False):
+    float_values = get_struct(tag.big_endian, 'ff').unpack(input_stream.read(8))
+    float_min = float_values[0]
+    float_max = float_values[1]
+    if increase_scale:
+        float_min = float_min * 100
+        float_max = float_max * 100
+
+    return (float_min, float_max)
+
+def read_point_2d_no_xml(input_stream, tag, xml_data=None, increase_scale=False):
+    float_a, float_b = get_struct(tag.big_endian, 'ff').unpack(input_stream.read(8))
+    if increase_scale:
+        float_a *= 100
+        float_b *= 100
+
+    return (float_a, float_b)
+
+def read_degree_2d_no_xml(input_stream, tag, xml_data=None):
+    float_a, float_b = get_struct(tag.big_endian, 'ff').unpack(input_stream.read(8))
+    degree_a = degrees(float_a)
+    degree_b = degrees(float_b)
+
+    return (degree_a, degree_b)
+
+def read_degree_no_xml(input_stream, tag, xml_data=None):
+    return degrees((get_struct(tag.big_endian, 'f').unpack(input_stream.read(4)))[0])
+
+def read_min_max_degree_no_xml(input_stream, tag, xml_data=None):
+    float_a, float_b = get_struct(tag.big_endian, 'ff').unpack(input_stream.read(8))
+    degree_a = degrees(float_a)
+    degree_b = degrees(float_b)
+
+    return (degree_a, degree_b)
+
+def read_point_3d_no_xml(input_stream, tag, xml_data=None, increase_scale=False):
+    pos = get_struct(tag.big_endian, '3f').unpack(input_stream.read(12))
+    pos_vector = Vector((pos[0], pos[1], pos[2]))
+    if increase_scale:
+        pos_vector *= 100
+
+    return pos_vector
+
+def read_euler_angles_no_xml(input_stream, tag, xml_data=None):
+    angles = get_struct(tag.big_endian, '3f').unpack(input_stream.read(12))
+    return Euler((degrees(angles[0]), degrees(angles[1]), degrees(angles[2])))
+
+def read_vector_no_xml(input_stream, tag, xml_data=None, increase_scale=False):
+    pos = get_struct(tag.big_endian, '3f').unpack(input_stream.read(12))
+    pos_vector = Vector((pos[0], pos[1], pos[2]))
+    if increase_scale:
+        pos_vector *= 100
+
+    return pos_vector
+
+def read_quaternion_no_xml(input_stream, tag, xml_data=None, is_inverted=False):
+    rot = get_struct(tag.big_endian, '4f').unpack(input_stream.read(16))
+    rot_value = Quaternion((rot[3], rot[0], rot[1], rot[2])) # Order is the way it is cause Halo stores quaternions as IJKW while Blender is WIJK. - General_101
+    if is_inverted:
+        rot_value = rot_value.inverted()
+
+    return rot_value
+
+def read_quaternion_squared_no_xml(input_stream, tag, xml_data=None, is_inverted=False):
+    rot = get_struct(tag.big_endian, '4h').unpack(input_stream.read(8))
+
+    q0 = rot[0]
+    q1 = rot[1]
+    q2 = rot[2]
+    q3 = rot[3]
+
+    rot_len = q0**2 + q1**2 + q2**2 + q3**2
+    if rot_len:
+        rot_len = 1 / sqrt(rot_len)
+        q0 *= rot_len
+        q1 *= rot_len
+        q2 *= rot_len
+        q3 *= rot_len
+
+    else:
+        q0 = q1 = q2 = 0.0
+        q3 = 1.0
+
+    rot_value = Quaternion((q3, q0, q1, q2)) # Order is the way it is cause Halo stores quaternions as IJKW while Blender is WIJK. - General_101
+
+    if is_inverted:
+        rot_value.inverted()
+
+    return rot_value
+
+def read_rgb_no_xml(input_stream, tag, xml_data=None):
+    rgb = get_struct(tag.big_endian, '3f').unpack(input_stream.read(12))
+
+    return (rgb[0], rgb[1], rgb[2], 1)
+
+def read_bgr_byte_no_xml(input_stream, tag, xml_data=None):
+    bgr = get_struct(tag.big_endian, '4B').unpack(input_stream.read(4))
+    R = bgr[2] / 255
+    G = bgr[1] / 255
+    B = bgr[0] / 255
+    A = 1.0
+
+    return (R, G, B, A) # Order is the way it is cause Halo stores color as BGR while Blender is RGBA. - General_101
+
+def read_argb_no_xml(input_stream, tag, xml_data=None):
+    argb = get_struct(tag.big_endian, '4f').unpack(input_stream.read(16))
+
+    return (argb[1], argb[2], argb[3], argb[0]) # Order is the way it is cause Halo stores color as ARGB while Blender is RGBA. - General_101
+
+def read_argb_byte_no_xml(input_stream, tag, xml_data=None):
+    argb = get_struct(tag.big_endian, '4B').unpack(input_stream.read(4))
+
+    return (argb[1] / 255, argb[2] / 255, argb[3] / 255, argb[0] / 255) # Order is the way it is cause Halo stores color as ARGB while Blender is RGBA. - General_101
+
+def read_rectangle_no_xml(input_stream, tag, xml_data=None):
+    rec2d = get_struct(tag.big_endian, '4h').unpack(input_stream.read(8))
+
+    return (rec2d[0], rec2d[1], rec2d[2], rec2d[3])
+
+def read_string32_no_xml(input_stream, tag, xml_data=None):
+    # Final byte is reserved for a null terminator. - General_101
+    return (get_struct(tag.big_endian, '31sx').unpack(input_stream.read(32)))[0].decode('utf-8', 'replace').split('\x00', 1)[0].strip('\x20')
+
+def read_string256_no_xml(input_stream, tag, xml_data=None):
+    # Final byte is reserved for a null terminator. - General_101
+    return (get_struct(tag.big_endian, '255sx').unpack(input_stream.read(256)))[0].decode('utf-8', 'replace').split('\x00', 1)[0].strip('\x20')
+
+def read_variable_string_no_xml(input_stream, string_length, tag, xml_data=None):
+    return (get_struct(tag.big_endian, '%ssx' % string_length).unpack(input_stream.read(string_length + 1)))[0].decode('utf-8', 'replace').split('\x00', 1)[0].strip('\x20')
+
+def read_variable_string_no_terminator_no_xml(input_stream, string_length, tag, xml_data=None):
+    return (get_struct(tag.big_endian, '%ss' % string_length).unpack(input_stream.read(string_length)))[0].decode('utf-8', 'replace').split('\x00', 1)[0].strip('\x20')
+
+def read_variable_string_no_terminator_reversed_no_xml(input_stream, string_length, tag, xml_data=None):
+    return (get_struct(tag.big_endian, '%ss' % string_length).unpack(input_stream.read(string_length)))[0].decode('utf-8', 'replace').split('\x00', 1)[0].strip('\x20')[::-1]
+
+no_xml_field_readers = {
+    "read_signed_byte": read_signed_byte_no_xml,
+    "read_block_index_signed_byte": read_block_index_signed_byte_no_xml,
+    "read_flag_unsigned_byte": read_flag_unsigned_byte_no_xml,
+    "read_enum_unsigned_byte": read_enum_unsigned_byte_no_xml,
+    "read_signed_short": read_signed_short_no_xml,
+    "read_min_max_signed_short": read_min_max_signed_short_no_xml,
+    "read_unsigned_short": read_unsigned_short_no_xml,
+    "read_enum_unsigned_short": read_enum_unsigned_short_no_xml,
+    "read_block_index_signed_short": read_block_index_signed_short_no_xml,
+    "read_flag_unsigned_short": read_flag_unsigned_short_no_xml,
+    "read_point_2d_short": read_point_2d_short_no_xml,
+    "read_signed_integer": read_signed_integer_no_xml,
+    "read_unsigned_integer": read_unsigned_integer_no_xml,
+    "read_flag_unsigned_integer": read_flag_unsigned_integer_no_xml,
+    "read_block_index_signed_integer": read_block_index_signed_integer_no_xml,
+    "read_enum_unsigned_integer": read_enum_unsigned_integer_no_xml,
+    "read_float": read_float_no_xml,
+    "read_min_max": read_min_max_no_xml,
+    "read_point_2d": read_point_2d_no_xml,
+    "read_degree_2d": read_degree_2d_no_xml,
+    "read_degree": read_degree_no_xml,
+    "read_min_max_degree": read_min_max_degree_no_xml,
+    "read_point_3d": read_point_3d_no_xml,
+    "read_euler_angles": read_euler_angles_no_xml,
+    "read_vector": read_vector_no_xml,
+    "read_quaternion": read_quaternion_no_xml,
+    "read_quaternion_squared": read_quaternion_squared_no_xml,
+    "read_rgb": read_rgb_no_xml,
+    "read_bgr_byte": read_bgr_byte_no_xml,
+    "read_argb": read_argb_no_xml,
+    "read_argb_byte": read_argb_byte_no_xml,
+    "read_rectangle": read_rectangle_no_xml,
+    "read_string32": read_string32_no_xml,
+    "read_string256": read_string256_no_xml,
+    "read_variable_string": read_variable_string_no_xml,
+    "read_variable_string_no_terminator": read_variable_string_no_terminator_no_xml,
+    "read_variable_string_no_terminator_reversed": read_variable_string_no_terminator_reversed_no_xml
+}
+
 class TagAsset():
     def __init__(self):
         self.big_endian = True
@@ -404,6 +1147,20 @@ class TagAsset():
         self.is_legacy = True
         self.upgrade_patches = None
 
+    @property
+    def xml_doc(self):
+        return self._xml_doc
+
+    @xml_doc.setter
+    def xml_doc(self, xml_doc):
+        self._xml_doc = xml_doc
+        if xml_doc == None:
+            self.__dict__.update(no_xml_field_readers)
+
+        else:
+            for reader_name in no_xml_field_readers:
+                self.__dict__.pop(reader_name, None)
+
     def string_to_bytes(self, string, reverse):
         if reverse:
             string = string[::-1]
@@ -416,24 +1173,24 @@ class TagAsset():
         return radian_vector
 
     def read_signed_byte(self, input_stream, tag, xml_data=None):
-        signed_byte = (struct.unpack('%sb' % get_endian_symbol(tag.big_endian), input_stream.read(1)))[0]
+        signed_byte = (get_struct(tag.big_endian, 'b').unpack(input_stream.read(1)))[0]
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "char integer")], signed_byte))
 
         return signed_byte
 
     def read_unsigned_byte(self, input_stream, big_endian):
-        return (struct.unpack('%sB' % get_endian_symbol(big_endian), input_stream.read(1)))[0]
+        return (get_struct(big_endian, 'B').unpack(input_stream.read(1)))[0]
 
     def read_block_index_signed_byte(self, input_stream, tag, xml_data=None):
-        signed_byte = (struct.unpack('%sb' % get_endian_symbol(tag.big_endian), input_stream.read(1)))[0]
+        signed_byte = (get_struct(tag.big_endian, 'b').unpack(input_stream.read(1)))[0]
         if not tag.xml_doc == None and not xml_data == None:
                         xml_data.xml_node.appendChild(create_xml_node("block_index", [("name", xml_data.element_name), ("type", "char block index"), ("index", str(signed_byte))], get_block_name(signed_byte, xml_data.block_count, xml_data.block_name)))
 
         return signed_byte
 
     def read_flag_unsigned_byte(self, input_stream, tag, xml_data=None):
-        flags = (struct.unpack('%sB' % get_endian_symbol(tag.big_endian), input_stream.read(1)))[0]
+        flags = (get_struct(tag.big_endian, 'B').unpack(input_stream.read(1)))[0]
         if not tag.xml_doc == None and not xml_data == None:
             flag_enums = []
             if not xml_data.enum_class == None:
@@ -444,21 +1201,21 @@ class TagAsset():
         return flags
 
     def read_enum_unsigned_byte(self, input_stream, tag, xml_data=None):
-        unsigned_byte = (struct.unpack('%sB' % get_endian_symbol(tag.big_endian), input_stream.read(1)))[0]
+        unsigned_byte = (get_struct(tag.big_endian, 'B').unpack(input_stream.read(1)))[0]
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "enum")], xml_enum(xml_data.enum_class, unsigned_byte)))
 
         return unsigned_byte
 
     def read_signed_short(self, input_stream, tag, xml_data=None):
-        signed_short = (struct.unpack('%sh' % get_endian_symbol(tag.big_endian), input_stream.read(2)))[0]
+        signed_short = (get_struct(tag.big_endian, 'h').unpack(input_stream.read(2)))[0]
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "short integer")], signed_short))
 
         return signed_short
 
     def read_min_max_signed_short(self, input_stream, tag, xml_data=None):
-        short_values = struct.unpack('%s2h' % get_endian_symbol(tag.big_endian), input_stream.read(4))
+        short_values = get_struct(tag.big_endian, '2h').unpack(input_stream.read(4))
         short_min = short_values[0]
         short_max = short_values[1]
 
@@ -468,28 +1225,28 @@ class TagAsset():
         return (short_min, short_max)
 
     def read_unsigned_short(self, input_stream, tag, xml_data=None):
-        unsigned_short = (struct.unpack('%sH' % get_endian_symbol(tag.big_endian), input_stream.read(2)))[0]
+        unsigned_short = (get_struct(tag.big_endian, 'H').unpack(input_stream.read(2)))[0]
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "short integer")], unsigned_short))
 
         return unsigned_short
 
     def read_enum_unsigned_short(self, input_stream, tag, xml_data=None):
-        unsigned_short = (struct.unpack('%sH' % get_endian_symbol(tag.big_endian), input_stream.read(2)))[0]
+        unsigned_short = (get_struct(tag.big_endian, 'H').unpack(input_stream.read(2)))[0]
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "enum")], xml_enum(xml_data.enum_class, unsigned_short)))
 
         return unsigned_short
 
     def read_block_index_signed_short(self, input_stream, tag, xml_data=None):
-        signed_short = (struct.unpack('%sh' % get_endian_symbol(tag.big_endian), input_stream.read(2)))[0]
+        signed_short = (get_struct(tag.big_endian, 'h').unpack(input_stream.read(2)))[0]
         if not tag.xml_doc == None and not xml_data == None:
                         xml_data.xml_node.appendChild(create_xml_node("block_index", [("name", xml_data.element_name), ("type", "short block index"), ("index", str(signed_short))], get_block_name(signed_short, xml_data.block_count, xml_data.block_name)))
 
         return signed_short
 
     def read_flag_unsigned_short(self, input_stream, tag, xml_data=None):
-        flags = (struct.unpack('%sH' % get_endian_symbol(tag.big_endian), input_stream.read(2)))[0]
+        flags = (get_struct(tag.big_endian, 'H').unpack(input_stream.read(2)))[0]
         if not tag.xml_doc == None and not xml_data == None:
             flag_enums = []
             if not xml_data.enum_class == None:
@@ -500,28 +1257,28 @@ class TagAsset():
         return flags
 
     def read_point_2d_short(self, input_stream, tag, xml_data=None):
-        short_a, short_b = struct.unpack('%shh' % get_endian_symbol(tag.big_endian), input_stream.read(4))
+        short_a, short_b = get_struct(tag.big_endian, 'hh').unpack(input_stream.read(4))
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "short point 2d")], xml_bounds_short(short_a, short_b)))
 
         return (short_a, short_b)
 
     def read_signed_integer(self, input_stream, tag, xml_data=None):
-        signed_integer = (struct.unpack('%si' % get_endian_symbol(tag.big_endian), input_stream.read(4)))[0]
+        signed_integer = (get_struct(tag.big_endian, 'i').unpack(input_stream.read(4)))[0]
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "long integer")], signed_integer))
 
         return signed_integer
 
     def read_unsigned_integer(self, input_stream, tag, xml_data=None):
-        unsigned_integer = (struct.unpack('%sI' % get_endian_symbol(tag.big_endian), input_stream.read(4)))[0]
+        unsigned_integer = (get_struct(tag.big_endian, 'I').unpack(input_stream.read(4)))[0]
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "long integer")], unsigned_integer))
 
         return unsigned_integer
 
     def read_flag_unsigned_integer(self, input_stream, tag, xml_data=None):
-        flags = (struct.unpack('%sI' % get_endian_symbol(tag.big_endian), input_stream.read(4)))[0]
+        flags = (get_struct(tag.big_endian, 'I').unpack(input_stream.read(4)))[0]
         if not tag.xml_doc == None and not xml_data == None:
             flag_enums = []
             if not xml_data.enum_class == None:
@@ -532,26 +1289,26 @@ class TagAsset():
         return flags
 
     def read_block_index_signed_integer(self, input_stream, tag, xml_data=None):
-        signed_short = (struct.unpack('%si' % get_endian_symbol(tag.big_endian), input_stream.read(4)))[0]
+        signed_short = (get_struct(tag.big_endian, 'i').unpack(input_stream.read(4)))[0]
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("block_index", [("name", xml_data.element_name), ("type", "long block index"), ("index", str(signed_short))], get_block_name(signed_short, xml_data.block_count, xml_data.block_name)))
 
         return signed_short
 
     def read_enum_unsigned_integer(self, input_stream, tag, xml_data=None):
-        unsigned_integer = (struct.unpack('%sI' % get_endian_symbol(tag.big_endian), input_stream.read(4)))[0]
+        unsigned_integer = (get_struct(tag.big_endian, 'I').unpack(input_stream.read(4)))[0]
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "enum")], xml_enum(xml_data.enum_class, unsigned_integer)))
 
         return unsigned_integer
 
     def read_enum_integer(self, input_stream, big_endian):
-        unsigned_integer = (struct.unpack('%sI' % get_endian_symbol(big_endian), input_stream.read(4)))[0]
+        unsigned_integer = (get_struct(big_endian, 'I').unpack(input_stream.read(4)))[0]
 
         return unsigned_integer
 
     def read_float(self, input_stream, tag, xml_data=None, increase_scale=False):
-        float_value = (struct.unpack('%sf' % get_endian_symbol(tag.big_endian), input_stream.read(4)))[0]
+        float_value = (get_struct(tag.big_endian, 'f').unpack(input_stream.read(4)))[0]
         if not tag.xml_doc == None and not xml_data == None and not xml_data.xml_node == None:
             v1 = '%0.6f' % round(float_value, 6)
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "real")], v1))
@@ -562,7 +1319,7 @@ class TagAsset():
         return float_value
 
     def read_min_max(self, input_stream, tag, xml_data=None, increase_scale=False):
-        float_values = struct.unpack('%sff' % get_endian_symbol(tag.big_endian), input_stream.read(8))
+        float_values = get_struct(tag.big_endian, 'ff').unpack(input_stream.read(8))
         float_min = float_values[0]
         float_max = float_values[1]
         if increase_scale:
@@ -575,7 +1332,7 @@ class TagAsset():
         return (float_min, float_max)
 
     def read_point_2d(self, input_stream, tag, xml_data=None, increase_scale=False):
-        float_a, float_b = struct.unpack('%sff' % get_endian_symbol(tag.big_endian), input_stream.read(8))
+        float_a, float_b = get_struct(tag.big_endian, 'ff').unpack(input_stream.read(8))
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "real point 2d")], xml_2d(float_a, float_b)))
 
@@ -586,7 +1343,7 @@ class TagAsset():
         return (float_a, float_b)
 
     def read_degree_2d(self, input_stream, tag, xml_data=None):
-        float_a, float_b = struct.unpack('%sff' % get_endian_symbol(tag.big_endian), input_stream.read(8))
+        float_a, float_b = get_struct(tag.big_endian, 'ff').unpack(input_stream.read(8))
         degree_a = degrees(float_a)
         degree_b = degrees(float_b)
         if not tag.xml_doc == None:
@@ -595,7 +1352,7 @@ class TagAsset():
         return (degree_a, degree_b)
 
     def read_degree(self, input_stream, tag, xml_data=None):
-        degree = degrees((struct.unpack('%sf' % get_endian_symbol(tag.big_endian), input_stream.read(4)))[0])
+        degree = degrees((get_struct(tag.big_endian, 'f').unpack(input_stream.read(4)))[0])
         if not tag.xml_doc == None and not xml_data == None:
             v1 = '%0.6f' % round(degree, 6)
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "angle")], v1))
@@ -603,7 +1360,7 @@ class TagAsset():
         return degree
 
     def read_min_max_degree(self, input_stream, tag, xml_data=None):
-        float_a, float_b = struct.unpack('%sff' % get_endian_symbol(tag.big_endian), input_stream.read(8))
+        float_a, float_b = get_struct(tag.big_endian, 'ff').unpack(input_stream.read(8))
         degree_a = degrees(float_a)
         degree_b = degrees(float_b)
         if not tag.xml_doc == None:
@@ -612,7 +1369,7 @@ class TagAsset():
         return (degree_a, degree_b)
 
     def read_point_3d(self, input_stream, tag, xml_data=None, increase_scale=False):
-        pos = struct.unpack('%s3f' % get_endian_symbol(tag.big_endian), input_stream.read(12))
+        pos = get_struct(tag.big_endian, '3f').unpack(input_stream.read(12))
         pos_vector = Vector((pos[0], pos[1], pos[2]))
         if not tag.xml_doc == None and not xml_data == None and not xml_data.xml_node == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "real point 3d")], xml_vector(pos_vector)))
@@ -623,7 +1380,7 @@ class TagAsset():
         return pos_vector
 
     def read_euler_angles(self, input_stream, tag, xml_data=None):
-        angles = struct.unpack('%s3f' % get_endian_symbol(tag.big_endian), input_stream.read(12))
+        angles = get_struct(tag.big_endian, '3f').unpack(input_stream.read(12))
         euler_angles = Euler((degrees(angles[0]), degrees(angles[1]), degrees(angles[2])))
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "real euler angles 3d")], xml_vector(euler_angles)))
@@ -631,7 +1388,7 @@ class TagAsset():
         return euler_angles
 
     def read_vector(self, input_stream, tag, xml_data=None, increase_scale=False):
-        pos = struct.unpack('%s3f' % get_endian_symbol(tag.big_endian), input_stream.read(12))
+        pos = get_struct(tag.big_endian, '3f').unpack(input_stream.read(12))
         pos_vector = Vector((pos[0], pos[1], pos[2]))
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "real vector 3d")], xml_vector(pos_vector)))
@@ -642,7 +1399,7 @@ class TagAsset():
         return pos_vector
 
     def read_quaternion(self, input_stream, tag, xml_data=None, is_inverted=False):
-        rot = struct.unpack('%s4f' % get_endian_symbol(tag.big_endian), input_stream.read(16))
+        rot = get_struct(tag.big_endian, '4f').unpack(input_stream.read(16))
         rot_value = Quaternion((rot[3], rot[0], rot[1], rot[2])) # Order is the way it is cause Halo stores quaternions as IJKW while Blender is WIJK. - General_101
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "real quaternion")], xml_quaternion(rot_value)))
@@ -653,7 +1410,7 @@ class TagAsset():
         return rot_value
 
     def read_quaternion_squared(self, input_stream, tag, xml_data=None, is_inverted=False):
-        rot = struct.unpack('%s4h' % get_endian_symbol(tag.big_endian), input_stream.read(8))
+        rot = get_struct(tag.big_endian, '4h').unpack(input_stream.read(8))
 
         q0 = rot[0]
         q1 = rot[1]
@@ -683,14 +1440,14 @@ class TagAsset():
         return rot_value
 
     def read_rgb(self, input_stream, tag, xml_data=None):
-        rgb = struct.unpack('%s3f' % get_endian_symbol(tag.big_endian), input_stream.read(12))
+        rgb = get_struct(tag.big_endian, '3f').unpack(input_stream.read(12))
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "rgb color")], xml_vector(rgb)))
 
         return (rgb[0], rgb[1], rgb[2], 1)
 
     def read_bgr_byte(self, input_stream, tag, xml_data=None):
-        bgr = struct.unpack('%s4B' % get_endian_symbol(tag.big_endian), input_stream.read(4))
+        bgr = get_struct(tag.big_endian, '4B').unpack(input_stream.read(4))
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "rgb color")], xml_vector_short((bgr[2], bgr[1], bgr[0]))))
 
@@ -702,21 +1459,21 @@ class TagAsset():
         return (R, G, B, A) # Order is the way it is cause Halo stores color as BGR while Blender is RGBA. - General_101
 
     def read_argb(self, input_stream, tag, xml_data=None):
-        argb = struct.unpack('%s4f' % get_endian_symbol(tag.big_endian), input_stream.read(16))
+        argb = get_struct(tag.big_endian, '4f').unpack(input_stream.read(16))
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "argb color")], xml_tuple(argb)))
 
         return (argb[1], argb[2], argb[3], argb[0]) # Order is the way it is cause Halo stores color as ARGB while Blender is RGBA. - General_101
 
     def read_argb_byte(self, input_stream, tag, xml_data=None):
-        argb = struct.unpack('%s4B' % get_endian_symbol(tag.big_endian), input_stream.read(4))
+        argb = get_struct(tag.big_endian, '4B').unpack(input_stream.read(4))
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "argb color")], xml_tuple_short(argb)))
 
         return (argb[1] / 255, argb[2] / 255, argb[3] / 255, argb[0] / 255) # Order is the way it is cause Halo stores color as ARGB while Blender is RGBA. - General_101
 
     def read_rectangle(self, input_stream, tag, xml_data=None):
-        rec2d = struct.unpack('%s4h' % get_endian_symbol(tag.big_endian), input_stream.read(8))
+        rec2d = get_struct(tag.big_endian, '4h').unpack(input_stream.read(8))
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "rectangle 2d")], xml_tuple_short(rec2d)))
 
@@ -724,7 +1481,7 @@ class TagAsset():
 
     def read_string32(self, input_stream, tag, xml_data=None):
         # Final byte is reserved for a null terminator. - General_101
-        string_value = (struct.unpack('%s31sx' % get_endian_symbol(tag.big_endian), input_stream.read(32)))[0].decode('utf-8', 'replace').split('\x00', 1)[0].strip('\x20')
+        string_value = (get_struct(tag.big_endian, '31sx').unpack(input_stream.read(32)))[0].decode('utf-8', 'replace').split('\x00', 1)[0].strip('\x20')
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "string")], string_value))
 
@@ -732,34 +1489,28 @@ class TagAsset():
 
     def read_string256(self, input_stream, tag, xml_data=None):
         # Final byte is reserved for a null terminator. - General_101
-        string_value = (struct.unpack('%s255sx' % get_endian_symbol(tag.big_endian), input_stream.read(256)))[0].decode('utf-8', 'replace').split('\x00', 1)[0].strip('\x20')
+        string_value = (get_struct(tag.big_endian, '255sx').unpack(input_stream.read(256)))[0].decode('utf-8', 'replace').split('\x00', 1)[0].strip('\x20')
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "string")], string_value))
 
         return string_value
 
     def read_variable_string(self, input_stream, string_length, tag, xml_data=None):
-        unpack_string = '%s%ssx' % (get_endian_symbol(tag.big_endian), string_length)
-
-        string_value = (struct.unpack(unpack_string, input_stream.read(string_length + 1)))[0].decode('utf-8', 'replace').split('\x00', 1)[0].strip('\x20')
+        string_value = (get_struct(tag.big_endian, '%ssx' % string_length).unpack(input_stream.read(string_length + 1)))[0].decode('utf-8', 'replace').split('\x00', 1)[0].strip('\x20')
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "string")], string_value))
 
         return string_value
 
     def read_variable_string_no_terminator(self, input_stream, string_length, tag, xml_data=None):
-        unpack_string = '%s%ss' % (get_endian_symbol(tag.big_endian), string_length)
-
-        string_value = (struct.unpack(unpack_string, input_stream.read(string_length)))[0].decode('utf-8', 'replace').split('\x00', 1)[0].strip('\x20')
+        string_value = (get_struct(tag.big_endian, '%ss' % string_length).unpack(input_stream.read(string_length)))[0].decode('utf-8', 'replace').split('\x00', 1)[0].strip('\x20')
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "string")], string_value))
 
         return string_value
 
     def read_variable_string_no_terminator_reversed(self, input_stream, string_length, tag, xml_data=None):
-        unpack_string = '%s%ss' % (get_endian_symbol(tag.big_endian), string_length)
-
-        string_value = (struct.unpack(unpack_string, input_stream.read(string_length)))[0].decode('utf-8', 'replace').split('\x00', 1)[0].strip('\x20')[::-1]
+        string_value = (get_struct(tag.big_endian, '%ss' % string_length).unpack(input_stream.read(string_length)))[0].decode('utf-8', 'replace').split('\x00', 1)[0].strip('\x20')[::-1]
         if not tag.xml_doc == None and not xml_data == None:
             xml_data.xml_node.appendChild(create_xml_node("field", [("name", xml_data.element_name), ("type", "string")], string_value))
 
@@ -773,7 +1524,7 @@ class TagAsset():
             self.size = size
 
         def read(self, input_stream, tag, reverse=True):
-            tag_block_header_struct = struct.unpack('%s4s3I' % get_endian_symbol(tag.big_endian), input_stream.read(16))
+            tag_block_header_struct = get_struct(tag.big_endian, '4s3I').unpack(input_stream.read(16))
             self.name = tag_block_header_struct[0]
             if reverse:
                 self.name = self.name[::-1]
@@ -791,7 +1542,7 @@ class TagAsset():
                       self.count,
                       self.size)
 
-            output_stream.write(struct.pack('%s4s3I' % get_endian_symbol(tag.big_endian), *header))
+            output_stream.write(get_struct(tag.big_endian, '4s3I').pack(*header))
 
     class TagBlock:
         def __init__(self, count=0, maximum_count=0, address=0, definition=0):
@@ -801,7 +1552,7 @@ class TagAsset():
             self.definition = definition
 
         def read(self, input_stream, tag, xml_data=None, maximum_count=0):
-            tag_block_struct = struct.unpack('%siII' % get_endian_symbol(tag.big_endian), input_stream.read(12))
+            tag_block_struct = get_struct(tag.big_endian, 'iII').unpack(input_stream.read(12))
             self.count = tag_block_struct[0]
             self.maximum_count = maximum_count
             self.address = tag_block_struct[1]
@@ -816,7 +1567,7 @@ class TagAsset():
                          self.address,
                          self.definition)
 
-            output_stream.write(struct.pack('%siII' % get_endian_symbol(big_endian), *tag_block))
+            output_stream.write(get_struct(big_endian, 'iII').pack(*tag_block))
 
     class TagRef:
         def __init__(self, tag_group=None, name="", name_length=0, salt=0, index=-1, upgrade_patches=None):
@@ -827,7 +1578,7 @@ class TagAsset():
             self.index = index
 
         def read(self, input_stream, tag, xml_data=None, is_reversed=False):
-            tag_reference_struct = struct.unpack('%s4siii' % get_endian_symbol(tag.big_endian), input_stream.read(16))
+            tag_reference_struct = get_struct(tag.big_endian, '4siii').unpack(input_stream.read(16))
             self.tag_group = tag_reference_struct[0].decode('utf-8', 'replace')
             if not tag.big_endian:
                 self.tag_group = tag_reference_struct[0].decode('utf-8', 'replace')[::-1]
@@ -843,14 +1594,14 @@ class TagAsset():
 
         def write(self, output_stream, big_endian, reverse=False, pad=0):
             if self.tag_group == None:
-                output_stream.write(struct.pack('%siiii' % get_endian_symbol(big_endian), -1, self.salt, 0, self.index))
+                output_stream.write(get_struct(big_endian, 'iiii').pack(-1, self.salt, 0, self.index))
             else:
                 tag_ref = (string_to_bytes(self.tag_group, reverse),
                         self.salt,
                         len(self.name) + pad,
                         self.index)
 
-                output_stream.write(struct.pack('%s4siii' % get_endian_symbol(big_endian), *tag_ref))
+                output_stream.write(get_struct(big_endian, '4siii').pack(*tag_ref))
 
         def append_xml_attributes(self, xml_node):
             append_xml_attributes(xml_node, [("type", self.tag_group)], self.name)
@@ -904,7 +1655,7 @@ class TagAsset():
             self.data = data
 
         def read(self, input_stream, tag, xml_data=None):
-            tag_data_struct = struct.unpack('%siiIII' % get_endian_symbol(tag.big_endian), input_stream.read(20))
+            tag_data_struct = get_struct(tag.big_endian, 'iiIII').unpack(input_stream.read(20))
             self.size = tag_data_struct[0]
             self.flags = tag_data_struct[1]
             self.raw_pointer = tag_data_struct[2]
@@ -922,7 +1673,7 @@ class TagAsset():
                         self.pointer,
                         self.id)
 
-            output_stream.write(struct.pack('%siiIII' % get_endian_symbol(big_endian), *tag_data))
+            output_stream.write(get_struct(big_endian, 'iiIII').pack(*tag_data))
 
     class Plane2D:
         def __init__(self, point_2d=(0.0, 0.0), distance=0.0):
@@ -930,7 +1681,7 @@ class TagAsset():
             self.distance = distance
 
         def read(self, input_stream, tag, xml_data=None):
-            plane_struct = struct.unpack('%s3f' % get_endian_symbol(tag.big_endian), input_stream.read(12))
+            plane_struct = get_struct(tag.big_endian, '3f').unpack(input_stream.read(12))
             self.point_2d = (plane_struct[0], plane_struct[1])
             self.distance = plane_struct[2]
             if not tag.xml_doc == None and not xml_data == None:
@@ -944,7 +1695,7 @@ class TagAsset():
             self.distance = distance
 
         def read(self, input_stream, tag, xml_data=None):
-            plane_struct = struct.unpack('%s4f' % get_endian_symbol(tag.big_endian), input_stream.read(16))
+            plane_struct = get_struct(tag.big_endian, '4f').unpack(input_stream.read(16))
             self.point_3d = Vector((plane_struct[0], plane_struct[1], plane_struct[2]))
             self.distance = plane_struct[3]
             if not tag.xml_doc == None and not xml_data == None:
@@ -996,7 +1747,7 @@ class TagAsset():
             else:
                 self.local_path = input_stream.name.rsplit(".", 1)[0]
 
-            header_struct = struct.unpack('%shbb32s4siiiihbb4s' % get_endian_symbol(tag.big_endian), input_stream.read(64))
+            header_struct = get_struct(tag.big_endian, 'hbb32s4siiiihbb4s').unpack(input_stream.read(64))
             self.unk1 = header_struct[0]
             self.flags = header_struct[1]
             self.type = header_struct[2]
@@ -1041,4 +1792,4 @@ class TagAsset():
                       self.plugin_handle,
                       string_to_bytes(self.engine_tag, reverse))
 
-            output_stream.write(struct.pack('%shbb32s4siiiihbb4s' % get_endian_symbol(big_endian), *header))
+            output_stream.write(get_struct(big_endian, 'hbb32s4siiiihbb4s').pack(*header))
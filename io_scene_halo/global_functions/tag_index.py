@@ -0,0 +1,185 @@
+# ##### BEGIN MIT LICENSE BLOCK #####
+#
+# MIT License
+#
+# Copyright (c) 2023 Steven Garcia & Jadeon Sheppard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# ##### END MIT LICENSE BLOCK #####
+
+import os
+import time
+import pickle
+import hashlib
+
+from . import global_functions, tag_cache
+
+INDEX_VERSION = 1
+# A lookup that misses only rescans the tag tree if the last scan is older than this many seconds. A model with many unresolved
+# materials would otherwise stat every directory once per material.
+REFRESH_INTERVAL = 10.0
+
+TAG_INDEXES = {}
+SHADER_COLLECTIONS = {}
+
+class TagTreeIndex():
+    # Maps lowercased "name.extension" file names in a tag directory to their paths relative to that directory. Every
+    # directory is stored with its mtime, so a refresh only lists directories that had entries added, removed or renamed.
+    def __init__(self, tag_path):
+        self.tag_path = tag_path
+        self.directories = {}
+        self.files = {}
+        self.refresh_time = None
+
+    def get_index_path(self):
+        enable_tag_cache, cache_directory, cache_size = tag_cache.get_cache_settings()
+        index_path = None
+        if enable_tag_cache:
+            tag_path_key = hashlib.sha1(os.path.normcase(os.path.abspath(self.tag_path)).encode("utf-8")).hexdigest()
+            index_path = os.path.join(cache_directory, "tag_index_%s.pickle" % tag_path_key)
+
+        return index_path
+
+    def load(self):
+        index_path = self.get_index_path()
+        if not index_path == None and os.path.isfile(index_path):
+            try:
+                index_data = tag_cache.read_signed_file(index_path)
+                if not index_data == None:
+                    index_version, directories = pickle.loads(index_data)
+                    if index_version == INDEX_VERSION:
+                        self.directories = directories
+
+            except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError):
+                self.directories = {}
+
+    def save(self):
+        index_path = self.get_index_path()
+        if not index_path == None:
+            try:
+                tag_cache.make_cache_directory(os.path.dirname(index_path))
+                tag_cache.write_signed_file(index_path, pickle.dumps((INDEX_VERSION, self.directories), pickle.HIGHEST_PROTOCOL))
+
+            except OSError:
+                pass
+
+    def refresh(self):
+        directories = {}
+        directory_changed = False
+        pending_directories = [""]
+        while len(pending_directories) > 0:
+            relative_directory = pending_directories.pop()
+            try:
+                directory_mtime = os.stat(os.path.join(self.tag_path, relative_directory)).st_mtime_ns
+
+            except OSError:
+                directory_changed = True
+                continue
+
+            directory_entry = self.directories.get(relative_directory)
+            if directory_entry == None or not directory_entry[0] == directory_mtime:
+                directory_changed = True
+                subdirectories = []
+                filenames = []
+                try:
+                    for entry in os.scandir(os.path.join(self.tag_path, relative_directory)):
+                        if entry.is_dir():
+                            subdirectories.append(entry.name)
+                        else:
+                            filenames.append(entry.name)
+
+                except OSError:
+                    continue
+
+                directory_entry = (directory_mtime, subdirectories, filenames)
+
+            directories[relative_directory] = directory_entry
+            for subdirectory in directory_entry[1]:
+                pending_directories.append(os.path.join(relative_directory, subdirectory))
+
+        if directory_changed or not len(directories) == len(self.directories):
+            self.directories = directories
+            self.save()
+
+        self.files = {}
+        for relative_directory in sorted(self.directories.keys()):
+            for filename in self.directories[relative_directory][2]:
+                self.files.setdefault(filename.lower(), []).append(os.path.join(relative_directory, filename))
+
+        self.refresh_time = time.monotonic()
+
+    def find(self, file_names, directory_prefix=None):
+        # Returns the absolute lowercased path for the first of file_names that exists under the tag directory, or None.
+        if self.refresh_time == None:
+            self.load()
+            self.refresh()
+
+        tag_path = self.find_indexed(file_names, directory_prefix)
+        if tag_path == None and time.monotonic() - self.refresh_time > REFRESH_INTERVAL:
+            self.refresh()
+            tag_path = self.find_indexed(file_names, directory_prefix)
+
+        return tag_path
+
+    def find_indexed(self, file_names, directory_prefix=None):
+        if not directory_prefix == None:
+            directory_prefix = os.path.join(os.path.normpath(directory_prefix.lower()), "")
+
+        for file_name in file_names:
+            for relative_path in self.files.get(file_name.lower(), ()):
+                if directory_prefix == None or relative_path.lower().startswith(directory_prefix):
+                    tag_path = os.path.join(self.tag_path, relative_path)
+                    if os.path.isfile(tag_path):
+                        return tag_path.lower()
+
+        return None
+
+def get_tag_index(tag_path):
+    tag_index = TAG_INDEXES.get(tag_path)
+    if tag_index == None:
+        tag_index = TagTreeIndex(tag_path)
+        TAG_INDEXES[tag_path] = tag_index
+
+    return tag_index
+
+def get_shader_collections(shader_collection_path):
+    # Shader collection files are read once and then only again if they change on disk.
+    try:
+        collection_mtime = os.stat(shader_collection_path).st_mtime_ns
+
+    except OSError:
+        return {}
+
+    collection_entry = SHADER_COLLECTIONS.get(shader_collection_path)
+    if collection_entry == None or not collection_entry[0] == collection_mtime:
+        shader_collection_dic = {}
+        with open(shader_collection_path, "r") as shader_collection_file:
+            for line in shader_collection_file.readlines():
+                if not global_functions.string_empty_check(line) and not line.startswith(";"):
+                    split_result = line.split()
+                    if len(split_result) == 2:
+                        prefix = split_result[0]
+                        path = split_result[1]
+                        shader_collection_dic[prefix] = path
+
+        collection_entry = (collection_mtime, shader_collection_dic)
+        SHADER_COLLECTIONS[shader_collection_path] = collection_entry
+
+    return collection_entry[1]
@@ -0,0 +1,188 @@
+# ##### BEGIN MIT LICENSE BLOCK #####
+#
+# MIT License
+#
+# Copyright (c) 2023 Steven Garcia & Jadeon Sheppard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# ##### END MIT LICENSE BLOCK #####
+
+
+import os
+import bpy
+import json
+import time
+import tempfile
+import threading
+
+# Report for the pipeline that is currently running or None when timing reports are off. Every phase() call checks this first
+# so instrumented code only pays for a global lookup and a shared no-op context manager while it is disabled.
+ACTIVE_REPORT = None
+PHASE_STACKS = threading.local()
+
+class NullPhase():
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+    def count(self, element_name, element_count):
+        pass
+
+NULL_PHASE = NullPhase()
+
+class TimingPhase():
+    # Phases nest per thread. A phase opened inside another one is stored under "parent/child" so the totals of top level
+    # phases never count the same time twice.
+    def __init__(self, timing_report, phase_name):
+        self.timing_report = timing_report
+        self.phase_name = phase_name
+        self.phase_path = phase_name
+        self.element_counts = {}
+        self.wall_start = 0.0
+        self.cpu_start = 0.0
+
+    def __enter__(self):
+        phase_stack = getattr(PHASE_STACKS, "phase_stack", None)
+        if phase_stack == None:
+            phase_stack = []
+            PHASE_STACKS.phase_stack = phase_stack
+
+        if len(phase_stack) > 0:
+            self.phase_path = "%s/%s" % (phase_stack[-1].phase_path, self.phase_name)
+
+        phase_stack.append(self)
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        wall_time = time.perf_counter() - self.wall_start
+        cpu_time = time.process_time() - self.cpu_start
+        PHASE_STACKS.phase_stack.pop()
+        self.timing_report.add_phase(self.phase_path, wall_time, cpu_time, self.element_counts)
+
+        return False
+
+    def count(self, element_name, element_count):
+        self.element_counts[element_name] = self.element_counts.get(element_name, 0) + element_count
+
+class TimingReport():
+    def __init__(self, pipeline_name):
+        self.pipeline_name = pipeline_name
+        self.phases = {}
+        self.lock = threading.Lock()
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.process_time()
+
+    def add_phase(self, phase_path, wall_time, cpu_time, element_counts):
+        # Writer threads can finish phases at the same time as the main thread.
+        with self.lock:
+            phase = self.phases.get(phase_path)
+            if phase == None:
+                phase = {"phase": phase_path, "calls": 0, "wall_time": 0.0, "cpu_time": 0.0, "counts": {}}
+                self.phases[phase_path] = phase
+
+            phase["calls"] += 1
+            phase["wall_time"] += wall_time
+            phase["cpu_time"] += cpu_time
+            for element_name, element_count in element_counts.items():
+                phase["counts"][element_name] = phase["counts"].get(element_name, 0) + element_count
+
+    def get_results(self):
+        with self.lock:
+            phases = [dict(phase, counts=dict(phase["counts"])) for phase in self.phases.values()]
+
+        return {"pipeline": self.pipeline_name,
+                "wall_time": time.perf_counter() - self.wall_start,
+                "cpu_time": time.process_time() - self.cpu_start,
+                "phases": phases}
+
+def get_summary(timing_results):
+    phase_summaries = []
+    for phase in timing_results["phases"]:
+        if not "/" in phase["phase"]:
+            phase_summary = "%s %0.3fs" % (phase["phase"], phase["wall_time"])
+            if len(phase["counts"]) > 0:
+                phase_summary += " (%s)" % ", ".join("%s %s" % (element_count, element_name) for element_name, element_count in phase["counts"].items())
+
+            phase_summaries.append(phase_summary)
+
+    return "%s took %0.3fs: %s" % (timing_results["pipeline"], timing_results["wall_time"], ", ".join(phase_summaries))
+
+def is_enabled():
+    return bpy.context.preferences.addons["io_scene_halo"].preferences.enable_timing_report
+
+def start(pipeline_name):
+    global ACTIVE_REPORT
+    ACTIVE_REPORT = None
+    # Drop anything a failed export left open so it doesn't become the parent of the new phases.
+    PHASE_STACKS.phase_stack = []
+    if is_enabled():
+        ACTIVE_REPORT = TimingReport(pipeline_name)
+
+def phase(phase_name):
+    if ACTIVE_REPORT == None:
+        return NULL_PHASE
+
+    return TimingPhase(ACTIVE_REPORT, phase_name)
+
+def begin_phase(phase_name):
+    # For long linear functions where wrapping everything in a with block would be awkward. Pair every call with end_phase().
+    return phase(phase_name).__enter__()
+
+def end_phase(timing_phase):
+    timing_phase.__exit__(None, None, None)
+
+def get_report_path(output_path, is_import):
+    # Exports put the report next to the file they wrote. Imports never write into the tags directory, their reports go to a
+    # folder in the system temp directory instead.
+    report_name = "%s.timing.json" % os.path.splitext(output_path)[0]
+    if is_import:
+        report_name = os.path.join(tempfile.gettempdir(), "io_scene_halo", os.path.basename(report_name))
+
+    return report_name
+
+def finish(output_path, report, is_import=False):
+    # Writes the results as JSON and puts a one line summary in the operator report.
+    global ACTIVE_REPORT
+    timing_report = ACTIVE_REPORT
+    ACTIVE_REPORT = None
+    if timing_report == None:
+        return
+
+    timing_results = timing_report.get_results()
+    report_path = get_report_path(output_path, is_import)
+    try:
+        if is_import:
+            os.makedirs(os.path.dirname(report_path), exist_ok=True)
+
+        with open(report_path, 'w', encoding='utf_8') as report_file:
+            json.dump(timing_results, report_file, indent=4)
+
+        if is_import:
+            report({'INFO'}, "Timing report written to %s" % report_path)
+
+    except OSError:
+        report({'WARNING'}, "Could not write timing report to %s" % report_path)
+
+    report({'INFO'}, get_summary(timing_results))
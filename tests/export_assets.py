@@ -0,0 +1,125 @@
+# ##### BEGIN MIT LICENSE BLOCK #####
+#
+# MIT License
+#
+# Copyright (c) 2023 Steven Garcia & Jadeon Sheppard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# ##### END MIT LICENSE BLOCK #####
+
+import random
+
+from types import SimpleNamespace
+
+# Plain stand-ins for the asset data the exporters hand to their writers. They are built from a fixed seed so the golden files
+# in fixtures/writers always describe the same geometry and animation.
+
+def get_decimal_formats(decimal_point):
+    return {
+        "DECIMAL_POINT": decimal_point,
+        "DECIMAL_1": '\n%0.{decimal_point}f'.format(decimal_point=decimal_point),
+        "DECIMAL_2": '\n%0.{decimal_point}f\t%0.{decimal_point}f'.format(decimal_point=decimal_point),
+        "DECIMAL_3": '\n%0.{decimal_point}f\t%0.{decimal_point}f\t%0.{decimal_point}f'.format(decimal_point=decimal_point),
+        "DECIMAL_4": '\n%0.{decimal_point}f\t%0.{decimal_point}f\t%0.{decimal_point}f\t%0.{decimal_point}f'.format(decimal_point=decimal_point),
+    }
+
+def get_vertex(rng):
+    node_set = [(rng.randint(0, 40), rng.random()) for node_idx in range(rng.randint(0, 4))]
+    uv_set = [(rng.uniform(-2, 2), rng.uniform(-2, 2)) for uv_idx in range(rng.randint(1, 4))]
+    return SimpleNamespace(region=rng.randint(0, 5),
+                           translation=tuple(rng.uniform(-1000, 1000) for axis in range(3)),
+                           normal=tuple(rng.uniform(-1, 1) for axis in range(3)),
+                           node_influence_count=len(node_set),
+                           node_set=node_set,
+                           uv_set=uv_set,
+                           color=(rng.random(), rng.random(), rng.random(), 1.0))
+
+def get_triangle(rng, vertex_count):
+    return SimpleNamespace(region=rng.randint(0, 5),
+                           material_index=rng.randint(-1, 9),
+                           v0=rng.randint(0, vertex_count - 1),
+                           v1=rng.randint(0, vertex_count - 1),
+                           v2=rng.randint(0, vertex_count - 1))
+
+def get_geometry_asset(vertex_count=24, triangle_count=24, seed=3):
+    rng = random.Random(seed)
+    vertices = [get_vertex(rng) for vertex_idx in range(vertex_count)]
+    triangles = [get_triangle(rng, vertex_count) for triangle_idx in range(triangle_count)]
+
+    return SimpleNamespace(vertices=vertices, triangles=triangles)
+
+def get_transform(rng):
+    return SimpleNamespace(translation=tuple(rng.uniform(-100, 100) for axis in range(3)),
+                           rotation=tuple(rng.uniform(-1, 1) for axis in range(4)),
+                           scale=rng.uniform(0.5, 2))
+
+def get_animation_asset(jma_version, node_count=6, frame_count=12, seed=5):
+    rng = random.Random(seed)
+    nodes = []
+    for node_idx in range(node_count):
+        nodes.append(SimpleNamespace(name="bone_%s" % node_idx,
+                                     parent=node_idx - 1,
+                                     child=(node_idx + 1) if node_idx + 1 < node_count else -1,
+                                     sibling=-1))
+
+    transforms = [[get_transform(rng) for node_idx in range(node_count)] for frame_idx in range(frame_count)]
+    biped_controller_transforms = [get_transform(rng) for frame_idx in range(frame_count)]
+
+    return SimpleNamespace(version=jma_version,
+                           node_checksum=rng.randint(-2147483648, 2147483647),
+                           frame_count=frame_count,
+                           frame_rate=30,
+                           actor_names=["unnamedActor"],
+                           node_count=node_count,
+                           nodes=nodes,
+                           transforms=transforms,
+                           biped_controller_transforms=biped_controller_transforms)
+
+def get_ijkw_rotation(rotation):
+    return (rotation[1], rotation[2], rotation[3], rotation[0])
+
+def set_export_layout(JMS):
+    # The importers store Blender vectors, WIJK quaternions, one list of transforms per frame and None for a missing permutation or
+    # region, while the writers expect plain tuples, Halo IJKW rotations, the transforms of a single frame and empty strings. An
+    # imported JMS is rearranged in place before it is written again.
+    JMS.transforms = [SimpleNamespace(translation=tuple(transform.translation), rotation=get_ijkw_rotation(transform.rotation)) for transform in JMS.transforms[0]]
+    for material in JMS.materials:
+        if material.permutation == None:
+            material.permutation = ''
+
+        if material.region == None:
+            material.region = ''
+
+    elements = (JMS.markers + JMS.xref_markers + JMS.spheres + JMS.boxes + JMS.capsules + JMS.convex_shapes + JMS.ragdolls + JMS.hinges +
+                JMS.car_wheels + JMS.point_to_points + JMS.prismatics)
+    for element in elements:
+        for attribute_name, attribute_value in vars(element).items():
+            if attribute_name.endswith("rotation"):
+                setattr(element, attribute_name, get_ijkw_rotation(attribute_value))
+
+            elif attribute_name.endswith("translation"):
+                setattr(element, attribute_name, tuple(attribute_value))
+
+    for vertex in JMS.vertices:
+        vertex.translation = tuple(vertex.translation)
+        vertex.normal = tuple(vertex.normal)
+        vertex.color = tuple(vertex.color)
+
+    return JMS
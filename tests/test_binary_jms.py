@@ -0,0 +1,90 @@
+# ##### BEGIN MIT LICENSE BLOCK #####
+#
+# MIT License
+#
+# Copyright (c) 2023 Steven Garcia & Jadeon Sheppard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# ##### END MIT LICENSE BLOCK #####
+
+# The binary JMS intermediate is internal only, so the writer and process_file_binary are only checked against each other here. A
+# retail JMS is parsed from text, written as binary and read back, and has to come out the same as the text parse to float
+# precision.
+
+import os
+import pytest
+
+pytest.importorskip("bpy")
+pytest.importorskip("mathutils")
+
+import export_assets
+
+from io_scene_halo.file_jms import build_asset
+from io_scene_halo.file_jms.format import JMSAsset
+from io_scene_halo.file_jms.process_file_retail import process_file_retail
+from io_scene_halo.file_jms.process_file_binary import process_file_binary, is_binary_file
+
+RESOURCE_DIRECTORY = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "io_scene_halo", "resources", "halo3")
+RETAIL_VERSIONS = (8197, 8198, 8199, 8200, 8201, 8202, 8203, 8204, 8205, 8206, 8207, 8208, 8209, 8210, 8211, 8212, 8213)
+
+def read_text_jms(input_file):
+    return process_file_retail(JMSAsset(input_file), 'auto', 'JMS', RETAIL_VERSIONS, 'default', 'default')
+
+def assert_values_equal(values, other_values):
+    assert list(values) == pytest.approx(list(other_values), rel=1e-6, abs=1e-6)
+
+@pytest.mark.parametrize("resource_name", ("sentinel_constructor.jms", "longsword.jms"))
+def test_binary_round_trip(resource_name, tmp_path, monkeypatch):
+    # The 8213 writer switches the module decimal formats, they are patched with their current values so they're restored after.
+    for attribute_name in ("DECIMAL_POINT", "DECIMAL_1", "DECIMAL_2", "DECIMAL_3", "DECIMAL_4"):
+        monkeypatch.setattr(build_asset, attribute_name, getattr(build_asset, attribute_name))
+
+    input_file = os.path.join(RESOURCE_DIRECTORY, resource_name)
+    TEXT_JMS = read_text_jms(input_file)
+    output_path = str(tmp_path / resource_name)
+    build_asset.write_asset_sections(export_assets.set_export_layout(read_text_jms(input_file)), output_path, TEXT_JMS.version, "halo3", binary=True)
+
+    assert is_binary_file(output_path + "B")
+    BINARY_JMS = process_file_binary(output_path + "B", 'auto', 'JMS', RETAIL_VERSIONS, 'default', 'default')
+
+    assert BINARY_JMS.version == TEXT_JMS.version
+    assert [(node.name, node.parent, node.child, node.sibling) for node in BINARY_JMS.nodes] == [(node.name, node.parent, node.child, node.sibling) for node in TEXT_JMS.nodes]
+    for transform, text_transform in zip(BINARY_JMS.transforms[0], TEXT_JMS.transforms[0]):
+        assert_values_equal(transform.translation, text_transform.translation)
+        assert_values_equal(transform.rotation, text_transform.rotation)
+
+    assert [(material.name, material.lod, material.permutation, material.region) for material in BINARY_JMS.materials] == [(material.name, material.lod, material.permutation, material.region) for material in TEXT_JMS.materials]
+    assert [(marker.name, marker.parent) for marker in BINARY_JMS.markers] == [(marker.name, marker.parent) for marker in TEXT_JMS.markers]
+    for marker, text_marker in zip(BINARY_JMS.markers, TEXT_JMS.markers):
+        assert_values_equal(marker.translation, text_marker.translation)
+        assert_values_equal(marker.rotation, text_marker.rotation)
+        assert marker.radius == pytest.approx(text_marker.radius, rel=1e-6, abs=1e-6)
+
+    assert len(BINARY_JMS.vertices) == len(TEXT_JMS.vertices)
+    for vertex, text_vertex in zip(BINARY_JMS.vertices, TEXT_JMS.vertices):
+        assert_values_equal(vertex.translation, text_vertex.translation)
+        assert_values_equal(vertex.normal, text_vertex.normal)
+        assert_values_equal(vertex.color, text_vertex.color)
+        assert [node_index for node_index, node_weight in vertex.node_set] == [node_index for node_index, node_weight in text_vertex.node_set]
+        assert_values_equal([node_weight for node_index, node_weight in vertex.node_set], [node_weight for node_index, node_weight in text_vertex.node_set])
+        assert_values_equal([value for uv in vertex.uv_set for value in uv], [value for uv in text_vertex.uv_set for value in uv])
+
+    assert [(triangle.material_index, triangle.v0, triangle.v1, triangle.v2) for triangle in BINARY_JMS.triangles] == [(triangle.material_index, triangle.v0, triangle.v1, triangle.v2) for triangle in TEXT_JMS.triangles]
+    assert [len(getattr(BINARY_JMS, section)) for section in ("spheres", "boxes", "capsules", "convex_shapes", "ragdolls", "hinges", "bounding_spheres", "skylights")] == [len(getattr(TEXT_JMS, section)) for section in ("spheres", "boxes", "capsules", "convex_shapes", "ragdolls", "hinges", "bounding_spheres", "skylights")]
@@ -0,0 +1,100 @@
+# ##### BEGIN MIT LICENSE BLOCK #####
+#
+# MIT License
+#
+# Copyright (c) 2023 Steven Garcia & Jadeon Sheppard
+#
+# Permission is hereby granted, free of charge, to any person obtaining a copy
+# of this software and associated documentation files (the "Software"), to deal
+# in the Software without restriction, including without limitation the rights
+# to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the Software is
+# furnished to do so, subject to the following conditions:
+#
+# The above copyright notice and this permission notice shall be included in all
+# copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+# IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+# FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+# AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+# LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+# OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+# SOFTWARE.
+#
+# ##### END MIT LICENSE BLOCK #####
+
+# The files in fixtures/writers were written by the JMS, JMA and ASS writers as they were before vertices and triangles were
+# formatted in chunks, using the assets from export_assets.py. The current writers have to reproduce them byte for byte.
+
+import io
+import os
+import pytest
+
+pytest.importorskip("bpy")
+pytest.importorskip("mathutils")
+
+import export_assets
+
+from io_scene_halo.file_jms import build_asset as jms_build_asset
+from io_scene_halo.file_jma import build_asset as jma_build_asset
+from io_scene_halo.file_ass import build_asset as ass_build_asset
+from io_scene_halo.global_functions import global_functions
+
+FIXTURE_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "writers")
+
+JMS_SECTION_WRITERS = ("write_vertices_8197", "write_vertices_8198", "write_vertices_8199", "write_vertices_8201",
+                       "write_vertices_8202", "write_vertices_8204", "write_vertices_8205", "write_vertices_8211",
+                       "write_triangles_8197", "write_triangles_8198", "write_triangles_8201", "write_triangles_8205")
+JMA_VERSIONS = (16390, 16391, 16392, 16393, 16394, 16395)
+ASS_VERSIONS = (1, 2, 3, 4, 5, 6, 7)
+
+def read_fixture(fixture_name):
+    with open(os.path.join(FIXTURE_DIRECTORY, fixture_name), 'r', encoding='utf_8', newline='') as fixture_file:
+        return fixture_file.read()
+
+def set_decimal_formats(monkeypatch, module, decimal_point):
+    for attribute_name, attribute_value in export_assets.get_decimal_formats(decimal_point).items():
+        monkeypatch.setattr(module, attribute_name, attribute_value)
+
+@pytest.mark.parametrize("writer_name", JMS_SECTION_WRITERS)
+def test_jms_section_writer_matches_golden(monkeypatch, writer_name):
+    JMS = export_assets.get_geometry_asset()
+    section_writer = getattr(jms_build_asset, writer_name)
+    output = io.StringIO()
+    for decimal_point in ("6", "10"):
+        set_decimal_formats(monkeypatch, jms_build_asset, decimal_point)
+        for write_comments in (False, True):
+            for write_whitespace in (False, True):
+                output.write("\n#### decimal=%s comments=%s whitespace=%s\n" % (decimal_point, write_comments, write_whitespace))
+                section_writer(output, JMS, False, write_comments, write_whitespace)
+
+    assert output.getvalue() == read_fixture("jms_%s.txt" % writer_name)
+
+@pytest.mark.parametrize("jma_version", JMA_VERSIONS)
+def test_jma_writer_matches_golden(monkeypatch, tmp_path, jma_version):
+    set_decimal_formats(monkeypatch, jma_build_asset, "6")
+    output_path = str(tmp_path / "test.jma")
+    jma_build_asset.write_asset(export_assets.get_animation_asset(jma_version), output_path, jma_version)
+    with open(output_path, 'r', encoding='utf_8') as output_file:
+        assert output_file.read() == read_fixture("jma_%s.jma" % jma_version)
+
+@pytest.mark.parametrize("ass_version", ASS_VERSIONS)
+def test_ass_mesh_writer_matches_golden(ass_version):
+    output = io.StringIO()
+    ass_build_asset.write_mesh_geometry(output, export_assets.get_geometry_asset(), ass_version)
+
+    assert output.getvalue() == read_fixture("ass_mesh_%s.txt" % ass_version)
+
+def test_record_chunks_match_single_chunk():
+    JMS = export_assets.get_geometry_asset()
+    def format_triangle(triangle_idx, triangle, values):
+        values.extend((triangle_idx, triangle.material_index, triangle.v0, triangle.v1, triangle.v2))
+        return '\n%s\t%s\t%s\t%s\t%s'
+
+    chunked_output = io.StringIO()
+    single_output = io.StringIO()
+    global_functions.write_record_chunks(chunked_output, JMS.triangles, format_triangle, 7)
+    global_functions.write_record_chunks(single_output, JMS.triangles, format_triangle, len(JMS.triangles))
+
+    assert chunked_output.getvalue() == single_output.getvalue()